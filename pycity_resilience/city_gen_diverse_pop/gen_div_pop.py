@@ -27,6 +27,7 @@ import pycity_resilience.ga.parser.parse_city_to_ind as parsecity
 import pycity_resilience.ga.parser.parse_dict_to_ind as parsedictind
 import pycity_resilience.ga.parser.parse_ind_to_city as parseindcit
 import pycity_resilience.ga.preprocess.add_bes as addbes
+import pycity_resilience.ga.preprocess.ref_mc_run as refrun
 import pycity_resilience.ga.preprocess.pv_areas as pvareas
 import pycity_resilience.ga.evolution.mutation_esys as mutesys
 import pycity_resilience.monte_carlo.run_mc as runmc
@@ -1440,7 +1441,7 @@ def gen_diverse_pop(city, nb_ind, nb_runs, failure_tolerance, sampling_method,
                     eeg_pv_limit=False, pv_min=None, pv_step=1, add_pv_prop=0,
                     use_street=False, do_upscale=False,
                     use_kwkg_lhn_sub=False, use_size_restr=True,
-                    dem_unc=True, prevent_boi_lhn=True):
+                    dem_unc=True, prevent_boi_lhn=True, path_ref_cache=None):
     """
     Generates and returns diverse population
 
@@ -1510,6 +1511,11 @@ def gen_diverse_pop(city, nb_ind, nb_runs, failure_tolerance, sampling_method,
     prevent_boi_lhn : bool, optional
 		Prevent boi/eh LHN combinations (without CHP) (default: True).
 		If True, adds CHPs to LHN systems without CHP
+    path_ref_cache : str, optional
+        Path to cache folder of reference scenario MC results (default:
+        None). Only relevant for dimensionless MC objectives. If not None,
+        results of identical city, samples and MC settings are loaded
+        from/saved to folder (see ref_mc_run.py)
 
     Returns
     -------
@@ -1570,6 +1576,27 @@ def gen_diverse_pop(city, nb_ind, nb_runs, failure_tolerance, sampling_method,
                                nb_runs=nb_runs,
                                failure_tolerance=failure_tolerance)
 
+    if (objective == 'mc_dimless_eco_em_2d_mean'
+            or objective == 'mc_dimless_eco_em_2d_risk_av'
+            or objective == 'mc_dimless_eco_em_2d_risk_friendly'
+            or objective == 'mc_dimless_eco_em_3d_mean'
+            or objective == 'mc_dimless_eco_em_3d_risk_av'
+            or objective == 'mc_dimless_eco_em_3d_risk_friendly'
+            or objective == 'mc_dimless_eco_em_2d_std'
+            or objective == 'mc_dimless_eco_em_3d_std'):
+        #  Perform reference system mc run (4x rescaled boiler) or load
+        #  persisted results (required for dimensionless objectives)
+        ga_runner._dict_mc_res_ref = \
+            refrun.perform_ref_mc_run(city=city,
+                                      mc_run=mc_run,
+                                      nb_runs=nb_runs,
+                                      sampling_method=sampling_method,
+                                      eeg_pv_limit=eeg_pv_limit,
+                                      use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                                      el_mix_for_chp=el_mix_for_chp,
+                                      el_mix_for_pv=el_mix_for_pv,
+                                      path_cache=path_ref_cache)
+
     if (objective == 'mc_risk_av_ann_co2_to_net_energy'
             or objective == 'ann_and_co2_to_net_energy_ref_test'
             or objective == 'ann_and_co2_ref_test'
@@ -1909,6 +1936,9 @@ if __name__ == '__main__':
                    + '.pkl'
     path_save = os.path.join(workspace, 'init_populations', pop_name)
 
+    #  Cache folder of reference scenario MC results (shared with opt_ga.py)
+    path_ref_cache = os.path.join(workspace, 'output', 'ref_mc_cache')
+
     #  Load city object instance
     city = pickle.load(open(path_city, mode='rb'))
 
@@ -2049,7 +2079,8 @@ if __name__ == '__main__':
                                          dict_restr=dict_restr,
                                          use_size_restr=use_size_restr,
                                          dem_unc=dem_unc,
-                                         prevent_boi_lhn=prevent_boi_lhn
+                                         prevent_boi_lhn=prevent_boi_lhn,
+                                         path_ref_cache=path_ref_cache
                                          )
 
     for ind in pop_div:
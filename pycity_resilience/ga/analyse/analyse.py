@@ -9,6 +9,8 @@ import copy
 
 import pycity_calc.toolbox.networks.network_ops as netop
 
+import pycity_resilience.ga.preprocess.spatial_index as spatind
+
 
 def get_build_ids_ind(ind):
     """
@@ -89,7 +91,8 @@ def get_ids_sorted_by_dist(id, dict_pos, list_av=None, max_dist=None):
         Reference point id
     dict_pos : dict
         Dict holding building node ids as keys and shapely point objects (2d)
-        as values
+        as values. If dict_pos is SpatialIndex object, uses precomputed
+        distances.
     list_av : list, optional
         List of available building node ids for LHN connection (default: None).
         If None, uses all nodes in dict_pos
@@ -123,11 +126,16 @@ def get_ids_sorted_by_dist(id, dict_pos, list_av=None, max_dist=None):
     #  Get position of reference point
     p1 = dict_pos[id]
 
-    list_dist = []
-    for i in range(len(list_av)):
-        p2 = dict_pos[list_av[i]]
-        dist = netop.calc_point_distance(point_1=p1, point_2=p2)
-        list_dist.append(dist)
+    if isinstance(dict_pos, spatind.SpatialIndex):
+        #  Distances larger than max_dist might be np.inf (erased below)
+        list_dist = dict_pos.get_dist(id=id, list_ids=list_av,
+                                      max_dist=max_dist)
+    else:
+        list_dist = []
+        for i in range(len(list_av)):
+            p2 = dict_pos[list_av[i]]
+            dist = netop.calc_point_distance(point_1=p1, point_2=p2)
+            list_dist.append(dist)
 
     # Sort dist_list and node_list by dist_list distance values
     tuple_dist, tuple_sorted = zip(*sorted(zip(list_dist, list_sorted)))
@@ -165,7 +173,8 @@ def get_ids_closest_dist_to_list_of_build(list_ref, list_search, dict_pos,
         List with search nodes
     dict_pos : dict
         Dict holding building node ids as keys and shapely point objects (2d)
-        as values
+        as values. If dict_pos is SpatialIndex object, uses precomputed
+        distances.
     max_dist : float, optional
         Maximum allowed distance in m from building to building, which
         can be connected to LHN (default: None).
@@ -177,6 +186,11 @@ def get_ids_closest_dist_to_list_of_build(list_ref, list_search, dict_pos,
         of reference nodes)
     """
 
+    if isinstance(dict_pos, spatind.SpatialIndex):
+        return dict_pos.get_min_dist(list_ref=list_ref,
+                                     list_search=list_search,
+                                     max_dist=max_dist)
+
     #  Dict to add node u ids as values and with distance to set of nodes n
     #  as values
     dict_dist = {}
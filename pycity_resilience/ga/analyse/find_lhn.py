@@ -2,11 +2,123 @@
 # -*- coding: utf-8 -*-
 """
 Script to check if node in individuum dict is connected to LHN
+
+LhnIndex holds the LHN subnetwork index of every LHN connected building
+node. It is generated once per operator call (e.g. mutation) and passed to
+the LHN mutation functions of lhn_changes.py, which keep it up to date, when
+they add or delete LHN subnetworks or nodes. Thus, membership queries within
+per-building loops do not require a scan of all LHN subnetworks.
 """
 from __future__ import division
 
 
-def has_lhn_connection(ind, id):
+class LhnIndex(dict):
+    def __init__(self, ind):
+        """
+        Constructor of LHN index (dict with LHN connected building node ids
+        as keys and index of LHN subnetwork in ind['lhn'] as values)
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        """
+
+        dict.__init__(self)
+
+        self.rebuild(ind=ind)
+
+    def rebuild(self, ind):
+        """
+        Rebuilds index (e.g. if ind['lhn'] has been replaced)
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        """
+
+        self.clear()
+
+        for i in range(len(ind['lhn'])):
+            for n in ind['lhn'][i]:
+                self[n] = i
+
+    def add_sublhn(self, ind, list_sublhn):
+        """
+        Adds LHN subnetwork to ind['lhn'] and index
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        list_sublhn : list (of ints)
+            List of building node ids of new LHN subnetwork
+        """
+
+        ind['lhn'].append(list_sublhn)
+
+        for n in list_sublhn:
+            self[n] = len(ind['lhn']) - 1
+
+    def del_sublhn(self, ind, idx_lhn):
+        """
+        Deletes LHN subnetwork from ind['lhn'] and index (indexes of following
+        subnetworks are decreased by one)
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        idx_lhn : int
+            Index of LHN subnetwork in ind['lhn']
+        """
+
+        for n in ind['lhn'][idx_lhn]:
+            self.pop(n, None)
+
+        del ind['lhn'][idx_lhn]
+
+        for i in range(idx_lhn, len(ind['lhn'])):
+            for n in ind['lhn'][i]:
+                self[n] = i
+
+    def add_node(self, ind, idx_lhn, n):
+        """
+        Adds building node to LHN subnetwork
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        idx_lhn : int
+            Index of LHN subnetwork in ind['lhn']
+        n : int
+            Building node id
+        """
+
+        ind['lhn'][idx_lhn].append(n)
+        self[n] = idx_lhn
+
+    def del_node(self, ind, idx_lhn, n):
+        """
+        Deletes building node from LHN subnetwork
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        idx_lhn : int
+            Index of LHN subnetwork in ind['lhn']
+        n : int
+            Building node id
+        """
+
+        ind['lhn'][idx_lhn].remove(n)
+        self.pop(n, None)
+
+
+def has_lhn_connection(ind, id, lhn_index=None):
     """
     Returns True, if node n of individuum ind has LHN connection. Else: False.
 
@@ -16,6 +128,9 @@ def has_lhn_connection(ind, id):
         Individuum dict
     id : int
         ID of building node
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None). If not None, index is used
+        instead of searching all LHN subnetworks.
 
     Returns
     -------
@@ -31,6 +146,9 @@ def has_lhn_connection(ind, id):
         msg = 'Individuum dict does not have lhn attribute. Check input data.'
         raise AssertionError(msg)
 
+    if lhn_index is not None:
+        return id in lhn_index
+
     has_lhn = False  # Assumes no connection to LHN
 
     if len(ind['lhn']) > 0:
@@ -44,7 +162,7 @@ def has_lhn_connection(ind, id):
     return has_lhn
 
 
-def get_all_lhn_ids(ind):
+def get_all_lhn_ids(ind, lhn_index=None):
     """
     Returns list of ids of ind, which hold LHN connections
 
@@ -52,6 +170,9 @@ def get_all_lhn_ids(ind):
     ----------
     ind : dict
         Individuum dict
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None). If not None, ids are taken
+        from index.
 
     Returns
     -------
@@ -59,6 +180,9 @@ def get_all_lhn_ids(ind):
         List holding ids of ind, which hold LHN connection
     """
 
+    if lhn_index is not None:
+        return list(lhn_index.keys())
+
     list_lhn_ids = []
 
     if len(ind['lhn']) > 0:
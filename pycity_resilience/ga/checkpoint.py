@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding checkpoints of GA runs.
+
+A checkpoint holds everything, which is required to resume a (killed) GA
+run exactly at the next generation without re-evaluating the population:
+population, parents, evaluated offspring, hall of fame, logbook,
+generation counter, states of random and np.random as well as states of
+fidelity schedule and surrogate model. Fitness values of the fitness cache
+are saved to the SQLite database file anyway (the checkpoint only holds
+the settings key of the cache to prevent resuming with other settings).
+
+Checkpoints are written to a temporary file first, which then replaces
+the former checkpoint (atomic), thus a job killed during writing never
+leaves a corrupt checkpoint.
+"""
+from __future__ import division
+
+import os
+import pickle
+import random
+import numpy as np
+
+
+def get_rng_state():
+    """
+    Returns states of random and np.random
+
+    Returns
+    -------
+    dict_rng : dict
+        Dict holding states of random ('random') and np.random
+        ('np_random')
+    """
+    return {'random': random.getstate(),
+            'np_random': np.random.get_state()}
+
+
+def set_rng_state(dict_rng):
+    """
+    Set states of random and np.random
+
+    Parameters
+    ----------
+    dict_rng : dict
+        Dict holding states of random ('random') and np.random
+        ('np_random'), see get_rng_state
+    """
+    random.setstate(dict_rng['random'])
+    np.random.set_state(dict_rng['np_random'])
+
+
+def save_checkpoint(path, dict_state):
+    """
+    Save checkpoint (dict_state plus current states of random and
+    np.random) to pickle file (atomic replace)
+
+    Parameters
+    ----------
+    path : str
+        Path to checkpoint pickle file
+    dict_state : dict
+        Dict holding GA state (e.g. 'gen', 'pop', 'parents', 'list_ind',
+        'halloffame', 'logbook')
+    """
+
+    if 'dict_rng' in dict_state:
+        msg = 'dict_state must not hold key dict_rng.'
+        raise AssertionError(msg)
+
+    dict_checkpoint = dict(dict_state)
+    dict_checkpoint['dict_rng'] = get_rng_state()
+
+    folder = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+    path_temp = path + '.' + str(os.getpid()) + '.tmp'
+    with open(path_temp, mode='wb') as file:
+        pickle.dump(dict_checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path_temp, path)
+
+
+def load_checkpoint(path):
+    """
+    Load checkpoint from pickle file (random states are not set, see
+    set_rng_state)
+
+    Parameters
+    ----------
+    path : str
+        Path to checkpoint pickle file
+
+    Returns
+    -------
+    dict_checkpoint : dict
+        Dict holding GA state and states of random and np.random
+        ('dict_rng')
+    """
+
+    with open(path, mode='rb') as file:
+        return pickle.load(file)
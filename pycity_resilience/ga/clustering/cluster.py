@@ -1,7 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
+Script holding clustering of building nodes (e.g. to generate LHN)
 
+Clusters are carried as row indexes of the coordinate array of list_av_ids
+(thus, building ids are returned without searching positions in dict_pos).
+Kmeans (vectorized Lloyd algorithm with k-means++ seeding) returns a
+solution in one call. Kmeans results with given seed are memoized per set
+of available building ids, nb. of clusters and seed.
 """
 from __future__ import division
 
@@ -11,81 +17,125 @@ import numpy as np
 import shapely.geometry.point as point
 
 from sklearn.cluster import MeanShift, estimate_bandwidth
-from sklearn.datasets.samples_generator import make_blobs
 
-import pycity_calc.toolbox.clustering.experiments.kmeans_city_clustering \
-    as kmean
-import pycity_calc.toolbox.clustering.experiments.kmeans_lloyd as kmeanslloyd
+#  Nb. of different seeds, which are used for kmeans clustering of LHN
+#  mutations (nb. of cached clusterings per set of available buildings)
+nb_cache_seeds = 10
 
+#  Max. nb. of iterations of kmeans (Lloyd algorithm)
+max_iter_kmeans = 100
 
-def get_id_of_pos(dict_pos, pos):
-    """
-    Returns id to given position
+#  Max. nb. of cached kmeans clusterings (cache is cleared, if exceeded)
+max_cache_size = 10000
 
-    Parameters
-    ----------
-    dict_pos : dict
-        Dict holding building node ids as key and shapely geometry points as
-        values
-    pos : object
-        Shapely geometry point object (2d)
+#  Cache of kmeans clusterings
+#  (frozenset of ids, nb_clusters, seed, coordinates) --> dict_clusters
+_dict_cache = {}
 
-    Returns
-    -------
-    id : int
-        Id of key of dict_pos with position pos
-    """
-
-    id = None
-
-    for key in dict_pos.keys():
-        if dict_pos[key] == pos:
-            id = key
 
-    return id
+def clear_cache():
+    """
+    Clear cache of kmeans clusterings
+    """
+    _dict_cache.clear()
 
 
-def conv_point_to_ids(dict_pos, dict_clust_points):
+def kmeans(x_y_array, nb_clusters, max_iter=max_iter_kmeans, rng=None):
     """
-    Convert point dictionary to ind ids
+    Vectorized kmeans clustering (Lloyd algorithm) with k-means++ seeding.
+    Empty clusters are repaired by moving the point with the largest
+    distance to its cluster center (of a cluster with more than one point)
+    into the empty cluster.
 
     Parameters
     ----------
-    dict_pos : dict
-        Dict holding building node ids as keys and shapely point objects (2d)
-        as values
-    dict_clust_points : dict
-        Dictionary holding cluster numbers (int) as keys and list of points
-        as values
+    x_y_array : np.array
+        Coordinates of nodes (nb. of nodes x 2)
+    nb_clusters : int
+        Number of clusters (<= nb. of nodes)
+    max_iter : int, optional
+        Max. nb. of iterations (default: max_iter_kmeans)
+    rng : object, optional
+        np.random.RandomState object (default: None). If None, global
+        random state of np.random is used.
 
     Returns
     -------
-    dict_ids : dict
-        Dictionary holding cluster numbers (int) as keys and list of node
-        ids as values
+    tup_res : tuple
+        Tuple (array_centers, array_labels) with cluster centers
+        (nb_clusters x 2) and cluster number per node
     """
 
-    dict_ids = {}
-
-    for key in dict_clust_points:
-        list_points = dict_clust_points[key]
-        list_nodes = []
-
-        for i in range(len(list_points)):
-            point = list_points[i]
-
-            id = get_id_of_pos(dict_pos=dict_pos, pos=point)
-
-            assert id is not None
-
-            list_nodes.append(id)
-
-        dict_ids[key] = list_nodes
-
-    return dict_ids
-
-
-def kmeans_clustering(dict_pos, list_av_ids, nb_clusters):
+    nb_nodes = len(x_y_array)
+
+    if nb_clusters < 1 or nb_clusters > nb_nodes:
+        msg = 'nb_clusters has to be between 1 and nb. of nodes (' \
+              + str(nb_nodes) + '), but is ' + str(nb_clusters) + '.'
+        raise AssertionError(msg)
+
+    if rng is None:
+        #  Global random state of numpy
+        rng = np.random
+
+    #  k-means++ seeding (next center with probability proportional to
+    #  squared distance to closest center)
+    array_centers = np.zeros((nb_clusters, x_y_array.shape[1]))
+    array_centers[0] = x_y_array[rng.randint(nb_nodes)]
+
+    array_d2 = np.sum((x_y_array - array_centers[0]) ** 2, axis=1)
+
+    for c in range(1, nb_clusters):
+        sum_d2 = np.sum(array_d2)
+        if sum_d2 > 0:
+            idx = np.searchsorted(np.cumsum(array_d2),
+                                  rng.random_sample() * sum_d2, side='right')
+            idx = min(idx, nb_nodes - 1)
+        else:
+            #  All nodes on existing centers
+            idx = rng.randint(nb_nodes)
+
+        array_centers[c] = x_y_array[idx]
+        array_d2 = np.minimum(array_d2,
+                              np.sum((x_y_array - array_centers[c]) ** 2,
+                                     axis=1))
+
+    array_rows = np.arange(nb_nodes)
+    array_labels_old = None
+
+    for i in range(max_iter):
+        matrix_d2 = np.sum((x_y_array[:, None, :]
+                            - array_centers[None, :, :]) ** 2, axis=2)
+        array_labels = np.argmin(matrix_d2, axis=1)
+        array_count = np.bincount(array_labels, minlength=nb_clusters)
+
+        #  Repair empty clusters
+        for c in np.flatnonzero(array_count == 0):
+            array_d2_own = np.where(array_count[array_labels] > 1,
+                                    matrix_d2[array_rows, array_labels], -1)
+            idx = np.argmax(array_d2_own)
+
+            array_count[array_labels[idx]] -= 1
+            array_labels[idx] = c
+            array_count[c] = 1
+            matrix_d2[idx, c] = 0
+
+        #  Update centers
+        for j in range(x_y_array.shape[1]):
+            array_centers[:, j] = np.bincount(array_labels,
+                                              weights=x_y_array[:, j],
+                                              minlength=nb_clusters) \
+                                  / array_count
+
+        if array_labels_old is not None \
+                and np.array_equal(array_labels, array_labels_old):
+            break
+        array_labels_old = array_labels
+
+    return (array_centers, array_labels)
+
+
+def kmeans_clustering(dict_pos, list_av_ids, nb_clusters, seed=None,
+                      use_cache=True):
     """
     Perform kmeans clustering on ind dict
 
@@ -97,7 +147,13 @@ def kmeans_clustering(dict_pos, list_av_ids, nb_clusters):
     list_av_ids : list
         List with available node ids for clustering
     nb_clusters : int
-        Number of desired clusters
+        Number of desired clusters (limited to nb. of available nodes)
+    seed : int, optional
+        Seed of random number generator for clustering (default: None).
+        If None, uses np.random (and result is not cached).
+    use_cache : bool, optional
+        Defines, if results of seeded clustering should be cached
+        (default: True)
 
     Returns
     -------
@@ -106,6 +162,9 @@ def kmeans_clustering(dict_pos, list_av_ids, nb_clusters):
         ids as values
     """
 
+    #  Sorted ids (result does not depend on order of list_av_ids)
+    list_av_ids = sorted(list_av_ids)
+
     #  Generate dummy array to extract
     x_y_array = np.zeros((len(list_av_ids), 2))
 
@@ -114,48 +173,48 @@ def kmeans_clustering(dict_pos, list_av_ids, nb_clusters):
         x_y_array[i][0] = dict_pos[list_av_ids[i]].x
         x_y_array[i][1] = dict_pos[list_av_ids[i]].y
 
-    cluster_dict = None
-    nb_tries = 0
-    # Perform kmeans clustering
-    while cluster_dict is None and nb_tries <= 10:
-        mu, cluster_dict = kmeanslloyd.find_centers(x_y_array, nb_clusters)
-        nb_tries += 1
+    use_cache = use_cache and seed is not None
+
+    if use_cache:
+        key_cache = (frozenset(list_av_ids), nb_clusters, seed,
+                     x_y_array.tobytes())
+
+        if key_cache in _dict_cache:
+            return copy.deepcopy(_dict_cache[key_cache])
 
-    if cluster_dict is None:
-        #  If kmeans could not finde solution, return None
-        msg = 'Kmeans could not find a solution. Return None'
+    if len(list_av_ids) == 0:
+        msg = 'No available nodes for kmeans clustering. Return None'
         warnings.warn(msg)
         return None
 
-    #  Convert cluster array to points
-    cluster_dict = kmean.conv_cluster_array_to_point(cluster_dict)
+    if seed is not None:
+        rng = np.random.RandomState(seed)
+    else:
+        rng = None
 
-    #  Get point ids to positions
-    dict_clusters = conv_point_to_ids(dict_pos=dict_pos,
-                                      dict_clust_points=cluster_dict)
+    (array_centers, array_labels) = \
+        kmeans(x_y_array=x_y_array,
+               nb_clusters=min(nb_clusters, len(list_av_ids)), rng=rng)
 
-    used_cleanup = False
-    #  Cleanup dict; Erase all lists with only a single node
-    dict_clusters_copy = copy.deepcopy(dict_clusters)
-    for key in dict_clusters.keys():
-        if len(dict_clusters[key]) == 1:  # If only holds single node
-            del dict_clusters_copy[key]
-            used_cleanup = True
-    #  Overwrite
-    dict_clusters = dict_clusters_copy
+    #  Get building ids of row indexes. Erase all clusters with only a
+    #  single node (solves #255: cluster numbers 0, 1, 2, 3, ..., n)
+    dict_clusters = {}
+    for label in range(len(array_centers)):
+        array_idx = np.flatnonzero(array_labels == label)
+
+        if len(array_idx) > 1:
+            dict_clusters[len(dict_clusters)] = [list_av_ids[i]
+                                                 for i in array_idx]
+
+    if len(dict_clusters) == 0:
+        msg = 'Kmeans found single node clusters, only. Return None'
+        warnings.warn(msg)
+        return None
 
-    #  Solves #255: Check key has been deleted, shift keys back into order
-    #  0, 1, 2, 3, ..., n
-    if used_cleanup:
-        dict_clusters_new = {}
-        list_ids_sorted = sorted(list(dict_clusters.keys()))
-
-        i = 0
-        for key in list_ids_sorted:
-            dict_clusters_new[i] = dict_clusters[key]
-            i += 1
-        #  Overwrite
-        dict_clusters = dict_clusters_new
+    if use_cache:
+        if len(_dict_cache) >= max_cache_size:
+            _dict_cache.clear()
+        _dict_cache[key_cache] = copy.deepcopy(dict_clusters)
 
     return dict_clusters
 
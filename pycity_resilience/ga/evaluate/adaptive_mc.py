@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding sequential (adaptive) Monte-Carlo evaluation of individuals.
+
+MC samples are evaluated in batches. After each batch, the confidence
+interval of the statistic, which is required by the objective (mean, std
+or risk averse/risk friendly combination of mean and std), is estimated
+for every stochastic objective (annuity and co2 related values). Sampling
+stops, as soon as the relative half width of all confidence intervals is
+below the given tolerance (or all samples have been used).
+
+Confidence intervals are estimated with normal approximations:
+- mean: z * s / sqrt(n)
+- std: z * s / sqrt(2 * (n - 1))
+- mean - k * std: z * sqrt(s ** 2 / n + k ** 2 * s ** 2 / (2 * (n - 1)))
+
+Statistic values are calculated as in objectives.calc_all_stats
+(EcoMCRunAnalyze), e.g. std without degrees of freedom correction and
+risk parameters as mean - k * std with signed risk factor k (k < 0: risk
+averse, k > 0: risk friendly).
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_calc.toolbox.mc_helpers.mc_runner as mcrun
+
+import pycity_resilience.ga.evaluate.objectives as objfkt
+
+
+def get_stat_type(objective):
+    """
+    Returns statistic type of MC based objective
+
+    Parameters
+    ----------
+    objective : str
+        Objective function (see eval.eval_obj)
+
+    Returns
+    -------
+    stat_type : str
+        Statistic type. Options: 'mean', 'std', 'risk_av', 'risk_friendly'
+    """
+    return objfkt.get_objective(objective=objective)[1]
+
+
+def get_risk_factor(objective, risk_fac_av=-1, risk_fac_friendly=1):
+    """
+    Returns risk factor (weight of std) of objective statistic
+
+    Parameters
+    ----------
+    objective : str
+        Objective function (see eval.eval_obj)
+    risk_fac_av : float, optional
+        Preference/risk value for mu-sigma-evaluation for risk averse
+        preference (default: -1). Only used for dimensionless objectives.
+    risk_fac_friendly : float, optional
+        Preference/risk value for mu-sigma-evaluation for risk
+        friendly preference (default: 1). Only used for dimensionless
+        objectives.
+
+    Returns
+    -------
+    risk_factor : float
+        Risk factor (0 for mean and std objectives). Statistic is
+        mean - risk_factor * std, thus risk_factor is negative for risk
+        averse and positive for risk friendly objectives (with default
+        risk values).
+    """
+
+    stat_type = get_stat_type(objective=objective)
+
+    if stat_type in ['mean', 'std']:
+        return 0
+    elif objective.startswith('mc_dimless'):
+        if stat_type == 'risk_av':
+            return risk_fac_av
+        return risk_fac_friendly
+
+    #  Default risk factors of EcoMCRunAnalyze
+    if stat_type == 'risk_av':
+        return -1
+    return 1
+
+
+def get_obj_arrays(mc_analyze, objective):
+    """
+    Returns result arrays (per successful MC run), which are used for
+    stochastic objective values (annuity and co2 related)
+
+    Parameters
+    ----------
+    mc_analyze : object
+        EcoMCRunAnalyze object (basic results have been extracted and, if
+        necessary, dimensionless values have been calculated)
+    objective : str
+        Objective function (see eval.eval_obj)
+
+    Returns
+    -------
+    tup_arrays : tuple (of arrays)
+        Tuple holding annuity and co2 related result arrays
+    """
+
+    dict_arrays = objfkt.get_quantity_arrays(mc_analyze=mc_analyze)
+
+    return tuple(dict_arrays[quantity] for quantity in
+                 objfkt.get_objective(objective=objective)[0])
+
+
+def calc_conf_half_width(array, stat_type, risk_factor=0, conf_z=1.96):
+    """
+    Estimate half width of confidence interval of statistic of array
+
+    Parameters
+    ----------
+    array : array-like
+        Sample values
+    stat_type : str
+        Statistic type. Options: 'mean', 'std', 'risk_av', 'risk_friendly'
+    risk_factor : float, optional
+        Signed weight of std for risk_av and risk_friendly (default: 0).
+        Statistic is mean - risk_factor * std (see get_risk_factor).
+    conf_z : float, optional
+        Quantile of standard normal distribution of confidence level
+        (default: 1.96, which is equal to 95 % confidence level)
+
+    Returns
+    -------
+    tup_res : tuple
+        Tuple holding (stat_value, half_width)
+    """
+
+    array = np.asarray(array, dtype=float)
+    nb_samples = len(array)
+
+    if nb_samples < 2:
+        msg = 'At least two samples are required to estimate confidence ' \
+              'interval!'
+        raise AssertionError(msg)
+
+    mean = np.mean(array)
+    #  Same std as objectives.calc_all_stats (reported fitness value)
+    std = np.std(array)
+
+    #  Standard errors are estimated with sample std
+    std_sample = np.std(array, ddof=1)
+    se_mean = std_sample / np.sqrt(nb_samples)
+    se_std = std_sample / np.sqrt(2 * (nb_samples - 1))
+
+    if stat_type == 'mean':
+        return (mean, conf_z * se_mean)
+    elif stat_type == 'std':
+        return (std, conf_z * se_std)
+    elif stat_type in ['risk_av', 'risk_friendly']:
+        stat = mean - risk_factor * std
+        half_width = conf_z * np.sqrt(se_mean ** 2
+                                      + risk_factor ** 2 * se_std ** 2)
+        return (stat, half_width)
+
+    msg = 'Unknown stat_type ' + str(stat_type)
+    raise AssertionError(msg)
+
+
+def is_converged(list_arrays, stat_type, risk_factor=0, rel_tol=0.01,
+                 conf_z=1.96):
+    """
+    Check, if confidence intervals of statistics of all arrays are
+    within relative tolerance
+
+    Parameters
+    ----------
+    list_arrays : list (of arrays)
+        List of sample value arrays (e.g. annuity and co2 values)
+    stat_type : str
+        Statistic type. Options: 'mean', 'std', 'risk_av', 'risk_friendly'
+    risk_factor : float, optional
+        Signed weight of std for risk_av and risk_friendly (default: 0)
+    rel_tol : float, optional
+        Relative tolerance of confidence interval half width, related to
+        statistic value (default: 0.01)
+    conf_z : float, optional
+        Quantile of standard normal distribution of confidence level
+        (default: 1.96)
+
+    Returns
+    -------
+    converged : bool
+        True, if all confidence intervals are within tolerance
+    """
+
+    for array in list_arrays:
+        (stat, half_width) = calc_conf_half_width(array=array,
+                                                  stat_type=stat_type,
+                                                  risk_factor=risk_factor,
+                                                  conf_z=conf_z)
+
+        if half_width > rel_tol * max(abs(stat), 10 ** -10):
+            return False
+
+    return True
+
+
+def concat_mc_results(list_tup_res):
+    """
+    Concatenate MC results of several batches
+
+    Parameters
+    ----------
+    list_tup_res : list (of tuples)
+        List of (dict_mc_res, dict_mc_setup) tuples of batches. Failed run
+        indexes have to be related to the result arrays of each batch.
+
+    Returns
+    -------
+    tup_res : tuple
+        (dict_mc_res, dict_mc_setup) of all batches
+    """
+
+    dict_mc_res = {}
+    list_failed = []
+    nb_runs = 0
+
+    for (dict_res, dict_setup) in list_tup_res:
+        for key in dict_res.keys():
+            if key in dict_mc_res:
+                dict_mc_res[key] = np.concatenate((dict_mc_res[key],
+                                                   dict_res[key]))
+            else:
+                dict_mc_res[key] = np.array(dict_res[key])
+        list_failed.extend([nb_runs + i
+                            for i in dict_setup['idx_failed_runs']])
+        nb_runs += dict_setup['nb_runs']
+
+    dict_mc_setup = dict(list_tup_res[-1][1])
+    dict_mc_setup['nb_runs'] = nb_runs
+    dict_mc_setup['idx_failed_runs'] = list_failed
+
+    return (dict_mc_res, dict_mc_setup)
+
+
+def perform_adaptive_mc_runs(run_batch, analyze, objective, nb_runs,
+                             failure_tolerance=0.05, batch_size=10,
+                             min_runs=20, rel_tol=0.01, conf_z=1.96,
+                             risk_fac_av=-1, risk_fac_friendly=1,
+                             stop_check=None):
+    """
+    Perform MC runs in batches, until confidence intervals of objective
+    statistics are within tolerance or nb_runs samples have been evaluated
+
+    Parameters
+    ----------
+    run_batch : callable
+        Function, which performs MC runs for list of sample indexes
+        (run_batch(list_idx)) and returns (dict_mc_res, dict_mc_setup) with
+        failed run indexes related to list_idx (failure tolerance should
+        not be checked by run_batch)
+    analyze : callable
+        Function, which returns EcoMCRunAnalyze object for
+        (dict_mc_res, dict_mc_setup) (analyze(dict_mc_res, dict_mc_setup))
+    objective : str
+        Objective function (see eval.eval_obj)
+    nb_runs : int
+        Maximum number of MC runs (total number of samples)
+    failure_tolerance : float, optional
+        Allowed EnergyBalanceException failure tolerance (default: 0.05)
+    batch_size : int, optional
+        Number of MC runs per batch (default: 10)
+    min_runs : int, optional
+        Minimum number of MC runs before stopping (default: 20)
+    rel_tol : float, optional
+        Relative tolerance of confidence interval half width (default: 0.01)
+    conf_z : float, optional
+        Quantile of standard normal distribution of confidence level
+        (default: 1.96)
+    risk_fac_av : float, optional
+        Preference/risk value for risk averse preference (default: -1)
+    risk_fac_friendly : float, optional
+        Preference/risk value for risk friendly preference (default: 1)
+    stop_check : callable, optional
+        Additional stop criterion (default: None), e.g. dominance race (see
+        racing.py). If not None, stop_check(mc_analyze, nb_used) is called
+        after each batch. Sampling stops, if True is returned.
+
+    Returns
+    -------
+    tup_res : tuple
+        (mc_analyze, nb_used) with EcoMCRunAnalyze object of all performed
+        runs and number of performed MC runs
+    """
+
+    if batch_size < 1:
+        msg = 'batch_size has to be larger than zero!'
+        raise AssertionError(msg)
+
+    stat_type = get_stat_type(objective=objective)
+    risk_factor = get_risk_factor(objective=objective,
+                                  risk_fac_av=risk_fac_av,
+                                  risk_fac_friendly=risk_fac_friendly)
+
+    list_tup_res = []
+    nb_used = 0
+    nb_failed = 0
+
+    while nb_used < nb_runs:
+        if nb_used == 0:
+            nb_batch = max(batch_size, min(min_runs, nb_runs))
+        else:
+            nb_batch = batch_size
+        list_idx = list(range(nb_used, min(nb_used + nb_batch, nb_runs)))
+
+        (dict_res, dict_setup) = run_batch(list_idx)
+        list_tup_res.append((dict_res, dict_setup))
+
+        nb_used += len(list_idx)
+        nb_failed += len(dict_setup['idx_failed_runs'])
+
+        #  Abort, if failures already exceed tolerance of all samples
+        if nb_failed > failure_tolerance * nb_runs:
+            msg = str(nb_failed) + ' MC runs failed, which exceeds ' \
+                                   'failure tolerance of ' + \
+                  str(failure_tolerance)
+            raise mcrun.McToleranceException(msg)
+
+        (dict_mc_res, dict_mc_setup) = concat_mc_results(list_tup_res)
+        mc_analyze = analyze(dict_mc_res, dict_mc_setup)
+
+        if nb_used >= nb_runs or nb_used - nb_failed < 2:
+            continue
+
+        if is_converged(list_arrays=get_obj_arrays(mc_analyze=mc_analyze,
+                                                   objective=objective),
+                        stat_type=stat_type, risk_factor=risk_factor,
+                        rel_tol=rel_tol, conf_z=conf_z):
+            break
+
+        if stop_check is not None and stop_check(mc_analyze, nb_used):
+            break
+
+    #  Failure tolerance related to performed runs
+    if nb_failed > failure_tolerance * nb_used:
+        msg = str(nb_failed) + ' of ' + str(nb_used) + ' MC runs failed, ' \
+              'which exceeds failure tolerance of ' + str(failure_tolerance)
+        raise mcrun.McToleranceException(msg)
+
+    return (mc_analyze, nb_used)
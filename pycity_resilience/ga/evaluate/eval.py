@@ -6,6 +6,7 @@ Script to evaluate objectives of GA
 from __future__ import division
 
 import copy
+import random
 import warnings
 import numpy as np
 
@@ -14,9 +15,16 @@ import pycity_calc.toolbox.mc_helpers.postprocessing.analyse_eco_mc_run \
     as analyzemc
 import pycity_calc.simulation.energy_balance.check_eb_requ as checkeb
 import pycity_calc.simulation.energy_balance.building_eb_calc as buildeb
-import pycity_calc.toolbox.flex_quantification.flexibility_quant as flexquant
 
 import pycity_resilience.ga.parser.parse_ind_to_city as parseind
+import pycity_resilience.ga.evaluate.eval_context as evalcon
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+import pycity_resilience.ga.evaluate.incremental as incr
+import pycity_resilience.ga.evaluate.adaptive_mc as adamc
+import pycity_resilience.ga.evaluate.racing as racing
+import pycity_resilience.ga.evaluate.objectives as objfkt
+import pycity_resilience.ga.evaluate.flex_cache as flexcache
+import pycity_resilience.monte_carlo.run_mc as runmc
 import pycity_resilience.ga.verify.check_validity as checkval
 
 
@@ -36,7 +44,16 @@ def eval_obj(individuum,
              el_mix_for_chp=True, el_mix_for_pv=True,
              heating_off=True,
              prevent_boi_lhn=True,
-             dict_heatloads=None):
+             dict_heatloads=None,
+             use_deepcopy=False,
+             fitness_cache=None,
+             use_incremental=False,
+             incr_max_units=incr.max_units,
+             dict_adaptive_mc=None,
+             dict_racing=None,
+             crn_seed=None,
+             mc_archive=None,
+             nb_runs=None):
     """
     Evaluation function
 
@@ -137,6 +154,53 @@ def eval_obj(individuum,
 	dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    use_deepcopy : bool, optional
+        Defines, if GA runner should be deep-copied for every evaluation
+        (default: False). If False, city and mc_runner of ga_runner are
+        reset to initial state (see eval_context.py)
+    fitness_cache : object, optional
+        FitnessCache object (default: None). If not None, fitness values of
+        already evaluated individuals are taken from cache. All objective
+        statistics of MC runs (see objectives.py) are saved to cache, too.
+    use_incremental : bool, optional
+        Defines, if MC runs should be performed incrementally per stand-alone
+        building and LHN subnetwork (default: False). If True, MC results of
+        unchanged buildings/subnetworks are reused (see incremental.py).
+        Requires sampling_method 'lhc'.
+    incr_max_units : int, optional
+        Maximum number of buildings/LHN subnetworks, whose MC results are
+        cached per process for incremental evaluation (default: 2000).
+        Only relevant, if use_incremental is True.
+    dict_adaptive_mc : dict, optional
+        Dict holding settings of adaptive MC runs (default: None). If None,
+        all nb_runs MC runs of ga_runner are performed. If not None, MC runs
+        are performed in batches, until confidence intervals of objective
+        statistics are within tolerance (see adaptive_mc.py), e.g.
+        {'batch_size': 10, 'min_runs': 20, 'rel_tol': 0.01, 'conf_z': 1.96}
+        Nb. of performed runs is saved to fitness_cache (if not None).
+    dict_racing : dict, optional
+        Dict holding settings of dominance racing (default: None). Requires
+        dict_adaptive_mc. If not None, partial MC statistics are compared
+        to current first front after each batch. If individuum is dominated
+        with chosen confidence, evaluation is aborted and upper confidence
+        bounds are used as fitness values (see racing.py), e.g.
+        {'path_front': path_front, 'conf_z': 1.96}
+    crn_seed : int, optional
+        Seed for energy system re-sampling (default: None). Only relevant
+        for sampling_method 'random'. If not None, energy system samples of
+        all individuals are drawn with identical random numbers (common
+        random numbers). Random states of numpy and random are restored
+        afterwards.
+    mc_archive : object, optional
+        McResultArchive object (default: None). If not None, per-run MC
+        result arrays and failed run indexes of every evaluated individuum
+        are saved to archive (see mc_archive.py)
+    nb_runs : int, optional
+        Number of MC runs (default: None). If None, uses nb_runs of
+        ga_runner. If smaller, only the first nb_runs samples of ga_runner
+        are used (e.g. for low fidelity stages of multi-fidelity schedule,
+        see fidelity.py). Fitness values are cached per nb_runs. MC results
+        are only archived for all nb_runs samples of ga_runner.
 
     Returns
     -------
@@ -174,6 +238,28 @@ def eval_obj(individuum,
                   'commands per day (e.g. max_switch = 8).'
             raise AssertionError(msg)
 
+    if dict_racing is not None and dict_adaptive_mc is None:
+        msg = 'dict_racing requires dict_adaptive_mc (batch wise MC runs).'
+        raise AssertionError(msg)
+
+    if use_incremental and sampling_method != 'lhc':
+        msg = 'use_incremental requires sampling_method lhc, as samples ' \
+              'have to be fixed for all individuals.'
+        raise AssertionError(msg)
+
+    if nb_runs is not None and nb_runs > ga_runner.nb_runs:
+        msg = 'nb_runs ' + str(nb_runs) + ' cannot be larger than number ' \
+              'of samples of ga_runner (' + str(ga_runner.nb_runs) + ').'
+        raise AssertionError(msg)
+
+    if nb_runs is not None and fitness_cache is not None:
+        #  Cache fitness values per nb. of MC runs
+        fitness_cache = fitness_cache.with_settings({'nb_runs': nb_runs})
+
+    if nb_runs is not None and nb_runs < ga_runner.nb_runs:
+        #  Only archive MC results of all samples
+        mc_archive = None
+
     # Check validity of ind
     checkval.run_all_checks(ind=individuum, dict_max_pv_area=dict_max_pv_area,
                             dict_restr=dict_restr, dict_sh=dict_sh,
@@ -182,41 +268,238 @@ def eval_obj(individuum,
                             prevent_boi_lhn=prevent_boi_lhn,
                             dict_heatloads=dict_heatloads)
 
-    # Copy ga runner
-    ga_runner_copy = copy.deepcopy(ga_runner)
+    #  Canonical hash of individuum
+    ind_hash = fitcache.calc_ind_hash(ind=individuum)
+
+    if fitness_cache is not None:
+        #  Return cached fitness, if individuum has already been evaluated
+        #  with identical settings
+        tuple_obj_fkt = fitness_cache.get_by_hash(ind_hash=ind_hash)
+
+        if tuple_obj_fkt is not None:
+            print('Use cached fitness values: ', tuple_obj_fkt)
+            return tuple_obj_fkt
+
+    #  Dict to return additional evaluation information (e.g. nb. of
+    #  performed MC runs)
+    dict_info = {}
+
+    tuple_obj_fkt = \
+        _calc_fitness(individuum=individuum, ga_runner=ga_runner,
+                      sampling_method=sampling_method, objective=objective,
+                      use_street=use_street, eeg_pv_limit=eeg_pv_limit,
+                      use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                      chp_switch_pen=chp_switch_pen, max_switch=max_switch,
+                      risk_fac_av=risk_fac_av,
+                      risk_fac_friendly=risk_fac_friendly,
+                      el_mix_for_chp=el_mix_for_chp,
+                      el_mix_for_pv=el_mix_for_pv,
+                      heating_off=heating_off,
+                      use_deepcopy=use_deepcopy,
+                      use_incremental=use_incremental,
+                      incr_max_units=incr_max_units,
+                      dict_adaptive_mc=dict_adaptive_mc,
+                      dict_racing=dict_racing,
+                      crn_seed=crn_seed,
+                      dict_info=dict_info,
+                      nb_runs=nb_runs,
+                      ind_hash=ind_hash,
+                      fitness_cache=fitness_cache)
+
+    if dict_info.get('raced', False) and fitness_cache is not None:
+        #  Conservative fitness estimate of dominated individuum (aborted by
+        #  dominance race) is saved with raced flag. Thus, it is not
+        #  returned as final fitness value by later cache lookups
+        fitness_cache = fitness_cache.with_settings({'raced': True})
+
+    #  Only archive MC results of all samples (not of adaptive MC runs or
+    #  dominance races, which have been stopped early)
+    if (mc_archive is not None and 'mc_results' in dict_info
+            and dict_info['nb_runs'] >= ga_runner.nb_runs):
+        (dict_mc_res, list_idx_failed) = dict_info['mc_results']
+        mc_archive.put_by_hash(ind_hash=ind_hash,
+                               dict_mc_res=dict_mc_res,
+                               list_idx_failed=list_idx_failed)
+
+    if fitness_cache is not None:
+        fitness_cache.put_by_hash(ind_hash=ind_hash, fitness=tuple_obj_fkt)
+
+        if 'nb_runs' in dict_info:
+            fitness_cache.put_nb_runs_by_hash(ind_hash=ind_hash,
+                                              nb_runs=dict_info['nb_runs'])
+
+        if 'stats' in dict_info:
+            fitness_cache.put_obj_stats_by_hash(ind_hash=ind_hash,
+                                                dict_stats=
+                                                dict_info['stats'])
+
+    return tuple_obj_fkt
+
+
+def eval_population(list_ind, evaluate, map_func=map, fitness_cache=None):
+    """
+    Evaluate list of individuals with deduplication. Individuals are
+    canonicalized (see fitness_cache.calc_ind_hash), duplicates within the
+    list are collapsed and already cached individuals are taken from
+    fitness_cache. Only unique, uncached individuals are sent to map_func.
+    Fitness values are fanned back out to all copies.
+
+    Parameters
+    ----------
+    list_ind : list
+        List of individuals
+    evaluate : function
+        Evaluation function (e.g. toolbox.evaluate), which takes individuum
+        and returns fitness tuple
+    map_func : function, optional
+        Map function (default: map), e.g. toolbox.map for parallel
+        evaluation with SCOOP or multiprocessing.Pool
+    fitness_cache : object, optional
+        FitnessCache object (default: None). If not None, cached fitness
+        values are used without sending individuals to map_func.
 
-    #  Pointers to nb. of runs and failure tolerance
-    nb_runs = ga_runner_copy.nb_runs
-    failure_tolerance = ga_runner_copy.failure_tolerance
+    Returns
+    -------
+    tup_res : tuple
+        (list_fitness, dict_dedup) with list_fitness holding fitness tuples
+        in order of list_ind and dict_dedup holding 'nb_inds' (number of
+        individuals), 'nb_unique' (unique individuals), 'nb_cached'
+        (unique individuals taken from cache), 'nb_work' (evaluated
+        individuals) and 'work_ratio' (nb_work / nb_inds)
+    """
 
-    #  Add new individuum parameters to city object instance
-    #  on CityEBCalculator (use original city object (city_copy is False)
-    #  on copied ga_runner object (thus, original city on original ga_runner
-    #  is not going to be modified)
-    parseind.parse_ind_dict_to_city(dict_ind=individuum,
-                                    city=ga_runner_copy._city,
-                                    list_build_ids=
-                                    ga_runner_copy._list_build_ids,
-                                    use_street=use_street,
-                                    copy_city=False)
+    list_hashes = [fitcache.calc_ind_hash(ind=ind) for ind in list_ind]
 
-    #  Reinitialize CityEBCalculator with new city object instance
-    ga_runner_copy.mc_runner._city_eco_calc.energy_balance.reinit()
+    #  Unique hashes (in order of first occurrence) and their first index
+    dict_first_idx = {}
+    for i in range(len(list_hashes)):
+        if list_hashes[i] not in dict_first_idx:
+            dict_first_idx[list_hashes[i]] = i
+
+    dict_fitness = {}
+
+    if fitness_cache is not None:
+        for ind_hash in dict_first_idx.keys():
+            fitness = fitness_cache.get_by_hash(ind_hash=ind_hash,
+                                                count=False)
+            if fitness is not None:
+                dict_fitness[ind_hash] = fitness
+
+    nb_cached = len(dict_fitness)
+
+    #  Only send unique, uncached individuals to workers
+    list_hashes_work = [ind_hash for ind_hash in dict_first_idx.keys()
+                        if ind_hash not in dict_fitness]
+    list_ind_work = [list_ind[dict_first_idx[ind_hash]]
+                     for ind_hash in list_hashes_work]
+
+    if len(list_ind_work) > 0:
+        list_fit_work = list(map_func(evaluate, list_ind_work))
+
+        for (ind_hash, fitness) in zip(list_hashes_work, list_fit_work):
+            dict_fitness[ind_hash] = fitness
+
+    list_fitness = [dict_fitness[ind_hash] for ind_hash in list_hashes]
+
+    nb_inds = len(list_ind)
+    if nb_inds > 0:
+        work_ratio = len(list_ind_work) / nb_inds
+    else:
+        work_ratio = 0
+
+    dict_dedup = {'nb_inds': nb_inds,
+                  'nb_unique': len(dict_first_idx),
+                  'nb_cached': nb_cached,
+                  'nb_work': len(list_ind_work),
+                  'work_ratio': work_ratio}
+
+    return (list_fitness, dict_dedup)
+
+
+def _calc_fitness(individuum, ga_runner, sampling_method, objective,
+                  use_street, eeg_pv_limit, use_kwkg_lhn_sub, chp_switch_pen,
+                  max_switch, risk_fac_av, risk_fac_friendly, el_mix_for_chp,
+                  el_mix_for_pv, heating_off, use_deepcopy,
+                  use_incremental=False, incr_max_units=incr.max_units,
+                  dict_adaptive_mc=None,
+                  dict_racing=None, crn_seed=None, dict_info=None,
+                  nb_runs=None, ind_hash=None, fitness_cache=None):
+    """
+    Calculates fitness values of (valid) individuum. Parameters are
+    equal to eval_obj. If dict_info is not None, the number of performed
+    MC runs, all objective statistics and the MC results are saved to
+    dict_info['nb_runs'], dict_info['stats'] and dict_info['mc_results'].
+    dict_info['raced'] is True, if evaluation has been aborted by dominance
+    race (fitness values are conservative estimates).
+    Dimensionless el. flexibility beta_el is memoized per ind_hash (and
+    saved to fitness_cache, if not None), see flex_cache.py.
+
+    Returns
+    -------
+    tuple_obj_fkt : tuple
+        Tuple holding objective function fitness values
+    """
+
+    if ind_hash is None:
+        ind_hash = fitcache.calc_ind_hash(ind=individuum)
+
+    if use_deepcopy:
+        # Copy ga runner
+        ga_runner_copy = copy.deepcopy(ga_runner)
+
+        #  Add new individuum parameters to city object instance
+        #  on CityEBCalculator (use original city object (city_copy is False)
+        #  on copied ga_runner object (thus, original city on original
+        #  ga_runner is not going to be modified)
+        parseind.parse_ind_dict_to_city(dict_ind=individuum,
+                                        city=ga_runner_copy._city,
+                                        list_build_ids=
+                                        ga_runner_copy._list_build_ids,
+                                        use_street=use_street,
+                                        copy_city=False)
+
+        #  Reinitialize CityEBCalculator with new city object instance
+        ga_runner_copy.mc_runner._city_eco_calc.energy_balance.reinit()
+
+        mc_runner = ga_runner_copy.mc_runner
+        city = ga_runner_copy._city
+
+    else:
+        #  Use city and mc_runner of ga_runner. Energy systems and LHN
+        #  networks of former evaluation are reset to initial state, before
+        #  individuum is parsed to city (and energy balance is reinitialized)
+        eval_context = evalcon.get_eval_context(ga_runner=ga_runner)
+
+        city = eval_context.load_ind(ind=individuum, use_street=use_street)
+        mc_runner = eval_context.mc_runner
+
+    #  Pointers to nb. of samples, runs and failure tolerance
+    nb_samples = ga_runner.nb_runs
+    if nb_runs is None:
+        nb_runs = nb_samples
+    failure_tolerance = ga_runner.failure_tolerance
+    nb_runs_used = nb_runs
+
+    if nb_runs < nb_samples:
+        #  Low fidelity: Only use first nb_runs samples
+        list_idx_fid = list(range(nb_runs))
+    else:
+        list_idx_fid = None
 
     #  Evaluate reference values instead of MC runs (for testing purpose)
     #  ##############################################################
     if objective == 'ann_and_co2_to_net_energy_ref_test':
         try:
             #  Perform reference run
-            (ann, co2, sh_dem, el_dem, dhw_dem) = ga_runner_copy. \
-                mc_runner.perform_ref_run(eeg_pv_limit=eeg_pv_limit,
-                                          use_kwkg_lhn_sub=use_kwkg_lhn_sub,
-                                          chp_switch_pen=chp_switch_pen,
-                                          max_switch=max_switch,
-                                          obj='min',
-                                          el_mix_for_chp=el_mix_for_chp,
-                                          el_mix_for_pv=el_mix_for_pv
-                                          )
+            (ann, co2, sh_dem, el_dem, dhw_dem) = mc_runner.perform_ref_run(
+                eeg_pv_limit=eeg_pv_limit,
+                use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                chp_switch_pen=chp_switch_pen,
+                max_switch=max_switch,
+                obj='min',
+                el_mix_for_chp=el_mix_for_chp,
+                el_mix_for_pv=el_mix_for_pv
+                )
 
             ann_to_en = ann / (sh_dem + el_dem + dhw_dem)
 
@@ -238,14 +521,14 @@ def eval_obj(individuum,
     elif objective == 'ann_and_co2_ref_test':
         try:
             #  Perform reference run
-            (ann, co2, sh_dem, el_dem, dhw_dem) = ga_runner_copy. \
-                mc_runner.perform_ref_run(eeg_pv_limit=eeg_pv_limit,
-                                          use_kwkg_lhn_sub=use_kwkg_lhn_sub,
-                                          chp_switch_pen=chp_switch_pen,
-                                          max_switch=max_switch, obj='min',
-                                          el_mix_for_chp=el_mix_for_chp,
-                                          el_mix_for_pv=el_mix_for_pv
-                                          )
+            (ann, co2, sh_dem, el_dem, dhw_dem) = mc_runner.perform_ref_run(
+                eeg_pv_limit=eeg_pv_limit,
+                use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                chp_switch_pen=chp_switch_pen,
+                max_switch=max_switch, obj='min',
+                el_mix_for_chp=el_mix_for_chp,
+                el_mix_for_pv=el_mix_for_pv
+                )
 
         except buildeb.EnergyBalanceException or checkeb.EnergySupplyException:
             msg = 'Ran into EnergyBalanceException ' \
@@ -263,14 +546,14 @@ def eval_obj(individuum,
     elif objective == 'ann_and_co2_dimless_ref':
         try:
             #  Perform reference run
-            (ann, co2, sh_dem, el_dem, dhw_dem) = ga_runner_copy. \
-                mc_runner.perform_ref_run(eeg_pv_limit=eeg_pv_limit,
-                                          use_kwkg_lhn_sub=use_kwkg_lhn_sub,
-                                          chp_switch_pen=chp_switch_pen,
-                                          max_switch=max_switch, obj='min',
-                                          el_mix_for_chp=el_mix_for_chp,
-                                          el_mix_for_pv=el_mix_for_pv
-                                          )
+            (ann, co2, sh_dem, el_dem, dhw_dem) = mc_runner.perform_ref_run(
+                eeg_pv_limit=eeg_pv_limit,
+                use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                chp_switch_pen=chp_switch_pen,
+                max_switch=max_switch, obj='min',
+                el_mix_for_chp=el_mix_for_chp,
+                el_mix_for_pv=el_mix_for_pv
+                )
 
             #  Calculate dimensionless parameters
             ann = ann / ga_runner._ann_ref
@@ -293,26 +576,23 @@ def eval_obj(individuum,
     elif objective == 'ann_and_co2_dimless_ref_3d':
         try:
             #  Perform reference run
-            (ann, co2, sh_dem, el_dem, dhw_dem) = ga_runner_copy. \
-                mc_runner.perform_ref_run(eeg_pv_limit=eeg_pv_limit,
-                                          use_kwkg_lhn_sub=use_kwkg_lhn_sub,
-                                          chp_switch_pen=chp_switch_pen,
-                                          max_switch=max_switch, obj='min',
-                                          el_mix_for_chp=el_mix_for_chp,
-                                          el_mix_for_pv=el_mix_for_pv
-                                          )
+            (ann, co2, sh_dem, el_dem, dhw_dem) = mc_runner.perform_ref_run(
+                eeg_pv_limit=eeg_pv_limit,
+                use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                chp_switch_pen=chp_switch_pen,
+                max_switch=max_switch, obj='min',
+                el_mix_for_chp=el_mix_for_chp,
+                el_mix_for_pv=el_mix_for_pv
+                )
 
             #  Calculate dimensionless parameters
             ann = ann / ga_runner._ann_ref
             co2 = co2 / ga_runner._co2_ref
 
-            #  Calc. flexibility
-            city_flex_copy = copy.deepcopy(ga_runner_copy._city)
-
-            (beta_el_pos, beta_el_neg) = \
-                flexquant.calc_beta_el_city(city=city_flex_copy)
-
-            beta_el = abs(beta_el_pos) + abs(beta_el_neg)
+            #  Calc. flexibility (memoized per energy system configuration)
+            beta_el = flexcache.get_beta_el(
+                city=city, ind_hash=ind_hash, fitness_cache=fitness_cache,
+                scope_key=getattr(ga_runner, 'scope_key', None))
 
             print('Dimensionless el. energy flexibility beta_el: ', beta_el)
             print()
@@ -338,213 +618,203 @@ def eval_obj(individuum,
     if sampling_method == 'random':
         #  Re-sample energy system parameters, as esys config might have
         #  changed
-        ga_runner_copy.mc_runner.perform_esys_resampling(nb_runs=nb_runs)
+        if crn_seed is not None:
+            #  Use identical random numbers for all individuals
+            state_np = np.random.get_state()
+            state_random = random.getstate()
+            np.random.seed(crn_seed)
+            random.seed(crn_seed)
+
+            try:
+                mc_runner.perform_esys_resampling(nb_runs=nb_samples)
+            finally:
+                np.random.set_state(state_np)
+                random.setstate(state_random)
+        else:
+            mc_runner.perform_esys_resampling(nb_runs=nb_samples)
+
+    def run_batch(list_idx):
+        """
+        Perform MC runs for sample indexes of list_idx (failure tolerance
+        is checked on all runs). Returns (dict_mc_res, dict_mc_setup) with
+        failed run indexes related to list_idx.
+        """
+        if use_incremental:
+            return incr_evaluator.perform_mc_runs(
+                ind=individuum,
+                sampling_method=sampling_method,
+                list_idx=list_idx,
+                failure_tolerance=1,
+                use_street=use_street,
+                heating_off=heating_off,
+                eeg_pv_limit=eeg_pv_limit,
+                use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                el_mix_for_chp=el_mix_for_chp,
+                el_mix_for_pv=el_mix_for_pv)
+
+        (dict_res, dict_setup, dict_cov) = \
+            runmc.perform_mc_runs_for_samples(
+                mc_run=mc_runner,
+                list_idx=list_idx,
+                nb_samples=nb_samples,
+                sampling_method=sampling_method,
+                failure_tolerance=1,
+                heating_off=heating_off,
+                eeg_pv_limit=eeg_pv_limit,
+                use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                el_mix_for_chp=el_mix_for_chp,
+                el_mix_for_pv=el_mix_for_pv)
+        dict_setup['idx_failed_runs'] = \
+            [list_idx.index(i) for i in dict_setup['idx_failed_runs']]
+        return (dict_res, dict_setup)
+
+    def analyze(dict_mc_res, dict_mc_setup):
+        """
+        Returns EcoMCRunAnalyze object of MC results
+        """
+        return _analyze_mc_results(dict_mc_res=dict_mc_res,
+                                   dict_mc_setup=dict_mc_setup,
+                                   objective=objective,
+                                   ga_runner=ga_runner)
 
     try:
-        #  Perform Monte-Carlo runs (dict_mc_cov is currently None/unused)
-        (dict_mc_res, dict_mc_setup, dict_mc_cov) = \
-            ga_runner_copy.mc_runner.perform_mc_runs(nb_runs=nb_runs,
-                                                     sampling_method=
-                                                     sampling_method,
-                                                     failure_tolerance=
-                                                     failure_tolerance,
-                                                     eeg_pv_limit=eeg_pv_limit,
-                                                     use_kwkg_lhn_sub=
-                                                     use_kwkg_lhn_sub,
-                                                     el_mix_for_chp=
-                                                     el_mix_for_chp,
-                                                     el_mix_for_pv=
-                                                     el_mix_for_pv,
-                                                     heating_off=heating_off
-                                                     )
-
-        #  Initialize mc analyze object
-        mc_analyze = analyzemc.EcoMCRunAnalyze()
-
-        #  Hand over results and setup dict
-        mc_analyze.dict_results = dict_mc_res
-        mc_analyze.dict_setup = dict_mc_setup
-
-        #  Extract basic results
-        #  ####################################################################
-        mc_analyze.extract_basic_results()
-        # mc_analyze.calc_net_energy_to_annuity_ratio()
-        # mc_analyze.calc_net_energy_to_co2_ratio()
-        # mc_analyze.calc_net_exergy_to_annuity_ratio()
-        # mc_analyze.calc_net_exergy_to_co2_ratio()
-        mc_analyze.calc_annuity_to_net_energy_ratio()
-        mc_analyze.calc_co2_to_net_energy_ratio()
-
-        #  Pre-calculate dimensionless cost and co2 parameters:
-        if (objective == 'mc_dimless_eco_em_2d_mean'
-                or objective == 'mc_dimless_eco_em_2d_risk_av'
-                or objective == 'mc_dimless_eco_em_2d_risk_friendly'
-                or objective == 'mc_dimless_eco_em_3d_mean'
-                or objective == 'mc_dimless_eco_em_3d_risk_av'
-                or objective == 'mc_dimless_eco_em_3d_risk_friendly'
-                or objective == 'mc_dimless_eco_em_2d_std'
-                or objective == 'mc_dimless_eco_em_3d_std'):
-            #  Calculate dimensionless cost and co2 parameters
-            mc_analyze.calc_dimless_cost_co2(dict_ref_run=
-                                             ga_runner._dict_mc_res_ref)
+        if use_incremental:
+            #  Only simulate buildings/LHN subnetworks, which have not been
+            #  evaluated with identical energy systems, yet
+            incr_evaluator = \
+                incr.get_incr_evaluator(ga_runner=ga_runner,
+                                        max_units=incr_max_units)
+
+        if dict_racing is not None:
+            #  Abort MC runs, if individuum is dominated by current front
+            race = racing.DominanceRace(objective=objective,
+                                        risk_fac_av=risk_fac_av,
+                                        risk_fac_friendly=risk_fac_friendly,
+                                        **dict_racing)
+        else:
+            race = None
+
+        if dict_adaptive_mc is not None:
+            #  Perform MC runs in batches, until confidence intervals of
+            #  objective statistics are within tolerance
+            (mc_analyze, nb_runs_used) = \
+                adamc.perform_adaptive_mc_runs(
+                    run_batch=run_batch,
+                    analyze=analyze,
+                    objective=objective,
+                    nb_runs=nb_runs,
+                    failure_tolerance=failure_tolerance,
+                    risk_fac_av=risk_fac_av,
+                    risk_fac_friendly=risk_fac_friendly,
+                    stop_check=race,
+                    **dict_adaptive_mc)
+
+            print('Nb. of performed MC runs: ', nb_runs_used)
+
+        elif use_incremental:
+            (dict_mc_res, dict_mc_setup) = \
+                incr_evaluator.perform_mc_runs(
+                    ind=individuum,
+                    sampling_method=sampling_method,
+                    list_idx=list_idx_fid,
+                    failure_tolerance=failure_tolerance,
+                    use_street=use_street,
+                    heating_off=heating_off,
+                    eeg_pv_limit=eeg_pv_limit,
+                    use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                    el_mix_for_chp=el_mix_for_chp,
+                    el_mix_for_pv=el_mix_for_pv)
+
+            mc_analyze = analyze(dict_mc_res, dict_mc_setup)
+
+        elif list_idx_fid is not None:
+            #  Perform Monte-Carlo runs for first nb_runs samples (failed
+            #  run indexes are equal to relative indexes)
+            (dict_mc_res, dict_mc_setup, dict_mc_cov) = \
+                runmc.perform_mc_runs_for_samples(
+                    mc_run=mc_runner,
+                    list_idx=list_idx_fid,
+                    nb_samples=nb_samples,
+                    sampling_method=sampling_method,
+                    failure_tolerance=failure_tolerance,
+                    heating_off=heating_off,
+                    eeg_pv_limit=eeg_pv_limit,
+                    use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                    el_mix_for_chp=el_mix_for_chp,
+                    el_mix_for_pv=el_mix_for_pv)
+
+            mc_analyze = analyze(dict_mc_res, dict_mc_setup)
+
+        else:
+            #  Perform Monte-Carlo runs (dict_mc_cov is currently None/unused)
+            (dict_mc_res, dict_mc_setup, dict_mc_cov) = \
+                mc_runner.perform_mc_runs(nb_runs=nb_runs,
+                                          sampling_method=sampling_method,
+                                          failure_tolerance=failure_tolerance,
+                                          eeg_pv_limit=eeg_pv_limit,
+                                          use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                                          el_mix_for_chp=el_mix_for_chp,
+                                          el_mix_for_pv=el_mix_for_pv,
+                                          heating_off=heating_off
+                                          )
+
+            mc_analyze = analyze(dict_mc_res, dict_mc_setup)
+
+        if dict_info is not None:
+            dict_info['nb_runs'] = nb_runs_used
+            dict_info['mc_results'] = \
+                (mc_analyze.dict_results,
+                 mc_analyze.dict_setup['idx_failed_runs'])
 
         #  Pre-calculate energy flexibility
         if (objective == 'mc_dimless_eco_em_3d_mean'
                 or objective == 'mc_dimless_eco_em_3d_risk_av'
                 or objective == 'mc_dimless_eco_em_3d_risk_friendly'
                 or objective == 'mc_dimless_eco_em_3d_std'):
-            #  Calc. flexibility
-            city_flex_copy = copy.deepcopy(ga_runner_copy._city)
-
-            (beta_el_pos, beta_el_neg) = \
-                flexquant.calc_beta_el_city(city=city_flex_copy)
-
-            beta_el = abs(beta_el_pos) + abs(beta_el_neg)
+            #  Calc. flexibility (memoized per energy system configuration)
+            beta_el = flexcache.get_beta_el(
+                city=city, ind_hash=ind_hash, fitness_cache=fitness_cache,
+                scope_key=getattr(ga_runner, 'scope_key', None))
 
             print('Dimensionless el. energy flexibility beta_el: ', beta_el)
             print()
 
-        if objective == 'mc_risk_av_ann_co2_to_net_energy':
-            #  Evaluate risk aversion with annuity / CO2 values to net energy
-            ann_risk_factor = mc_analyze.calc_risk_averse_parameters(
-                type='ann_to_en')
-            co2_risk_factor = mc_analyze.calc_risk_averse_parameters(
-                type='co2_to_en')
-
-            print('Risk aversion evaluation factor of annuity to net '
-                  'energy ratios:')
-            print(round(ann_risk_factor, 2))
-
-            print('Risk aversion evaluation factor of co2 to net '
-                  'energy ratios:')
-            print(round(co2_risk_factor, 2))
-            print()
-
-        elif objective == 'mc_risk_av_ann_and_co2':
-            #  Evaluate risk aversion with annuity / CO2 values
-            ann_risk_factor = mc_analyze.calc_risk_averse_parameters(
-                type='annuity')
-            co2_risk_factor = mc_analyze.calc_risk_averse_parameters(
-                type='co2')
-
-            print('Risk aversion evaluation factor of annuity:')
-            print(round(ann_risk_factor, 2))
-
-            print('Risk aversion evaluation factor of co2:')
-            print(round(co2_risk_factor, 2))
-            print()
-
-        elif objective == 'mc_mean_ann_and_co2':
-
-            #  Extract annuity values and calculate mean
-            ann_risk_factor = np.mean(mc_analyze._array_ann_mod)
-
-            #  Extract CO2 values and calculate mean
-            co2_risk_factor = np.mean(mc_analyze._array_co2_mod)
-
-            print('Mean value of annuity:')
-            print(round(ann_risk_factor, 2))
-
-            print('Mean value of CO2:')
-            print(round(co2_risk_factor, 2))
-            print()
-
-        elif objective == 'mc_risk_friendly_ann_and_co2':
-            # #  Evaluate risk friendly (mean) with annuity / CO2 values
-
-            ann_risk_factor = mc_analyze.calc_risk_friendly_parameters(
-                type='annuity')
-            co2_risk_factor = mc_analyze.calc_risk_friendly_parameters(
-                type='co2')
-
-            print('Risk friendly evaluation factor of annuity:')
-            print(round(ann_risk_factor, 2))
-
-            print('Risk friendly evaluation factor of co2:')
-            print(round(co2_risk_factor, 2))
-            print()
-
-        elif objective == 'mc_min_std_of_ann_and_co2':
-            # #  Minimize std of annuity / CO2 values
-
-            #  Extract annuity values and calculate mean
-            ann_risk_factor = np.std(mc_analyze._array_ann_mod)
-
-            #  Extract CO2 values and calculate mean
-            co2_risk_factor = np.std(mc_analyze._array_co2_mod)
-
-            print('Std. value of annuity:')
-            print(round(ann_risk_factor, 2))
-
-            print('Std. value of CO2:')
-            print(round(co2_risk_factor, 2))
-            print()
-
-        elif (objective == 'mc_dimless_eco_em_2d_mean' or
-              objective == 'mc_dimless_eco_em_3d_mean'):
-            #  Minimize mean of dimless cost and co2
+        #  Calculate all statistics of all result quantities (e.g. to
+        #  re-rank individuals with other objectives without re-simulation)
+        dict_stats = objfkt.calc_all_stats(
+            mc_analyze=mc_analyze, risk_fac_av=risk_fac_av,
+            risk_fac_friendly=risk_fac_friendly)
 
-            #  Extract dimless annuity values and calculate mean
-            ann_risk_factor = np.mean(mc_analyze._array_dimless_cost)
+        if objfkt.get_objective(objective=objective)[2]:
+            dict_stats['beta_el'] = beta_el
 
-            #  Extract dimless CO2 values and calculate mean
-            co2_risk_factor = np.mean(mc_analyze._array_dimless_co2)
+        if dict_info is not None:
+            dict_info['stats'] = dict_stats
 
-            print('Mean value of dimensionless annuity:')
-            print(round(ann_risk_factor, 2))
+        #  Extract fitness values of chosen objective
+        tup_obj = objfkt.get_obj_values(dict_stats=dict_stats,
+                                        objective=objective)
+        ann_risk_factor = tup_obj[0]
+        co2_risk_factor = tup_obj[1]
 
-            print('Mean value of dimensionless CO2:')
-            print(round(co2_risk_factor, 2))
-            print()
-
-        elif (objective == 'mc_dimless_eco_em_2d_risk_av' or
-              objective == 'mc_dimless_eco_em_3d_risk_av'):
-            #  Minimize risk averse dimensionless cost and emissions
-
-            #  Evaluate risk aversion with dimless annuity / CO2 values
-            ann_risk_factor = mc_analyze.calc_risk_averse_parameters(
-                type='dimless_an', risk_factor=risk_fac_av)
-            co2_risk_factor = mc_analyze.calc_risk_averse_parameters(
-                type='dimless_co2', risk_factor=risk_fac_av)
-
-            print('Risk aversion evaluation factor of dimensionless annuity:')
-            print(round(ann_risk_factor, 2))
-
-            print('Risk aversion evaluation factor of dimensionless co2:')
-            print(round(co2_risk_factor, 2))
-            print()
-
-        elif (objective == 'mc_dimless_eco_em_2d_risk_friendly' or
-              objective == 'mc_dimless_eco_em_3d_risk_friendly'):
-            #  Minimize risk friendly dimensionless cost and emissions
+        print('Annuity related fitness value of ' + str(objective) + ':')
+        print(round(ann_risk_factor, 2))
 
-            ann_risk_factor = mc_analyze.calc_risk_friendly_parameters(
-                type='dimless_an', risk_factor=risk_fac_friendly)
-            co2_risk_factor = mc_analyze.calc_risk_friendly_parameters(
-                type='dimless_co2', risk_factor=risk_fac_friendly)
+        print('CO2 related fitness value of ' + str(objective) + ':')
+        print(round(co2_risk_factor, 2))
+        print()
 
-            print('Risk friendly evaluation factor of dimensionless annuity:')
-            print(round(ann_risk_factor, 2))
+        if race is not None and race.fitness_est is not None:
+            #  Individuum is dominated by current first front. Use upper
+            #  confidence bounds as conservative fitness estimate
+            (ann_risk_factor, co2_risk_factor) = race.fitness_est
 
-            print('Risk friendly evaluation factor of dimensionless co2:')
-            print(round(co2_risk_factor, 2))
-            print()
-
-        elif (objective == 'mc_dimless_eco_em_2d_std' or
-              objective == 'mc_dimless_eco_em_3d_std'):
-            #  Minimize std of dimless cost and co2
-
-            #  Extract dimless annuity values and calculate mean
-            ann_risk_factor = np.std(mc_analyze._array_dimless_cost)
-
-            #  Extract dimless CO2 values and calculate mean
-            co2_risk_factor = np.std(mc_analyze._array_dimless_co2)
+            if dict_info is not None:
+                dict_info['raced'] = True
 
-            print('Std. value of dimensionless annuity:')
-            print(round(ann_risk_factor, 2))
-
-            print('Std. value of dimensionless CO2:')
-            print(round(co2_risk_factor, 2))
+            print('Evaluation aborted (dominated by first front). '
+                  'Conservative fitness estimate:')
+            print(round(ann_risk_factor, 2), round(co2_risk_factor, 2))
             print()
 
     except mcrun.McToleranceException:
@@ -621,3 +891,59 @@ def eval_obj(individuum,
           or objective == 'mc_dimless_eco_em_3d_risk_friendly'
           or objective == 'mc_dimless_eco_em_3d_std'):
         return (ann_risk_factor, co2_risk_factor, beta_el)
+
+
+def _analyze_mc_results(dict_mc_res, dict_mc_setup, objective, ga_runner):
+    """
+    Returns EcoMCRunAnalyze object with extracted basic results (and
+    dimensionless cost and co2 values, if required by objective)
+
+    Parameters
+    ----------
+    dict_mc_res : dict
+        Dict holding MC results (see perform_mc_runs of McRunner)
+    dict_mc_setup : dict
+        Dict holding MC setup (see perform_mc_runs of McRunner)
+    objective : str
+        Objective function (see eval_obj)
+    ga_runner : object
+        GA runner object of pyCity_resilience
+
+    Returns
+    -------
+    mc_analyze : object
+        EcoMCRunAnalyze object
+    """
+
+    #  Initialize mc analyze object
+    mc_analyze = analyzemc.EcoMCRunAnalyze()
+
+    #  Hand over results and setup dict
+    mc_analyze.dict_results = dict_mc_res
+    mc_analyze.dict_setup = dict_mc_setup
+
+    #  Extract basic results
+    #  ####################################################################
+    mc_analyze.extract_basic_results()
+    # mc_analyze.calc_net_energy_to_annuity_ratio()
+    # mc_analyze.calc_net_energy_to_co2_ratio()
+    # mc_analyze.calc_net_exergy_to_annuity_ratio()
+    # mc_analyze.calc_net_exergy_to_co2_ratio()
+    mc_analyze.calc_annuity_to_net_energy_ratio()
+    mc_analyze.calc_co2_to_net_energy_ratio()
+
+    #  Pre-calculate dimensionless cost and co2 parameters:
+    if (objective == 'mc_dimless_eco_em_2d_mean'
+            or objective == 'mc_dimless_eco_em_2d_risk_av'
+            or objective == 'mc_dimless_eco_em_2d_risk_friendly'
+            or objective == 'mc_dimless_eco_em_3d_mean'
+            or objective == 'mc_dimless_eco_em_3d_risk_av'
+            or objective == 'mc_dimless_eco_em_3d_risk_friendly'
+            or objective == 'mc_dimless_eco_em_2d_std'
+            or objective == 'mc_dimless_eco_em_3d_std'
+            or ga_runner._dict_mc_res_ref is not None):
+        #  Calculate dimensionless cost and co2 parameters
+        mc_analyze.calc_dimless_cost_co2(dict_ref_run=
+                                         ga_runner._dict_mc_res_ref)
+
+    return mc_analyze
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding reset-based evaluation context. Instead of deep-copying the
+whole GA runner (city graph, load profiles, MC sample dicts) for every
+fitness evaluation, one mutable city and McRunner are kept per process.
+Before an individual is parsed to the city, only the energy system
+attributes and LHN edges/nodes, which are touched by
+parse_ind_to_city.parse_ind_dict_to_city, are restored to their initial
+state.
+"""
+from __future__ import division
+
+import copy
+import numpy as np
+
+import pycity_resilience.ga.parser.parse_ind_to_city as parseind
+
+#  Boolean energy system flags on bes, which are set by parser
+list_bes_flags = ['hasBattery', 'hasBoiler', 'hasChp', 'hasElectricalHeater',
+                  'hasHeatpump', 'hasPv', 'hasTes']
+
+#  Energy system devices on bes, which are modified by parser
+list_bes_devices = ['battery', 'boiler', 'chp', 'electricalHeater',
+                    'heatpump', 'pv', 'tes']
+
+
+def _restore_attributes(obj, dict_snap, memo):
+    """
+    Restore attributes of object to state of snapshot dict. Numpy arrays
+    with equal shape are overwritten in place to prevent reallocation.
+
+    Parameters
+    ----------
+    obj : object
+        Object, which should be restored (e.g. boiler object)
+    dict_snap : dict
+        Snapshot of obj.__dict__ (generated with copy.deepcopy)
+    memo : dict
+        Memo dict for copy.deepcopy, holding shared objects (such as
+        environment), which should not be copied
+    """
+
+    dict_obj = obj.__dict__
+
+    #  Remove attributes, which have been added after snapshot
+    for key in list(dict_obj.keys()):
+        if key not in dict_snap:
+            del dict_obj[key]
+
+    for key, val in dict_snap.items():
+        curr = dict_obj.get(key, None)
+
+        if (isinstance(val, np.ndarray) and isinstance(curr, np.ndarray)
+                and curr is not val and curr.shape == val.shape
+                and curr.dtype == val.dtype):
+            #  Overwrite array in place
+            curr[...] = val
+        elif isinstance(val, (list, dict, set, np.ndarray)):
+            #  Mutable container --> Copy (snapshot must stay untouched)
+            dict_obj[key] = copy.deepcopy(val, memo)
+        else:
+            dict_obj[key] = val
+
+
+class EvalContext(object):
+    def __init__(self, city, mc_runner, list_build_ids=None):
+        """
+        Constructor of evaluation context object instance. Generates
+        snapshot of energy system and LHN state of city.
+
+        Parameters
+        ----------
+        city : object
+            City object of pyCity_calc (going to be modified during
+            evaluations and restored before every new evaluation)
+        mc_runner : object
+            MC Runner object of pyCity_calc (holding city)
+        list_build_ids : list (of ints), optional
+            List with building node ids (default: None). If None, searches
+            for all building node ids in city.
+        """
+
+        self.city = city
+        self.mc_runner = mc_runner
+
+        if list_build_ids is None:
+            list_build_ids = city.get_list_build_entity_node_ids()
+        self.list_build_ids = list_build_ids
+
+        #  Shared objects, which should never be copied or restored
+        self._memo = {}
+        self._add_to_memo(city.environment)
+        for val in city.environment.__dict__.values():
+            self._add_to_memo(val)
+
+        self._dict_esys_snap = None
+        self._set_nodes = None
+        self._list_edges = None
+        self._set_edges = None
+        self._next_node_number = None
+        self._dict_mc_runner = None
+
+        self.take_snapshot()
+
+    def _add_to_memo(self, obj):
+        """
+        Add object to deepcopy memo dict (object is going to be shared
+        instead of copied)
+
+        Parameters
+        ----------
+        obj : object
+            Object instance
+        """
+        self._memo[id(obj)] = obj
+
+    def take_snapshot(self):
+        """
+        Generate snapshot of current energy system attributes, LHN
+        related city graph state and McRunner attributes
+        """
+
+        self._dict_esys_snap = {}
+
+        for n in self.list_build_ids:
+            bes = self.city.nodes[n]['entity'].bes
+
+            dict_flags = {}
+            for flag in list_bes_flags:
+                dict_flags[flag] = getattr(bes, flag)
+
+            dict_dev = {}
+            for dev in list_bes_devices:
+                if hasattr(bes, dev) and getattr(bes, dev) is not None:
+                    dict_dev[dev] = copy.deepcopy(getattr(bes, dev).__dict__,
+                                                  self._memo)
+
+            self._dict_esys_snap[n] = (dict_flags, dict_dev)
+
+        #  Graph state (LHN edges and nodes, which might be added by
+        #  LHN dimensioning with street routing)
+        self._set_nodes = set(self.city.nodes())
+        self._list_edges = [(u, v, dict(data)) for (u, v, data)
+                            in self.city.edges(data=True)]
+        self._set_edges = set()
+        for (u, v, data) in self._list_edges:
+            self._set_edges.add((u, v))
+            self._set_edges.add((v, u))
+        self._next_node_number = getattr(self.city, 'next_node_number', None)
+
+        #  Shallow copy of McRunner attributes (e.g. references to sample
+        #  dicts, which might be replaced by esys resampling)
+        self._dict_mc_runner = dict(self.mc_runner.__dict__)
+
+    def reset(self):
+        """
+        Restore energy systems, LHN networks and McRunner attributes to
+        snapshot state
+        """
+
+        for n in self.list_build_ids:
+            bes = self.city.nodes[n]['entity'].bes
+
+            (dict_flags, dict_dev) = self._dict_esys_snap[n]
+
+            for flag in list_bes_flags:
+                setattr(bes, flag, dict_flags[flag])
+
+            for dev in dict_dev.keys():
+                _restore_attributes(obj=getattr(bes, dev),
+                                    dict_snap=dict_dev[dev],
+                                    memo=self._memo)
+
+        #  Remove nodes, which have been added after snapshot (e.g. LHN
+        #  network nodes along streets)
+        list_new_nodes = [n for n in self.city.nodes()
+                          if n not in self._set_nodes]
+        for n in list_new_nodes:
+            if hasattr(self.city, 'remove_network_node'):
+                self.city.remove_network_node(n)
+            else:  # pragma: no cover
+                self.city.remove_node(n)
+
+        #  Remove all edges, which do not exist in snapshot and re-add
+        #  snapshot edges with their original attributes
+        list_new_edges = [(u, v) for (u, v) in self.city.edges()
+                          if (u, v) not in self._set_edges]
+        self.city.remove_edges_from(list_new_edges)
+
+        for (u, v, data) in self._list_edges:
+            if not self.city.has_edge(u, v):
+                self.city.add_edge(u, v, **data)
+
+        if self._next_node_number is not None:
+            self.city.next_node_number = self._next_node_number
+
+        #  Reset McRunner attributes (city_eco_calc object stays the same)
+        self.mc_runner.__dict__.update(self._dict_mc_runner)
+
+    def load_ind(self, ind, use_street=False):
+        """
+        Reset city and parse individuum to city object. Reinitializes
+        energy balance object of McRunner afterwards.
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        use_street : bool, optional
+            Use street networks to route LHN pipelines (default: False)
+            Requires street nodes and edges on city graph, is
+            use_street == True
+
+        Returns
+        -------
+        city : object
+            City object of pyCity_calc holding esys of ind
+        """
+
+        self.reset()
+
+        parseind.parse_ind_dict_to_city(dict_ind=ind,
+                                        city=self.city,
+                                        list_build_ids=self.list_build_ids,
+                                        use_street=use_street,
+                                        copy_city=False)
+
+        #  Reinitialize CityEBCalculator with modified city object instance
+        self.mc_runner._city_eco_calc.energy_balance.reinit()
+
+        return self.city
+
+
+def get_eval_context(ga_runner):
+    """
+    Returns evaluation context of ga_runner. Generates context (and
+    snapshot of initial city state) on first call within current process.
+
+    Parameters
+    ----------
+    ga_runner : object
+        GA runner object of pyCity_resilience
+
+    Returns
+    -------
+    eval_context : object
+        EvalContext object instance
+    """
+
+    eval_context = getattr(ga_runner, '_eval_context', None)
+
+    if eval_context is None:
+        eval_context = EvalContext(city=ga_runner._city,
+                                   mc_runner=ga_runner.mc_runner,
+                                   list_build_ids=ga_runner._list_build_ids)
+        ga_runner._eval_context = eval_context
+
+    return eval_context
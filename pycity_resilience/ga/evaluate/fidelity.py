@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding multi-fidelity schedule of Monte-Carlo sample counts.
+
+Early generations are evaluated with few MC runs (low fidelity), as designs
+of a diverse population can already be ranked with coarse statistics. As
+soon as the first pareto front converges at the current fidelity (relative
+change of mean front fitness values below tolerance over several
+generations) or the max. number of generations per stage is reached, the
+next stage with more MC runs is activated. The surviving population is then
+re-evaluated with the new fidelity (see opt_ga.py). The last stage should
+use all MC samples of the GA runner.
+"""
+from __future__ import division
+
+import numpy as np
+
+#  Fitness values with larger absolute values are penalty values of
+#  eval_obj (e.g. 10 ** 100) and are not used for convergence check
+penalty_limit = 10 ** 90
+
+
+def calc_front_mean(list_fitness):
+    """
+    Returns mean fitness values of (first) pareto front (penalty values are
+    excluded)
+
+    Parameters
+    ----------
+    list_fitness : list (of tuples)
+        List of fitness values of front members
+
+    Returns
+    -------
+    array_mean : np.array (or None)
+        Mean fitness value per objective. None, if no valid fitness values
+        exist.
+    """
+
+    list_valid = [fit for fit in list_fitness
+                  if np.all(np.abs(fit) < penalty_limit)]
+
+    if len(list_valid) == 0:
+        return None
+
+    return np.mean(np.array(list_valid, dtype=float), axis=0)
+
+
+class FidelitySchedule(object):
+    def __init__(self, list_nb_runs, rel_tol=0.01, nb_stall_gen=5,
+                 max_stage_gen=50):
+        """
+        Constructor of multi-fidelity schedule
+
+        Parameters
+        ----------
+        list_nb_runs : list (of ints)
+            List of increasing numbers of MC runs per fidelity stage, e.g.
+            [10, 25, 50, 100]. Last value should be equal to nb_runs of
+            GA runner.
+        rel_tol : float, optional
+            Relative tolerance of change of mean first front fitness values
+            over nb_stall_gen generations (default: 0.01). If change of all
+            objectives is below rel_tol, next stage is activated.
+        nb_stall_gen : int, optional
+            Number of generations used for convergence check (default: 5)
+        max_stage_gen : int, optional
+            Maximum number of generations per stage (default: 50)
+        """
+
+        if len(list_nb_runs) == 0:
+            msg = 'list_nb_runs cannot be empty.'
+            raise AssertionError(msg)
+
+        if list(list_nb_runs) != sorted(list_nb_runs):
+            msg = 'list_nb_runs has to be sorted in increasing order.'
+            raise AssertionError(msg)
+
+        self.list_nb_runs = list(list_nb_runs)
+        self.rel_tol = rel_tol
+        self.nb_stall_gen = nb_stall_gen
+        self.max_stage_gen = max_stage_gen
+
+        self.stage = 0
+        self.gen_stage_start = 0
+        self._list_front_means = []
+
+    def get_nb_runs(self):
+        """
+        Returns number of MC runs of current stage
+
+        Returns
+        -------
+        nb_runs : int
+            Number of MC runs
+        """
+        return self.list_nb_runs[self.stage]
+
+    def is_final(self):
+        """
+        Returns True, if last stage (highest fidelity) is active
+
+        Returns
+        -------
+        is_final : bool
+            True, if last stage is active
+        """
+        return self.stage == len(self.list_nb_runs) - 1
+
+    def is_converged(self):
+        """
+        Returns True, if mean first front fitness values changed less than
+        rel_tol over last nb_stall_gen generations
+
+        Returns
+        -------
+        converged : bool
+            True, if front has converged at current fidelity
+        """
+
+        list_means = [mean for mean in self._list_front_means
+                      if mean is not None]
+
+        if len(list_means) <= self.nb_stall_gen:
+            return False
+
+        array_old = list_means[-1 - self.nb_stall_gen]
+        array_new = list_means[-1]
+
+        array_rel = np.abs(array_new - array_old) \
+                    / np.maximum(np.abs(array_old), 10 ** -10)
+
+        return bool(np.all(array_rel < self.rel_tol))
+
+    def update(self, gen, list_fitness_front):
+        """
+        Add first front of current generation and activate next stage, if
+        front has converged or max. number of generations per stage has been
+        reached
+
+        Parameters
+        ----------
+        gen : int
+            Current generation
+        list_fitness_front : list (of tuples)
+            List of fitness values of current first pareto front
+
+        Returns
+        -------
+        raised : bool
+            True, if next stage has been activated (population has to be
+            re-evaluated with new fidelity)
+        """
+
+        if self.is_final():
+            return False
+
+        self._list_front_means.append(calc_front_mean(list_fitness_front))
+
+        if (self.is_converged()
+                or gen - self.gen_stage_start >= self.max_stage_gen):
+            self.stage += 1
+            self.gen_stage_start = gen
+            self._list_front_means = []
+            return True
+
+        return False
@@ -0,0 +1,564 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding persistent fitness cache for GA evaluations.
+
+Individuals are identified by a canonical hash of their energy system sizes
+(per building) and their sorted LHN subnetworks. The hash is combined with
+a key of the evaluation settings (objective, nb. of MC runs, sampling method,
+risk factors, hash of MC samples...). Results are stored in a SQLite
+database on local disk, which can be shared by all worker processes and
+survives restarts.
+"""
+from __future__ import division
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+#  Energy system keys of single building dict (fixed order for hashing)
+list_esys_keys = ['bat', 'boi', 'chp', 'eh', 'hp_aw', 'hp_ww', 'pv', 'tes']
+
+
+def get_canonical_ind(ind):
+    """
+    Returns canonical (hashable, order independent) representation of
+    individuum dict
+
+    Parameters
+    ----------
+    ind : dict
+        Individuum dict
+
+    Returns
+    -------
+    tup_canon : tuple
+        Tuple holding tuple of (building id, esys size tuple) tuples (sorted
+        by building id) and tuple of sorted LHN subnetworks (each sorted by
+        node id)
+    """
+
+    list_build = []
+
+    for key in ind.keys():
+        if key == 'lhn':
+            continue
+        tup_esys = tuple(float(ind[key][esys]) for esys in list_esys_keys)
+        list_build.append((key, tup_esys))
+
+    list_build.sort()
+
+    list_lhn = []
+    if ind['lhn'] is not None:
+        for sublhn in ind['lhn']:
+            if len(sublhn) > 0:
+                list_lhn.append(tuple(sorted(sublhn)))
+    list_lhn.sort()
+
+    return (tuple(list_build), tuple(list_lhn))
+
+
+def calc_ind_hash(ind):
+    """
+    Returns canonical hash of individuum dict. Individuals with identical
+    energy systems and LHN networks (independent of dict or LHN node order)
+    have the same hash.
+
+    Parameters
+    ----------
+    ind : dict
+        Individuum dict
+
+    Returns
+    -------
+    ind_hash : str
+        Hex digest of sha1 hash of canonical individuum
+    """
+
+    return hashlib.sha1(repr(get_canonical_ind(ind)).encode('utf-8')).\
+        hexdigest()
+
+
+def calc_settings_key(dict_settings):
+    """
+    Returns key of evaluation settings (e.g. objective, nb_runs,
+    sampling_method, risk factors)
+
+    Parameters
+    ----------
+    dict_settings : dict
+        Dict holding setting names as keys and setting values as values
+
+    Returns
+    -------
+    settings_key : str
+        Hex digest of sha1 hash of sorted settings
+    """
+
+    list_items = sorted((str(key), repr(val))
+                        for (key, val) in dict_settings.items())
+
+    return hashlib.sha1(repr(list_items).encode('utf-8')).hexdigest()
+
+
+class FitnessCache(object):
+    def __init__(self, path, dict_settings, timeout=600, stats_interval=100):
+        """
+        Constructor of persistent fitness cache
+
+        Parameters
+        ----------
+        path : str
+            Path to SQLite database file (generated, if not existent)
+        dict_settings : dict
+            Dict holding evaluation settings, which influence fitness values
+            (e.g. {'objective': objective, 'nb_runs': nb_runs,
+            'sampling_method': sampling_method, 'risk_fac_av': risk_fac_av,
+            'risk_fac_friendly': risk_fac_friendly})
+        timeout : float, optional
+            Timeout in seconds to wait for database lock (default: 600)
+        stats_interval : int, optional
+            Number of counted hits/misses of current process, after which
+            counts are written to database (default: 100). Counts are kept
+            in memory in between, so that cache lookups do not require
+            database writes.
+        """
+
+        self.path = path
+        self.dict_settings = dict_settings
+        self.settings_key = calc_settings_key(dict_settings)
+        self.timeout = timeout
+        self.stats_interval = stats_interval
+
+        #  Hits and misses of current process
+        self.nb_hits = 0
+        self.nb_misses = 0
+
+        #  Hits and misses, which have not been written to database, yet
+        self._nb_hits_new = 0
+        self._nb_misses_new = 0
+
+        self._conn = None
+        #  Process id of process, which opened _conn
+        self._pid = None
+
+        #  Caches with modified settings (see with_settings)
+        self._dict_derived = {}
+
+        #  Generate tables
+        self._get_conn()
+
+    def with_settings(self, dict_update):
+        """
+        Returns fitness cache on same database with modified settings (e.g.
+        other nb_runs of multi-fidelity stage). Derived caches are kept, so
+        that hits and misses are counted per settings.
+
+        Parameters
+        ----------
+        dict_update : dict
+            Dict holding modified evaluation settings (e.g. {'nb_runs': 10})
+
+        Returns
+        -------
+        fitness_cache : object
+            FitnessCache object with modified settings
+        """
+
+        dict_settings = dict(self.dict_settings)
+        dict_settings.update(dict_update)
+
+        if dict_settings == self.dict_settings:
+            return self
+
+        settings_key = calc_settings_key(dict_settings)
+
+        if settings_key not in self._dict_derived:
+            self._dict_derived[settings_key] = \
+                FitnessCache(path=self.path, dict_settings=dict_settings,
+                             timeout=self.timeout,
+                             stats_interval=self.stats_interval)
+
+        return self._dict_derived[settings_key]
+
+    def __getstate__(self):
+        """
+        Exclude database connection from pickling (each process opens its
+        own connection). Unwritten hit/miss counts stay with current process.
+        """
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_nb_hits_new'] = 0
+        state['_nb_misses_new'] = 0
+        return state
+
+    def _get_conn(self):
+        """
+        Returns database connection of current process (opens connection and
+        generates tables, if necessary). Connections inherited by forked
+        processes are not used (SQLite connections must not be shared
+        between processes).
+
+        Returns
+        -------
+        conn : object
+            sqlite3 connection object
+        """
+
+        if self._conn is not None and self._pid != os.getpid():
+            #  Forked process --> Open own connection
+            self._conn = None
+
+        if self._conn is None:
+            folder = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS fitness '
+                         '(ind_hash TEXT, settings TEXT, fitness TEXT, '
+                         'PRIMARY KEY (ind_hash, settings))')
+            conn.execute('CREATE TABLE IF NOT EXISTS mc_runs '
+                         '(ind_hash TEXT, settings TEXT, nb_runs INTEGER, '
+                         'PRIMARY KEY (ind_hash, settings))')
+            conn.execute('CREATE TABLE IF NOT EXISTS obj_stats '
+                         '(ind_hash TEXT, settings TEXT, obj_stats TEXT, '
+                         'PRIMARY KEY (ind_hash, settings))')
+            conn.execute('CREATE TABLE IF NOT EXISTS beta_el '
+                         '(ind_hash TEXT, settings TEXT, beta_el REAL, '
+                         'PRIMARY KEY (ind_hash, settings))')
+            conn.execute('CREATE TABLE IF NOT EXISTS stats '
+                         '(settings TEXT PRIMARY KEY, hits INTEGER, '
+                         'misses INTEGER)')
+            conn.execute('INSERT OR IGNORE INTO stats VALUES (?, 0, 0)',
+                         (self.settings_key,))
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+
+        return self._conn
+
+    def _execute(self, sql, args=()):
+        """
+        Execute and commit sql statement (retries, if database is locked
+        by another process)
+
+        Parameters
+        ----------
+        sql : str
+            SQL statement
+        args : tuple, optional
+            Arguments of SQL statement
+
+        Returns
+        -------
+        list_rows : list
+            List of result rows
+        """
+
+        conn = self._get_conn()
+
+        while True:
+            try:
+                list_rows = conn.execute(sql, args).fetchall()
+                conn.commit()
+                return list_rows
+            except sqlite3.OperationalError as e:  # pragma: no cover
+                if 'locked' not in str(e):
+                    raise
+                time.sleep(0.1)
+
+    def get_by_hash(self, ind_hash, count=True):
+        """
+        Returns cached fitness of individuum hash or None, if hash is unknown
+
+        Parameters
+        ----------
+        ind_hash : str
+            Canonical hash of individuum (see calc_ind_hash)
+        count : bool, optional
+            Defines, if hit/miss should be counted (default: True)
+
+        Returns
+        -------
+        fitness : tuple (or None)
+            Tuple holding fitness values. None, if not cached
+        """
+
+        list_rows = self._execute('SELECT fitness FROM fitness WHERE '
+                                  'ind_hash=? AND settings=?',
+                                  (ind_hash, self.settings_key))
+
+        if len(list_rows) > 0:
+            fitness = tuple(json.loads(list_rows[0][0]))
+        else:
+            fitness = None
+
+        if count:
+            if fitness is None:
+                self.nb_misses += 1
+                self._nb_misses_new += 1
+            else:
+                self.nb_hits += 1
+                self._nb_hits_new += 1
+
+            if self._nb_hits_new + self._nb_misses_new \
+                    >= self.stats_interval:
+                self.flush_stats()
+
+        return fitness
+
+    def get(self, ind, count=True):
+        """
+        Returns cached fitness of individuum or None, if ind is unknown
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        count : bool, optional
+            Defines, if hit/miss should be counted (default: True)
+
+        Returns
+        -------
+        fitness : tuple (or None)
+            Tuple holding fitness values. None, if not cached
+        """
+        return self.get_by_hash(ind_hash=calc_ind_hash(ind), count=count)
+
+    def put_by_hash(self, ind_hash, fitness):
+        """
+        Save fitness of individuum hash to cache
+
+        Parameters
+        ----------
+        ind_hash : str
+            Canonical hash of individuum (see calc_ind_hash)
+        fitness : tuple
+            Tuple holding fitness values
+        """
+
+        self._execute('INSERT OR REPLACE INTO fitness VALUES (?, ?, ?)',
+                      (ind_hash, self.settings_key,
+                       json.dumps(list(fitness))))
+
+    def put(self, ind, fitness):
+        """
+        Save fitness of individuum to cache
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        fitness : tuple
+            Tuple holding fitness values
+        """
+        self.put_by_hash(ind_hash=calc_ind_hash(ind), fitness=fitness)
+
+    def put_nb_runs_by_hash(self, ind_hash, nb_runs):
+        """
+        Save number of performed MC runs of individuum hash (e.g. for
+        adaptive MC runs)
+
+        Parameters
+        ----------
+        ind_hash : str
+            Canonical hash of individuum (see calc_ind_hash)
+        nb_runs : int
+            Number of performed MC runs
+        """
+
+        self._execute('INSERT OR REPLACE INTO mc_runs VALUES (?, ?, ?)',
+                      (ind_hash, self.settings_key, int(nb_runs)))
+
+    def get_nb_runs(self, ind):
+        """
+        Returns number of performed MC runs of individuum or None, if
+        unknown
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+
+        Returns
+        -------
+        nb_runs : int (or None)
+            Number of performed MC runs
+        """
+
+        list_rows = self._execute('SELECT nb_runs FROM mc_runs WHERE '
+                                  'ind_hash=? AND settings=?',
+                                  (calc_ind_hash(ind), self.settings_key))
+
+        if len(list_rows) > 0:
+            return list_rows[0][0]
+        return None
+
+    def get_nb_runs_stats(self):
+        """
+        Returns number of individuals with saved nb. of MC runs and
+        overall number of performed MC runs (for current settings)
+
+        Returns
+        -------
+        tup_stats : tuple
+            Tuple holding (nb_inds, nb_runs_total)
+        """
+
+        list_rows = self._execute('SELECT COUNT(*), SUM(nb_runs) FROM '
+                                  'mc_runs WHERE settings=?',
+                                  (self.settings_key,))
+
+        nb_runs_total = list_rows[0][1]
+        if nb_runs_total is None:
+            nb_runs_total = 0
+
+        return (list_rows[0][0], nb_runs_total)
+
+    def put_obj_stats_by_hash(self, ind_hash, dict_stats):
+        """
+        Save all objective statistics of individuum hash (see
+        objectives.calc_all_stats)
+
+        Parameters
+        ----------
+        ind_hash : str
+            Canonical hash of individuum (see calc_ind_hash)
+        dict_stats : dict
+            Dict holding statistic names as keys and float values
+        """
+
+        self._execute('INSERT OR REPLACE INTO obj_stats VALUES (?, ?, ?)',
+                      (ind_hash, self.settings_key,
+                       json.dumps(dict_stats, sort_keys=True)))
+
+    def get_obj_stats(self, ind):
+        """
+        Returns all objective statistics of individuum or None, if unknown
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+
+        Returns
+        -------
+        dict_stats : dict (or None)
+            Dict holding statistic names as keys and float values
+        """
+
+        list_rows = self._execute('SELECT obj_stats FROM obj_stats WHERE '
+                                  'ind_hash=? AND settings=?',
+                                  (calc_ind_hash(ind), self.settings_key))
+
+        if len(list_rows) > 0:
+            return json.loads(list_rows[0][0])
+        return None
+
+    def put_beta_el_by_hash(self, ind_hash, beta_el):
+        """
+        Save dimensionless el. flexibility beta_el of individuum hash
+
+        Parameters
+        ----------
+        ind_hash : str
+            Canonical hash of individuum (see calc_ind_hash)
+        beta_el : float
+            Dimensionless el. flexibility
+        """
+
+        self._execute('INSERT OR REPLACE INTO beta_el VALUES (?, ?, ?)',
+                      (ind_hash, self.settings_key, float(beta_el)))
+
+    def get_beta_el_by_hash(self, ind_hash):
+        """
+        Returns dimensionless el. flexibility beta_el of individuum hash or
+        None, if unknown
+
+        Parameters
+        ----------
+        ind_hash : str
+            Canonical hash of individuum (see calc_ind_hash)
+
+        Returns
+        -------
+        beta_el : float (or None)
+            Dimensionless el. flexibility
+        """
+
+        list_rows = self._execute('SELECT beta_el FROM beta_el WHERE '
+                                  'ind_hash=? AND settings=?',
+                                  (ind_hash, self.settings_key))
+
+        if len(list_rows) > 0:
+            return list_rows[0][0]
+        return None
+
+    def flush_stats(self):
+        """
+        Write hit and miss counts of current process, which have not been
+        written to database, yet
+        """
+
+        if self._nb_hits_new == 0 and self._nb_misses_new == 0:
+            return
+
+        self._execute('UPDATE stats SET hits=hits+?, misses=misses+? WHERE '
+                      'settings=?', (self._nb_hits_new, self._nb_misses_new,
+                                     self.settings_key))
+
+        self._nb_hits_new = 0
+        self._nb_misses_new = 0
+
+    def get_stats(self):
+        """
+        Returns overall hit and miss counts of all processes (for current
+        settings). Counts of other processes are written every
+        stats_interval counts (or on flush/close).
+
+        Returns
+        -------
+        tup_stats : tuple
+            Tuple holding (nb_hits, nb_misses)
+        """
+
+        self.flush_stats()
+
+        list_rows = self._execute('SELECT hits, misses FROM stats WHERE '
+                                  'settings=?', (self.settings_key,))
+
+        return (list_rows[0][0], list_rows[0][1])
+
+    def flush(self):
+        """
+        Write all committed entries of write-ahead log to database file
+        (e.g. before saving checkpoint of GA run). Hit and miss counts of
+        current process are written before.
+        """
+
+        self.flush_stats()
+        for fitness_cache in self._dict_derived.values():
+            fitness_cache.flush_stats()
+
+        self._execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def close(self):
+        """
+        Write hit and miss counts of current process and close database
+        connections (of this and all derived caches)
+        """
+
+        for fitness_cache in [self] + list(self._dict_derived.values()):
+            fitness_cache.flush_stats()
+            if fitness_cache._conn is not None:
+                fitness_cache._conn.close()
+                fitness_cache._conn = None
+
+    def __len__(self):
+        list_rows = self._execute('SELECT COUNT(*) FROM fitness WHERE '
+                                  'settings=?', (self.settings_key,))
+        return list_rows[0][0]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding memoization of dimensionless el. flexibility beta_el.
+
+beta_el only depends on the (deterministic) energy system configuration of
+the city, not on the MC samples. Thus, it is calculated once per canonical
+individuum hash (see fitness_cache.calc_ind_hash) and kept in a
+process-wide memo. Memo entries are scoped by a key of the city (e.g.
+scope_key of GA runner or settings key of fitness cache), as identical
+energy system configurations of different cities have different beta_el
+values. If a fitness cache is used, beta_el is saved to the
+cache database, too, so that other worker processes and restarted GA runs
+can reuse it. The city deepcopy and the flexibility calculation are only
+performed for unknown energy system configurations.
+"""
+from __future__ import division
+
+import copy
+from collections import OrderedDict
+
+import pycity_calc.toolbox.flex_quantification.flexibility_quant as flexquant
+
+#  Process-wide memo: (scope_key, ind_hash) --> beta_el (least recently
+#  used order)
+_dict_beta_el = OrderedDict()
+
+#  Max. number of memo entries
+max_memo_size = 100000
+
+
+def calc_beta_el(city):
+    """
+    Calculate dimensionless el. flexibility beta_el of city (on copy of
+    city)
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc (with energy systems of individuum)
+
+    Returns
+    -------
+    beta_el : float
+        Dimensionless el. flexibility (sum of absolute positive and negative
+        flexibility)
+    """
+
+    city_flex_copy = copy.deepcopy(city)
+
+    (beta_el_pos, beta_el_neg) = \
+        flexquant.calc_beta_el_city(city=city_flex_copy)
+
+    return abs(beta_el_pos) + abs(beta_el_neg)
+
+
+def get_beta_el(city, ind_hash, fitness_cache=None, scope_key=None):
+    """
+    Returns memoized dimensionless el. flexibility beta_el of individuum.
+    Calculates beta_el, if energy system configuration is unknown.
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc (with energy systems of individuum)
+    ind_hash : str
+        Canonical hash of individuum (see fitness_cache.calc_ind_hash)
+    fitness_cache : object, optional
+        FitnessCache object (default: None). If not None, beta_el is loaded
+        from/saved to cache database.
+    scope_key : str, optional
+        Key of city, which scopes memo entries (default: None), e.g.
+        scope_key of GA runner. If None, settings key of fitness_cache is
+        used. If both are None, beta_el is not memoized.
+
+    Returns
+    -------
+    beta_el : float
+        Dimensionless el. flexibility
+    """
+
+    if scope_key is None and fitness_cache is not None:
+        scope_key = fitness_cache.settings_key
+
+    memo_key = (scope_key, ind_hash)
+
+    if scope_key is not None and memo_key in _dict_beta_el:
+        _dict_beta_el.move_to_end(memo_key)
+        return _dict_beta_el[memo_key]
+
+    beta_el = None
+
+    if fitness_cache is not None:
+        beta_el = fitness_cache.get_beta_el_by_hash(ind_hash=ind_hash)
+
+    if beta_el is None:
+        beta_el = calc_beta_el(city=city)
+
+        if fitness_cache is not None:
+            fitness_cache.put_beta_el_by_hash(ind_hash=ind_hash,
+                                              beta_el=beta_el)
+
+    if scope_key is None:
+        return beta_el
+
+    _dict_beta_el[memo_key] = beta_el
+
+    while len(_dict_beta_el) > max_memo_size:
+        _dict_beta_el.popitem(last=False)
+
+    return beta_el
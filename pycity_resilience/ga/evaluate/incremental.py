@@ -0,0 +1,559 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding incremental (per building / per LHN subnetwork) Monte-Carlo
+evaluation of individuals.
+
+An individuum is split into independent units:
+- every stand-alone building (not connected to any LHN)
+- every LHN subnetwork (with all connected buildings)
+MC results of every unit are cached, keyed by the unit configuration (e.g.
+(building id, esys tuple)) and the MC sample index. A new individuum, which
+only differs in some genes, only re-simulates the units, which are not
+cached, yet. City-level results (annuity, co2, demands...) are the sums
+of the unit results per MC sample.
+
+Each unit is simulated on a sub-city, which only holds the buildings of
+the unit (and all non-building nodes, such as street nodes). Sub-cities and
+their McRunner objects share environment and sample dicts with the full
+city and are reset with an EvalContext.
+
+Remark: Aggregation assumes that annuity and emissions of stand-alone units
+are additive (device-related and demand-related parts are calculated per
+building/subnetwork in pyCity_calc). Requires fixed samples (sampling method
+'lhc'), as 'random' sampling re-samples energy system parameters for every
+evaluation.
+"""
+from __future__ import division
+
+import copy
+import collections
+import numpy as np
+
+import pycity_calc.toolbox.mc_helpers.mc_runner as mcrun
+
+import pycity_resilience.ga.analyse.find_lhn as findlhn
+import pycity_resilience.ga.evaluate.eval_context as evalcon
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+import pycity_resilience.monte_carlo.run_mc as runmc
+
+#  Default max. nb. of cached units per process (each unit holds result
+#  arrays of all MC samples, e.g. about 100 kB for 1000 samples)
+max_units = 2000
+
+
+def get_eval_units(ind):
+    """
+    Split individuum into independent evaluation units (stand-alone
+    buildings and LHN subnetworks)
+
+    Parameters
+    ----------
+    ind : dict
+        Individuum dict
+
+    Returns
+    -------
+    list_units : list (of tuples)
+        List of (unit_key, list_ids, sub_ind) tuples.
+        unit_key : tuple
+            ('build', building id, esys tuple) for stand-alone buildings
+            ('lhn', tuple of ids, tuple of esys tuples) for LHN subnetworks
+        list_ids : list (of ints)
+            Sorted list of building ids of unit
+        sub_ind : dict
+            Individuum dict of unit (only holding buildings of unit)
+    """
+
+    list_units = []
+
+    lhn_index = findlhn.LhnIndex(ind=ind)
+
+    for key in sorted(k for k in ind.keys() if k != 'lhn'):
+        if key not in lhn_index:
+            tup_esys = tuple(float(ind[key][esys])
+                             for esys in fitcache.list_esys_keys)
+            sub_ind = {key: ind[key], 'lhn': []}
+            list_units.append((('build', key, tup_esys), [key], sub_ind))
+
+    for sublhn in ind['lhn']:
+        if len(sublhn) == 0:  # pragma: no cover
+            continue
+        list_ids = sorted(sublhn)
+        tup_esys = tuple(tuple(float(ind[n][esys])
+                               for esys in fitcache.list_esys_keys)
+                         for n in list_ids)
+        sub_ind = {'lhn': [list_ids]}
+        for n in list_ids:
+            sub_ind[n] = ind[n]
+        list_units.append((('lhn', tuple(list_ids), tup_esys), list_ids,
+                           sub_ind))
+
+    return list_units
+
+
+class PartialResultCache(object):
+    def __init__(self, nb_samples, max_units=max_units):
+        """
+        Constructor of cache for MC results of evaluation units, keyed
+        by unit key and MC sample index
+
+        Parameters
+        ----------
+        nb_samples : int
+            Total number of MC samples
+        max_units : int, optional
+            Maximum number of cached units (default: 2000). Oldest units
+            are removed first. If None, no limitation.
+        """
+
+        self.nb_samples = nb_samples
+        self.max_units = max_units
+
+        #  unit_key --> dict with 'done' (bool array), 'failed' (bool array)
+        #  and result arrays (np.nan for not evaluated samples)
+        self._dict_units = collections.OrderedDict()
+
+        self.nb_hits = 0  # Nb. of reused (unit, sample) results
+        self.nb_misses = 0  # Nb. of simulated (unit, sample) results
+
+    def _get_entry(self, unit_key):
+        """
+        Returns cache entry of unit (generates empty entry, if necessary)
+
+        Parameters
+        ----------
+        unit_key : tuple
+            Key of evaluation unit
+
+        Returns
+        -------
+        dict_entry : dict
+            Cache entry of unit
+        """
+
+        if unit_key not in self._dict_units:
+            self._dict_units[unit_key] = \
+                {'done': np.zeros(self.nb_samples, dtype=bool),
+                 'failed': np.zeros(self.nb_samples, dtype=bool),
+                 'res': {}}
+
+            if (self.max_units is not None
+                    and len(self._dict_units) > self.max_units):
+                self._dict_units.popitem(last=False)
+
+        return self._dict_units[unit_key]
+
+    def get_missing_idx(self, unit_key, list_idx):
+        """
+        Returns sample indexes of list_idx, which have not been evaluated
+        for unit, yet
+
+        Parameters
+        ----------
+        unit_key : tuple
+            Key of evaluation unit
+        list_idx : list (of ints)
+            List of sample indexes
+
+        Returns
+        -------
+        list_missing : list (of ints)
+            List of sample indexes, which have not been evaluated, yet
+        """
+
+        if unit_key not in self._dict_units:
+            list_missing = list(list_idx)
+        else:
+            array_done = self._dict_units[unit_key]['done']
+            list_missing = [i for i in list_idx if not array_done[i]]
+
+        self.nb_misses += len(list_missing)
+        self.nb_hits += len(list_idx) - len(list_missing)
+
+        return list_missing
+
+    def add_results(self, unit_key, list_idx, dict_res, list_failed):
+        """
+        Add MC results of unit for sample indexes to cache
+
+        Parameters
+        ----------
+        unit_key : tuple
+            Key of evaluation unit
+        list_idx : list (of ints)
+            List of sample indexes (order of result arrays)
+        dict_res : dict
+            Dict holding result names as keys and result arrays (same
+            length and order as list_idx) as values
+        list_failed : list (of ints)
+            List of failed sample indexes (original sample indexes)
+        """
+
+        dict_entry = self._get_entry(unit_key=unit_key)
+        array_idx = np.array(list_idx, dtype=int)
+
+        for key in dict_res.keys():
+            if key not in dict_entry['res']:
+                dict_entry['res'][key] = np.full(self.nb_samples, np.nan)
+            dict_entry['res'][key][array_idx] = dict_res[key]
+
+        dict_entry['done'][array_idx] = True
+        dict_entry['failed'][array_idx] = False
+        if len(list_failed) > 0:
+            dict_entry['failed'][np.array(list_failed, dtype=int)] = True
+
+    def get_results(self, unit_key, list_idx):
+        """
+        Returns cached MC results of unit for sample indexes
+
+        Parameters
+        ----------
+        unit_key : tuple
+            Key of evaluation unit
+        list_idx : list (of ints)
+            List of sample indexes (have to be evaluated, before)
+
+        Returns
+        -------
+        tuple_res : tuple
+            (dict_res, list_failed) with result arrays ordered as list_idx
+            and list of failed sample indexes
+        """
+
+        dict_entry = self._dict_units[unit_key]
+        array_idx = np.array(list_idx, dtype=int)
+
+        if not np.all(dict_entry['done'][array_idx]):
+            msg = 'Not all samples of unit ' + str(unit_key) + ' have been ' \
+                                                               'evaluated!'
+            raise AssertionError(msg)
+
+        dict_res = {}
+        for key in dict_entry['res'].keys():
+            dict_res[key] = dict_entry['res'][key][array_idx]
+
+        list_failed = [i for i in list_idx if dict_entry['failed'][i]]
+
+        return (dict_res, list_failed)
+
+    def __len__(self):
+        return len(self._dict_units)
+
+
+def sum_unit_results(list_dict_res):
+    """
+    Sum result arrays of evaluation units (per MC sample)
+
+    Parameters
+    ----------
+    list_dict_res : list (of dicts)
+        List of unit result dicts (result names as keys, arrays as values)
+
+    Returns
+    -------
+    dict_sum : dict
+        Dict holding summed result arrays (missing results of single units
+        are treated as zeros)
+    """
+
+    if len(list_dict_res) == 0:
+        msg = 'list_dict_res cannot be empty!'
+        raise AssertionError(msg)
+
+    dict_sum = {}
+    for dict_res in list_dict_res:
+        for key in dict_res.keys():
+            if key in dict_sum:
+                dict_sum[key] = dict_sum[key] + dict_res[key]
+            else:
+                dict_sum[key] = np.array(dict_res[key], dtype=float)
+
+    return dict_sum
+
+
+def _get_shared_memo(city, mc_runner):
+    """
+    Returns deepcopy memo dict, which shares environment of city and
+    samples of mc_runner (not copied)
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc
+    mc_runner : object
+        MC Runner object of pyCity_calc (holding city and samples)
+
+    Returns
+    -------
+    memo : dict
+        Memo dict for copy.deepcopy
+    """
+
+    memo = {id(city.environment): city.environment}
+    for val in city.environment.__dict__.values():
+        memo[id(val)] = val
+    for key in runmc.get_sample_attr_names(mc_run=mc_runner):
+        val = mc_runner.__dict__[key]
+        memo[id(val)] = val
+
+    return memo
+
+
+class IncrementalEvaluator(object):
+    def __init__(self, city, mc_runner, nb_samples, max_units=max_units,
+                 max_sub_contexts=100):
+        """
+        Constructor of incremental evaluator
+
+        Parameters
+        ----------
+        city : object
+            City object of pyCity_calc in initial state (e.g. reset by
+            EvalContext)
+        mc_runner : object
+            MC Runner object of pyCity_calc (holding city and samples)
+        nb_samples : int
+            Total number of MC samples on mc_runner
+        max_units : int, optional
+            Maximum number of cached units (default: 2000)
+        max_sub_contexts : int, optional
+            Maximum number of stored sub-cities (default: 100)
+        """
+
+        self.city = city
+        self.mc_runner = mc_runner
+        self.nb_samples = nb_samples
+        self.max_sub_contexts = max_sub_contexts
+
+        self.cache = PartialResultCache(nb_samples=nb_samples,
+                                        max_units=max_units)
+
+        #  tuple of building ids --> EvalContext of sub-city
+        self._dict_sub_contexts = collections.OrderedDict()
+
+    def _gen_sub_context(self, list_ids):
+        """
+        Generate sub-city, which only holds buildings of list_ids, and
+        corresponding McRunner object (sharing environment and samples)
+
+        Parameters
+        ----------
+        list_ids : list (of ints)
+            List of building ids
+
+        Returns
+        -------
+        eval_context : object
+            EvalContext object of sub-city
+        """
+
+        list_build_all = self.city.get_list_build_entity_node_ids()
+        list_other = [n for n in list_build_all if n not in list_ids]
+
+        #  Share environment and samples, skip buildings of other nodes
+        memo = _get_shared_memo(city=self.city, mc_runner=self.mc_runner)
+        for n in list_other:
+            memo[id(self.city.nodes[n]['entity'])] = None
+
+        city_sub = copy.deepcopy(self.city, memo)
+
+        for n in list_other:
+            if hasattr(city_sub, 'remove_building'):
+                city_sub.remove_building(n)
+            else:  # pragma: no cover
+                city_sub.remove_node(n)
+
+        memo[id(self.city)] = city_sub
+        mc_sub = copy.deepcopy(self.mc_runner, memo)
+        mc_sub._list_build_ids = list(list_ids)
+
+        return evalcon.EvalContext(city=city_sub, mc_runner=mc_sub,
+                                   list_build_ids=list(list_ids))
+
+    def _get_sub_context(self, list_ids):
+        """
+        Returns (stored) EvalContext of sub-city with buildings of list_ids
+
+        Parameters
+        ----------
+        list_ids : list (of ints)
+            List of building ids
+
+        Returns
+        -------
+        eval_context : object
+            EvalContext object of sub-city
+        """
+
+        key = tuple(sorted(list_ids))
+
+        if key in self._dict_sub_contexts:
+            self._dict_sub_contexts.move_to_end(key)
+        else:
+            self._dict_sub_contexts[key] = \
+                self._gen_sub_context(list_ids=list(key))
+            if len(self._dict_sub_contexts) > self.max_sub_contexts:
+                self._dict_sub_contexts.popitem(last=False)
+
+        return self._dict_sub_contexts[key]
+
+    def perform_mc_runs(self, ind, sampling_method, list_idx=None,
+                        failure_tolerance=0.05, use_street=False,
+                        heating_off=True, eeg_pv_limit=False,
+                        use_kwkg_lhn_sub=False, el_mix_for_chp=True,
+                        el_mix_for_pv=True):
+        """
+        Perform incremental MC evaluation of individuum. Only units, which
+        have not been evaluated for the given sample indexes, are
+        simulated.
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        sampling_method : str
+            Defines method used for sampling. Only 'lhc' is supported.
+        list_idx : list (of ints), optional
+            List of sample indexes (default: None). If None, uses all
+            samples.
+        failure_tolerance : float, optional
+            Allowed EnergyBalanceException failure tolerance (default: 0.05)
+            on city level
+        use_street : bool, optional
+            Use street networks to route LHN pipelines (default: False)
+        heating_off : bool, optional
+            Defines, if sampling to deactivate heating during summer should
+            be used (default: True)
+        eeg_pv_limit : bool, optional
+            Defines, if EEG PV feed-in limitation is active (default: False)
+        use_kwkg_lhn_sub : bool, optional
+            Defines, if KWKG LHN subsidies are used (default: False)
+        el_mix_for_chp : bool, optional
+            Defines, if el. mix should be used for CHP fed-in electricity
+            (default: True)
+        el_mix_for_pv : bool, optional
+            Defines, if el. mix should be used for PV fed-in electricity
+            (default: True)
+
+        Returns
+        -------
+        tuple_res : tuple (of dicts)
+            (dict_mc_res, dict_mc_setup) of city (same structure as results
+            of perform_mc_runs of McRunner)
+        """
+
+        if sampling_method != 'lhc':
+            msg = 'Incremental evaluation requires fixed samples ' \
+                  '(sampling_method lhc), but ' + str(sampling_method) + \
+                  ' has been chosen.'
+            raise AssertionError(msg)
+
+        if list_idx is None:
+            list_idx = list(range(self.nb_samples))
+        list_idx = list(list_idx)
+
+        list_dict_res = []
+        set_failed = set()
+
+        for (unit_key, list_ids, sub_ind) in get_eval_units(ind=ind):
+
+            list_missing = self.cache.get_missing_idx(unit_key=unit_key,
+                                                      list_idx=list_idx)
+
+            if len(list_missing) > 0:
+                #  Simulate unit on sub-city
+                eval_context = self._get_sub_context(list_ids=list_ids)
+                eval_context.load_ind(ind=sub_ind, use_street=use_street)
+
+                #  Failure tolerance is checked on city level
+                (dict_mc_res, dict_mc_setup, dict_mc_cov) = \
+                    runmc.perform_mc_runs_for_samples(
+                        mc_run=eval_context.mc_runner,
+                        list_idx=list_missing,
+                        nb_samples=self.nb_samples,
+                        sampling_method=sampling_method,
+                        failure_tolerance=1,
+                        heating_off=heating_off,
+                        eeg_pv_limit=eeg_pv_limit,
+                        use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                        el_mix_for_chp=el_mix_for_chp,
+                        el_mix_for_pv=el_mix_for_pv)
+
+                dict_arrays = {}
+                for key in dict_mc_res.keys():
+                    if (isinstance(dict_mc_res[key], np.ndarray)
+                            and len(dict_mc_res[key]) == len(list_missing)):
+                        dict_arrays[key] = dict_mc_res[key]
+
+                self.cache.add_results(unit_key=unit_key,
+                                       list_idx=list_missing,
+                                       dict_res=dict_arrays,
+                                       list_failed=
+                                       dict_mc_setup['idx_failed_runs'])
+
+            (dict_res, list_failed) = \
+                self.cache.get_results(unit_key=unit_key, list_idx=list_idx)
+
+            list_dict_res.append(dict_res)
+            set_failed.update(list_failed)
+
+        list_idx_failed = sorted(list_idx.index(i) for i in set_failed)
+
+        if len(list_idx_failed) > failure_tolerance * len(list_idx):
+            msg = str(len(list_idx_failed)) + ' of ' + str(len(list_idx)) + \
+                  ' runs failed, which exceeds failure tolerance of ' + \
+                  str(failure_tolerance)
+            raise mcrun.McToleranceException(msg)
+
+        dict_mc_res = sum_unit_results(list_dict_res=list_dict_res)
+
+        dict_mc_setup = {'nb_runs': len(list_idx),
+                         'failure_tolerance': failure_tolerance,
+                         'heating_off': heating_off,
+                         'idx_failed_runs': list_idx_failed}
+
+        return (dict_mc_res, dict_mc_setup)
+
+
+def get_incr_evaluator(ga_runner, max_units=max_units):
+    """
+    Returns incremental evaluator of ga_runner. Generates evaluator on first
+    call within current process from copy of initial city state of eval
+    context (city of eval context is not modified).
+
+    Parameters
+    ----------
+    ga_runner : object
+        GA runner object of pyCity_resilience
+    max_units : int, optional
+        Maximum number of cached units (default: 2000). Only used, if
+        evaluator is generated.
+
+    Returns
+    -------
+    incr_evaluator : object
+        IncrementalEvaluator object instance
+    """
+
+    incr_evaluator = getattr(ga_runner, '_incr_evaluator', None)
+
+    if incr_evaluator is None:
+        eval_context = evalcon.get_eval_context(ga_runner=ga_runner)
+
+        #  Sub-cities are generated from initial city state. City of eval
+        #  context might hold parsed individuum and is modified by every
+        #  evaluation. Thus, restore initial state on copy.
+        memo = _get_shared_memo(city=eval_context.city,
+                                mc_runner=eval_context.mc_runner)
+        context_copy = copy.deepcopy(eval_context, memo)
+        context_copy.reset()
+
+        incr_evaluator = IncrementalEvaluator(city=context_copy.city,
+                                              mc_runner=
+                                              context_copy.mc_runner,
+                                              nb_samples=ga_runner.nb_runs,
+                                              max_units=max_units)
+        ga_runner._incr_evaluator = incr_evaluator
+
+    return incr_evaluator
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding archive of per-run MC results of evaluated individuals.
+
+During the GA run, the MC result arrays (annuity, co2, demands...) and the
+indexes of failed runs of every evaluated individuum are saved as
+compressed npz BLOB in a SQLite database, keyed by the canonical hash of
+the individuum (see fitness_cache.calc_ind_hash). Thus, postprocessing
+(e.g. reevaluate_par_frontier.py) can load the results of pareto solutions
+without re-running the MC simulation.
+
+The MC results of the reference system (rescaled boilers) can be stored
+with key ref_key.
+"""
+from __future__ import division
+
+import io
+import os
+import time
+import sqlite3
+import numpy as np
+
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+
+#  Key of MC results of reference system
+ref_key = 'reference'
+
+#  Name of array with failed run indexes in npz data
+failed_name = 'idx_failed_runs'
+
+
+def pack_results(dict_mc_res, list_idx_failed):
+    """
+    Pack MC result arrays and failed run indexes to compressed npz bytes
+
+    Parameters
+    ----------
+    dict_mc_res : dict
+        Dict holding result names as keys and result arrays as values
+    list_idx_failed : list (of ints)
+        List of indexes of failed runs
+
+    Returns
+    -------
+    data : bytes
+        Compressed npz data
+    """
+
+    if failed_name in dict_mc_res:
+        msg = str(failed_name) + ' cannot be used as result name.'
+        raise AssertionError(msg)
+
+    dict_arrays = {}
+    for key in dict_mc_res.keys():
+        dict_arrays[str(key)] = np.asarray(dict_mc_res[key])
+    dict_arrays[failed_name] = np.array(list_idx_failed, dtype=int)
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **dict_arrays)
+
+    return buffer.getvalue()
+
+
+def unpack_results(data):
+    """
+    Unpack compressed npz bytes to MC result arrays and failed run indexes
+
+    Parameters
+    ----------
+    data : bytes
+        Compressed npz data (see pack_results)
+
+    Returns
+    -------
+    tup_res : tuple
+        (dict_mc_res, list_idx_failed)
+    """
+
+    dict_mc_res = {}
+
+    with np.load(io.BytesIO(data)) as npz:
+        for key in npz.files:
+            dict_mc_res[key] = npz[key]
+
+    list_idx_failed = [int(i) for i in dict_mc_res.pop(failed_name)]
+
+    return (dict_mc_res, list_idx_failed)
+
+
+class McResultArchive(object):
+    def __init__(self, path, dict_settings=None, timeout=600):
+        """
+        Constructor of MC result archive
+
+        Parameters
+        ----------
+        path : str
+            Path to SQLite database file (generated, if not existent)
+        dict_settings : dict, optional
+            Dict holding MC settings (e.g. nb_runs, sampling_method...)
+            (default: None). If None, results are loaded independent of
+            settings (e.g. for postprocessing of a single GA run).
+            Results are saved with settings key of empty dict.
+        timeout : float, optional
+            Timeout in seconds to wait for database lock (default: 600)
+        """
+
+        self.path = path
+        if dict_settings is None:
+            self.settings_key = None
+        else:
+            self.settings_key = fitcache.calc_settings_key(dict_settings)
+        self.timeout = timeout
+
+        self._conn = None
+        #  Process id of process, which opened _conn
+        self._pid = None
+
+        #  Generate tables
+        self._get_conn()
+
+    def __getstate__(self):
+        """
+        Exclude database connection from pickling (each process opens its
+        own connection)
+        """
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        return state
+
+    def _get_conn(self):
+        """
+        Returns database connection of current process (opens connection and
+        generates table, if necessary). Connections inherited by forked
+        processes are not used (SQLite connections must not be shared
+        between processes).
+
+        Returns
+        -------
+        conn : object
+            sqlite3 connection object
+        """
+
+        if self._conn is not None and self._pid != os.getpid():
+            #  Forked process --> Open own connection
+            self._conn = None
+
+        if self._conn is None:
+            folder = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS mc_results '
+                         '(ind_hash TEXT, settings TEXT, data BLOB, '
+                         'PRIMARY KEY (ind_hash, settings))')
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+
+        return self._conn
+
+    def _execute(self, sql, args=()):
+        """
+        Execute and commit sql statement (retries, if database is locked
+        by another process)
+
+        Parameters
+        ----------
+        sql : str
+            SQL statement
+        args : tuple, optional
+            Arguments of SQL statement
+
+        Returns
+        -------
+        list_rows : list
+            List of result rows
+        """
+
+        conn = self._get_conn()
+
+        while True:
+            try:
+                list_rows = conn.execute(sql, args).fetchall()
+                conn.commit()
+                return list_rows
+            except sqlite3.OperationalError as e:  # pragma: no cover
+                if 'locked' not in str(e):
+                    raise
+                time.sleep(0.1)
+
+    def close(self):
+        """
+        Close database connection (reopened on next access)
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _get_settings_key(self):
+        """
+        Returns settings key used for saving results
+        """
+        if self.settings_key is None:
+            return fitcache.calc_settings_key({})
+        return self.settings_key
+
+    def put_by_hash(self, ind_hash, dict_mc_res, list_idx_failed):
+        """
+        Save MC results of individuum hash to archive
+
+        Parameters
+        ----------
+        ind_hash : str
+            Canonical hash of individuum (see fitness_cache.calc_ind_hash)
+            or ref_key for reference system
+        dict_mc_res : dict
+            Dict holding result names as keys and result arrays as values
+            (see perform_mc_runs of McRunner)
+        list_idx_failed : list (of ints)
+            List of indexes of failed runs
+        """
+
+        data = pack_results(dict_mc_res=dict_mc_res,
+                            list_idx_failed=list_idx_failed)
+
+        self._execute('INSERT OR REPLACE INTO mc_results VALUES (?, ?, ?)',
+                      (ind_hash, self._get_settings_key(),
+                       sqlite3.Binary(data)))
+
+    def put(self, ind, dict_mc_res, list_idx_failed):
+        """
+        Save MC results of individuum to archive
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        dict_mc_res : dict
+            Dict holding result names as keys and result arrays as values
+        list_idx_failed : list (of ints)
+            List of indexes of failed runs
+        """
+        self.put_by_hash(ind_hash=fitcache.calc_ind_hash(ind),
+                         dict_mc_res=dict_mc_res,
+                         list_idx_failed=list_idx_failed)
+
+    def get_by_hash(self, ind_hash):
+        """
+        Returns archived MC results of individuum hash or None, if unknown
+
+        Parameters
+        ----------
+        ind_hash : str
+            Canonical hash of individuum or ref_key
+
+        Returns
+        -------
+        tup_res : tuple (or None)
+            (dict_mc_res, list_idx_failed). None, if not archived.
+        """
+
+        if self.settings_key is None:
+            list_rows = self._execute('SELECT data FROM mc_results WHERE '
+                                      'ind_hash=?', (ind_hash,))
+        else:
+            list_rows = self._execute('SELECT data FROM mc_results WHERE '
+                                      'ind_hash=? AND settings=?',
+                                      (ind_hash, self.settings_key))
+
+        if len(list_rows) == 0:
+            return None
+
+        return unpack_results(data=bytes(list_rows[0][0]))
+
+    def get(self, ind):
+        """
+        Returns archived MC results of individuum or None, if unknown
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+
+        Returns
+        -------
+        tup_res : tuple (or None)
+            (dict_mc_res, list_idx_failed). None, if not archived.
+        """
+        return self.get_by_hash(ind_hash=fitcache.calc_ind_hash(ind))
+
+    def __contains__(self, ind):
+        return self.get(ind) is not None
+
+    def __len__(self):
+        if self.settings_key is None:
+            list_rows = self._execute('SELECT COUNT(*) FROM mc_results')
+        else:
+            list_rows = self._execute('SELECT COUNT(*) FROM mc_results '
+                                      'WHERE settings=?',
+                                      (self.settings_key,))
+        return list_rows[0][0]
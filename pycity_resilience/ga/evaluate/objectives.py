@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding objective registry of MC based objectives.
+
+All statistics (mean, std, risk averse and risk friendly values) of all
+result quantities (annuity, co2, annuity and co2 to net energy ratios and
+dimensionless cost and co2) are calculated from a single MC result. Fitness
+values of every registered objective can then be taken from these
+statistics (e.g. to re-rank individuals with another objective without
+re-simulation).
+"""
+from __future__ import division
+
+import numpy as np
+
+#  Result quantities --> type names of EcoMCRunAnalyze
+dict_quantities = {'annuity': 'annuity',
+                   'co2': 'co2',
+                   'ann_to_en': 'ann_to_en',
+                   'co2_to_en': 'co2_to_en',
+                   'dimless_an': 'dimless_an',
+                   'dimless_co2': 'dimless_co2'}
+
+#  Statistic types
+list_stats = ['mean', 'std', 'risk_av', 'risk_friendly']
+
+#  Objective registry: objective --> (quantities, statistic, uses beta_el)
+dict_objectives = \
+    {'mc_risk_av_ann_co2_to_net_energy':
+         (('ann_to_en', 'co2_to_en'), 'risk_av', False),
+     'mc_risk_av_ann_and_co2': (('annuity', 'co2'), 'risk_av', False),
+     'mc_mean_ann_and_co2': (('annuity', 'co2'), 'mean', False),
+     'mc_risk_friendly_ann_and_co2':
+         (('annuity', 'co2'), 'risk_friendly', False),
+     'mc_min_std_of_ann_and_co2': (('annuity', 'co2'), 'std', False),
+     'mc_dimless_eco_em_2d_mean':
+         (('dimless_an', 'dimless_co2'), 'mean', False),
+     'mc_dimless_eco_em_2d_risk_av':
+         (('dimless_an', 'dimless_co2'), 'risk_av', False),
+     'mc_dimless_eco_em_2d_risk_friendly':
+         (('dimless_an', 'dimless_co2'), 'risk_friendly', False),
+     'mc_dimless_eco_em_2d_std':
+         (('dimless_an', 'dimless_co2'), 'std', False),
+     'mc_dimless_eco_em_3d_mean':
+         (('dimless_an', 'dimless_co2'), 'mean', True),
+     'mc_dimless_eco_em_3d_risk_av':
+         (('dimless_an', 'dimless_co2'), 'risk_av', True),
+     'mc_dimless_eco_em_3d_risk_friendly':
+         (('dimless_an', 'dimless_co2'), 'risk_friendly', True),
+     'mc_dimless_eco_em_3d_std':
+         (('dimless_an', 'dimless_co2'), 'std', True)}
+
+
+def get_objective(objective):
+    """
+    Returns registry entry of MC based objective
+
+    Parameters
+    ----------
+    objective : str
+        Objective function (see eval.eval_obj)
+
+    Returns
+    -------
+    tup_obj : tuple
+        (tup_quantities, stat_type, use_beta_el)
+    """
+
+    if objective not in dict_objectives:
+        msg = 'Objective ' + str(objective) + ' is not a registered MC ' \
+                                              'based objective.'
+        raise AssertionError(msg)
+
+    return dict_objectives[objective]
+
+
+def get_quantity_arrays(mc_analyze):
+    """
+    Returns result arrays (per successful MC run) of all available result
+    quantities
+
+    Parameters
+    ----------
+    mc_analyze : object
+        EcoMCRunAnalyze object (basic results have been extracted)
+
+    Returns
+    -------
+    dict_arrays : dict
+        Dict holding quantity names as keys and result arrays as values.
+        Dimensionless quantities are only included, if dimensionless
+        cost and co2 values have been calculated.
+    """
+
+    array_en = (np.asarray(mc_analyze._array_sh_dem_mod)
+                + np.asarray(mc_analyze._array_el_dem_mod)
+                + np.asarray(mc_analyze._array_dhw_dem_mod))
+
+    dict_arrays = {'annuity': np.asarray(mc_analyze._array_ann_mod),
+                   'co2': np.asarray(mc_analyze._array_co2_mod)}
+
+    dict_arrays['ann_to_en'] = dict_arrays['annuity'] / array_en
+    dict_arrays['co2_to_en'] = dict_arrays['co2'] / array_en
+
+    if getattr(mc_analyze, '_array_dimless_cost', None) is not None:
+        dict_arrays['dimless_an'] = \
+            np.asarray(mc_analyze._array_dimless_cost)
+        dict_arrays['dimless_co2'] = \
+            np.asarray(mc_analyze._array_dimless_co2)
+
+    return dict_arrays
+
+
+def calc_all_stats(mc_analyze, risk_fac_av=-1, risk_fac_friendly=1):
+    """
+    Calculate all statistics of all available result quantities of one MC
+    result
+
+    Parameters
+    ----------
+    mc_analyze : object
+        EcoMCRunAnalyze object (basic results have been extracted and,
+        if possible, dimensionless values have been calculated)
+    risk_fac_av : float, optional
+        Preference/risk value for mu-sigma-evaluation for risk averse
+        preference (default: -1). Used for dimensionless quantities
+        (default risk factor of EcoMCRunAnalyze for all other quantities)
+    risk_fac_friendly : float, optional
+        Preference/risk value for mu-sigma-evaluation for risk
+        friendly preference (default: 1). Used for dimensionless quantities.
+
+    Returns
+    -------
+    dict_stats : dict
+        Dict holding '<quantity>_<stat>' keys (e.g. 'annuity_mean',
+        'dimless_co2_risk_av') and float values
+    """
+
+    dict_arrays = get_quantity_arrays(mc_analyze=mc_analyze)
+    list_keys = sorted(dict_arrays.keys())
+
+    #  Mean and std of all quantities in one pass
+    matrix = np.vstack([dict_arrays[key] for key in list_keys])
+    array_mean = np.mean(matrix, axis=1)
+    array_std = np.std(matrix, axis=1)
+
+    dict_stats = {}
+
+    for i in range(len(list_keys)):
+        key = list_keys[i]
+        dict_stats[key + '_mean'] = float(array_mean[i])
+        dict_stats[key + '_std'] = float(array_std[i])
+
+        #  Risk parameters as defined in EcoMCRunAnalyze
+        if key.startswith('dimless'):
+            dict_stats[key + '_risk_av'] = \
+                float(mc_analyze.calc_risk_averse_parameters(
+                    type=dict_quantities[key], risk_factor=risk_fac_av))
+            dict_stats[key + '_risk_friendly'] = \
+                float(mc_analyze.calc_risk_friendly_parameters(
+                    type=dict_quantities[key],
+                    risk_factor=risk_fac_friendly))
+        else:
+            dict_stats[key + '_risk_av'] = \
+                float(mc_analyze.calc_risk_averse_parameters(
+                    type=dict_quantities[key]))
+            dict_stats[key + '_risk_friendly'] = \
+                float(mc_analyze.calc_risk_friendly_parameters(
+                    type=dict_quantities[key]))
+
+    return dict_stats
+
+
+def get_obj_values(dict_stats, objective, beta_el=None):
+    """
+    Returns fitness values of objective from statistics dict
+
+    Parameters
+    ----------
+    dict_stats : dict
+        Dict holding statistics (see calc_all_stats)
+    objective : str
+        MC based objective function (see eval.eval_obj)
+    beta_el : float, optional
+        Dimensionless el. flexibility (default: None). Required for 3d
+        objectives. If None, uses dict_stats['beta_el'].
+
+    Returns
+    -------
+    tup_obj : tuple
+        Tuple holding fitness values of objective
+    """
+
+    (tup_quantities, stat_type, use_beta_el) = \
+        get_objective(objective=objective)
+
+    list_values = []
+    for quantity in tup_quantities:
+        key = quantity + '_' + stat_type
+        if key not in dict_stats:
+            msg = 'Statistic ' + str(key) + ' is not available in ' \
+                                            'dict_stats.'
+            raise AssertionError(msg)
+        list_values.append(dict_stats[key])
+
+    if use_beta_el:
+        if beta_el is None:
+            beta_el = dict_stats['beta_el']
+        list_values.append(beta_el)
+
+    return tuple(list_values)
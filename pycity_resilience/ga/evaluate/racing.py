@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding dominance based racing for adaptive Monte-Carlo evaluation.
+
+The master process saves the fitness values of the current first pareto
+front to a json file (save_front) at the beginning of every generation.
+During adaptive MC evaluation (see adaptive_mc.py), partial statistics of
+an individuum are compared to this front after each batch of samples. If
+the lower confidence bounds of all objectives are dominated by at least one
+front member, the individuum is dominated with the chosen confidence. Then,
+the evaluation is aborted and the upper confidence bounds are returned as
+conservative fitness estimate.
+
+Only supports objectives with two objective values, which are minimized.
+"""
+from __future__ import division
+
+import os
+import json
+
+import numpy as np
+
+import pycity_resilience.ga.evaluate.adaptive_mc as adamc
+import pycity_resilience.ga.evaluate.objectives as objfkt
+
+#  Cached front of current process: path --> (mtime, array_front)
+_dict_fronts = {}
+
+
+def save_front(path, list_fitness):
+    """
+    Save fitness values of (first) pareto front to json file (atomic
+    replace, as workers might read file at the same time)
+
+    Parameters
+    ----------
+    path : str
+        Path to json file
+    list_fitness : list (of tuples)
+        List of fitness value tuples of pareto front
+    """
+
+    path_temp = path + '.tmp'
+
+    with open(path_temp, mode='w') as file:
+        json.dump([list(fit) for fit in list_fitness], file)
+
+    os.replace(path_temp, path)
+
+
+def load_front(path):
+    """
+    Load fitness values of pareto front. Reloads file, only if file has
+    been modified.
+
+    Parameters
+    ----------
+    path : str
+        Path to json file
+
+    Returns
+    -------
+    array_front : np.array (or None)
+        2d array holding fitness values of front members (one row per
+        member). None, if file does not exist.
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    mtime = os.path.getmtime(path)
+
+    if path in _dict_fronts and _dict_fronts[path][0] == mtime:
+        return _dict_fronts[path][1]
+
+    with open(path, mode='r') as file:
+        array_front = np.array(json.load(file), dtype=float)
+
+    _dict_fronts[path] = (mtime, array_front)
+
+    return array_front
+
+
+def is_dominated(array_lower, array_front):
+    """
+    Check, if point is dominated by at least one front member (minimization
+    of all objectives)
+
+    Parameters
+    ----------
+    array_lower : array-like
+        Objective values (e.g. lower confidence bounds) of individuum
+    array_front : np.array
+        2d array holding fitness values of front members
+
+    Returns
+    -------
+    dominated : bool
+        True, if at least one front member is better or equal in all
+        objectives and better in at least one objective
+    """
+
+    if array_front is None or len(array_front) == 0:
+        return False
+
+    array_lower = np.asarray(array_lower, dtype=float)
+
+    array_leq = np.all(array_front <= array_lower, axis=1)
+    array_less = np.any(array_front < array_lower, axis=1)
+
+    return bool(np.any(array_leq & array_less))
+
+
+class DominanceRace(object):
+    def __init__(self, path_front, objective, conf_z=1.96, risk_fac_av=-1,
+                 risk_fac_friendly=1):
+        """
+        Constructor of dominance race (stop criterion for adaptive MC runs)
+
+        Parameters
+        ----------
+        path_front : str
+            Path to json file with fitness values of current first front
+        objective : str
+            Objective function (see eval.eval_obj). Has to be a 2d MC based
+            objective.
+        conf_z : float, optional
+            Quantile of standard normal distribution of confidence level
+            of dominance (default: 1.96)
+        risk_fac_av : float, optional
+            Preference/risk value for risk averse preference (default: -1)
+        risk_fac_friendly : float, optional
+            Preference/risk value for risk friendly preference (default: 1)
+        """
+
+        if objfkt.get_objective(objective=objective)[2]:
+            msg = 'Racing does not support 3d objective ' + str(objective)
+            raise AssertionError(msg)
+
+        self.path_front = path_front
+        self.objective = objective
+        self.conf_z = conf_z
+        self.stat_type = adamc.get_stat_type(objective=objective)
+        self.risk_factor = \
+            adamc.get_risk_factor(objective=objective,
+                                  risk_fac_av=risk_fac_av,
+                                  risk_fac_friendly=risk_fac_friendly)
+
+        #  Conservative fitness estimate (set, if race has been lost)
+        self.fitness_est = None
+
+    def calc_bounds(self, mc_analyze):
+        """
+        Calculate lower and upper confidence bounds of objective values
+
+        Parameters
+        ----------
+        mc_analyze : object
+            EcoMCRunAnalyze object of performed runs
+
+        Returns
+        -------
+        tup_bounds : tuple (of lists)
+            (list_lower, list_upper)
+        """
+
+        list_lower = []
+        list_upper = []
+
+        for array in adamc.get_obj_arrays(mc_analyze=mc_analyze,
+                                          objective=self.objective):
+            (stat, half_width) = \
+                adamc.calc_conf_half_width(array=array,
+                                           stat_type=self.stat_type,
+                                           risk_factor=self.risk_factor,
+                                           conf_z=self.conf_z)
+            list_lower.append(stat - half_width)
+            list_upper.append(stat + half_width)
+
+        return (list_lower, list_upper)
+
+    def __call__(self, mc_analyze, nb_used):
+        """
+        Stop criterion of adaptive MC runs
+
+        Parameters
+        ----------
+        mc_analyze : object
+            EcoMCRunAnalyze object of performed runs
+        nb_used : int
+            Number of performed MC runs
+
+        Returns
+        -------
+        stop : bool
+            True, if individuum is dominated by front with chosen confidence
+        """
+
+        array_front = load_front(path=self.path_front)
+
+        if array_front is None:
+            return False
+
+        (list_lower, list_upper) = self.calc_bounds(mc_analyze=mc_analyze)
+
+        if is_dominated(array_lower=list_lower, array_front=array_front):
+            self.fitness_est = tuple(list_upper)
+            return True
+
+        return False
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding surrogate model for pre-screening of offspring.
+
+A random forest regressor is trained on feature vectors of evaluated
+individuals (esys sizes per building and LHN connection flags) and their
+fitness values. Before evaluation of new offspring, fitness values and
+uncertainties (spread of tree predictions) are predicted. Offspring, whose
+optimistic prediction (lower confidence bound of minimized objectives) is
+still dominated by the current first pareto front, are skipped and get the
+pessimistic prediction as conservative fitness estimate (see racing.py).
+Promising and uncertain offspring are evaluated with eval_obj.
+"""
+from __future__ import division
+
+import numpy as np
+
+from sklearn.ensemble import RandomForestRegressor
+
+import pycity_resilience.ga.evaluate.racing as racing
+
+#  Energy system keys of individuum (per building)
+list_esys_keys = ['bat', 'boi', 'chp', 'eh', 'hp_aw', 'hp_ww', 'pv', 'tes']
+
+#  Fitness values with larger absolute values are penalty values of
+#  eval_obj (e.g. 10 ** 100) and are not used for training
+penalty_limit = 10 ** 90
+
+
+def get_build_ids(ind):
+    """
+    Returns sorted list of building ids of individuum
+
+    Parameters
+    ----------
+    ind : dict
+        Individuum dict
+
+    Returns
+    -------
+    list_build_ids : list (of ints)
+        Sorted list of building ids
+    """
+    return sorted([key for key in ind.keys() if key != 'lhn'])
+
+
+def encode_ind(ind, list_build_ids):
+    """
+    Encode individuum to feature vector (esys sizes of every building and
+    flag, if building is connected to LHN)
+
+    Parameters
+    ----------
+    ind : dict
+        Individuum dict
+    list_build_ids : list (of ints)
+        Sorted list of building ids
+
+    Returns
+    -------
+    array_feat : np.array
+        Feature vector of individuum
+    """
+
+    set_lhn_ids = set()
+    for list_sub in ind['lhn']:
+        set_lhn_ids.update(list_sub)
+
+    list_feat = []
+    for n in list_build_ids:
+        for key in list_esys_keys:
+            list_feat.append(float(ind[n][key]))
+        list_feat.append(float(n in set_lhn_ids))
+
+    return np.array(list_feat)
+
+
+class Surrogate(object):
+    def __init__(self, weights, min_train=100, max_train=5000,
+                 n_estimators=50, seed=None):
+        """
+        Constructor of surrogate model
+
+        Parameters
+        ----------
+        weights : tuple
+            Fitness weights of DEAP individuals (e.g. (-1.0, -1.0))
+        min_train : int, optional
+            Minimum number of training samples, before surrogate is used
+            (default: 100)
+        max_train : int, optional
+            Maximum number of training samples. If more samples exist, the
+            latest samples are used (default: 5000)
+        n_estimators : int, optional
+            Number of trees of random forest (default: 50)
+        seed : int, optional
+            Random seed of random forest (default: None)
+        """
+
+        self.weights = np.array(weights, dtype=float)
+        self.min_train = min_train
+        self.max_train = max_train
+        self.n_estimators = n_estimators
+        self.seed = seed
+
+        self.list_build_ids = None
+        self.list_feat = []
+        self.list_fitness = []
+
+        self.model = None
+        self.trained = False
+
+    def add_samples(self, list_ind, list_fitness):
+        """
+        Add evaluated individuals to training samples (penalty values are
+        excluded)
+
+        Parameters
+        ----------
+        list_ind : list
+            List of individuals
+        list_fitness : list (of tuples)
+            List of fitness values
+        """
+
+        for (ind, fitness) in zip(list_ind, list_fitness):
+            if np.any(np.abs(fitness) >= penalty_limit):
+                continue
+
+            if self.list_build_ids is None:
+                self.list_build_ids = get_build_ids(ind)
+
+            self.list_feat.append(encode_ind(ind=ind,
+                                             list_build_ids=
+                                             self.list_build_ids))
+            self.list_fitness.append(np.array(fitness, dtype=float))
+
+    def fit(self):
+        """
+        (Re-)train random forest with latest training samples (only, if
+        min. number of training samples exists)
+        """
+
+        if len(self.list_feat) < self.min_train:
+            return
+
+        matrix_feat = np.vstack(self.list_feat[-self.max_train:])
+        matrix_fit = np.vstack(self.list_fitness[-self.max_train:])
+
+        self.model = RandomForestRegressor(n_estimators=self.n_estimators,
+                                           random_state=self.seed)
+        self.model.fit(matrix_feat, matrix_fit)
+        self.trained = True
+
+    def predict(self, list_ind):
+        """
+        Predict fitness values and uncertainties of individuals
+
+        Parameters
+        ----------
+        list_ind : list
+            List of individuals
+
+        Returns
+        -------
+        tup_pred : tuple (of np.arrays)
+            (matrix_mean, matrix_std) with one row per individuum and one
+            column per objective. Std. is spread of tree predictions.
+        """
+
+        if not self.trained:
+            msg = 'Surrogate has not been trained, yet.'
+            raise AssertionError(msg)
+
+        matrix_feat = np.vstack([encode_ind(ind=ind,
+                                            list_build_ids=
+                                            self.list_build_ids)
+                                 for ind in list_ind])
+
+        array_trees = np.array([tree.predict(matrix_feat)
+                                for tree in self.model.estimators_])
+        array_trees = array_trees.reshape(len(self.model.estimators_),
+                                          len(list_ind), -1)
+
+        return (np.mean(array_trees, axis=0), np.std(array_trees, axis=0))
+
+    def prescreen(self, list_ind, list_front_fitness, conf_z=1.96):
+        """
+        Split offspring into individuals, which should be evaluated, and
+        individuals, which are dominated by front with chosen confidence
+
+        Parameters
+        ----------
+        list_ind : list
+            List of offspring individuals
+        list_front_fitness : list (of tuples)
+            List of fitness values of current first pareto front
+        conf_z : float, optional
+            Quantile of standard normal distribution of confidence level
+            of dominance (default: 1.96)
+
+        Returns
+        -------
+        tup_res : tuple
+            (list_ind_eval, list_ind_skip, matrix_pred_eval, list_fit_skip)
+            matrix_pred_eval holds predicted fitness values of
+            list_ind_eval, list_fit_skip the conservative fitness estimates
+            of list_ind_skip.
+        """
+
+        if len(list_ind) == 0:
+            return ([], [], np.zeros((0, len(self.weights))), [])
+
+        (matrix_mean, matrix_std) = self.predict(list_ind=list_ind)
+
+        #  Convert to minimization of all objectives
+        sign = -np.sign(self.weights)
+        array_front = np.array(list_front_fitness, dtype=float) * sign
+
+        list_ind_eval = []
+        list_idx_eval = []
+        list_ind_skip = []
+        list_fit_skip = []
+
+        for i in range(len(list_ind)):
+            array_mean = matrix_mean[i] * sign
+            array_lower = array_mean - conf_z * matrix_std[i]
+
+            if racing.is_dominated(array_lower=array_lower,
+                                   array_front=array_front):
+                array_upper = array_mean + conf_z * matrix_std[i]
+                list_ind_skip.append(list_ind[i])
+                list_fit_skip.append(tuple(array_upper * sign))
+            else:
+                list_ind_eval.append(list_ind[i])
+                list_idx_eval.append(i)
+
+        return (list_ind_eval, list_ind_skip, matrix_mean[list_idx_eval],
+                list_fit_skip)
+
+
+def calc_pred_error(matrix_pred, list_fitness):
+    """
+    Calculate mean relative prediction error per objective (penalty values
+    are excluded)
+
+    Parameters
+    ----------
+    matrix_pred : np.array
+        Predicted fitness values (one row per individuum)
+    list_fitness : list (of tuples)
+        List of evaluated fitness values
+
+    Returns
+    -------
+    array_error : np.array (or None)
+        Mean relative absolute error per objective. None, if no valid
+        fitness values exist.
+    """
+
+    list_idx = [i for i in range(len(list_fitness))
+                if np.all(np.abs(list_fitness[i]) < penalty_limit)]
+
+    if len(list_idx) == 0:
+        return None
+
+    matrix_fit = np.array([list_fitness[i] for i in list_idx], dtype=float)
+    matrix_pred = np.asarray(matrix_pred)[list_idx]
+
+    matrix_rel = np.abs(matrix_pred - matrix_fit) \
+                 / np.maximum(np.abs(matrix_fit), 10 ** -10)
+
+    return np.mean(matrix_rel, axis=0)
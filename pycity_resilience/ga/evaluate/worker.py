@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding worker-resident evaluation context for SCOOP and
+multiprocessing.Pool.
+
+Instead of binding the GA runner (city and McRunner) into the evaluate
+partial (and thus pickling it with every task), the master process saves
+the GA runner and the evaluation settings once to a pickle file. Every
+worker loads this file a single time and keeps the GA runner (and its
+reset-based evaluation context) in memory. Afterwards, each task only
+carries the individuum and returns the fitness tuple.
+
+Usage with multiprocessing:
+    pool = multiprocessing.Pool(processes=nb_processes,
+                                initializer=worker.init_worker,
+                                initargs=(path_setup,))
+
+Usage with SCOOP:
+    shared.setConst(path_worker_setup=path_setup)
+    (workers initialize themselves on their first task)
+"""
+from __future__ import division
+
+import pickle
+
+import pycity_resilience.ga.evaluate.eval as eval
+import pycity_resilience.ga.evaluate.eval_context as evalcon
+
+#  Name of SCOOP shared constant holding path to worker setup file
+scoop_const_name = 'path_worker_setup'
+
+#  Process-wide worker state
+_dict_worker = {'path': None, 'ga_runner': None, 'dict_eval_kwargs': None}
+
+
+def save_worker_setup(path, ga_runner, dict_eval_kwargs):
+    """
+    Save GA runner and evaluation settings to pickle file, which is loaded
+    by every worker process
+
+    Parameters
+    ----------
+    path : str
+        Path to pickle file
+    ga_runner : object
+        GA runner object of pyCity_resilience
+    dict_eval_kwargs : dict
+        Dict holding all keyword arguments of eval.eval_obj except
+        individuum and ga_runner (e.g. dict_restr, objective,
+        sampling_method...)
+    """
+
+    if 'individuum' in dict_eval_kwargs or 'ga_runner' in dict_eval_kwargs:
+        msg = 'dict_eval_kwargs must not hold individuum or ga_runner!'
+        raise AssertionError(msg)
+
+    with open(path, mode='wb') as file:
+        pickle.dump((ga_runner, dict_eval_kwargs), file,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+
+    _dict_worker['path'] = path
+
+
+def init_worker(path):
+    """
+    Initialize worker process (load GA runner and evaluation settings and
+    generate evaluation context). Can be used as initializer of
+    multiprocessing.Pool.
+
+    Parameters
+    ----------
+    path : str
+        Path to pickle file generated with save_worker_setup
+    """
+
+    with open(path, mode='rb') as file:
+        (ga_runner, dict_eval_kwargs) = pickle.load(file)
+
+    _dict_worker['path'] = path
+    _dict_worker['ga_runner'] = ga_runner
+    _dict_worker['dict_eval_kwargs'] = dict_eval_kwargs
+
+    #  Generate evaluation context (snapshot of initial city state)
+    evalcon.get_eval_context(ga_runner=ga_runner)
+
+
+def _get_scoop_setup_path():
+    """
+    Returns path to worker setup file shared via SCOOP constant (or None,
+    if SCOOP is not running or constant has not been set)
+
+    Returns
+    -------
+    path : str (or None)
+        Path to worker setup file
+    """
+
+    try:
+        from scoop import shared
+        return shared.getConst(scoop_const_name, timeout=60)
+    except Exception:
+        return None
+
+
+def is_initialized():
+    """
+    Returns True, if worker state has been loaded in current process
+
+    Returns
+    -------
+    is_init : bool
+        True, if worker has been initialized
+    """
+    return _dict_worker['ga_runner'] is not None
+
+
+def eval_ind(ind, **kwargs):
+    """
+    Evaluate individuum with worker-resident GA runner. Initializes worker
+    on first call, if necessary.
+
+    Parameters
+    ----------
+    ind : dict
+        Individuum dict
+    kwargs : dict, optional
+        Keyword arguments of eval.eval_obj, which overwrite saved evaluation
+        settings (e.g. nb_runs of current multi-fidelity stage)
+
+    Returns
+    -------
+    tuple_obj_fkt : tuple
+        Tuple holding objective function fitness values
+    """
+
+    if not is_initialized():
+        path = _dict_worker['path']
+        if path is None:
+            path = _get_scoop_setup_path()
+        if path is None:
+            msg = 'Worker has not been initialized and no path to worker ' \
+                  'setup file is known. Call init_worker() or share path ' \
+                  'via SCOOP constant ' + str(scoop_const_name) + '.'
+            raise AssertionError(msg)
+        init_worker(path=path)
+
+    dict_eval_kwargs = _dict_worker['dict_eval_kwargs']
+    if len(kwargs) > 0:
+        dict_eval_kwargs = dict(dict_eval_kwargs)
+        dict_eval_kwargs.update(kwargs)
+
+    return eval.eval_obj(individuum=ind,
+                         ga_runner=_dict_worker['ga_runner'],
+                         **dict_eval_kwargs)
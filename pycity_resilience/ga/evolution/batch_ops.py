@@ -0,0 +1,782 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding batched (vectorized) crossover and mutation operators.
+
+cx_tournament and do_mutate process one individuum dict at a time (Python
+loops, random.choice calls and deepcopies). The batch operators work on
+the whole population matrix of size indexes (nb. of individuals x nb. of
+buildings x nb. of esys keys, see genome.py) at once:
+- NSGA2 tournament selection with population wide front ranks and crowding
+  distances
+- crossover of single energy systems or complete building configurations
+  (same rules as crossover.do_crossover) with vectorized random draws
+- mutation of energy system sizes (same rules as
+  mutation_esys.mut_esys_val_single_build) and energy system
+  configurations (rules of esys_changes.py as lookup tables)
+
+Allowed sizes per building (e.g. boiler sizes larger than design heat load)
+are precomputed as choice tables, thus random draws are array operations.
+LHN mutations keep the per-individuum path (lhn_mutate function, e.g.
+do_mutate with LHN mutation, only).
+"""
+from __future__ import division
+
+import math
+import warnings
+import numpy as np
+
+from deap import tools
+
+import pycity_resilience.ga.parser.genome as genom
+import pycity_resilience.ga.evolution.helpers.mod_list_esys_sizes as modlist
+
+#  Column index per esys key in population matrix
+dict_key_idx = {}
+for _idx in range(len(genom.list_esys_keys)):
+    dict_key_idx[genom.list_esys_keys[_idx]] = _idx
+
+#  Thermal esys keys (single crossover requires existing systems)
+list_th_keys = ['chp', 'boi', 'hp_aw', 'hp_ww', 'eh', 'tes']
+
+#  Crossover combinations of do_crossover (index 0: complete building)
+list_cx_keys = [None, 'chp', 'boi', 'hp_aw', 'hp_ww', 'eh', 'bat', 'pv',
+                'tes']
+
+#  Energy system configuration rules of esys_changes.py
+#  option: ({esys key: choice table name or 0 (delete)}, delete bat, if no
+#  PV exists)
+dict_option_rules = {
+    'boi': ({'boi': 'boi_hl', 'chp': 0, 'hp_aw': 0, 'hp_ww': 0, 'eh': 0,
+             'tes': 0}, True),
+    'boi_tes': ({'boi': 'boi_hl', 'chp': 0, 'hp_aw': 0, 'hp_ww': 0, 'eh': 0,
+                 'tes': 'tes'}, True),
+    'chp_boi_tes': ({'boi': 'boi_chp', 'chp': 'chp_chp', 'hp_aw': 0,
+                     'hp_ww': 0, 'eh': 0, 'tes': 'tes_chp'}, False),
+    'chp_boi_eh_tes': ({'boi': 'boi_chp', 'chp': 'chp_chp', 'hp_aw': 0,
+                        'hp_ww': 0, 'eh': 'eh', 'tes': 'tes_chp'}, False),
+    'hp_aw_eh': ({'boi': 0, 'chp': 0, 'hp_aw': 'hp_aw_sh', 'hp_ww': 0,
+                  'eh': 'eh', 'tes': 'tes_hp'}, True),
+    'hp_ww_eh': ({'boi': 0, 'chp': 0, 'hp_aw': 0, 'hp_ww': 'hp_ww_sh',
+                  'eh': 'eh', 'tes': 'tes_hp'}, True),
+    'hp_aw_boi': ({'boi': 'boi', 'chp': 0, 'hp_aw': 'hp_aw', 'hp_ww': 0,
+                   'eh': 0, 'tes': 'tes'}, True),
+    'hp_ww_boi': ({'boi': 'boi', 'chp': 0, 'hp_aw': 0, 'hp_ww': 'hp_ww',
+                   'eh': 0, 'tes': 'tes'}, True),
+    'hp_aw_eh_boi': ({'boi': 'boi', 'chp': 0, 'hp_aw': 'hp_aw', 'hp_ww': 0,
+                      'eh': 'eh', 'tes': 'tes'}, True),
+    'hp_ww_eh_boi': ({'boi': 'boi', 'chp': 0, 'hp_aw': 0, 'hp_ww': 'hp_ww',
+                      'eh': 'eh', 'tes': 'tes'}, True),
+    'no_th_supply': ({'boi': 0, 'chp': 0, 'hp_aw': 0, 'hp_ww': 0, 'eh': 0,
+                      'tes': 0}, True),
+    'bat': ({}, False),
+    'pv': ({}, False)}
+
+#  Action codes of option lookup table
+act_keep = -1
+act_zero = -2
+
+
+def calc_rank_and_crowding(pop):
+    """
+    Returns pareto front rank and crowding distance of every individuum
+    (NSGA2 criteria)
+
+    Parameters
+    ----------
+    pop : list
+        List of individuals with valid fitness values
+
+    Returns
+    -------
+    tup_res : tuple
+        Tuple (array_rank, array_crowd) with front rank (0: first front) and
+        crowding distance per individuum
+    """
+
+    array_rank = np.zeros(len(pop), dtype=int)
+    array_crowd = np.zeros(len(pop))
+
+    dict_pos = {}
+    for i in range(len(pop)):
+        dict_pos[id(pop[i])] = i
+
+    list_fronts = tools.sortNondominated(pop, len(pop))
+
+    for rank in range(len(list_fronts)):
+        tools.emo.assignCrowdingDist(list_fronts[rank])
+        for ind in list_fronts[rank]:
+            array_rank[dict_pos[id(ind)]] = rank
+            array_crowd[dict_pos[id(ind)]] = ind.fitness.crowding_dist
+
+    return (array_rank, array_crowd)
+
+
+def select_tournament(array_rank, array_crowd, nb_pairs, nb_part=4):
+    """
+    Returns indexes of tournament winners (two best participants per
+    tournament, lower rank first, larger crowding distance second)
+
+    Parameters
+    ----------
+    array_rank : np.array (of ints)
+        Front rank per individuum
+    array_crowd : np.array (of floats)
+        Crowding distance per individuum
+    nb_pairs : int
+        Number of tournaments
+    nb_part : int, optional
+        Number of participants per tournament (default: 4)
+
+    Returns
+    -------
+    tup_res : tuple
+        Tuple (array_win1, array_win2) of individuum indexes
+    """
+
+    array_part = np.random.randint(0, len(array_rank),
+                                   size=(nb_pairs, nb_part))
+
+    array_order = np.lexsort((-array_crowd[array_part],
+                              array_rank[array_part]), axis=1)
+
+    array_rows = np.arange(nb_pairs)
+
+    return (array_part[array_rows, array_order[:, 0]],
+            array_part[array_rows, array_order[:, 1]])
+
+
+class BatchOperators(object):
+    def __init__(self, codec, dict_restr, dict_max_pv_area, pv_min,
+                 pv_step=1, dict_sh=None, dict_heatloads=None, prob_mut=0.3,
+                 list_prob_mute_type=[0.5, 0.5], list_options=None,
+                 list_opt_prob=None, list_lhn_opt=None, list_lhn_prob=None,
+                 use_bat=True, use_pv=True, add_pv_prop=0, add_bat_prob=0):
+        """
+        Constructor of batch operators (builds choice and option lookup
+        tables)
+
+        Parameters
+        ----------
+        codec : object
+            GenomeCodec object
+        dict_restr : dict
+            Dict holding possible energy system sizes
+        dict_max_pv_area : dict
+            Dict holding maximum usable PV area values in m2 per building
+        pv_min : float
+            Minimum possible PV area per building in m2
+        pv_step : float, optional
+            Defines discrete step of Pv sizing in m2 (default: 1)
+        dict_sh : dict, optional
+            Dictionary holding building node ids as keys and maximum space
+            heating power values in Watt as dict values (default: None). If
+            not None, used for size limitation.
+        dict_heatloads : dict, optional
+            Dict holding building ids as keys and design heat loads in Watt
+            as values (default: None)
+        prob_mut : float, optional
+            Probability of mutation of single energy system size
+            (default: 0.3)
+        list_prob_mute_type : list (of floats), optional
+            List holding probabilities for attribute change (index 0) and
+            attribute generation/deletion (index 1) (default: [0.5, 0.5])
+        list_options : list (of str), optional
+            List holding energy system options of stand-alone buildings
+            (default: None). If None, uses defaults of
+            mut_esys_config_single_build.
+        list_opt_prob : list (of floats), optional
+            List holding probability factors of list_options (default: None)
+        list_lhn_opt : list (of str), optional
+            List holding energy system options of LHN connected buildings
+            (default: None)
+        list_lhn_prob : list (of floats), optional
+            List holding probability factors of list_lhn_opt (default: None)
+        use_bat : bool, optional
+            Defines, if battery can be used (default: True)
+        use_pv : bool, optional
+            Defines, if PV can be used (default: True)
+        add_pv_prop : float, optional
+            Additional probability of PV being changed after configuration
+            change (default: 0)
+        add_bat_prob : float, optional
+            Additional probability of BAT being changed after configuration
+            change (default: 0)
+        """
+
+        assert abs(sum(list_prob_mute_type) - 1) < 0.0000000001
+        assert prob_mut >= 0
+        assert prob_mut <= 1
+        assert pv_step > 0
+
+        if list_options is None:
+            list_options = ['boi', 'boi_tes', 'chp_boi_tes',
+                            'chp_boi_eh_tes', 'hp_aw_eh', 'hp_ww_eh',
+                            'hp_aw_boi', 'hp_ww_boi', 'hp_aw_eh_boi',
+                            'hp_ww_eh_boi', 'bat', 'pv']
+        if list_opt_prob is None:
+            list_opt_prob = [0.1, 0.1, 0.2, 0.05, 0.1, 0.1, 0.05, 0.05, 0.05,
+                             0.05, 0.05, 0.1]
+        if list_lhn_opt is None:
+            list_lhn_opt = ['chp_boi_tes', 'chp_boi_eh_tes',
+                            'bat', 'pv', 'no_th_supply']
+        if list_lhn_prob is None:
+            list_lhn_prob = [0.1, 0.05, 0.05, 0.2, 0.6]
+
+        assert len(list_options) == len(list_opt_prob)
+        assert len(list_lhn_opt) == len(list_lhn_prob)
+        assert abs(sum(list_opt_prob) - 1) < 0.0000001
+        assert abs(sum(list_lhn_prob) - 1) < 0.0000001
+
+        for option in list_options + list_lhn_opt:
+            if option not in dict_option_rules:
+                msg = 'Unknown energy system option ' + str(option) + '.'
+                raise AssertionError(msg)
+
+        if use_pv is False:
+            add_pv_prop = 0
+        if use_bat is False:
+            add_bat_prob = 0
+
+        self.codec = codec
+        self.prob_mut = prob_mut
+        self.list_prob_mute_type = list_prob_mute_type
+        self.use_bat = use_bat
+        self.use_pv = use_pv
+        self.add_pv_prop = add_pv_prop
+        self.add_bat_prob = add_bat_prob
+
+        list_build_ids = codec.list_build_ids
+
+        #  Choice tables (sizes per building)
+        #  #################################################################
+        use_sh_hl = dict_sh is not None and dict_heatloads is not None
+
+        dict_tes_chp = None
+        dict_tes_hp = None
+        if use_sh_hl:
+            dict_tes_chp = dict((n, 500) for n in list_build_ids)
+        if dict_sh is not None:
+            dict_tes_hp = dict((n, 300) for n in list_build_ids)
+
+        #  name: (esys key, 'min' or 'max' filter, reference dict or None)
+        dict_specs = {'boi': ('boi', 'min', None),
+                      'boi_hl': ('boi', 'min', dict_heatloads),
+                      'boi_chp': ('boi', 'min',
+                                  dict_heatloads if use_sh_hl else None),
+                      'val_boi': ('boi', 'min',
+                                  dict_heatloads if dict_sh is not None
+                                  else None),
+                      'chp': ('chp', 'max', None),
+                      'chp_chp': ('chp', 'max',
+                                  dict_sh if use_sh_hl else None),
+                      'val_chp': ('chp', 'max', dict_sh),
+                      'hp_aw': ('hp_aw', 'min', None),
+                      'hp_aw_sh': ('hp_aw', 'min', dict_sh),
+                      'hp_ww': ('hp_ww', 'min', None),
+                      'hp_ww_sh': ('hp_ww', 'min', dict_sh),
+                      'eh': ('eh', 'min', None),
+                      'tes': ('tes', 'min', None),
+                      'tes_chp': ('tes', 'min', dict_tes_chp),
+                      'tes_hp': ('tes', 'min', dict_tes_hp),
+                      'bat': ('bat', 'min', None)}
+
+        self._dict_tables = {}
+
+        for name in dict_specs:
+            (key, mode, dict_ref) = dict_specs[name]
+
+            list_list_val = []
+            for n in list_build_ids:
+                list_val = sorted(dict_restr[key])
+                if dict_ref is not None:
+                    if mode == 'min':
+                        list_val = modlist.get_list_values_larger_than_ref(
+                            list_val=list_val, ref_val=dict_ref[n])
+                    else:
+                        list_val = modlist.get_list_values_smaller_than_ref(
+                            list_val=list_val, ref_val=dict_ref[n])
+                list_list_val.append(list_val)
+
+            self._dict_tables[name] = self._gen_table(key=key,
+                                                      list_list_val=
+                                                      list_list_val)
+
+        #  PV areas (see esys_changes.gen_or_del_pv)
+        list_list_val = []
+        for n in list_build_ids:
+            min_ref = round(pv_min, 0)
+            max_ref = math.ceil(dict_max_pv_area[n])
+
+            if max_ref > min_ref:
+                list_val = list(np.arange(start=min_ref, stop=max_ref,
+                                          step=pv_step))
+            elif max_ref == min_ref:
+                list_val = [min_ref + 0.0]
+            else:
+                list_val = [0]
+            list_list_val.append(list_val)
+
+        self._dict_tables['pv'] = self._gen_table(key='pv',
+                                                  list_list_val=list_list_val)
+
+        #  Option lookup tables
+        #  #################################################################
+        self.list_opt_names = sorted(set(list_options + list_lhn_opt))
+        self.list_table_names = sorted(self._dict_tables.keys())
+
+        nb_opt = len(self.list_opt_names)
+
+        #  Action per option and esys key (act_keep, act_zero or index of
+        #  choice table in list_table_names)
+        self.array_action = np.full((nb_opt, len(genom.list_esys_keys)),
+                                    act_keep, dtype=int)
+        self.array_del_bat = np.zeros(nb_opt, dtype=bool)
+        self.array_toggle_bat = np.zeros(nb_opt, dtype=bool)
+        self.array_toggle_pv = np.zeros(nb_opt, dtype=bool)
+
+        for o in range(nb_opt):
+            option = self.list_opt_names[o]
+            (dict_rules, del_bat) = dict_option_rules[option]
+
+            for key in dict_rules:
+                if dict_rules[key] == 0:
+                    self.array_action[o, dict_key_idx[key]] = act_zero
+                else:
+                    self.array_action[o, dict_key_idx[key]] = \
+                        self.list_table_names.index(dict_rules[key])
+
+            self.array_del_bat[o] = del_bat
+            self.array_toggle_bat[o] = option == 'bat' and use_bat
+            self.array_toggle_pv[o] = option == 'pv' and use_pv
+
+        #  Option indexes and cumulated probabilities
+        self.array_opt_sa = np.array([self.list_opt_names.index(option)
+                                      for option in list_options])
+        self.array_cum_sa = np.cumsum(list_opt_prob)
+        self.array_opt_lhn = np.array([self.list_opt_names.index(option)
+                                       for option in list_lhn_opt])
+        self.array_cum_lhn = np.cumsum(list_lhn_prob)
+
+        self.idx_opt_pv = None
+        if 'pv' in self.list_opt_names:
+            self.idx_opt_pv = self.list_opt_names.index('pv')
+
+    def _gen_table(self, key, list_list_val):
+        """
+        Returns choice table (padded matrix of value indexes per building and
+        number of choices per building)
+
+        Parameters
+        ----------
+        key : str
+            Esys key
+        list_list_val : list (of lists)
+            List of allowed sizes per building (building order of codec)
+
+        Returns
+        -------
+        tup_table : tuple
+            Tuple (array_table, array_len)
+        """
+
+        key_idx = dict_key_idx[key]
+
+        max_len = max(len(list_val) for list_val in list_list_val)
+
+        array_table = np.zeros((len(list_list_val), max_len), dtype=np.int16)
+        array_len = np.zeros(len(list_list_val), dtype=int)
+
+        for b in range(len(list_list_val)):
+            for j in range(len(list_list_val[b])):
+                array_table[b, j] = self.codec.get_idx(
+                    key_idx=key_idx, value=list_list_val[b][j])
+            array_len[b] = len(list_list_val[b])
+
+        return (array_table, array_len)
+
+    def draw(self, name, array_build):
+        """
+        Returns random value indexes of choice table
+
+        Parameters
+        ----------
+        name : str
+            Name of choice table (e.g. 'boi_hl')
+        array_build : np.array (of ints)
+            Building index per draw
+
+        Returns
+        -------
+        array_idx : np.array (of ints)
+            Value indexes (codec) per draw
+        """
+
+        (array_table, array_len) = self._dict_tables[name]
+
+        array_pos = (np.random.random(len(array_build))
+                     * array_len[array_build]).astype(int)
+
+        return array_table[array_build, array_pos]
+
+    def _set(self, esys, mask, key, name):
+        """
+        Draw new sizes of choice table name for esys key at masked positions
+        """
+        (array_i, array_b) = np.nonzero(mask)
+        esys[array_i, array_b, dict_key_idx[key]] = \
+            self.draw(name=name, array_build=array_b)
+
+    def _toggle_bat(self, esys, mask):
+        """
+        Generate (if CHP or PV exists) or delete battery at masked positions
+        """
+        has_bat = esys[:, :, dict_key_idx['bat']] > 0
+        has_chp_pv = ((esys[:, :, dict_key_idx['chp']] > 0)
+                      | (esys[:, :, dict_key_idx['pv']] > 0))
+
+        esys[:, :, dict_key_idx['bat']][mask & has_bat] = 0
+        self._set(esys=esys, mask=mask & ~has_bat & has_chp_pv, key='bat',
+                  name='bat')
+
+    def _toggle_pv(self, esys, mask):
+        """
+        Generate or delete PV at masked positions
+        """
+        has_pv = esys[:, :, dict_key_idx['pv']] > 0
+
+        esys[:, :, dict_key_idx['pv']][mask & has_pv] = 0
+        self._set(esys=esys, mask=mask & ~has_pv, key='pv', name='pv')
+
+    def mutate_values(self, esys, mask):
+        """
+        Mutate sizes of existing energy systems (rules of
+        mutation_esys.mut_esys_val_single_build) in place
+
+        Parameters
+        ----------
+        esys : np.array (of ints)
+            Population matrix (nb. of individuals x nb. of buildings x nb. of
+            esys keys)
+        mask : np.array (of bools)
+            Mask (nb. of individuals x nb. of buildings) of buildings, which
+            should be mutated
+        """
+
+        def has(key):
+            return esys[:, :, dict_key_idx[key]] > 0
+
+        #  Existence of systems is not changed (conditions are fixed)
+        has_boi = has('boi')
+        has_chp = has('chp')
+        has_hp_aw = has('hp_aw')
+        has_hp_ww = has('hp_ww')
+
+        list_mut = [('boi', 'val_boi', has_boi),
+                    ('chp', 'val_chp', has_chp & ~has_hp_aw & ~has_hp_ww),
+                    ('hp_aw', 'hp_aw_sh', has_hp_aw & ~has_hp_ww & ~has_chp),
+                    ('hp_ww', 'hp_ww_sh', has_hp_ww & ~has_hp_aw & ~has_chp),
+                    ('eh', 'eh', has('eh')),
+                    ('tes', 'tes', has('tes') & (has_boi | has_chp
+                                                 | has_hp_aw | has_hp_ww)),
+                    ('pv', 'pv', has('pv')),
+                    ('bat', 'bat', has('bat'))]
+
+        for (key, name, mask_cond) in list_mut:
+            mask_mut = mask & mask_cond \
+                       & (np.random.random(mask.shape) < self.prob_mut)
+            self._set(esys=esys, mask=mask_mut, key=key, name=name)
+
+    def mutate_configs(self, esys, lhn, mask):
+        """
+        Change energy system configurations (rules of esys_changes.py as
+        lookup tables) in place
+
+        Parameters
+        ----------
+        esys : np.array (of ints)
+            Population matrix (nb. of individuals x nb. of buildings x nb. of
+            esys keys)
+        lhn : np.array (of ints)
+            LHN membership matrix (nb. of individuals x nb. of buildings)
+        mask : np.array (of bools)
+            Mask (nb. of individuals x nb. of buildings) of buildings, which
+            should be mutated
+        """
+
+        #  Draw options (stand-alone and LHN options)
+        array_rand = np.random.random(mask.shape)
+
+        idx_sa = np.minimum(np.searchsorted(self.array_cum_sa, array_rand,
+                                            side='right'),
+                            len(self.array_opt_sa) - 1)
+        idx_lhn = np.minimum(np.searchsorted(self.array_cum_lhn, array_rand,
+                                             side='right'),
+                             len(self.array_opt_lhn) - 1)
+
+        array_opt = np.where(lhn > 0, self.array_opt_lhn[idx_lhn],
+                             self.array_opt_sa[idx_sa])
+
+        for o in range(len(self.list_opt_names)):
+            mask_opt = mask & (array_opt == o)
+            if not np.any(mask_opt):
+                continue
+
+            for k in range(len(genom.list_esys_keys)):
+                action = self.array_action[o, k]
+                if action == act_zero:
+                    esys[:, :, k][mask_opt] = 0
+                elif action != act_keep:
+                    self._set(esys=esys, mask=mask_opt,
+                              key=genom.list_esys_keys[k],
+                              name=self.list_table_names[action])
+
+            if self.array_del_bat[o]:
+                esys[:, :, dict_key_idx['bat']][
+                    mask_opt & (esys[:, :, dict_key_idx['pv']] == 0)] = 0
+
+            if self.array_toggle_bat[o]:
+                self._toggle_bat(esys=esys, mask=mask_opt)
+
+            if self.array_toggle_pv[o]:
+                self._toggle_pv(esys=esys, mask=mask_opt)
+
+        #  Additional chance to change PV (if PV has not been changed)
+        if self.add_pv_prop > 0:
+            mask_pv = mask \
+                      & (np.random.random(mask.shape) < self.add_pv_prop)
+            if self.idx_opt_pv is not None:
+                mask_pv &= array_opt != self.idx_opt_pv
+            self._toggle_pv(esys=esys, mask=mask_pv)
+
+        #  Additional chance to change BAT
+        if self.add_bat_prob > 0:
+            mask_bat = mask \
+                       & (np.random.random(mask.shape) < self.add_bat_prob)
+            self._toggle_bat(esys=esys, mask=mask_bat)
+
+    def mutate(self, esys, lhn):
+        """
+        Mutate energy systems of all buildings of all individuals in place
+        (per building: size or configuration change with
+        list_prob_mute_type)
+
+        Parameters
+        ----------
+        esys : np.array (of ints)
+            Population matrix (nb. of individuals x nb. of buildings x nb. of
+            esys keys)
+        lhn : np.array (of ints)
+            LHN membership matrix (nb. of individuals x nb. of buildings)
+        """
+
+        mask_val = np.random.random(lhn.shape) < self.list_prob_mute_type[0]
+
+        self.mutate_values(esys=esys, mask=mask_val)
+        self.mutate_configs(esys=esys, lhn=lhn, mask=~mask_val)
+
+    def crossover(self, esys1, esys2, max_tries=20):
+        """
+        Crossover of energy systems of pairs of individuals in place (rules
+        of crossover.do_crossover). Per pair, either all energy systems of
+        a building or a single energy system are exchanged between random
+        buildings.
+
+        Parameters
+        ----------
+        esys1 : np.array (of ints)
+            Population matrix of first individuals of pairs
+        esys2 : np.array (of ints)
+            Population matrix of second individuals of pairs
+        max_tries : int, optional
+            Max. number of tries per pair (default: 20)
+
+        Returns
+        -------
+        array_done : np.array (of bools)
+            True per pair, if crossover has been applied
+        """
+
+        nb_pairs = esys1.shape[0]
+        nb_build = esys1.shape[1]
+
+        array_key = np.array([-1 if key is None else dict_key_idx[key]
+                              for key in list_cx_keys])
+        array_is_th = np.array([key in list_th_keys for key in list_cx_keys])
+
+        array_done = np.zeros(nb_pairs, dtype=bool)
+
+        for i in range(max_tries):
+            array_pend = np.flatnonzero(~array_done)
+            if len(array_pend) == 0:
+                break
+
+            nb_pend = len(array_pend)
+
+            array_cx = np.random.randint(0, len(list_cx_keys), size=nb_pend)
+            array_n1 = np.random.randint(0, nb_build, size=nb_pend)
+            array_n2 = np.random.randint(0, nb_build, size=nb_pend)
+
+            build1 = esys1[array_pend, array_n1].copy()
+            build2 = esys2[array_pend, array_n2].copy()
+
+            #  Complete building configuration
+            is_full = array_cx == 0
+            ok_full = is_full & np.any(build1 != build2, axis=1)
+
+            #  Single energy system
+            array_k = np.maximum(array_key[array_cx], 0)
+            array_rows = np.arange(nb_pend)
+            val1 = build1[array_rows, array_k]
+            val2 = build2[array_rows, array_k]
+
+            ok_single = ~is_full & (val1 != val2) \
+                        & (~array_is_th[array_cx] | ((val1 > 0) & (val2 > 0)))
+
+            esys1[array_pend[ok_full], array_n1[ok_full]] = build2[ok_full]
+            esys2[array_pend[ok_full], array_n2[ok_full]] = build1[ok_full]
+
+            esys1[array_pend[ok_single], array_n1[ok_single],
+                  array_k[ok_single]] = val2[ok_single]
+            esys2[array_pend[ok_single], array_n2[ok_single],
+                  array_k[ok_single]] = val1[ok_single]
+
+            array_done[array_pend[ok_full | ok_single]] = True
+
+        if not np.all(array_done):
+            msg = 'Crossover aborted for ' + str(np.sum(~array_done)) \
+                  + ' pairs (reached more than ' + str(max_tries) + ' tries).'
+            warnings.warn(msg)
+
+        return array_done
+
+    def encode_population(self, pop):
+        """
+        Returns population matrix and LHN membership matrix of individuals
+
+        Parameters
+        ----------
+        pop : list
+            List of individuum dicts (ind)
+
+        Returns
+        -------
+        tup_res : tuple
+            Tuple (esys, lhn) with population matrix (nb. of individuals x
+            nb. of buildings x nb. of esys keys) and LHN membership matrix
+            (nb. of individuals x nb. of buildings)
+        """
+
+        list_genome = [self.codec.encode(ind) for ind in pop]
+
+        return (np.array([genome.esys for genome in list_genome]),
+                np.array([genome.lhn for genome in list_genome]))
+
+    def gen_offspring(self, pop, ind_class, prob_cx, prob_mutation,
+                      nb_part=4, list_prob_lhn_and_esys=[0.4, 0.3, 0.3],
+                      lhn_mutate=None, check_ind=None):
+        """
+        Generate offspring with batched tournament selection, crossover and
+        mutation (replacement of cx_tournament and do_mutate calls)
+
+        Parameters
+        ----------
+        pop : list
+            List of individuum dicts (ind) with valid fitness values (not
+            modified)
+        ind_class : class
+            Individuum class (e.g. creator.Individual)
+        prob_cx : float
+            Probability of crossover being applied
+        prob_mutation : float
+            Probability that mutation is applied
+        nb_part : int, optional
+            Number of individuums which take part in single tournament
+            (default: 4)
+        list_prob_lhn_and_esys : list (of floats), optional
+            List holding probabilities for LHN and esys mutation (index 0),
+            LHN mutation (index 1) and single energy system mutation
+            (index 2) (default: [0.4, 0.3, 0.3])
+        lhn_mutate : function, optional
+            Function, which takes and returns individuum dict and performs
+            LHN mutation (default: None). If None, LHN is not mutated.
+        check_ind : function, optional
+            Function, which checks (and corrects) mutated/crossovered
+            individuum dict in place (default: None), e.g.
+            check_validity.run_all_checks
+
+        Returns
+        -------
+        offspring : list
+            List of individuals (ind_class). Individuals without crossover
+            and mutation keep fitness values of parents.
+        """
+
+        assert abs(sum(list_prob_lhn_and_esys) - 1) < 0.0000000001
+
+        (esys, lhn) = self.encode_population(pop)
+
+        nb_pairs = int(round(len(pop) / 2))
+
+        #  Selection
+        (array_rank, array_crowd) = calc_rank_and_crowding(pop)
+        (array_win1, array_win2) = \
+            select_tournament(array_rank=array_rank, array_crowd=array_crowd,
+                              nb_pairs=nb_pairs, nb_part=nb_part)
+
+        #  Crossover
+        esys1 = esys[array_win1]
+        esys2 = esys[array_win2]
+
+        array_cx = np.random.random(nb_pairs) < prob_cx
+
+        esys1_cx = esys1[array_cx]
+        esys2_cx = esys2[array_cx]
+        self.crossover(esys1=esys1_cx, esys2=esys2_cx)
+        esys1[array_cx] = esys1_cx
+        esys2[array_cx] = esys2_cx
+
+        esys_off = np.concatenate((esys1, esys2))
+        lhn_off = np.concatenate((lhn[array_win1], lhn[array_win2]))
+        array_parent = np.concatenate((array_win1, array_win2))
+        array_mod = np.concatenate((array_cx, array_cx))
+
+        #  Mutation
+        array_mut = np.random.random(len(esys_off)) < prob_mutation
+        array_mod |= array_mut
+
+        array_type = np.random.choice(3, size=len(esys_off),
+                                      p=list_prob_lhn_and_esys)
+        if lhn_mutate is None:
+            #  Energy system mutation, only
+            array_type[:] = 2
+
+        #  LHN mutation (per individuum)
+        for i in np.flatnonzero(array_mut & (array_type <= 1)):
+            genome = genom.Genome(codec=self.codec, esys=esys_off[i],
+                                  lhn=lhn_off[i])
+            genome_mut = self.codec.encode(lhn_mutate(genome.to_dict()))
+            esys_off[i] = genome_mut.esys
+            lhn_off[i] = genome_mut.lhn
+
+        #  Energy system mutation (batched)
+        array_esys_mut = array_mut & (array_type != 1)
+        esys_mut = esys_off[array_esys_mut]
+        self.mutate(esys=esys_mut, lhn=lhn_off[array_esys_mut])
+        esys_off[array_esys_mut] = esys_mut
+
+        offspring = []
+        for i in range(len(esys_off)):
+            genome = genom.Genome(codec=self.codec, esys=esys_off[i],
+                                  lhn=lhn_off[i])
+            ind = ind_class(genome.to_dict())
+
+            if array_mod[i]:
+                if check_ind is not None:
+                    check_ind(ind)
+            else:
+                ind.fitness.values = pop[array_parent[i]].fitness.values
+
+            offspring.append(ind)
+
+        return offspring
@@ -20,7 +20,8 @@ from deap import tools
 def do_crossover(ind1, ind2, dict_max_pv_area, dict_restr=None,
                  list_cx_combis=None, do_copy=True, perform_checks=True,
                  dict_sh=None, pv_min=None, pv_step=1, use_pv=False,
-                 add_pv_prop=0, prevent_boi_lhn=True, dict_heatloads=None):
+                 add_pv_prop=0, prevent_boi_lhn=True, dict_heatloads=None,
+                 dirty_checks=False):
     """
     Executes a two-point crossover on the input
     individuals. The two individuals are modified in place and both keep
@@ -77,6 +78,10 @@ def do_crossover(ind1, ind2, dict_max_pv_area, dict_restr=None,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    dirty_checks : bool, optional
+        If True, only crossovered buildings (and their LHN subnetworks) are
+        checked (default: False). Same result as complete check, if ind1
+        and ind2 fulfill all constraints (see check_validity.run_dirty_checks)
 
     Returns
     -------
@@ -105,6 +110,10 @@ def do_crossover(ind1, ind2, dict_max_pv_area, dict_restr=None,
     cx_not_done = True
     counter = 0
 
+    #  Buildings with changed energy systems
+    list_dirty_1 = []
+    list_dirty_2 = []
+
     #  Try to crossover until crossover was applied
     while cx_not_done:
 
@@ -127,6 +136,8 @@ def do_crossover(ind1, ind2, dict_max_pv_area, dict_restr=None,
                     ind1[node1][key], ind2[node2][key] = ind2[node2][key], \
                                                          ind1[node1][key]
                     cx_not_done = False
+                    list_dirty_1.append(node1)
+                    list_dirty_2.append(node2)
         else:
             # Single value Crossover: Only switch one value
             # get str from list
@@ -145,6 +156,8 @@ def do_crossover(ind1, ind2, dict_max_pv_area, dict_restr=None,
                                                                  ind1[node1][
                                                                      key]
                             cx_not_done = False
+                            list_dirty_1.append(node1)
+                            list_dirty_2.append(node2)
 
             elif key == 'bat' or key == 'pv':
                 # crossover bat or pv
@@ -154,6 +167,8 @@ def do_crossover(ind1, ind2, dict_max_pv_area, dict_restr=None,
                     ind1[node1][key], ind2[node2][key] = ind2[node2][key], \
                                                          ind1[node1][key]
                     cx_not_done = False
+                    list_dirty_1.append(node1)
+                    list_dirty_2.append(node2)
 
         counter += 1
         if counter >= 20:
@@ -165,7 +180,22 @@ def do_crossover(ind1, ind2, dict_max_pv_area, dict_restr=None,
     # Check configuration
     #  #############################################################
 
-    if perform_checks:
+    if perform_checks and dirty_checks:
+        checkval.run_dirty_checks(ind=ind1, dict_max_pv_area=dict_max_pv_area,
+                                  list_dirty_ids=list_dirty_1,
+                                  dict_restr=dict_restr, dict_sh=dict_sh,
+                                  pv_min=pv_min, pv_step=pv_step,
+                                  use_pv=use_pv, add_pv_prop=add_pv_prop,
+                                  prevent_boi_lhn=prevent_boi_lhn,
+                                  dict_heatloads=dict_heatloads)
+        checkval.run_dirty_checks(ind=ind2, dict_max_pv_area=dict_max_pv_area,
+                                  list_dirty_ids=list_dirty_2,
+                                  dict_restr=dict_restr, dict_sh=dict_sh,
+                                  pv_min=pv_min, pv_step=pv_step,
+                                  use_pv=use_pv, add_pv_prop=add_pv_prop,
+                                  prevent_boi_lhn=prevent_boi_lhn,
+                                  dict_heatloads=dict_heatloads)
+    elif perform_checks:
         checkval.run_all_checks(ind=ind1, dict_max_pv_area=dict_max_pv_area,
                                 dict_restr=dict_restr, dict_sh=dict_sh,
                                 pv_min=pv_min, pv_step=pv_step, use_pv=use_pv,
@@ -187,7 +217,8 @@ def do_crossover(ind1, ind2, dict_max_pv_area, dict_restr=None,
 def cx_tournament(pop, prob_cx, dict_max_pv_area, dict_restr, nb_part=4,
                   perform_checks=True, dict_sh=None,
                   pv_min=None, pv_step=1, use_pv=False, add_pv_prop=0,
-                  prevent_boi_lhn=True, dict_heatloads=None):
+                  prevent_boi_lhn=True, dict_heatloads=None,
+                  dirty_checks=False, nb_offspring=None):
     """
     Performs crossover on individuusm, which have been selected by selNSGA2
     tournament.
@@ -232,6 +263,13 @@ def cx_tournament(pop, prob_cx, dict_max_pv_area, dict_restr, nb_part=4,
 	dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    dirty_checks : bool, optional
+        If True, only crossovered buildings are checked (default: False).
+        Requires valid individuums in pop (see do_crossover)
+    nb_offspring : int, optional
+        Number of offspring individuums (default: None). If None, number
+        of individuums in pop is used. Odd numbers are rounded up (pairs of
+        individuums), e.g. for few free workers of steady-state GA loop.
 
     Returns
     -------
@@ -239,9 +277,14 @@ def cx_tournament(pop, prob_cx, dict_max_pv_area, dict_restr, nb_part=4,
         List of individuum dicts (ind) / population
     """
 
+    if nb_offspring is None:
+        nb_pairs = int(round(len(pop) / 2))
+    else:
+        nb_pairs = (nb_offspring + 1) // 2
+
     offspring = []
 
-    for i in range(int(round(len(pop) / 2))):
+    for i in range(nb_pairs):
 
         #  Randomly select participants
         list_participants = np.random.choice(pop, size=nb_part)
@@ -263,7 +306,8 @@ def cx_tournament(pop, prob_cx, dict_max_pv_area, dict_restr, nb_part=4,
                                       use_pv=use_pv,
                                       add_pv_prop=add_pv_prop,
                                       prevent_boi_lhn=prevent_boi_lhn,
-                                      dict_heatloads=dict_heatloads
+                                      dict_heatloads=dict_heatloads,
+                                      dirty_checks=dirty_checks
                                       )
 
             #  Delete old fitness values
@@ -38,8 +38,8 @@ def gen_boiler_only(ind, n, dict_restr, dict_heatloads=None):
     if dict_heatloads is not None:
         #  Boiler
         list_boi_choice = \
-            modlist.get_list_values_larger_than_ref(
-                list_val=dict_restr['boi'],
+            modlist.get_range_larger_than_ref(
+                dict_restr=dict_restr, key='boi',
                 ref_val=dict_heatloads[n])
     else:
         list_boi_choice = dict_restr['boi']
@@ -79,8 +79,8 @@ def gen_boi_tes(ind, n, dict_restr, dict_heatloads=None):
     if dict_heatloads is not None:
         #  Boiler
         list_boi_choice = \
-            modlist.get_list_values_larger_than_ref(
-                list_val=dict_restr['boi'],
+            modlist.get_range_larger_than_ref(
+                dict_restr=dict_restr, key='boi',
                 ref_val=dict_heatloads[n])
     else:
         list_boi_choice = dict_restr['boi']
@@ -133,16 +133,16 @@ def gen_chp_boi_tes(ind, n, dict_restr, dict_sh=None, to_lhn=False,
     if dict_sh is not None and to_lhn is False and dict_heatloads is not None:
         #  Boiler
         list_boi_choice = \
-            modlist.get_list_values_larger_than_ref(list_val=dict_restr['boi'],
-                                            ref_val=dict_heatloads[n])
+            modlist.get_range_larger_than_ref(dict_restr=dict_restr, key='boi',
+                                              ref_val=dict_heatloads[n])
         #  CHP
         list_chp_choice = modlist. \
-            get_list_values_smaller_than_ref(list_val=dict_restr['chp'],
-                                             ref_val=dict_sh[n])
+            get_range_smaller_than_ref(dict_restr=dict_restr, key='chp',
+                                       ref_val=dict_sh[n])
         #  TES
         list_tes_choice = modlist.\
-            get_list_values_larger_than_ref(list_val=dict_restr['tes'],
-                                            ref_val=500)
+            get_range_larger_than_ref(dict_restr=dict_restr, key='tes',
+                                      ref_val=500)
     else:
         list_boi_choice = dict_restr['boi']
         list_chp_choice = dict_restr['chp']
@@ -220,16 +220,16 @@ def gen_chp_boi_eh_tes(ind, n, dict_restr, dict_sh=None, sh_power_min=None,
     if dict_sh is not None and dict_heatloads is not None:
         #  Boiler
         list_boi_choice = \
-            modlist.get_list_values_larger_than_ref(list_val=dict_restr['boi'],
-                                            ref_val=dict_heatloads[n])
+            modlist.get_range_larger_than_ref(dict_restr=dict_restr, key='boi',
+                                              ref_val=dict_heatloads[n])
         #  CHP
         list_chp_choice = modlist. \
-            get_list_values_smaller_than_ref(list_val=dict_restr['chp'],
-                                             ref_val=dict_sh[n])
+            get_range_smaller_than_ref(dict_restr=dict_restr, key='chp',
+                                       ref_val=dict_sh[n])
         #  TES
         list_tes_choice = modlist.\
-            get_list_values_larger_than_ref(list_val=dict_restr['tes'],
-                                            ref_val=500)
+            get_range_larger_than_ref(dict_restr=dict_restr, key='tes',
+                                      ref_val=500)
     else:
         list_boi_choice = dict_restr['boi']
         list_chp_choice = dict_restr['chp']
@@ -298,12 +298,12 @@ def gen_hp_aw_eh(ind, n, dict_restr, dict_sh=None):
     if dict_sh is not None:
         #  Air/water heat pump
         list_hp_aw_choice = modlist. \
-            get_list_values_larger_than_ref(list_val=dict_restr['hp_aw'],
-                                            ref_val=dict_sh[n])
+            get_range_larger_than_ref(dict_restr=dict_restr, key='hp_aw',
+                                      ref_val=dict_sh[n])
         #  TES
         list_tes_choice = modlist. \
-            get_list_values_larger_than_ref(list_val=dict_restr['tes'],
-                                            ref_val=300)
+            get_range_larger_than_ref(dict_restr=dict_restr, key='tes',
+                                      ref_val=300)
     else:
         list_hp_aw_choice = dict_restr['hp_aw']
         list_tes_choice = dict_restr['tes']
@@ -344,12 +344,12 @@ def gen_hp_ww_eh(ind, n, dict_restr, dict_sh=None):
     if dict_sh is not None:
         #  water/water heat pump
         list_hp_ww_choice = modlist. \
-            get_list_values_larger_than_ref(list_val=dict_restr['hp_ww'],
-                                            ref_val=dict_sh[n])
+            get_range_larger_than_ref(dict_restr=dict_restr, key='hp_ww',
+                                      ref_val=dict_sh[n])
         #  TES
         list_tes_choice = modlist. \
-            get_list_values_larger_than_ref(list_val=dict_restr['tes'],
-                                            ref_val=300)
+            get_range_larger_than_ref(dict_restr=dict_restr, key='tes',
+                                      ref_val=300)
     else:
         list_hp_ww_choice = dict_restr['hp_ww']
         list_tes_choice = dict_restr['tes']
@@ -1,10 +1,18 @@
 #!/usr/bin/env python
 # coding=utf-8
 """
+Script holding restrictions of energy system size lists.
 
+get_list_values_larger_than_ref/get_list_values_smaller_than_ref return new
+lists. SizeTable holds sorted sizes of single esys type and returns
+SizeRange objects (index range of table) via bisect. SizeRange can be used
+like a list (e.g. random.choice(size_range) is an O(1) index draw).
+SizeTables is dict_restr with precomputed SizeTable per esys type.
 """
 from __future__ import division
 
+import bisect
+import random
 import warnings
 import copy
 
@@ -75,6 +83,233 @@ def get_list_values_smaller_than_ref(list_val, ref_val):
     return list_smaller
 
 
+class SizeRange(object):
+    __slots__ = ('list_val', 'start', 'stop')
+
+    def __init__(self, list_val, start, stop):
+        """
+        Constructor of size range (view on sorted size list)
+
+        Parameters
+        ----------
+        list_val : list (of floats)
+            Sorted list of sizes
+        start : int
+            First index of range
+        stop : int
+            Index after last index of range
+        """
+        self.list_val = list_val
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError('SizeRange index out of range')
+        return self.list_val[self.start + idx]
+
+    def __iter__(self):
+        for i in range(self.start, self.stop):
+            yield self.list_val[i]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def choice(self):
+        """
+        Returns random size of range (same as random.choice(size_range))
+
+        Returns
+        -------
+        size : float
+            Random size
+        """
+        return self.list_val[random.randrange(self.start, self.stop)]
+
+
+class SizeTable(object):
+    def __init__(self, list_val):
+        """
+        Constructor of size table
+
+        Parameters
+        ----------
+        list_val : list (of floats)
+            List of sizes
+        """
+
+        if len(list_val) == 0:
+            msg = 'list_val of SizeTable is empty.'
+            raise AssertionError(msg)
+
+        self.list_val = sorted(list_val)
+
+    def get_range(self):
+        """
+        Returns range of all sizes
+
+        Returns
+        -------
+        size_range : object
+            SizeRange object
+        """
+        return SizeRange(self.list_val, 0, len(self.list_val))
+
+    def get_range_larger_than_ref(self, ref_val):
+        """
+        Returns range of sizes, which are larger than or equal to ref_val
+        (largest size, if no size is large enough)
+
+        Parameters
+        ----------
+        ref_val : float
+            Reference value, which defines lower bound for search
+
+        Returns
+        -------
+        size_range : object
+            SizeRange object
+        """
+
+        start = bisect.bisect_left(self.list_val, ref_val)
+
+        if start == len(self.list_val):
+            msg = 'list_larger is empty list. Thus, going to use largest ' \
+                  'values of original list list_val.'
+            warnings.warn(msg)
+            start -= 1
+
+        return SizeRange(self.list_val, start, len(self.list_val))
+
+    def get_range_smaller_than_ref(self, ref_val):
+        """
+        Returns range of sizes, which are smaller than or equal to ref_val
+        (smallest size, if no size is small enough)
+
+        Parameters
+        ----------
+        ref_val : float
+            Reference value, which defines upper bound for search
+
+        Returns
+        -------
+        size_range : object
+            SizeRange object
+        """
+
+        stop = bisect.bisect_right(self.list_val, ref_val)
+
+        if stop == 0:
+            msg = 'list_smaller is empty list. Thus, going to use smallest ' \
+                  'values of original list list_val.'
+            warnings.warn(msg)
+            stop = 1
+
+        return SizeRange(self.list_val, 0, stop)
+
+
+class SizeTables(dict):
+    def __init__(self, dict_restr):
+        """
+        Constructor of dict_restr with precomputed size tables (can be used
+        as dict_restr everywhere)
+
+        Parameters
+        ----------
+        dict_restr : dict
+            Dict holding possible energy system sizes
+        """
+
+        dict.__init__(self, dict_restr)
+
+        self.dict_tables = {}
+        for key in dict_restr:
+            self.dict_tables[key] = SizeTable(list_val=dict_restr[key])
+
+
+def get_size_table(dict_restr, key):
+    """
+    Returns size table of esys type (precomputed, if dict_restr is
+    SizeTables object)
+
+    Parameters
+    ----------
+    dict_restr : dict
+        Dict holding possible energy system sizes
+    key : str
+        Esys type (e.g. 'boi')
+
+    Returns
+    -------
+    size_table : object
+        SizeTable object
+    """
+
+    if isinstance(dict_restr, SizeTables):
+        return dict_restr.dict_tables[key]
+
+    return SizeTable(list_val=dict_restr[key])
+
+
+def get_range_larger_than_ref(dict_restr, key, ref_val):
+    """
+    Returns range of sizes of esys type, which are larger than or equal to
+    ref_val (same values as get_list_values_larger_than_ref for sorted
+    size lists)
+
+    Parameters
+    ----------
+    dict_restr : dict
+        Dict holding possible energy system sizes
+    key : str
+        Esys type (e.g. 'boi')
+    ref_val : float
+        Reference value, which defines lower bound for search
+
+    Returns
+    -------
+    size_range : object
+        SizeRange object
+    """
+    return get_size_table(dict_restr=dict_restr,
+                          key=key).get_range_larger_than_ref(ref_val=ref_val)
+
+
+def get_range_smaller_than_ref(dict_restr, key, ref_val):
+    """
+    Returns range of sizes of esys type, which are smaller than or equal to
+    ref_val (same values as get_list_values_smaller_than_ref for sorted
+    size lists)
+
+    Parameters
+    ----------
+    dict_restr : dict
+        Dict holding possible energy system sizes
+    key : str
+        Esys type (e.g. 'chp')
+    ref_val : float
+        Reference value, which defines upper bound for search
+
+    Returns
+    -------
+    size_range : object
+        SizeRange object
+    """
+    return get_size_table(dict_restr=dict_restr,
+                          key=key).get_range_smaller_than_ref(ref_val=ref_val)
+
+
 if __name__ == '__main__':
     list_input = [1, 2, 3, 4, 5, 6, 7, 8]
     ref_val = 2.5
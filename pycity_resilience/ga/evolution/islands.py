@@ -0,0 +1,445 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding island-model GA runner.
+
+Instead of a single (large) population, the population is split into
+nb_islands sub-populations (islands). Every island evolves in its own
+process with its own multiprocessing pool (subset of worker processes),
+using crossover, mutate, select and evaluate of the toolbox of opt_ga.py.
+Every mig_interval generations, each island sends copies of its best
+individuals (NSGA2 selection) to its target islands (migration topology)
+and inserts all received immigrants into its population (NSGA2 based
+selection of toolbox.select). Migration uses multiprocessing queues
+(no external services). Islands do not wait for migrants (asynchronous).
+
+Island processes are forked (Linux), thus toolbox, creator types and
+statistics objects of the master process are inherited and not pickled.
+"""
+from __future__ import division
+
+import os
+import sys
+import copy
+import queue
+import random
+import pickle
+import numpy as np
+import multiprocessing
+
+from deap import tools
+
+import pycity_resilience.ga.evolution.steady_state as steady
+
+#  Possible migration topologies
+list_topologies = ['ring', 'full', 'random']
+
+
+def get_targets(island_id, nb_islands, topology='ring'):
+    """
+    Returns list of target islands of migration
+
+    Parameters
+    ----------
+    island_id : int
+        Id of sending island (0 to nb_islands - 1)
+    nb_islands : int
+        Number of islands
+    topology : str, optional
+        Migration topology (default: 'ring')
+        Options:
+        'ring': Send migrants to next island
+        'full': Send migrants to all other islands
+        'random': Send migrants to randomly chosen other island
+
+    Returns
+    -------
+    list_targets : list (of ints)
+        List of target island ids
+    """
+
+    if topology not in list_topologies:
+        msg = 'Unknown migration topology ' + str(topology) + '. Options: ' \
+              + str(list_topologies)
+        raise AssertionError(msg)
+
+    list_others = [i for i in range(nb_islands) if i != island_id]
+
+    if len(list_others) == 0:
+        return []
+
+    if topology == 'ring':
+        return [(island_id + 1) % nb_islands]
+    elif topology == 'full':
+        return list_others
+    elif topology == 'random':
+        return [random.choice(list_others)]
+
+
+def select_migrants(pop, nb_migrants):
+    """
+    Returns copies of best individuals of population (NSGA2 selection)
+
+    Parameters
+    ----------
+    pop : list
+        List of individuum dicts (ind) / population (not modified)
+    nb_migrants : int
+        Number of migrants
+
+    Returns
+    -------
+    list_migrants : list
+        List of copied individuum dicts (ind)
+    """
+
+    nb_migrants = min(nb_migrants, len(pop))
+
+    return [copy.deepcopy(ind) for ind in tools.selNSGA2(pop, nb_migrants)]
+
+
+def receive_migrants(inbox, pop):
+    """
+    Returns all migrants of inbox (without blocking), which are not part of
+    population, yet
+
+    Parameters
+    ----------
+    inbox : object
+        multiprocessing Queue of island
+    pop : list
+        List of individuum dicts (ind) / population of island
+
+    Returns
+    -------
+    list_immigrants : list
+        List of new individuum dicts (ind) with valid fitness values
+    """
+
+    list_immigrants = []
+
+    while True:
+        try:
+            (source_id, list_migrants) = inbox.get_nowait()
+        except queue.Empty:
+            break
+
+        for ind in list_migrants:
+            if ind not in pop and ind not in list_immigrants:
+                list_immigrants.append(ind)
+
+    return list_immigrants
+
+
+def evolve_generation(pop, toolbox, nb_ind, prob_mutation, objective):
+    """
+    Perform single generation of island (crossover, mutation, evaluation
+    and selection)
+
+    Parameters
+    ----------
+    pop : list
+        List of individuum dicts (ind) / evaluated population of island
+    toolbox : object
+        Toolbox object of deap (with crossover, mutate, evaluate, select
+        and map function)
+    nb_ind : int
+        Number of individuals of island population
+    prob_mutation : float
+        Probability that mutation is applied
+    objective : str
+        Objective function (see select.do_selection)
+
+    Returns
+    -------
+    tup_res : tuple
+        Tuple (pop_new, nb_evals) with new population and number of
+        evaluated individuals
+    """
+
+    list_ind = steady.gen_offspring(pop=pop, toolbox=toolbox,
+                                    nb_offspring=len(pop),
+                                    prob_mutation=prob_mutation)
+
+    fitnesses = list(toolbox.map(toolbox.evaluate, list_ind))
+
+    for ind, fit in zip(list_ind, fitnesses):
+        ind.fitness.values = fit
+
+    pop_new = toolbox.select(parents=pop, invalid_ind=list_ind,
+                             nb_ind=nb_ind, objective=objective)
+
+    return (pop_new, len(list_ind))
+
+
+def run_island(island_id, pop, toolbox, ngen, prob_mutation, objective,
+               mig_interval, nb_migrants, topology, list_inbox, queue_res,
+               nb_processes=1, pool_initializer=None, pool_initargs=(),
+               stats=None, seed=None, path_log=None, folder_pop=None):
+    """
+    Run GA on single island (target function of island process)
+
+    Parameters
+    ----------
+    island_id : int
+        Id of island
+    pop : list
+        List of individuum dicts (ind) / evaluated start population of
+        island
+    toolbox : object
+        Toolbox object of deap (with crossover, mutate, evaluate and select
+        function)
+    ngen : int
+        Number of generations
+    prob_mutation : float
+        Probability that mutation is applied
+    objective : str
+        Objective function (see select.do_selection)
+    mig_interval : int
+        Number of generations between migrations
+    nb_migrants : int
+        Number of migrants per migration and target island
+    topology : str
+        Migration topology (see get_targets)
+    list_inbox : list
+        List of multiprocessing Queues (inbox per island)
+    queue_res : object
+        multiprocessing Queue to return results to master process
+    nb_processes : int, optional
+        Number of worker processes of island (default: 1). If 1, individuals
+        are evaluated within island process.
+    pool_initializer : function, optional
+        Initializer of worker processes (default: None), e.g.
+        worker.init_worker
+    pool_initargs : tuple, optional
+        Arguments of pool_initializer (default: ())
+    stats : object, optional
+        Statistics object of deap (default: None). If not None, statistics
+        are recorded to logbook of island.
+    seed : int, optional
+        Seed of island (default: None). If None, random seed is used.
+    path_log : str, optional
+        Path to log file of island (default: None)
+    folder_pop : str, optional
+        Path to folder to save island populations per generation as pickle
+        files (default: None). If None, populations are not saved.
+    """
+
+    #  Forked islands inherit random state of master process
+    random.seed(seed)
+    np.random.seed(seed)
+
+    if path_log is not None:
+        sys.stdout = open(path_log, mode='w')
+
+    #  Trailing migrants of finished islands are discarded
+    for inbox in list_inbox:
+        inbox.cancel_join_thread()
+
+    nb_ind = len(pop)
+    inbox = list_inbox[island_id]
+
+    pool = None
+    if nb_processes > 1:
+        pool = multiprocessing.Pool(processes=nb_processes,
+                                    initializer=pool_initializer,
+                                    initargs=pool_initargs)
+        toolbox.register('map', pool.map)
+    else:
+        if pool_initializer is not None:
+            pool_initializer(*pool_initargs)
+        toolbox.register('map', map)
+
+    logbook = tools.Logbook()
+    nb_immigrants = 0
+
+    try:
+        for g in range(ngen):
+            (pop, nb_evals) = \
+                evolve_generation(pop=pop, toolbox=toolbox, nb_ind=nb_ind,
+                                  prob_mutation=prob_mutation,
+                                  objective=objective)
+
+            if mig_interval > 0 and (g + 1) % mig_interval == 0:
+                #  Send copies of best individuals to target islands
+                list_migrants = select_migrants(pop=pop,
+                                                nb_migrants=nb_migrants)
+                for target in get_targets(island_id=island_id,
+                                          nb_islands=len(list_inbox),
+                                          topology=topology):
+                    list_inbox[target].put((island_id, list_migrants))
+
+                #  Insert immigrants of other islands
+                list_immigrants = receive_migrants(inbox=inbox, pop=pop)
+                if len(list_immigrants) > 0:
+                    pop = toolbox.select(parents=pop,
+                                         invalid_ind=list_immigrants,
+                                         nb_ind=nb_ind, objective=objective)
+                nb_immigrants += len(list_immigrants)
+
+                print('Island ', island_id, ': Received immigrants: ',
+                      len(list_immigrants))
+
+            if stats is not None:
+                logbook.record(gen=g, evals=nb_evals, **stats.compile(pop))
+
+            print('Island ', island_id, ' generation ', g, ':')
+            for ind in pop:
+                print(ind, 'fitness: ', ind.fitness.values)
+            print()
+
+            if folder_pop is not None:
+                name_pop = 'population_island_' + str(island_id) + '_' \
+                           + str(g) + '.pkl'
+                pickle.dump(pop, open(os.path.join(folder_pop, name_pop),
+                                      mode='wb'))
+
+            sys.stdout.flush()
+
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    queue_res.put((island_id, pop, logbook, nb_immigrants))
+
+
+def run_islands(pop, toolbox, nb_islands, ngen, prob_mutation, objective,
+                mig_interval=10, nb_migrants=5, topology='ring',
+                nb_processes=1, pool_initializer=None, pool_initargs=(),
+                stats=None, seed=None, folder_log=None, folder_pop=None):
+    """
+    Perform island-model GA run (one process per island). Requires fork
+    start method of multiprocessing (Linux).
+
+    Parameters
+    ----------
+    pop : list
+        List of individuum dicts (ind) / evaluated start population, which
+        is split into nb_islands island populations
+    toolbox : object
+        Toolbox object of deap (with crossover, mutate, evaluate and select
+        function)
+    nb_islands : int
+        Number of islands
+    ngen : int
+        Number of generations per island
+    prob_mutation : float
+        Probability that mutation is applied
+    objective : str
+        Objective function (see select.do_selection)
+    mig_interval : int, optional
+        Number of generations between migrations (default: 10). If 0, no
+        migration is performed.
+    nb_migrants : int, optional
+        Number of migrants per migration and target island (default: 5)
+    topology : str, optional
+        Migration topology (default: 'ring'). Options: 'ring', 'full',
+        'random' (see get_targets)
+    nb_processes : int, optional
+        Total number of worker processes (default: 1), which are split
+        between islands (at least one per island)
+    pool_initializer : function, optional
+        Initializer of worker processes (default: None), e.g.
+        worker.init_worker
+    pool_initargs : tuple, optional
+        Arguments of pool_initializer (default: ())
+    stats : object, optional
+        Statistics object of deap (default: None)
+    seed : int, optional
+        Seed (default: None). If not None, island i uses seed + i.
+    folder_log : str, optional
+        Path to folder to save log file per island (default: None)
+    folder_pop : str, optional
+        Path to folder to save island populations (default: None)
+
+    Returns
+    -------
+    tup_res : tuple
+        Tuple (list_pop, list_logbook, list_nb_immigrants) with final
+        population, logbook and number of received immigrants per island
+    """
+
+    if nb_islands < 1:
+        msg = 'nb_islands has to be larger than zero.'
+        raise AssertionError(msg)
+
+    if len(pop) < 2 * nb_islands:
+        msg = 'Population (' + str(len(pop)) + ' individuals) is too ' \
+              'small for ' + str(nb_islands) + ' islands.'
+        raise AssertionError(msg)
+
+    #  Check topology
+    get_targets(island_id=0, nb_islands=nb_islands, topology=topology)
+
+    ctx = multiprocessing.get_context('fork')
+
+    list_inbox = [ctx.Queue() for i in range(nb_islands)]
+    queue_res = ctx.Queue()
+
+    nb_proc_island = max(1, nb_processes // nb_islands)
+
+    list_proc = []
+    for i in range(nb_islands):
+        if seed is None:
+            seed_island = None
+        else:
+            seed_island = seed + i
+
+        if folder_log is not None:
+            path_log = os.path.join(folder_log,
+                                    'log_island_' + str(i) + '.txt')
+        else:
+            path_log = None
+
+        proc = ctx.Process(target=run_island,
+                           kwargs={'island_id': i,
+                                   'pop': pop[i::nb_islands],
+                                   'toolbox': toolbox,
+                                   'ngen': ngen,
+                                   'prob_mutation': prob_mutation,
+                                   'objective': objective,
+                                   'mig_interval': mig_interval,
+                                   'nb_migrants': nb_migrants,
+                                   'topology': topology,
+                                   'list_inbox': list_inbox,
+                                   'queue_res': queue_res,
+                                   'nb_processes': nb_proc_island,
+                                   'pool_initializer': pool_initializer,
+                                   'pool_initargs': pool_initargs,
+                                   'stats': stats,
+                                   'seed': seed_island,
+                                   'path_log': path_log,
+                                   'folder_pop': folder_pop})
+        proc.start()
+        list_proc.append(proc)
+
+    list_pop = [None] * nb_islands
+    list_logbook = [None] * nb_islands
+    list_nb_immigrants = [None] * nb_islands
+
+    #  Collect results before joining (results are sent via queue)
+    nb_res = 0
+    while nb_res < nb_islands:
+        try:
+            (island_id, pop_island, logbook, nb_immigrants) = \
+                queue_res.get(timeout=1)
+        except queue.Empty:
+            for proc in list_proc:
+                if proc.exitcode is not None and proc.exitcode != 0:
+                    for proc_term in list_proc:
+                        proc_term.terminate()
+                    msg = 'Island process failed with exit code ' \
+                          + str(proc.exitcode) + '.'
+                    raise AssertionError(msg)
+            continue
+
+        nb_res += 1
+        list_pop[island_id] = pop_island
+        list_logbook[island_id] = logbook
+        list_nb_immigrants[island_id] = nb_immigrants
+
+    for proc in list_proc:
+        proc.join()
+
+    return (list_pop, list_logbook, list_nb_immigrants)
@@ -23,7 +23,7 @@ import pycity_resilience.ga.clustering.cluster as clust
 def add_lhn_all_build(ind, dict_restr, pv_min, dict_max_pv_area,
                       prob_feed=[0.7, 0.3], dict_sh=None, add_pv_prop=0,
                       add_bat_prob=0,
-                      dict_heatloads=None):
+                      dict_heatloads=None, lhn_index=None):
     """
     Add LHN to all buildings with one or multiple feeder nodes
 
@@ -57,6 +57,9 @@ def add_lhn_all_build(ind, dict_restr, pv_min, dict_max_pv_area,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
 
     #  Get list with building ids (delete key 'lhn')
@@ -65,6 +68,9 @@ def add_lhn_all_build(ind, dict_restr, pv_min, dict_max_pv_area,
     #  Add single LHN to all building nodes
     ind['lhn'] = [copy.copy(list_ids)]
 
+    if lhn_index is not None:
+        lhn_index.rebuild(ind=ind)
+
     #  Add, at least, one feeder node. Set other thermal
     #  supply systems to zero
     select_single_or_multi = \
@@ -80,7 +86,8 @@ def add_lhn_all_build(ind, dict_restr, pv_min, dict_max_pv_area,
                           list_possible_feed=list_possible_feed,
                           other_no_th_sup=True, dict_sh=dict_sh,
                           add_pv_prop=add_pv_prop, add_bat_prob=add_bat_prob,
-                          dict_heatloads=dict_heatloads)
+                          dict_heatloads=dict_heatloads,
+                          lhn_index=lhn_index)
 
     elif select_single_or_multi == 'multi':
         #  Add multiple feeder nodes
@@ -90,14 +97,15 @@ def add_lhn_all_build(ind, dict_restr, pv_min, dict_max_pv_area,
                              other_no_th_sup=True,
                              dict_sh=dict_sh, add_pv_prop=add_pv_prop,
                              add_bat_prob=add_bat_prob,
-                             dict_heatloads=dict_heatloads)
+                             dict_heatloads=dict_heatloads,
+                             lhn_index=lhn_index)
 
 
 def del_lhn(ind, dict_restr, pv_min, dict_max_pv_area,
             prob_del=[0.7, 0.3], list_options=None,
             list_lhn_to_stand_alone=None, dict_sh=None,
             add_pv_prop=0, add_bat_prob=0,
-            dict_heatloads=None):
+            dict_heatloads=None, lhn_index=None):
     """
     Delete single or multiple LHN systems in ind.
 
@@ -141,6 +149,9 @@ def del_lhn(ind, dict_restr, pv_min, dict_max_pv_area,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
     if list_options is None:
         list_options = ['boi', 'boi_tes', 'chp_boi_tes', 'chp_boi_eh_tes',
@@ -166,6 +177,9 @@ def del_lhn(ind, dict_restr, pv_min, dict_max_pv_area,
         #  Only one LHN
         prob_del = [1, 0]
 
+    if lhn_index is None:
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
     # Delete, at least, one LHN. Set other thermal
     #  supply systems to zero
     select_single_or_multi = \
@@ -181,7 +195,7 @@ def del_lhn(ind, dict_restr, pv_min, dict_max_pv_area,
         list_new_esys = copy.copy(ind['lhn'][idx_lhn])
 
         #  Delete list by index
-        del ind['lhn'][idx_lhn]
+        lhn_index.del_sublhn(ind=ind, idx_lhn=idx_lhn)
 
     elif select_single_or_multi == 'multi':
 
@@ -209,7 +223,7 @@ def del_lhn(ind, dict_restr, pv_min, dict_max_pv_area,
         # Delete lists by index (sort to prevent index "changes")
         for idx in sorted(list_idx_del, reverse=True):
             # Delete LHN list by index
-            del ind['lhn'][idx]
+            lhn_index.del_sublhn(ind=ind, idx_lhn=idx)
 
     if list_options is None:
         list_options = ['boi', 'boi_tes', 'chp_boi_tes', 'chp_boi_eh_tes',
@@ -229,13 +243,14 @@ def del_lhn(ind, dict_restr, pv_min, dict_max_pv_area,
                                          dict_sh=dict_sh,
                                          add_pv_prop=add_pv_prop,
                                          add_bat_prob=add_bat_prob,
-                                         dict_heatloads=dict_heatloads)
+                                         dict_heatloads=dict_heatloads,
+                                         lhn_index=lhn_index)
 
 
 def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
             list_prob_lhn=[0.5, 0.5], max_dist=None, prob_feed=[0.7, 0.3],
             prob_gen_method=[0.5, 0.3, 0.2], dict_sh=None, add_pv_prop=0,
-            add_bat_prob=0, dict_heatloads=None):
+            add_bat_prob=0, dict_heatloads=None, lhn_index=None):
     """
     Add single or multiple LHN systems to
 
@@ -283,13 +298,19 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
 
     #  Get list of building node ids
     list_build_ids = analyse.get_build_ids_ind(ind=ind)
 
+    if lhn_index is None:
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
     #  Get list of all buildings, which are already connected to LHN(s)
-    list_lhn_ids = findlhn.get_all_lhn_ids(ind=ind)
+    list_lhn_ids = findlhn.get_all_lhn_ids(ind=ind, lhn_index=lhn_index)
 
     #  Check if, at least, two nodes are available for LHN generation
     #  Otherwise, warn user and leave function
@@ -319,7 +340,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                            prob_feed=prob_feed,
                            dict_sh=dict_sh, add_pv_prop=add_pv_prop,
                            add_bat_prob=add_bat_prob,
-                           dict_heatloads=dict_heatloads)
+                           dict_heatloads=dict_heatloads,
+                           lhn_index=lhn_index)
 
         elif select_method == 'kmeans':
 
@@ -339,7 +361,9 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
             # Use kmeans algorithm to generate LHN
             dict_clusters = clust. \
                 kmeans_clustering(dict_pos=dict_pos, list_av_ids=list_av_ids,
-                                  nb_clusters=nb_clusters)
+                                  nb_clusters=nb_clusters,
+                                  seed=random.randint(
+                                      0, clust.nb_cache_seeds - 1))
 
             #  If kmeans could not find a solution, exit function
             if dict_clusters is None:  # pragma: no cover
@@ -354,7 +378,7 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
             list_lhn_new = dict_clusters[idx_new]
 
             #  Add lists as single LHN
-            ind['lhn'].append(list_lhn_new)
+            lhn_index.add_sublhn(ind=ind, list_sublhn=list_lhn_new)
 
             #  Add single or multi feeders
 
@@ -372,7 +396,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                   other_no_th_sup=True, dict_sh=dict_sh,
                                   add_pv_prop=add_pv_prop,
                                   add_bat_prob=add_bat_prob,
-                                  dict_heatloads=dict_heatloads
+                                  dict_heatloads=dict_heatloads,
+                                  lhn_index=lhn_index
                                   )
 
             elif select_single_or_multi == 'multi':
@@ -385,7 +410,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                      dict_sh=dict_sh,
                                      add_pv_prop=add_pv_prop,
                                      add_bat_prob=add_bat_prob,
-                                     dict_heatloads=dict_heatloads
+                                     dict_heatloads=dict_heatloads,
+                                     lhn_index=lhn_index
                                      )
 
         elif select_method == 'meanshift':
@@ -411,7 +437,7 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
             list_lhn_new = dict_clusters[idx_new]
 
             #  Add lists as single LHN
-            ind['lhn'].append(list_lhn_new)
+            lhn_index.add_sublhn(ind=ind, list_sublhn=list_lhn_new)
 
             #  Add single or multi feeders
 
@@ -429,7 +455,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                   other_no_th_sup=True, dict_sh=dict_sh,
                                   add_pv_prop=add_pv_prop,
                                   add_bat_prob=add_bat_prob,
-                                  dict_heatloads=dict_heatloads
+                                  dict_heatloads=dict_heatloads,
+                                  lhn_index=lhn_index
                                   )
 
             elif select_single_or_multi == 'multi':
@@ -442,7 +469,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                      dict_sh=dict_sh,
                                      add_pv_prop=add_pv_prop,
                                      add_bat_prob=add_bat_prob,
-                                     dict_heatloads=dict_heatloads
+                                     dict_heatloads=dict_heatloads,
+                                     lhn_index=lhn_index
                                      )
 
     elif select_single_or_multi == 'multi':
@@ -475,7 +503,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                prob_feed=prob_feed,
                                dict_sh=dict_sh, add_pv_prop=add_pv_prop,
                                add_bat_prob=add_bat_prob,
-                               dict_heatloads=dict_heatloads)
+                               dict_heatloads=dict_heatloads,
+                               lhn_index=lhn_index)
 
         elif select_method == 'kmeans':
 
@@ -495,7 +524,9 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
             # Use kmeans algorithm to generate LHN
             dict_clusters = clust. \
                 kmeans_clustering(dict_pos=dict_pos, list_av_ids=list_av_ids,
-                                  nb_clusters=nb_clusters)
+                                  nb_clusters=nb_clusters,
+                                  seed=random.randint(
+                                      0, clust.nb_cache_seeds - 1))
 
             #  If kmeans could not find a solution, exit function
             if dict_clusters is None:  # pragma: no cover
@@ -508,7 +539,7 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                 list_sublhn = dict_clusters[key]
 
                 #  Add lists as single LHN
-                ind['lhn'].append(list_sublhn)
+                lhn_index.add_sublhn(ind=ind, list_sublhn=list_sublhn)
 
                 #  Add single or multi feeders
 
@@ -526,7 +557,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                       other_no_th_sup=True, dict_sh=dict_sh,
                                       add_pv_prop=add_pv_prop,
                                       add_bat_prob=add_bat_prob,
-                                      dict_heatloads=dict_heatloads
+                                      dict_heatloads=dict_heatloads,
+                                      lhn_index=lhn_index
                                       )
 
                 elif select_single_or_multi == 'multi':
@@ -539,7 +571,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                          dict_sh=dict_sh,
                                          add_pv_prop=add_pv_prop,
                                          add_bat_prob=add_bat_prob,
-                                         dict_heatloads=dict_heatloads
+                                         dict_heatloads=dict_heatloads,
+                                         lhn_index=lhn_index
                                          )
 
         elif select_method == 'meanshift':
@@ -563,7 +596,7 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                 list_sublhn = dict_clusters[key]
 
                 #  Add lists as single LHN
-                ind['lhn'].append(list_sublhn)
+                lhn_index.add_sublhn(ind=ind, list_sublhn=list_sublhn)
 
                 #  Add single or multi feeders
 
@@ -582,7 +615,8 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                       dict_sh=dict_sh,
                                       add_pv_prop=add_pv_prop,
                                       add_bat_prob=add_bat_prob,
-                                      dict_heatloads=dict_heatloads
+                                      dict_heatloads=dict_heatloads,
+                                      lhn_index=lhn_index
                                       )
 
                 elif select_single_or_multi == 'multi':
@@ -595,14 +629,15 @@ def add_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                                          dict_sh=dict_sh,
                                          add_pv_prop=add_pv_prop,
                                          add_bat_prob=add_bat_prob,
-                                         dict_heatloads=dict_heatloads
+                                         dict_heatloads=dict_heatloads,
+                                         lhn_index=lhn_index
                                          )
 
 
 def add_single_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                    max_dist=None, prob_feed=[0.7, 0.3], dict_sh=None,
                    add_pv_prop=0, add_bat_prob=0,
-                   dict_heatloads=None):
+                   dict_heatloads=None, lhn_index=None):
     """
     Tries to add single LHN to ind dict. If not enough nodes are left or
     LHN systems would cross, exits function.
@@ -643,6 +678,9 @@ def add_single_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
 
     assert abs(sum(prob_feed) - 1) < 0.000000001
@@ -650,8 +688,11 @@ def add_single_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
     #  Get list of building node ids
     list_build_ids = analyse.get_build_ids_ind(ind=ind)
 
+    if lhn_index is None:
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
     #  Get list of all buildings, which are already connected to LHN(s)
-    list_lhn_ids = findlhn.get_all_lhn_ids(ind=ind)
+    list_lhn_ids = findlhn.get_all_lhn_ids(ind=ind, lhn_index=lhn_index)
 
     #  Check if, at least, two nodes are available for LHN generation
     #  Otherwise, warn user and leave function
@@ -695,7 +736,7 @@ def add_single_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
     list_new_lhn.append(start_id)
 
     # Add list of new LHN nodes to ind['lhn']
-    ind['lhn'].append(list_new_lhn)
+    lhn_index.add_sublhn(ind=ind, list_sublhn=list_new_lhn)
 
     #  Add single or multi feeders
 
@@ -711,7 +752,8 @@ def add_single_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                           list_possible_feed=list_new_lhn,
                           other_no_th_sup=True, dict_sh=dict_sh,
                           add_pv_prop=add_pv_prop, add_bat_prob=add_bat_prob,
-                          dict_heatloads=dict_heatloads)
+                          dict_heatloads=dict_heatloads,
+                          lhn_index=lhn_index)
 
     elif select_single_or_multi == 'multi':
         #  Add multiple feeder nodes
@@ -721,13 +763,14 @@ def add_single_lhn(ind, dict_restr, pv_min, dict_max_pv_area, dict_pos,
                              other_no_th_sup=True,
                              dict_sh=dict_sh, add_pv_prop=add_pv_prop,
                              add_bat_prob=add_bat_prob,
-                             dict_heatloads=dict_heatloads)
+                             dict_heatloads=dict_heatloads,
+                             lhn_index=lhn_index)
 
 
 def add_single_feeder(ind, dict_restr, pv_min, dict_max_pv_area,
                       list_possible_feed, other_no_th_sup=False,
                       dict_sh=None, add_pv_prop=0, add_bat_prob=0,
-                      dict_heatloads=None):
+                      dict_heatloads=None, lhn_index=None):
     """
     Add single feeder building to LHN. Set all other nodes within
     list_possible_feed to no thermal supply.
@@ -764,6 +807,9 @@ def add_single_feeder(ind, dict_restr, pv_min, dict_max_pv_area,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
 
     #  Take first index of ind['lhn'], as it is a list of lists
@@ -796,7 +842,8 @@ def add_single_feeder(ind, dict_restr, pv_min, dict_max_pv_area,
                                             sh_power_min=sh_power_min,
                                             add_pv_prop=add_pv_prop,
                                             add_bat_prob=add_bat_prob,
-                                            dict_heatloads=dict_heatloads
+                                            dict_heatloads=dict_heatloads,
+                                            lhn_index=lhn_index
                                             )
 
     if other_no_th_sup:
@@ -810,7 +857,7 @@ def add_single_feeder(ind, dict_restr, pv_min, dict_max_pv_area,
 def add_multiple_feeders(ind, dict_restr, pv_min, dict_max_pv_area,
                          list_possible_feed, other_no_th_sup=False,
                          dict_sh=None, add_pv_prop=0, add_bat_prob=0,
-                         dict_heatloads=None):
+                         dict_heatloads=None, lhn_index=None):
     """
     Add multiple feeder nodes to LHN. Set all other nodes within
     list_possible_feed to no thermal supply.
@@ -847,6 +894,9 @@ def add_multiple_feeders(ind, dict_restr, pv_min, dict_max_pv_area,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
 
     if len(list_possible_feed) > 2:
@@ -856,6 +906,9 @@ def add_multiple_feeders(ind, dict_restr, pv_min, dict_max_pv_area,
 
     list_feeders = random.sample(list_possible_feed, nb_feeders)
 
+    if lhn_index is None:
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
     for n in list_feeders:
         #  Mutate feeder node with CHP, boiler, tes combi
         mutateesys.mut_esys_config_single_build(ind=ind, n=n,
@@ -871,7 +924,8 @@ def add_multiple_feeders(ind, dict_restr, pv_min, dict_max_pv_area,
                                                 dict_sh=dict_sh,
                                                 add_pv_prop=add_pv_prop,
                                                 add_bat_prob=add_bat_prob,
-                                                dict_heatloads=dict_heatloads)
+                                                dict_heatloads=dict_heatloads,
+                                                lhn_index=lhn_index)
 
         if other_no_th_sup:
             #  Set all other LHN nodes to no thermal supply
@@ -885,7 +939,7 @@ def add_lhn_node(ind, idx_lhn, dict_restr,
                  dict_pos, max_dist=None, prob_nodes=[0.7, 0.3],
                  prob_lhn_mut=0.8, prob_no_th_sup=0.9, prob_closest=0.7,
                  dict_sh=None,
-                 dict_heatloads=None):
+                 dict_heatloads=None, lhn_index=None):
     """
     Add single or multiple LHN nodes to network
 
@@ -923,6 +977,9 @@ def add_lhn_node(ind, idx_lhn, dict_restr,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
 
     if len(ind['lhn']) == 0:  # pragma: no cover
@@ -936,8 +993,11 @@ def add_lhn_node(ind, idx_lhn, dict_restr,
     # Get list of building node ids
     list_build_ids = analyse.get_build_ids_ind(ind=ind)
 
+    if lhn_index is None:
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
     #  Get list of all buildings, which are already connected to LHN(s)
-    list_lhn_ids = findlhn.get_all_lhn_ids(ind=ind)
+    list_lhn_ids = findlhn.get_all_lhn_ids(ind=ind, lhn_index=lhn_index)
 
     # Get list of available building nodes to be connected to LHN
     list_av_ids = list(set(list_build_ids) - set(list_lhn_ids))
@@ -983,7 +1043,7 @@ def add_lhn_node(ind, idx_lhn, dict_restr,
             new_id = list_tup_sorted[random.
                 randint(1, int(len(list_tup_sorted) - 1))][0]
 
-        ind['lhn'][idx_lhn].append(new_id)
+        lhn_index.add_node(ind=ind, idx_lhn=idx_lhn, n=new_id)
 
         #  Define, if new node is feeder or not
         if random.random() <= prob_no_th_sup:
@@ -1011,7 +1071,7 @@ def add_lhn_node(ind, idx_lhn, dict_restr,
         for i in range(nb_new_lhn):
             #  Take closest node to reference LHN
             new_id = list_tup_sorted[i][0]
-            ind['lhn'][idx_lhn].append(new_id)
+            lhn_index.add_node(ind=ind, idx_lhn=idx_lhn, n=new_id)
 
             #  Define, if new node is feeder or not
             if random.random() <= prob_no_th_sup:
@@ -1031,7 +1091,7 @@ def del_lhn_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                  prob_lhn_mut=0.8, list_options=None,
                  list_lhn_to_stand_alone=None,
                  dict_sh=None, add_pv_prop=0, add_bat_prob=0,
-                 dict_heatloads=None):
+                 dict_heatloads=None, lhn_index=None):
     """
     Delete single or multiple LHN nodes
 
@@ -1084,6 +1144,9 @@ def del_lhn_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
     if list_options is None:
         list_options = ['boi', 'boi_tes', 'chp_boi_tes', 'chp_boi_eh_tes',
@@ -1109,6 +1172,9 @@ def del_lhn_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
     # Get info about nb. of existing nodes in chosen LHN system
     nb_nodes = len(ind['lhn'][idx_lhn])
 
+    if lhn_index is None:
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
     if nb_nodes <= 2:  # pragma: no cover
         msg = 'Lhn has less than 3 nodes left. Thus, cannot delete nodes.'
         warnings.warn(msg)
@@ -1129,7 +1195,7 @@ def del_lhn_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
         #  TODO: Add method to erase node which is "out of center"
 
         #  Delete id from list
-        ind['lhn'][idx_lhn].remove(id_del)
+        lhn_index.del_node(ind=ind, idx_lhn=idx_lhn, n=id_del)
 
         #  Add energy system to stand-alone building
         mutateesys. \
@@ -1142,7 +1208,8 @@ def del_lhn_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                                          dict_sh=dict_sh,
                                          add_pv_prop=add_pv_prop,
                                          add_bat_prob=add_bat_prob,
-                                         dict_heatloads=dict_heatloads)
+                                         dict_heatloads=dict_heatloads,
+                                         lhn_index=lhn_index)
 
     elif select_single_or_multi == 'multi':
 
@@ -1159,7 +1226,7 @@ def del_lhn_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
 
         for n in list_ids_del:
             #  Delete id from list
-            ind['lhn'][idx_lhn].remove(n)
+            lhn_index.del_node(ind=ind, idx_lhn=idx_lhn, n=n)
 
             #  Add energy system to stand-alone building
             mutateesys. \
@@ -1172,13 +1239,14 @@ def del_lhn_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                                              list_lhn_to_stand_alone,
                                              add_pv_prop=add_pv_prop,
                                              add_bat_prob=add_bat_prob,
-                                             dict_heatloads=dict_heatloads)
+                                             dict_heatloads=dict_heatloads,
+                                             lhn_index=lhn_index)
 
 
 def add_lhn_feeder_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                         prob_feed=[0.7, 0.3], prob_lhn_mut=0.8, dict_sh=None,
                         add_pv_prop=0, add_bat_prob=0,
-                        dict_heatloads=None):
+                        dict_heatloads=None, lhn_index=None):
     """
     Add single or multiple LHN feeder node to LHN (LHN mutation)
 
@@ -1218,6 +1286,9 @@ def add_lhn_feeder_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
 
     if len(ind['lhn']) == 0:  # pragma: no cover
@@ -1253,7 +1324,8 @@ def add_lhn_feeder_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                           list_possible_feed=list_no_th_sup,
                           dict_sh=dict_sh, add_pv_prop=add_pv_prop,
                           add_bat_prob=add_bat_prob,
-                          dict_heatloads=dict_heatloads
+                          dict_heatloads=dict_heatloads,
+                          lhn_index=lhn_index
                           )
 
     elif select_single_or_multi == 'multi':
@@ -1263,7 +1335,8 @@ def add_lhn_feeder_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                              list_possible_feed=list_no_th_sup,
                              dict_sh=dict_sh, add_pv_prop=add_pv_prop,
                              add_bat_prob=add_bat_prob,
-                             dict_heatloads=dict_heatloads
+                             dict_heatloads=dict_heatloads,
+                             lhn_index=lhn_index
                              )
 
 
@@ -1346,7 +1419,7 @@ def del_lhn_feeder(ind, idx_lhn, prob_feed=[0.7, 0.3], prob_lhn_mut=0.8):
 def change_lhn_feeder_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                            prob_feed=[0.7, 0.3], prob_lhn_mut=0.8,
                            dict_sh=None, add_pv_prop=0, add_bat_prob=0,
-                           dict_heatloads=None):
+                           dict_heatloads=None, lhn_index=None):
     """
     Change position of single or multiple feeder nodes in LHN
     (LHN mutation)
@@ -1387,6 +1460,9 @@ def change_lhn_feeder_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. Is kept
+        up to date, if LHN subnetworks or nodes are changed.
     """
 
     if len(ind['lhn']) == 0:  # pragma: no cover
@@ -1443,7 +1519,8 @@ def change_lhn_feeder_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                           list_possible_feed=[id_feed_new],
                           dict_sh=dict_sh, add_pv_prop=add_pv_prop,
                           add_bat_prob=add_bat_prob,
-                          dict_heatloads=dict_heatloads)
+                          dict_heatloads=dict_heatloads,
+                          lhn_index=lhn_index)
 
         #  Delete old feeder
         esyschanges.set_th_supply_off(ind=ind, n=id_feed_del)
@@ -1487,7 +1564,8 @@ def change_lhn_feeder_node(ind, idx_lhn, dict_restr, pv_min, dict_max_pv_area,
                               list_possible_feed=[id_new], dict_sh=dict_sh,
                               add_pv_prop=add_pv_prop,
                               add_bat_prob=add_bat_prob,
-                              dict_heatloads=dict_heatloads)
+                              dict_heatloads=dict_heatloads,
+                              lhn_index=lhn_index)
 
             #  Delete old feeder
             esyschanges.set_th_supply_off(ind=ind, n=id_del)
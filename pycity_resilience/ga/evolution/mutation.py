@@ -11,6 +11,7 @@ import numpy as np
 
 import pycity_resilience.ga.verify.check_validity as checkval
 import pycity_resilience.ga.analyse.analyse as analyse
+import pycity_resilience.ga.analyse.find_lhn as findlhn
 import pycity_resilience.ga.evolution.lhn_changes as lhnchanges
 import pycity_resilience.ga.evolution.mutation_esys as mutateesys
 
@@ -174,6 +175,9 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
         # Mutate LHN system
         #  #############################################################
 
+        #  LHN index (kept up to date by LHN mutation functions)
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
         #  Check if LHN(s) exists or not
         if ind['lhn'] == []:  # [Prob. of gen/del, Prob. of muation]
             list_prob_lhn_gen_mut = [1, 0]
@@ -216,7 +220,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                              dict_sh=dict_sh,
                                              add_pv_prop=add_pv_prop,
                                              add_bat_prob=add_bat_prob,
-                                             dict_heatloads=dict_heatloads)
+                                             dict_heatloads=dict_heatloads,
+                                             lhn_index=lhn_index)
 
             elif select_lhn_gen == 'del':
                 #  Delete network(s)
@@ -230,7 +235,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                    dict_sh=dict_sh,
                                    add_pv_prop=add_pv_prop,
                                    add_bat_prob=add_bat_prob,
-                                   dict_heatloads=dict_heatloads)
+                                   dict_heatloads=dict_heatloads,
+                                   lhn_index=lhn_index)
 
             elif select_lhn_gen == 'subnet':
                 #  Add specific number of subnetworks to ind
@@ -242,7 +248,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                    max_dist=max_dist,
                                    dict_sh=dict_sh,
                                    add_pv_prop=add_pv_prop,
-                                   add_bat_prob=add_bat_prob)
+                                   add_bat_prob=add_bat_prob,
+                                   lhn_index=lhn_index)
 
         # Mutate existing LHN(s)
         #  #############################################################
@@ -271,7 +278,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                             dict_pos=dict_pos,
                                             max_dist=max_dist,
                                             dict_sh=dict_sh,
-                                            dict_heatloads=dict_heatloads)
+                                            dict_heatloads=dict_heatloads,
+                                            lhn_index=lhn_index)
 
                 # Delete neighbor node
                 elif select_lhn_mut == 'del_node':
@@ -286,7 +294,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                             list_options=list_options,
                                             list_lhn_to_stand_alone=
                                             list_lhn_to_stand_alone,
-                                            dict_heatloads=dict_heatloads)
+                                            dict_heatloads=dict_heatloads,
+                                            lhn_index=lhn_index)
 
                 # Add feeder
                 elif select_lhn_mut == 'add_feed':
@@ -301,7 +310,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                                    add_pv_prop=add_pv_prop,
                                                    add_bat_prob=add_bat_prob,
                                                    dict_heatloads=
-                                                   dict_heatloads
+                                                   dict_heatloads,
+                                                   lhn_index=lhn_index
                                                    )
 
                 # Delete feeder
@@ -322,7 +332,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                                dict_sh=dict_sh,
                                                add_pv_prop=add_pv_prop,
                                                add_bat_prob=add_bat_prob,
-                                               dict_heatloads=dict_heatloads)
+                                               dict_heatloads=dict_heatloads,
+                                               lhn_index=lhn_index)
 
                 # Multi options to mutate existing LHN
                 elif select_lhn_mut == 'all_modes':
@@ -339,7 +350,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                 dict_pos=dict_pos,
                                 max_dist=max_dist,
                                 dict_sh=dict_sh,
-                                dict_heatloads=dict_heatloads)
+                                dict_heatloads=dict_heatloads,
+                                lhn_index=lhn_index)
                             add_node = True
 
                         if random.random() < prob_lhn and add_node is False:
@@ -355,7 +367,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                                     list_lhn_to_stand_alone=
                                                     list_lhn_to_stand_alone,
                                                     dict_heatloads=
-                                                    dict_heatloads)
+                                                    dict_heatloads,
+                                                    lhn_index=lhn_index)
 
                         if random.random() < prob_lhn:
                             #  Add feeder node(s)
@@ -370,7 +383,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                                     add_pv_prop=add_pv_prop,
                                                     add_bat_prob=add_bat_prob,
                                                     dict_heatloads=
-                                                    dict_heatloads
+                                                    dict_heatloads,
+                                                    lhn_index=lhn_index
                                                     )
 
                         if random.random() < prob_lhn:
@@ -390,7 +404,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                 dict_sh=dict_sh,
                                 add_pv_prop=add_pv_prop,
                                 add_bat_prob=add_bat_prob,
-                                dict_heatloads=dict_heatloads)
+                                dict_heatloads=dict_heatloads,
+                                lhn_index=lhn_index)
 
         # Check configuration
         #  #############################################################
@@ -409,6 +424,9 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
     #  #############################################################
     if do_esys_mut:
 
+        #  LHN index (LHN might have been changed by checks)
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
         for n in list_ids:
 
             type_mute = np.random.choice(a=[0, 1], p=list_prob_mute_type)
@@ -446,7 +464,8 @@ def do_mutate(ind, prob_mut, prob_lhn, dict_restr, dict_max_pv_area, pv_min,
                                                  pv_step=pv_step,
                                                  add_pv_prop=add_pv_prop,
                                                  add_bat_prob=add_bat_prob,
-                                                 dict_heatloads=dict_heatloads)
+                                                 dict_heatloads=dict_heatloads,
+                                                 lhn_index=lhn_index)
 
             else:
                 msg = 'Unknown type_mute!'
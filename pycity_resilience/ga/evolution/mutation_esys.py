@@ -59,22 +59,22 @@ def mut_esys_val_single_build(ind, n, prob_mut, dict_restr, pv_min,
     if dict_sh is not None:
         #  Boiler
         list_boi_choice = \
-            modlist.get_list_values_larger_than_ref(
-                list_val=dict_restr['boi'],
+            modlist.get_range_larger_than_ref(
+                dict_restr=dict_restr, key='boi',
                 ref_val=dict_heatloads[n])
         #  Air/water heat pump
         list_hp_aw_choice = modlist. \
-            get_list_values_larger_than_ref(list_val=dict_restr['hp_aw'],
-                                            ref_val=dict_sh[n])
+            get_range_larger_than_ref(dict_restr=dict_restr, key='hp_aw',
+                                      ref_val=dict_sh[n])
         #  Water/water heat pump
         list_hp_ww_choice = modlist. \
-            get_list_values_larger_than_ref(list_val=dict_restr['hp_ww'],
-                                            ref_val=dict_sh[n])
+            get_range_larger_than_ref(dict_restr=dict_restr, key='hp_ww',
+                                      ref_val=dict_sh[n])
 
         #  CHP
         list_chp_choice = modlist. \
-            get_list_values_smaller_than_ref(list_val=dict_restr['chp'],
-                                             ref_val=dict_sh[n])
+            get_range_smaller_than_ref(dict_restr=dict_restr, key='chp',
+                                       ref_val=dict_sh[n])
 
         assert len(list_boi_choice) > 0
         assert len(list_hp_aw_choice) > 0
@@ -159,7 +159,8 @@ def mut_esys_config_single_build(ind, n, dict_restr, pv_min,
                                  pv_step=1,
                                  add_pv_prop=0,
                                  add_bat_prob=0,
-                                 dict_heatloads=None):
+                                 dict_heatloads=None,
+                                 lhn_index=None):
     """
     Change energy system configurations (e.g. from HP/EH to boiler/CHP).
 
@@ -227,6 +228,9 @@ def mut_esys_config_single_build(ind, n, dict_restr, pv_min,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    lhn_index : object, optional
+        LhnIndex object of ind (default: None), see find_lhn.py. If None,
+        LHN subnetworks are searched for n.
     """
 
     assert pv_min >= 0
@@ -282,7 +286,7 @@ def mut_esys_config_single_build(ind, n, dict_restr, pv_min,
         raise AssertionError(msg)
 
     # Search for LHN connection of n (if True, has LHN)
-    has_lhn = findlhn.has_lhn_connection(ind=ind, id=n)
+    has_lhn = findlhn.has_lhn_connection(ind=ind, id=n, lhn_index=lhn_index)
 
     #  Perform mutation
     #  #################################################################
@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding asynchronous steady-state GA loop.
+
+In the generational loop of opt_ga.py, every generation waits for the
+slowest evaluation (e.g. an individuum with LHN and many MC runs), while
+the other workers are idle. In steady-state mode, a fixed number of
+evaluations is kept in flight. As soon as any evaluation finishes, the
+evaluated individuum is inserted into the population (NSGA2 based
+selection of toolbox.select) and new offspring (toolbox.crossover and
+toolbox.mutate on current population) is submitted to the free worker.
+
+Every nb_ind finished evaluations are counted as one generation
+equivalent (e.g. for logging, logbook and termination checks).
+"""
+from __future__ import division
+
+import queue
+import random
+import warnings
+
+from scoop import futures
+
+
+class AsyncEvaluator(object):
+    def __init__(self, evaluate, pool=None):
+        """
+        Constructor of asynchronous evaluator
+
+        Parameters
+        ----------
+        evaluate : function
+            Evaluation function, which takes individuum as single input and
+            returns fitness tuple (e.g. toolbox.evaluate)
+        pool : object, optional
+            Pool object of multiprocessing package (default: None). If None,
+            SCOOP futures are used.
+        """
+
+        self.evaluate = evaluate
+        self.pool = pool
+
+        #  Pending evaluations (future/task id --> individuum)
+        self._dict_pending = {}
+
+        #  Finished evaluations of pool (task id, fitness, exception)
+        self._queue_done = queue.Queue()
+
+        self._task_id = 0
+
+    def get_nb_pending(self):
+        """
+        Returns number of submitted, but not yet finished evaluations
+
+        Returns
+        -------
+        nb_pending : int
+            Number of pending evaluations
+        """
+        return len(self._dict_pending)
+
+    def get_pending_inds(self):
+        """
+        Returns list of individuals with pending evaluation
+
+        Returns
+        -------
+        list_ind : list
+            List of individuum dicts (ind)
+        """
+        return list(self._dict_pending.values())
+
+    def submit(self, ind):
+        """
+        Submit evaluation of individuum (returns immediately)
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict
+        """
+
+        if self.pool is None:
+            future = futures.submit(self.evaluate, ind)
+            self._dict_pending[future] = ind
+
+        else:
+            task_id = self._task_id
+            self._task_id += 1
+
+            self._dict_pending[task_id] = ind
+
+            self.pool.apply_async(
+                self.evaluate, (ind,),
+                callback=lambda fit: self._queue_done.put((task_id, fit,
+                                                           None)),
+                error_callback=lambda exc: self._queue_done.put((task_id,
+                                                                 None, exc)))
+
+    def wait_any(self):
+        """
+        Block until at least one pending evaluation has finished
+
+        Returns
+        -------
+        list_res : list (of tuples)
+            List of tuples (ind, fitness) of all finished evaluations
+        """
+
+        if len(self._dict_pending) == 0:
+            msg = 'No pending evaluations to wait for.'
+            raise AssertionError(msg)
+
+        list_res = []
+
+        if self.pool is None:
+            (done, not_done) = \
+                futures.wait(list(self._dict_pending.keys()),
+                             return_when=futures.FIRST_COMPLETED)
+
+            for future in done:
+                ind = self._dict_pending.pop(future)
+                list_res.append((ind, future.result()))
+
+        else:
+            #  Wait for first finished task, then collect all other
+            #  finished tasks
+            list_done = [self._queue_done.get()]
+            while True:
+                try:
+                    list_done.append(self._queue_done.get_nowait())
+                except queue.Empty:
+                    break
+
+            for (task_id, fit, exc) in list_done:
+                ind = self._dict_pending.pop(task_id)
+                if exc is not None:
+                    raise exc
+                list_res.append((ind, fit))
+
+        return list_res
+
+
+def gen_offspring(pop, toolbox, nb_offspring, prob_mutation,
+                  list_exclude=None):
+    """
+    Generate new offspring of current population with crossover and
+    mutation operators of toolbox
+
+    Parameters
+    ----------
+    pop : list
+        List of individuum dicts (ind) / current population (not modified)
+    toolbox : object
+        Toolbox object of deap (with crossover and mutate function)
+    nb_offspring : int
+        Max. number of new individuals
+    prob_mutation : float
+        Probability that mutation is applied
+    list_exclude : list, optional
+        List of individuals, which should not be returned (default: None),
+        e.g. individuals with pending evaluation
+
+    Returns
+    -------
+    list_offspring : list
+        List of new individuals without valid fitness values (can hold less
+        than nb_offspring individuals, if crossover and mutation did not
+        generate enough new individuals)
+    """
+
+    if list_exclude is None:
+        list_exclude = []
+
+    #  Crossover copies tournament winners (pop is not modified). Only
+    #  parents of required offspring are selected and crossovered
+    offspring = toolbox.crossover(pop, nb_offspring=nb_offspring)
+
+    list_offspring = []
+
+    for ind in offspring:
+        if len(list_offspring) == nb_offspring:
+            break
+
+        if random.random() < prob_mutation:
+            ind = toolbox.mutate(ind)
+            del ind.fitness.values
+
+        #  Only use new individuals
+        if (not ind.fitness.valid and ind not in pop
+                and ind not in list_exclude and ind not in list_offspring):
+            list_offspring.append(ind)
+
+    return list_offspring
+
+
+def run_steady_state(pop, toolbox, evaluator, nb_ind, nb_evals,
+                     prob_mutation, nb_parallel, objective, callback=None,
+                     max_retries=100):
+    """
+    Perform asynchronous steady-state GA run
+
+    Parameters
+    ----------
+    pop : list
+        List of individuum dicts (ind) / evaluated start population
+        (modified in place)
+    toolbox : object
+        Toolbox object of deap (with crossover, mutate and select function)
+    evaluator : object
+        AsyncEvaluator object
+    nb_ind : int
+        Number of individuals in population
+    nb_evals : int
+        Max. number of evaluations (e.g. ngen * nb_ind)
+    prob_mutation : float
+        Probability that mutation is applied
+    nb_parallel : int
+        Number of evaluations, which are kept in flight (should be equal to
+        or larger than number of worker processes)
+    objective : str
+        Objective function (see select.do_selection)
+    callback : function, optional
+        Function, which is called after every nb_ind finished evaluations
+        (generation equivalent) with inputs gen, pop and list_ind (list of
+        individuals evaluated in generation equivalent). If callback returns
+        True, run is stopped (after finishing pending evaluations).
+        (default: None)
+    max_retries : int, optional
+        Max. number of repeated offspring generations, if no new individuum
+        has been generated (e.g. only duplicates) and no evaluation is
+        pending (default: 100). Run is stopped afterwards.
+
+    Returns
+    -------
+    nb_done : int
+        Number of finished evaluations
+    """
+
+    if nb_parallel < 1:
+        msg = 'nb_parallel has to be larger than zero.'
+        raise AssertionError(msg)
+
+    nb_done = 0
+    nb_submitted = 0
+    gen = 0
+    stop = False
+
+    #  Individuals evaluated in current generation equivalent
+    list_ind_gen = []
+
+    while nb_done < nb_evals:
+
+        #  Keep workers saturated
+        nb_free = min(nb_parallel - evaluator.get_nb_pending(),
+                      nb_evals - nb_submitted)
+
+        if nb_free > 0 and not stop:
+            nb_retries = 0
+
+            while True:
+                list_offspring = \
+                    gen_offspring(pop=pop, toolbox=toolbox,
+                                  nb_offspring=nb_free,
+                                  prob_mutation=prob_mutation,
+                                  list_exclude=evaluator.get_pending_inds())
+
+                #  Retry, if workers would be idle (e.g. only duplicates
+                #  have been generated)
+                if (len(list_offspring) > 0
+                        or evaluator.get_nb_pending() > 0
+                        or nb_retries >= max_retries):
+                    break
+                nb_retries += 1
+
+            for ind in list_offspring:
+                evaluator.submit(ind)
+                nb_submitted += 1
+
+        if evaluator.get_nb_pending() == 0:
+            if not stop:
+                msg = 'Steady-state GA run stopped after ' + str(nb_done) \
+                      + ' evaluations, as no new individuals could be ' \
+                        'generated within ' + str(max_retries) + ' retries.'
+                warnings.warn(msg)
+            break
+
+        #  Insert finished individuals into population
+        list_ind_new = []
+        for (ind, fit) in evaluator.wait_any():
+            ind.fitness.values = fit
+            list_ind_new.append(ind)
+
+        nb_done += len(list_ind_new)
+        list_ind_gen.extend(list_ind_new)
+
+        pop[:] = toolbox.select(parents=pop, invalid_ind=list_ind_new,
+                                nb_ind=nb_ind, objective=objective)
+
+        if nb_done >= (gen + 1) * nb_ind:
+            if callback is not None:
+                if callback(gen, pop, list_ind_gen):
+                    stop = True
+            gen += 1
+            list_ind_gen = []
+
+    return nb_done
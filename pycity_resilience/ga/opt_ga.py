@@ -9,6 +9,7 @@ import os
 import sys
 import time
 import copy
+import uuid
 import pickle
 import random
 import datetime
@@ -20,20 +21,37 @@ import pycity_calc.toolbox.dimensioning.dim_functions as dimfunc
 import pycity_calc.toolbox.modifiers.mod_resc_peak_load_day as modpeak
 
 import pycity_resilience.monte_carlo.run_mc as runmc
+import pycity_resilience.monte_carlo.sample_bank as samplebank
 import pycity_resilience.ga.parser.parse_city_to_ind as parsecity
 import pycity_resilience.ga.preprocess.add_bes as addbes
+import pycity_resilience.ga.preprocess.ref_mc_run as refrun
 import pycity_resilience.ga.evaluate.eval as eval
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+import pycity_resilience.ga.evaluate.worker as worker
+import pycity_resilience.ga.evaluate.racing as racing
+import pycity_resilience.ga.evaluate.objectives as objfkt
+import pycity_resilience.ga.evaluate.mc_archive as mcarch
+import pycity_resilience.ga.evaluate.surrogate as surro
+import pycity_resilience.ga.evaluate.fidelity as fidel
 import pycity_resilience.ga.preprocess.pv_areas as pvareas
 import pycity_resilience.ga.evolution.crossover as cx
 import pycity_resilience.ga.evolution.mutation as muta
+import pycity_resilience.ga.evolution.steady_state as steady
+import pycity_resilience.ga.evolution.islands as islands
+import pycity_resilience.ga.evolution.batch_ops as batchops
+import pycity_resilience.ga.parser.genome as genom
+import pycity_resilience.ga.verify.check_validity as checkval
+import pycity_resilience.ga.checkpoint as checkp
 import pycity_resilience.ga.preprocess.get_pos as getpos
+import pycity_resilience.ga.preprocess.spatial_index as spatind
 import pycity_resilience.ga.selection.select as selec
 import pycity_resilience.ga.preprocess.del_energy_networks as delnet
 import pycity_resilience.ga.evolution.helpers.mod_esys_prob as modprob
+import pycity_resilience.ga.evolution.helpers.mod_list_esys_sizes as modlist
 import pycity_resilience.ga.preprocess.get_max_sh as getmaxsh
 import pycity_resilience.ga.preprocess.est_sh_dhw_design_heat_load as estdhl
 
-from scoop import futures
+from scoop import futures, shared
 from deap import base, creator, tools, algorithms
 
 
@@ -42,7 +60,8 @@ from deap import base, creator, tools, algorithms
 
 
 class GARunner(object):
-    def __init__(self, mc_runner, nb_runs, failure_tolerance):
+    def __init__(self, mc_runner, nb_runs, failure_tolerance,
+                 path_sample_bank=None):
         """
         Constructor of GA Runner object instance
 
@@ -56,11 +75,16 @@ class GARunner(object):
             Allowed EnergyBalanceException failure tolerance (default: 0.05).
             E.g. 0.05 means, that 5% of runs are allowed to fail with
             EnergyBalanceException.
+        path_sample_bank : str, optional
+            Path to sample bank folder (default: None). If not None, samples
+            of mc_runner are not pickled, but attached from sample bank
+            (memory-mapped arrays) after unpickling (see sample_bank.py)
         """
 
         self.mc_runner = mc_runner
         self.nb_runs = nb_runs
         self.failure_tolerance = failure_tolerance
+        self.path_sample_bank = path_sample_bank
 
         #  MC results for reference system (rescaled boilers)
         #  Required for dimensionless cost and co2 fitnesses
@@ -74,6 +98,88 @@ class GARunner(object):
         self._city = mc_runner._city_eco_calc.energy_balance.city
         self._list_build_ids = mc_runner._list_build_ids
 
+        #  Evaluation context (reset-based reuse of city and mc_runner
+        #  within a process, see eval_context.py). Generated on demand.
+        self._eval_context = None
+
+        #  Incremental evaluator (per building/LHN MC result reuse, see
+        #  incremental.py). Generated on demand.
+        self._incr_evaluator = None
+
+        #  Unique key of city (and samples) of GA runner, which scopes
+        #  process-wide memos (e.g. beta_el, see flex_cache.py). Is kept on
+        #  copies and pickled GA runners.
+        self.scope_key = uuid.uuid4().hex
+
+    def __getstate__(self):
+        """
+        Exclude process specific evaluation context and incremental
+        evaluator (and samples, if sample bank is used) from pickling
+        """
+        state = self.__dict__.copy()
+        state['_eval_context'] = None
+        state['_incr_evaluator'] = None
+        if self.path_sample_bank is not None:
+            state['mc_runner'] = \
+                samplebank.get_state_without_samples(
+                    mc_run=self.mc_runner, path=self.path_sample_bank)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Attach samples of sample bank after unpickling
+        """
+        self.__dict__.update(state)
+        if self.path_sample_bank is not None:
+            samplebank.attach_sample_bank(mc_run=self.mc_runner,
+                                          path=self.path_sample_bank)
+
+
+def is_std_stall(logbook, nb_min_gen, std_break):
+    """
+    Check, if standard deviations of max. fitness values over last
+    nb_min_gen logbook entries are below std_break * fitness values
+
+    Parameters
+    ----------
+    logbook : object
+        Logbook object of deap
+    nb_min_gen : int
+        Number of generations over which the standard deviation is checked
+    std_break : float
+        Min standard deviation factor
+
+    Returns
+    -------
+    tup_res : tuple
+        Tuple (stall, ref_obj_0, ref_obj_1) with stall (bool, True, if
+        both standard deviations are below limit) and reference fitness
+        values ref_obj_0 and ref_obj_1
+    """
+
+    obj_0 = np.zeros(nb_min_gen)
+    obj_1 = np.zeros(nb_min_gen)
+
+    count = 0
+    #  Get lat nb_min_gen number of results out of logbook
+    for n in range(len(logbook) - 1 - nb_min_gen,
+                   len(logbook) - 1):
+        obj_0[count] = logbook[n]["max"][0]
+        obj_1[count] = logbook[n]["max"][1]
+        count += 1
+
+    # Calculate standard deviations
+    std_dev0 = np.std(obj_0)
+    std_dev1 = np.std(obj_1)
+
+    ref_obj_0 = obj_0[0]
+    ref_obj_1 = obj_1[0]
+
+    stall = (std_dev0 < std_break * ref_obj_0
+             and std_dev1 < std_break * ref_obj_1)
+
+    return (stall, ref_obj_0, ref_obj_1)
+
 
 # Initialize toolbox
 #  ####################################################################
@@ -107,6 +213,13 @@ nb_processes = 3
 #  SCOOP automatically tries to use maximum number of available cores,
 #  except the user hands over cmd window parameter
 
+use_worker_context = True
+#  If True, ga_runner and evaluation settings are saved once to
+#  worker_setup.pkl in log folder and loaded once by every worker process.
+#  Tasks then only carry the individuum (instead of pickling city and
+#  mc_runner for every evaluation task).
+#  If False, ga_runner is handed over with every evaluation task.
+
 #  Project name / log folder name
 log_folder = 'ga_run'
 #  Defines path, where results should be logged
@@ -174,6 +287,77 @@ std_break = 0.001
 #  Settings for energy balance monte-carlo run
 failure_tolerance = 0.05  # Share of allowed failed runs in MC analysis
 
+use_adaptive_mc = False
+#  Defines, if MC runs should be performed in batches and stopped early,
+#  as soon as confidence intervals of objective statistics (mean, std or
+#  risk averse/friendly value) are within tolerance (max. nb_runs runs).
+#  Nb. of performed runs per individuum is saved to fitness cache.
+mc_batch_size = 10  # Nb. of MC runs per batch
+mc_min_runs = 20  # Min. nb. of MC runs per individuum
+mc_rel_tol = 0.01  # Relative tolerance of confidence interval half width
+mc_conf_z = 1.96  # Standard normal quantile of confidence level (95 %)
+
+use_racing = False
+#  Defines, if adaptive MC runs should be aborted, as soon as individuum is
+#  dominated by current first pareto front with given confidence
+#  (requires use_adaptive_mc = True and 2d objective). Aborted individuals
+#  get upper confidence bounds as conservative fitness values.
+racing_conf_z = 1.96  # Standard normal quantile of dominance confidence
+
+use_surrogate = False
+#  Defines, if random forest surrogate model (trained on all evaluated
+#  individuals) should be used to pre-screen offspring. Offspring, which
+#  are dominated by current first pareto front even with optimistic
+#  prediction, are not evaluated and get pessimistic prediction as
+#  conservative fitness values. Skipped evaluations and prediction error
+#  are logged per generation.
+surrogate_min_train = 100  # Min. nb. of training samples to use surrogate
+surrogate_conf_z = 1.96  # Standard normal quantile of prediction confidence
+
+use_fidelity = False
+#  Defines, if multi-fidelity schedule should be used. Early generations are
+#  evaluated with few MC runs (first samples of nb_runs samples). As soon
+#  as mean fitness values of first pareto front change less than
+#  fid_rel_tol over fid_nb_stall_gen generations (or fid_max_stage_gen
+#  generations have been processed), the next stage is activated and the
+#  surviving population is re-evaluated with more MC runs.
+fid_list_nb_runs = [10, 25, 50, 100]  # Nb. of MC runs per stage (last
+#  value has to be equal to nb_runs)
+fid_rel_tol = 0.01  # Relative tolerance of front convergence
+fid_nb_stall_gen = 5  # Nb. of generations of convergence check
+fid_max_stage_gen = 50  # Max. nb. of generations per stage
+
+use_steady_state = False
+#  Defines, if asynchronous steady-state GA loop should be used instead of
+#  generational loop. ss_nb_parallel evaluations are kept in flight. As soon
+#  as any evaluation finishes, the individuum is inserted into the
+#  population (selection) and new offspring is submitted, so that workers
+#  do not wait for the slowest evaluation of a generation. nb_ind finished
+#  evaluations count as one generation (max. ngen * nb_ind evaluations).
+#  Cannot be combined with use_surrogate or use_fidelity.
+ss_nb_parallel = 6  # Nb. of evaluations in flight (>= nb. of workers)
+
+use_islands = False
+#  Defines, if island model should be used. Population is split into
+#  nb_islands island populations (nb_ind / nb_islands individuals), which
+#  evolve in own processes with own worker pools (nb_processes are split
+#  between islands) for ngen generations. Every mig_interval generations,
+#  nb_migrants best individuals are sent to target islands of mig_topology
+#  ('ring', 'full' or 'random'). Requires use_scoop = False (Linux) and
+#  cannot be combined with use_steady_state, use_surrogate, use_fidelity or
+#  use_racing.
+nb_islands = 4  # Nb. of islands
+mig_interval = 10  # Nb. of generations between migrations
+nb_migrants = 5  # Nb. of migrants per migration and target island
+mig_topology = 'ring'  # Migration topology
+
+use_batch_ops = False
+#  Defines, if batched (vectorized) operators of batch_ops.py should be used
+#  for tournament selection, crossover and energy system mutation of the
+#  generational loop. The whole population is processed as matrix of size
+#  indexes, random draws are vectorized. LHN mutations keep the
+#  per-individuum path of do_mutate.
+
 #  Use street routings to construct lhn pipes or el. cables
 use_street = False
 
@@ -182,6 +366,24 @@ sampling_method = 'lhc'
 #  'lhc': Latin hypercube (lhc)
 #  'random': Randomized
 
+use_ref_cache = True
+#  Defines, if MC results of reference scenario (rescaled boilers, required
+#  for dimensionless objectives) should be saved to/loaded from cache
+#  folder (workspace/output/ref_mc_cache). Results are identified by hash
+#  of city content, MC samples and MC settings.
+
+use_sample_bank = True
+#  Defines, if city, building and energy system samples should be saved
+#  once to memory-mapped sample bank (sample_bank folder in log folder).
+#  All workers index the same sample rows (common random numbers) without
+#  holding/pickling own copies of the samples.
+
+crn_seed = 1
+#  Seed for energy system re-sampling of each individuum (only relevant for
+#  sampling_method 'random'). If not None, all individuals use identical
+#  random numbers for energy system samples (common random numbers).
+#  If None, energy system samples are drawn randomly for every evaluation.
+
 dem_unc = False
 # dem_unc : bool, optional
 # 	Defines, if thermal, el. and dhw demand are assumed to be uncertain
@@ -328,6 +530,37 @@ perform_checks = True
 #  Defines, if energy systems should be checked on plausibility after each
 #  mutation and crossover. If False, increases speed, but only checks config.
 #  before evaluation.
+use_dirty_checks = False
+#  Defines, if only crossovered buildings (and their LHN subnetworks) are
+#  checked after crossover (instead of complete individuums). Same result as
+#  complete check, if parents fulfill all constraints (see
+#  check_validity.run_dirty_checks). Only relevant, if perform_checks is True.
+
+use_fitness_cache = True
+#  Defines, if fitness values should be cached in SQLite database file
+#  (fitness_cache.sqlite in log folder). Already evaluated individuals (with
+#  identical objective and MC settings) are not evaluated again. Cache is
+#  shared by all worker processes and persists between runs.
+
+use_mc_archive = False
+#  Defines, if per-run MC results (annuity, co2, demands...) and failed run
+#  indexes of every evaluated individuum should be saved to MC result
+#  archive (mc_archive.sqlite in log folder), e.g. to analyze pareto
+#  solutions without re-simulation (see reevaluate_par_frontier.py).
+#  Archive settings are saved to mc_archive_settings.pkl in log folder.
+
+use_incremental_eval = False
+#  Defines, if MC runs should be performed incrementally per stand-alone
+#  building and LHN subnetwork. If True, MC results of buildings/subnetworks
+#  with unchanged energy systems are reused within each worker process
+#  (only re-simulates changed parts of the city). Requires sampling_method
+#  'lhc'. Assumes that annuity and emissions are additive per building/
+#  subnetwork.
+
+incr_max_units = 2000
+#  Max. number of buildings/subnetworks, whose MC results are cached per
+#  worker process for incremental evaluation (oldest are removed first).
+#  Each cached unit holds result arrays of all nb_runs samples.
 
 #  Energy system flags
 #  #############################################
@@ -440,6 +673,9 @@ dict_restr = {'boi': list(range(10000, boiler_max + 10000, 10000)),
               'bat': list(range(0, bat_max * 3600 * 1000 + 1 * 3600 * 1000,
                                 1 * 3600 * 1000))}  # bat in Joule!!
 
+#  Precompute sorted size tables of dict_restr (bisect-based size ranges)
+dict_restr = modlist.SizeTables(dict_restr=dict_restr)
+
 #  ####################################################################
 
 #  If energy flags are False, prevent usage of specific energy system
@@ -516,6 +752,42 @@ log_path = os.path.join(folder_path, log_name)
 
 path_logbook = os.path.join(folder_path, 'logbook.pkl')
 
+path_fitness_cache = os.path.join(folder_path, 'fitness_cache.sqlite')
+
+path_worker_setup = os.path.join(folder_path, 'worker_setup.pkl')
+
+path_front = os.path.join(folder_path, 'first_front.json')
+
+path_sample_bank = os.path.join(folder_path, 'sample_bank')
+
+path_mc_archive = os.path.join(folder_path, 'mc_archive.sqlite')
+
+path_archive_settings = os.path.join(folder_path, 'mc_archive_settings.pkl')
+
+path_checkpoint = os.path.join(folder_path, 'checkpoint.pkl')
+
+use_checkpoint = True
+#  Defines, if checkpoint (checkpoint.pkl in log folder) should be saved
+#  every checkpoint_interval generations. Checkpoint holds population,
+#  parents, offspring, hall of fame, logbook, generation counter, random
+#  states, fidelity schedule and surrogate model (fitness values of fitness
+#  cache are persisted in SQLite file). Only used by generational loop.
+checkpoint_interval = 1
+
+resume_run = False
+#  Defines, if GA run should be resumed from checkpoint of log folder (if
+#  checkpoint exists). Samples of sample bank of log folder are reused, so
+#  that fitness values are identical to interrupted run.
+
+#  Resume run from existing checkpoint?
+do_resume = resume_run and os.path.exists(path_checkpoint)
+
+if use_ref_cache:
+    #  Shared by all GA runs (key holds city, samples and MC settings)
+    path_ref_cache = os.path.join(workspace, 'output', 'ref_mc_cache')
+else:
+    path_ref_cache = None
+
 save_pop = True  # Save intermediate populations as pickle file
 
 #  End of user inputs
@@ -560,6 +832,7 @@ print('Timestamp: ', timestamp)
 print('City file name: ', city_name)
 print()
 print('use_scoop: ', use_scoop)
+print('use_worker_context: ', use_worker_context)
 print('log_folder: ', log_folder)
 print('path_city: ', path_city)
 print()
@@ -578,10 +851,42 @@ print('size_hof: ', size_hof)
 print('nb_min_gen: ', nb_min_gen)
 print('std_break: ', std_break)
 print('failure_tolerance: ', failure_tolerance)
+print('use_adaptive_mc: ', use_adaptive_mc)
+if use_adaptive_mc:
+    print('mc_batch_size: ', mc_batch_size)
+    print('mc_min_runs: ', mc_min_runs)
+    print('mc_rel_tol: ', mc_rel_tol)
+    print('mc_conf_z: ', mc_conf_z)
+    print('use_racing: ', use_racing)
+    if use_racing:
+        print('racing_conf_z: ', racing_conf_z)
+print('use_surrogate: ', use_surrogate)
+if use_surrogate:
+    print('surrogate_min_train: ', surrogate_min_train)
+    print('surrogate_conf_z: ', surrogate_conf_z)
+print('use_fidelity: ', use_fidelity)
+if use_fidelity:
+    print('fid_list_nb_runs: ', fid_list_nb_runs)
+    print('fid_rel_tol: ', fid_rel_tol)
+    print('fid_nb_stall_gen: ', fid_nb_stall_gen)
+    print('fid_max_stage_gen: ', fid_max_stage_gen)
+print('use_steady_state: ', use_steady_state)
+if use_steady_state:
+    print('ss_nb_parallel: ', ss_nb_parallel)
+print('use_islands: ', use_islands)
+if use_islands:
+    print('nb_islands: ', nb_islands)
+    print('mig_interval: ', mig_interval)
+    print('nb_migrants: ', nb_migrants)
+    print('mig_topology: ', mig_topology)
+print('use_batch_ops: ', use_batch_ops)
 print()
 print('use_street: ', use_street)
 print()
 print('sampling_method: ', sampling_method)
+print('use_ref_cache: ', use_ref_cache)
+print('use_sample_bank: ', use_sample_bank)
+print('crn_seed: ', crn_seed)
 print('load_city_n_build_samples: ', load_city_n_build_samples)
 if load_city_n_build_samples:
     print('city_sample_name: ', city_sample_name)
@@ -598,6 +903,18 @@ if use_profile_pool:
     print('path_profile_dict: ', path_profile_dict)
 print()
 print('perform_checks: ', perform_checks)
+print('use_dirty_checks: ', use_dirty_checks)
+print('use_fitness_cache: ', use_fitness_cache)
+print('use_mc_archive: ', use_mc_archive)
+print('use_incremental_eval: ', use_incremental_eval)
+if use_incremental_eval:
+    print('incr_max_units: ', incr_max_units)
+print('use_checkpoint: ', use_checkpoint)
+if use_checkpoint:
+    print('checkpoint_interval: ', checkpoint_interval)
+print('resume_run: ', resume_run)
+if do_resume:
+    print('Resume from checkpoint: ', path_checkpoint)
 print()
 print('use_chp: ', use_chp)
 print('use_lhn: ', use_lhn)
@@ -674,8 +991,8 @@ for key in dict_max_pv_area.keys():
               + str(key) + ' is negative! ' + str(dict_max_pv_area[key])
         raise AssertionError(msg)
 
-#  Get dict with building positions
-dict_pos = getpos.get_build_pos(city=city)
+#  Get dict with building positions (with precomputed distances)
+dict_pos = spatind.SpatialIndex(dict_pos=getpos.get_build_pos(city=city))
 
 #  #######################################################################
 #  Get dict with max. space heating power per building
@@ -742,11 +1059,47 @@ elif sampling_method == 'lhc':
                                 path_build_sample_dict=path_build_sample_dict,
                                 dem_unc=dem_unc)
 
+if sampling_method == 'random':
+    #  Energy system samples are re-sampled for every individuum (not part
+    #  of sample bank and samples hash)
+    list_exclude = ['_dict_samples_esys']
+else:
+    list_exclude = None
+
+if use_sample_bank:
+    #  Save samples once to memory-mapped sample bank, which is shared
+    #  by all worker processes
+    if do_resume and samplebank.has_sample_bank(path=path_sample_bank):
+        #  Reuse samples of interrupted run
+        print('Reuse samples of sample bank ', path_sample_bank)
+    elif __name__ == '__main__':
+        #  Only origin process writes sample bank. SCOOP workers re-execute
+        #  module level code and must not redraw or overwrite samples
+        samplebank.save_sample_bank(mc_run=mc_run, path=path_sample_bank,
+                                    nb_samples=nb_runs,
+                                    list_exclude=list_exclude)
+
+    #  Workers only attach to sample bank (if already written by origin
+    #  process). ga_runner of origin process attaches sample bank on
+    #  unpickling in every worker, anyway.
+    if samplebank.has_sample_bank(path=path_sample_bank):
+        samplebank.attach_sample_bank(mc_run=mc_run, path=path_sample_bank)
+else:
+    path_sample_bank = None
+
+    if do_resume:
+        msg = 'Resume GA run without sample bank. Thus, samples are ' \
+              'redrawn. Resume is only possible, if samples are identical ' \
+              'to samples of interrupted run (e.g. loaded sample files), ' \
+              'which is checked with samples hash of checkpoint.'
+        warnings.warn(msg)
+
 #  Initialize GA runner object
 #  ####################################################################
 ga_runner = GARunner(mc_runner=mc_run,
                      nb_runs=nb_runs,
-                     failure_tolerance=failure_tolerance)
+                     failure_tolerance=failure_tolerance,
+                     path_sample_bank=path_sample_bank)
 
 #  Perform reference mc run for rescaled boiler system (necessary to
 #  use dimensionless quantifiers for fitnesses)
@@ -760,39 +1113,22 @@ if (objective == 'mc_dimless_eco_em_2d_mean'
         or objective == 'mc_dimless_eco_em_2d_std'
         or objective == 'mc_dimless_eco_em_3d_std'
 ):
-    #  Perform reference system mc run (4x rescaled boiler)
-
-    #  Copy city, only use boilers
-    city_copy = copy.deepcopy(city)
-
-    #  Add to copy of mc_runner --> Perform mc run
-    addbes.gen_boiler_ref_scenario(city=city_copy)
-
-    #  Copy mc_runner obj. of ga_runner
-    mc_run_ref = copy.deepcopy(ga_runner.mc_runner)
-
-    #  Replace city object with city_copy
-    mc_run_ref._city_eco_calc.energy_balance.city = city_copy
-
+    #  Perform reference system mc run (4x rescaled boiler) or load
+    #  persisted results of identical city, samples and MC settings
     nb_runs = ga_runner.nb_runs
 
-    #  Run MC analysis
-    (dict_mc_res, dict_mc_setup, dict_mc_cov) = \
-        mc_run_ref.perform_mc_runs(nb_runs=nb_runs,
-                                   sampling_method=sampling_method,
-                                   eeg_pv_limit=eeg_pv_limit,
-                                   use_kwkg_lhn_sub=use_kwkg_lhn_sub,
-                                   el_mix_for_chp=el_mix_for_chp,
-                                   el_mix_for_pv=el_mix_for_pv,
-                                   heating_off=heating_off
-                                   )
-
     #  Save results to dict
-    ga_runner._dict_mc_res_ref = dict_mc_res
-
-    if len(dict_mc_setup['idx_failed_runs']) > 0:
-        msg = 'Reference run (rescaled boilers) failed!'
-        raise AssertionError(msg)
+    ga_runner._dict_mc_res_ref = \
+        refrun.perform_ref_mc_run(city=city,
+                                  mc_run=ga_runner.mc_runner,
+                                  nb_runs=nb_runs,
+                                  sampling_method=sampling_method,
+                                  eeg_pv_limit=eeg_pv_limit,
+                                  use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                                  el_mix_for_chp=el_mix_for_chp,
+                                  el_mix_for_pv=el_mix_for_pv,
+                                  heating_off=heating_off,
+                                  path_cache=path_ref_cache)
 
 if (objective == 'ann_and_co2_dimless_ref'
         or objective == 'ann_and_co2_dimless_ref_3d'):
@@ -838,6 +1174,107 @@ if (objective == 'ann_and_co2_dimless_ref'
     print('Reference emissions in kg/a: ')
     print(round(co2_ref, 2))
 
+#  Settings of adaptive MC runs
+if use_adaptive_mc:
+    dict_adaptive_mc = {'batch_size': mc_batch_size,
+                        'min_runs': mc_min_runs,
+                        'rel_tol': mc_rel_tol,
+                        'conf_z': mc_conf_z}
+else:
+    dict_adaptive_mc = None
+
+#  Settings of dominance racing
+if use_racing:
+    if not use_adaptive_mc:
+        msg = 'use_racing requires use_adaptive_mc to be True.'
+        raise AssertionError(msg)
+
+    if objfkt.get_objective(objective=objective)[2]:
+        msg = 'use_racing does not support 3d objective ' + str(objective)
+        raise AssertionError(msg)
+
+    dict_racing = {'path_front': path_front,
+                   'conf_z': racing_conf_z}
+
+    #  Remove front of former GA run (only origin process, SCOOP workers
+    #  re-execute module level code)
+    if __name__ == '__main__' and os.path.exists(path_front):
+        os.remove(path_front)
+else:
+    dict_racing = None
+
+#  Hash of MC samples prevents reuse of fitness values and MC results of
+#  former run with other samples (e.g. redrawn samples in reused log folder)
+samples_hash = refrun.calc_samples_hash(mc_run=ga_runner.mc_runner,
+                                        list_exclude=list_exclude)
+
+#  Initialize fitness cache
+#  ####################################################################
+if use_fitness_cache:
+    #  All settings, which influence fitness values
+    dict_cache_settings = {'objective': objective,
+                           'nb_runs': nb_runs,
+                           'sampling_method': sampling_method,
+                           'risk_fac_av': risk_fac_av,
+                           'risk_fac_friendly': risk_fac_friendly,
+                           'failure_tolerance': failure_tolerance,
+                           'city_name': city_name,
+                           'dem_unc': dem_unc,
+                           'heating_off': heating_off,
+                           'use_street': use_street,
+                           'eeg_pv_limit': eeg_pv_limit,
+                           'use_kwkg_lhn_sub': use_kwkg_lhn_sub,
+                           'chp_switch_pen': chp_switch_pen,
+                           'max_switch': max_switch,
+                           'el_mix_for_chp': el_mix_for_chp,
+                           'el_mix_for_pv': el_mix_for_pv,
+                           'dict_adaptive_mc': dict_adaptive_mc,
+                           'dict_racing': dict_racing,
+                           'crn_seed': crn_seed,
+                           'samples_hash': samples_hash}
+
+    fitness_cache = fitcache.FitnessCache(path=path_fitness_cache,
+                                          dict_settings=dict_cache_settings)
+else:
+    fitness_cache = None
+
+#  Initialize MC result archive
+#  ####################################################################
+if use_mc_archive:
+    #  All settings, which influence MC results
+    dict_archive_settings = {'nb_runs': nb_runs,
+                             'sampling_method': sampling_method,
+                             'failure_tolerance': failure_tolerance,
+                             'city_name': city_name,
+                             'dem_unc': dem_unc,
+                             'heating_off': heating_off,
+                             'use_street': use_street,
+                             'eeg_pv_limit': eeg_pv_limit,
+                             'use_kwkg_lhn_sub': use_kwkg_lhn_sub,
+                             'el_mix_for_chp': el_mix_for_chp,
+                             'el_mix_for_pv': el_mix_for_pv,
+                             'dict_adaptive_mc': dict_adaptive_mc,
+                             'dict_racing': dict_racing,
+                             'crn_seed': crn_seed,
+                             'samples_hash': samples_hash}
+
+    mc_archive = mcarch.McResultArchive(path=path_mc_archive,
+                                        dict_settings=dict_archive_settings)
+
+    if __name__ == '__main__':
+        #  Save settings to reopen archive in postprocessing (see
+        #  reevaluate_par_frontier.py)
+        pickle.dump(dict_archive_settings,
+                    open(path_archive_settings, mode='wb'))
+
+    if ga_runner._dict_mc_res_ref is not None:
+        #  Archive MC results of reference system (rescaled boilers)
+        mc_archive.put_by_hash(ind_hash=mcarch.ref_key,
+                               dict_mc_res=ga_runner._dict_mc_res_ref,
+                               list_idx_failed=[])
+else:
+    mc_archive = None
+
 #  Create types
 #  ####################################################################
 #  Create fitness and individuum types
@@ -905,29 +1342,38 @@ toolbox.register('population', tools.initRepeat, list, toolbox.individual)
 
 #  Add evaluate function
 #  ####################################################################
-# ga_runner_copy = copy.deepcopy(ga_runner)
-toolbox.register('evaluate', eval.eval_obj,
-                 ga_runner=ga_runner,
-                 dict_restr=dict_restr,
-                 objective=objective,
-                 use_street=use_street,
-                 eeg_pv_limit=eeg_pv_limit,
-                 dict_max_pv_area=dict_max_pv_area,
-                 dict_sh=dict_sh, pv_min=pv_min,
-                 pv_step=pv_step, use_pv=use_pv,
-                 add_pv_prop=add_pv_prop,
-                 sampling_method=sampling_method,
-                 use_kwkg_lhn_sub=use_kwkg_lhn_sub,
-                 chp_switch_pen=chp_switch_pen,
-                 max_switch=max_switch,
-                 risk_fac_av=risk_fac_av,
-                 risk_fac_friendly=risk_fac_friendly,
-                 el_mix_for_chp=el_mix_for_chp,
-                 el_mix_for_pv=el_mix_for_pv,
-                 heating_off=heating_off,
-                 prevent_boi_lhn=prevent_boi_lhn,
-                 dict_heatloads=dict_heatloads
-                 )
+#  Keyword arguments of evaluation function (except individuum and ga_runner)
+dict_eval_kwargs = {'dict_restr': dict_restr,
+                    'objective': objective,
+                    'use_street': use_street,
+                    'eeg_pv_limit': eeg_pv_limit,
+                    'dict_max_pv_area': dict_max_pv_area,
+                    'dict_sh': dict_sh,
+                    'pv_min': pv_min,
+                    'pv_step': pv_step,
+                    'use_pv': use_pv,
+                    'add_pv_prop': add_pv_prop,
+                    'sampling_method': sampling_method,
+                    'use_kwkg_lhn_sub': use_kwkg_lhn_sub,
+                    'chp_switch_pen': chp_switch_pen,
+                    'max_switch': max_switch,
+                    'risk_fac_av': risk_fac_av,
+                    'risk_fac_friendly': risk_fac_friendly,
+                    'el_mix_for_chp': el_mix_for_chp,
+                    'el_mix_for_pv': el_mix_for_pv,
+                    'heating_off': heating_off,
+                    'prevent_boi_lhn': prevent_boi_lhn,
+                    'dict_heatloads': dict_heatloads,
+                    'fitness_cache': fitness_cache,
+                    'use_incremental': use_incremental_eval,
+                    'incr_max_units': incr_max_units,
+                    'dict_adaptive_mc': dict_adaptive_mc,
+                    'dict_racing': dict_racing,
+                    'crn_seed': crn_seed,
+                    'mc_archive': mc_archive}
+
+toolbox.register('evaluate', eval.eval_obj, ga_runner=ga_runner,
+                 **dict_eval_kwargs)
 
 # # Test section
 # bit = toolbox.parse_city_to_ind()
@@ -960,7 +1406,8 @@ toolbox.register('crossover', cx.cx_tournament, prob_cx=prob_cx,
                  pv_min=pv_min, pv_step=pv_step, use_pv=use_pv,
                  add_pv_prop=add_pv_prop,
                  prevent_boi_lhn=prevent_boi_lhn,
-                 dict_heatloads=dict_heatloads
+                 dict_heatloads=dict_heatloads,
+                 dirty_checks=use_dirty_checks
                  )
 
 #  Add mutation function
@@ -996,16 +1443,62 @@ toolbox.register('mutate', muta.do_mutate,
 #  Register selection function function as select
 toolbox.register("select", selec.do_selection, objective=objective)
 
+if use_batch_ops:
+    #  Batched crossover and mutation operators (population matrix)
+    batch_ops = batchops.BatchOperators(
+        codec=genom.GenomeCodec(list_build_ids=ga_runner._list_build_ids,
+                                dict_restr=dict_restr),
+        dict_restr=dict_restr,
+        dict_max_pv_area=dict_max_pv_area,
+        pv_min=pv_min, pv_step=pv_step,
+        dict_sh=dict_sh, dict_heatloads=dict_heatloads,
+        prob_mut=prob_mut,
+        list_prob_mute_type=list_prob_mute_type,
+        list_options=list_options, list_opt_prob=list_opt_prob,
+        list_lhn_opt=list_lhn_opt, list_lhn_prob=list_lhn_prob,
+        use_bat=use_bat, use_pv=use_pv,
+        add_pv_prop=add_pv_prop, add_bat_prob=add_bat_prob)
+
+    #  LHN mutation, only (per individuum)
+    toolbox.register('mutate_lhn', toolbox.mutate,
+                     list_prob_lhn_and_esys=[0, 1, 0])
+
+    toolbox.register('check_ind', checkval.run_all_checks,
+                     dict_max_pv_area=dict_max_pv_area,
+                     dict_restr=dict_restr, dict_sh=dict_sh,
+                     pv_min=pv_min, pv_step=pv_step, use_pv=use_pv,
+                     add_pv_prop=add_pv_prop,
+                     prevent_boi_lhn=prevent_boi_lhn,
+                     dict_heatloads=dict_heatloads)
+
 if __name__ == '__main__':
 
+    if use_worker_context:
+        #  Save ga_runner and evaluation settings once. Workers load them
+        #  a single time and only receive individuals afterwards
+        worker.save_worker_setup(path=path_worker_setup,
+                                 ga_runner=ga_runner,
+                                 dict_eval_kwargs=dict_eval_kwargs)
+
+        toolbox.register('evaluate', worker.eval_ind)
+
     if use_scoop:
         toolbox.register("map", futures.map)
 
+        if use_worker_context:
+            #  Share path to worker setup file with all SCOOP workers
+            shared.setConst(path_worker_setup=path_worker_setup)
+
         print('Start multiprocessing using SCOOP')
 
     else:
         #  Use multiprocessing
-        pool = multiprocessing.Pool(processes=nb_processes)
+        if use_worker_context:
+            pool = multiprocessing.Pool(processes=nb_processes,
+                                        initializer=worker.init_worker,
+                                        initargs=(path_worker_setup,))
+        else:
+            pool = multiprocessing.Pool(processes=nb_processes)
 
         #  Enable multiprocessing usage
         toolbox.register("map", pool.map)
@@ -1022,174 +1515,598 @@ if __name__ == '__main__':
     #  initialize halloffame to store best individuums
     halloffame = tools.HallOfFame(size_hof)
 
-    print('Initialze population')
-    print('#######################################################')
+    if use_fidelity:
+        if fid_list_nb_runs[-1] != nb_runs:
+            msg = 'Last value of fid_list_nb_runs has to be equal to ' \
+                  'nb_runs (' + str(nb_runs) + ').'
+            raise AssertionError(msg)
 
-    #  Generate population
-    #  # Generate diverse initial population
-    if init_diverse:
-        pop = pickle.load(open(path_pop, mode='rb'))
+        fidelity = fidel.FidelitySchedule(list_nb_runs=fid_list_nb_runs,
+                                          rel_tol=fid_rel_tol,
+                                          nb_stall_gen=fid_nb_stall_gen,
+                                          max_stage_gen=fid_max_stage_gen)
 
-        if len(pop) != nb_ind:
-            msg = 'Population length ' \
-                  + str(len(pop)) + ' is different from number of desired ' \
-                                    'individuals ' + str(nb_ind) + '!'
-            raise AssertionError(msg)
+        #  Evaluate with nb. of MC runs of current fidelity stage
+        evaluate_full = toolbox.evaluate
+        toolbox.register('evaluate', evaluate_full,
+                         nb_runs=fidelity.get_nb_runs())
     else:
-        #  # Generate population with same individuals
-        pop = toolbox.population(n=nb_ind)
+        fidelity = None
 
-    # Evaluate fitnesses of start population
-    print('Evaluate initial population')
-    fitnesses = toolbox.map(toolbox.evaluate, pop)
+    if use_steady_state and (use_surrogate or use_fidelity):
+        msg = 'use_steady_state cannot be combined with use_surrogate or ' \
+              'use_fidelity.'
+        raise AssertionError(msg)
 
-    #  Save fitness values to each individuum
-    for ind, fit in zip(pop, fitnesses):
-        ind.fitness.values = fit
+    if use_islands and (use_scoop or use_steady_state or use_surrogate
+                        or use_fidelity or use_racing):
+        msg = 'use_islands requires use_scoop to be False and cannot be ' \
+              'combined with use_steady_state, use_surrogate, ' \
+              'use_fidelity or use_racing.'
+        raise AssertionError(msg)
 
-    # Write system print statements to log file
-    sys.stdout = log_file
+    if do_resume and (use_steady_state or use_islands):
+        msg = 'resume_run is only possible with generational loop ' \
+              '(use_steady_state and use_islands have to be False).'
+        raise AssertionError(msg)
 
-    print('Evaluated %i individuals' % len(pop))
+    if do_resume:
+        #  Load checkpoint of interrupted run
+        dict_checkpoint = checkp.load_checkpoint(path=path_checkpoint)
 
-    print('Initial Population:')
-    for i in pop:
-        print('Individuum: ', i)
-        print('Fitness: ', i.fitness.values)
-    print()
+        if dict_checkpoint.get('samples_hash') != samples_hash:
+            msg = 'Samples differ from samples of checkpoint (e.g. ' \
+                  'redrawn without sample bank). Cannot resume GA run ' \
+                  'with other samples.'
+            raise AssertionError(msg)
 
-    # Initial offspring is created by cloning
-    selected = list(map(toolbox.clone, pop))
+        if (fitness_cache is not None
+                and dict_checkpoint['cache_settings_key']
+                != fitness_cache.settings_key):
+            msg = 'Settings of fitness cache differ from settings of ' \
+                  'checkpoint. Cannot resume GA run with other settings.'
+            raise AssertionError(msg)
 
-    #  Dummy value
-    parents = None
-    list_ind = None
+        if fidelity is not None:
+            #  Continue with fidelity stage of checkpoint
+            fidelity = dict_checkpoint['fidelity']
+            toolbox.register('evaluate', evaluate_full,
+                             nb_runs=fidelity.get_nb_runs())
 
-    for g in range(ngen):
-        print('Generation ', g)
-        print('#######################################################')
+    #  Fitness cache of current fidelity stage (used for deduplication)
+    if fitness_cache is not None and fidelity is not None:
+        fitness_cache_stage = fitness_cache.with_settings(
+            {'nb_runs': fidelity.get_nb_runs()})
+    else:
+        fitness_cache_stage = fitness_cache
 
-        # Select the next generations individuals from parents + offspring
-        if g != 0:
-            selected = toolbox.select(parents=parents, invalid_ind=list_ind,
-                                      nb_ind=nb_ind,
-                                      objective=objective)
+    print('Initialze population')
+    print('#######################################################')
 
-        # Clone selected individuals
-        parents = list(map(toolbox.clone, selected))
-        newoffspring = list(map(toolbox.clone, selected))
+    if do_resume:
+        #  Continue with state of checkpoint (without re-evaluation)
+        g_start = dict_checkpoint['gen']
+        pop = dict_checkpoint['pop']
+        halloffame = dict_checkpoint['halloffame']
+        logbook = dict_checkpoint['logbook']
 
-        #  Replace population with new offspring
-        pop[:] = parents
+        if use_surrogate:
+            surrogate = dict_checkpoint['surrogate']
 
-        #  Store population to stats
-        record = stats.compile(pop)
+        # Write system print statements to log file
+        sys.stdout = log_file
 
-        print('Population of generation ', g, ':')
-        for i in pop:
-            print(i, 'fitness: ', i.fitness.values)
+        print('Resume GA run at generation ', g_start)
+        print()
 
-        # Deactivate plotting to logfile
-        sys.stdout = sys.__stdout__
+    else:
+        g_start = 0
+
+        #  Generate population
+        #  # Generate diverse initial population
+        if init_diverse:
+            pop = pickle.load(open(path_pop, mode='rb'))
+
+            if len(pop) != nb_ind:
+                msg = 'Population length ' + str(len(pop)) \
+                      + ' is different from number of desired ' \
+                        'individuals ' + str(nb_ind) + '!'
+                raise AssertionError(msg)
+        else:
+            #  # Generate population with same individuals
+            pop = toolbox.population(n=nb_ind)
+
+        # Evaluate fitnesses of start population
+        print('Evaluate initial population')
+        (fitnesses, dict_dedup) = \
+            eval.eval_population(list_ind=pop, evaluate=toolbox.evaluate,
+                                 map_func=toolbox.map,
+                                 fitness_cache=fitness_cache_stage)
+
+        #  Save fitness values to each individuum
+        for ind, fit in zip(pop, fitnesses):
+            ind.fitness.values = fit
 
-        #  Perform evolution (crossover)
-        offspring = toolbox. \
-            crossover(newoffspring,
-                      prob_cx=prob_cx,
-                      dict_max_pv_area=dict_max_pv_area,
-                      nb_part=nb_part_cx)
-
-        #  Perform evolution (mutation)
-        new_offspring = []
-        for ind_mut in offspring:
-            if random.random() < prob_mutation:
-                ind_mut = toolbox.mutate(ind_mut)
-                del ind_mut.fitness.values
-            new_offspring.append(ind_mut)
-        # Overwrite offspring
-        offspring = new_offspring
+        if use_surrogate:
+            #  Train surrogate model with initial population
+            surrogate = surro.Surrogate(weights=creator.Fitness.weights,
+                                        min_train=surrogate_min_train)
+            surrogate.add_samples(list_ind=pop,
+                                  list_fitness=[ind.fitness.values
+                                                for ind in pop])
+            surrogate.fit()
 
-        #  Write system print statements to log file
+        # Write system print statements to log file
         sys.stdout = log_file
 
-        print('Offspring after crossover and mutation call:')
-        for ind_off in offspring:
-            print(str(ind_off))
-            print('Fitness: ' + str(ind_off.fitness.values))
+        print('Evaluated %i individuals' % len(pop))
+
+        print('Initial Population:')
+        for i in pop:
+            print('Individuum: ', i)
+            print('Fitness: ', i.fitness.values)
         print()
 
+    if use_steady_state:
+        #  Asynchronous steady-state GA loop
+        #  ###############################################################
+        if use_scoop:
+            evaluator = steady.AsyncEvaluator(evaluate=toolbox.evaluate)
+        else:
+            evaluator = steady.AsyncEvaluator(evaluate=toolbox.evaluate,
+                                              pool=pool)
+
+        if use_racing:
+            #  Share first front of start population with workers
+            first_front = tools.sortNondominated(pop, len(pop),
+                                                 first_front_only=True)[0]
+            racing.save_front(path=path_front,
+                              list_fitness=[ind.fitness.values
+                                            for ind in first_front])
+
+        def log_generation(gen, pop, list_ind_gen):
+            """
+            Log generation equivalent (nb_ind finished evaluations) of
+            steady-state loop
+
+            Returns
+            -------
+            stop : bool
+                True, if standard deviation break criterion is reached
+            """
+
+            #  Write system print statements to log file
+            sys.stdout = log_file
+
+            print('Generation ', gen)
+            print('#######################################################')
+
+            for ind in list_ind_gen:
+                print('Mutated/crossovered individuum: ', ind)
+                print('Fitness values: ', ind.fitness.values)
+                print()
+
+            print('Population of generation ', gen, ':')
+            for i in pop:
+                print(i, 'fitness: ', i.fitness.values)
+            print()
+
+            if fitness_cache is not None:
+                (nb_hits, nb_misses) = fitness_cache.get_stats()
+                print('Fitness cache hits: ', nb_hits)
+                print('Fitness cache misses: ', nb_misses)
+                print()
+
+            if use_racing:
+                first_front = tools.sortNondominated(pop, len(pop),
+                                                     first_front_only=True)[0]
+                racing.save_front(path=path_front,
+                                  list_fitness=[ind.fitness.values
+                                                for ind in first_front])
+
+            #  Store population to stats
+            record = stats.compile(pop)
+
+            halloffame.update(pop)
+
+            logbook.record(gen=gen, evals=len(list_ind_gen), **record)
+
+            #  Save population as pickle file
+            if save_pop:
+                name_pop = 'population_' + str(gen) + '.pkl'
+                path_pop = os.path.join(workspace, 'output', 'ga_opt',
+                                        log_folder, name_pop)
+                pickle.dump(pop, open(path_pop, mode='wb'))
+
+            stop = False
+
+            if gen > nb_min_gen:
+                (stall, ref_obj_0, ref_obj_1) = \
+                    is_std_stall(logbook=logbook, nb_min_gen=nb_min_gen,
+                                 std_break=std_break)
+
+                if stall:
+                    print('Stop iteration, as standard deviation over the '
+                          'last' + str(nb_min_gen) + ' generations is '
+                          'smaller than  ' + str(std_break)
+                          + ' % of fitness values ' + str(ref_obj_0)
+                          + ' and ' + str(ref_obj_1))
+                    stop = True
+
+            # Deactivate plotting to logfile
+            sys.stdout = sys.__stdout__
+
+            return stop
+
         # Deactivate plotting to logfile
         sys.stdout = sys.__stdout__
 
-        #  Evaluate all mutated individuals to add new fitness value
+        nb_done = steady.run_steady_state(pop=pop, toolbox=toolbox,
+                                          evaluator=evaluator,
+                                          nb_ind=nb_ind,
+                                          nb_evals=ngen * nb_ind,
+                                          prob_mutation=prob_mutation,
+                                          nb_parallel=ss_nb_parallel,
+                                          objective=objective,
+                                          callback=log_generation)
+
+        print('Nb. of finished evaluations (steady-state): ', nb_done)
+
+    elif use_islands:
+        #  Island model (one process with own worker pool per island)
         #  ###############################################################
-        list_ind_temp = [ind for ind in offspring if not ind.fitness.valid]
+        #  Island processes generate own pools
+        pool.close()
+        pool.join()
+
+        if use_worker_context:
+            pool_initializer = worker.init_worker
+            pool_initargs = (path_worker_setup,)
+        else:
+            pool_initializer = None
+            pool_initargs = ()
+
+        #  Close database connections, as forked island processes must not
+        #  share SQLite connections of master process (reopened on access)
+        if fitness_cache is not None:
+            fitness_cache.close()
+        if mc_archive is not None:
+            mc_archive.close()
 
-        #  Check if individuum is already in parent generation
-        list_ind = [ind for ind in list_ind_temp if ind not in parents]
+        # Deactivate plotting to logfile
+        sys.stdout = sys.__stdout__
 
-        #  Evaluate fitness values for list of
-        fitnesses = toolbox.map(toolbox.evaluate, list_ind)
+        print('Start island model with ' + str(nb_islands) + ' islands.')
+
+        (list_pop, list_logbook, list_nb_immigrants) = \
+            islands.run_islands(pop=pop, toolbox=toolbox,
+                                nb_islands=nb_islands, ngen=ngen,
+                                prob_mutation=prob_mutation,
+                                objective=objective,
+                                mig_interval=mig_interval,
+                                nb_migrants=nb_migrants,
+                                topology=mig_topology,
+                                nb_processes=nb_processes,
+                                pool_initializer=pool_initializer,
+                                pool_initargs=pool_initargs,
+                                stats=stats,
+                                folder_log=folder_path,
+                                folder_pop=folder_path if save_pop
+                                else None)
 
         #  Write system print statements to log file
         sys.stdout = log_file
 
-        #  Save new fitness values to individuums
-        for ind, fit in zip(list_ind, fitnesses):
-            print('Mutated/crossovered individuum: ', ind)
-            print('Fitness values: ', fit)
-            print()
-            ind.fitness.values = fit
+        #  Merge island populations and logbooks
+        pop = []
+        for i in range(nb_islands):
+            print('Island ', i, ': Nb. of received immigrants: ',
+                  list_nb_immigrants[i])
+            pop.extend(list_pop[i])
 
-        # Deactivate plotting to logfile
-        sys.stdout = sys.__stdout__
+            for entry in list_logbook[i]:
+                logbook.record(island=i, **entry)
+        print()
 
-        # Update the hall of fame by the best individuals from offspring
         halloffame.update(pop)
 
-        #  Store the record to the logbook
-        logbook.record(gen=0, evals=30, **record)
-
-        #  Save population as pickle file
-        if save_pop:
-            name_pop = 'population_' + str(g) + '.pkl'
-            path_pop = os.path.join(workspace, 'output', 'ga_opt', log_folder,
-                                    name_pop)
-            pickle.dump(pop, open(path_pop, mode='wb'))
-
-        #  Check if minimum number of generations has been processed to 
-        #  check if GA execution can terminate
-        if g > nb_min_gen:
-
-            obj_0 = np.zeros(nb_min_gen)
-            obj_1 = np.zeros(nb_min_gen)
-
-            count = 0
-            #  Get lat nb_min_gen number of results out of logbook
-            for n in range(len(logbook) - 1 - nb_min_gen,
-                           len(logbook) - 1):
-                obj_0[count] = logbook[n]["max"][0]
-                obj_1[count] = logbook[n]["max"][1]
-                count += 1
-
-            # Calculate standard deviations
-            std_dev0 = np.std(obj_0)
-            std_dev1 = np.std(obj_1)
-
-            ref_obj_0 = obj_0[0]
-            ref_obj_1 = obj_1[0]
-
-            #  If both std are below std_break, exit iteration
-            if (std_dev0 < std_break * ref_obj_0
-                    and std_dev1 < std_break * ref_obj_1):
-                #  Write system print statements to log file
-                sys.stdout = log_file
-                print('Stop iteration, as standard deviation over the last'
-                      + str(nb_min_gen) + ' generations is smaller than  '
-                      + str(std_break) + ' % of fitness values '
-                      + str(ref_obj_0) + ' and '
-                      + str(ref_obj_1))
-                break
+    else:
+        # Initial offspring is created by cloning
+        selected = list(map(toolbox.clone, pop))
+
+        if do_resume:
+            #  Parents and evaluated offspring of last generation
+            parents = dict_checkpoint['parents']
+            list_ind = dict_checkpoint['list_ind']
+
+            #  Continue with random states of checkpoint
+            checkp.set_rng_state(dict_rng=dict_checkpoint['dict_rng'])
+        else:
+            #  Dummy value
+            parents = None
+            list_ind = None
+
+        for g in range(g_start, ngen):
+            print('Generation ', g)
+            print('#######################################################')
+
+            # Select the next generations individuals from parents + offspring
+            if g != 0:
+                selected = toolbox.select(parents=parents,
+                                          invalid_ind=list_ind,
+                                          nb_ind=nb_ind,
+                                          objective=objective)
+
+            # Clone selected individuals
+            parents = list(map(toolbox.clone, selected))
+
+            if fidelity is not None:
+                first_front = tools.sortNondominated(parents, len(parents),
+                                                     first_front_only=True)[0]
+
+                if fidelity.update(gen=g,
+                                   list_fitness_front=[
+                                       ind.fitness.values
+                                       for ind in first_front]):
+                    print('Raise fidelity to nb_runs: ',
+                          fidelity.get_nb_runs())
+
+                    toolbox.register('evaluate', evaluate_full,
+                                     nb_runs=fidelity.get_nb_runs())
+
+                    if fitness_cache is not None:
+                        fitness_cache_stage = fitness_cache.with_settings(
+                            {'nb_runs': fidelity.get_nb_runs()})
+
+                    #  Re-evaluate survivors with new fidelity
+                    (fitnesses, dict_dedup) = \
+                        eval.eval_population(list_ind=parents,
+                                             evaluate=toolbox.evaluate,
+                                             map_func=toolbox.map,
+                                             fitness_cache=fitness_cache_stage)
+
+                    sys.stdout = log_file
+
+                    for ind, fit in zip(parents, fitnesses):
+                        ind.fitness.values = fit
+
+                    #  Discard fitness values of lower fidelity
+                    halloffame.clear()
+
+                    if use_surrogate:
+                        surrogate = surro.Surrogate(
+                            weights=creator.Fitness.weights,
+                            min_train=surrogate_min_train)
+                        surrogate.add_samples(
+                            list_ind=parents,
+                            list_fitness=[ind.fitness.values
+                                          for ind in parents])
+                        surrogate.fit()
+
+                print('Fidelity stage nb_runs: ', fidelity.get_nb_runs())
+
+            newoffspring = list(map(toolbox.clone, parents))
+
+            #  Replace population with new offspring
+            pop[:] = parents
+
+            if use_racing:
+                #  Share current first front with evaluating workers
+                first_front = tools.sortNondominated(pop, len(pop),
+                                                     first_front_only=True)[0]
+                racing.save_front(path=path_front,
+                                  list_fitness=[ind.fitness.values
+                                                for ind in first_front])
+
+            #  Store population to stats
+            record = stats.compile(pop)
+
+            print('Population of generation ', g, ':')
+            for i in pop:
+                print(i, 'fitness: ', i.fitness.values)
+
+            # Deactivate plotting to logfile
+            sys.stdout = sys.__stdout__
+
+            if use_batch_ops:
+                #  Perform evolution (batched crossover and mutation)
+                if use_lhn:
+                    lhn_mutate = toolbox.mutate_lhn
+                else:
+                    lhn_mutate = None
+                if perform_checks:
+                    check_ind = toolbox.check_ind
+                else:
+                    check_ind = None
+
+                offspring = batch_ops. \
+                    gen_offspring(newoffspring,
+                                  ind_class=creator.Individual,
+                                  prob_cx=prob_cx,
+                                  prob_mutation=prob_mutation,
+                                  nb_part=nb_part_cx,
+                                  list_prob_lhn_and_esys=
+                                  list_prob_lhn_and_esys,
+                                  lhn_mutate=lhn_mutate,
+                                  check_ind=check_ind)
+            else:
+                #  Perform evolution (crossover)
+                offspring = toolbox. \
+                    crossover(newoffspring,
+                              prob_cx=prob_cx,
+                              dict_max_pv_area=dict_max_pv_area,
+                              nb_part=nb_part_cx)
+
+                #  Perform evolution (mutation)
+                new_offspring = []
+                for ind_mut in offspring:
+                    if random.random() < prob_mutation:
+                        ind_mut = toolbox.mutate(ind_mut)
+                        del ind_mut.fitness.values
+                    new_offspring.append(ind_mut)
+                # Overwrite offspring
+                offspring = new_offspring
+
+            #  Write system print statements to log file
+            sys.stdout = log_file
+
+            print('Offspring after crossover and mutation call:')
+            for ind_off in offspring:
+                print(str(ind_off))
+                print('Fitness: ' + str(ind_off.fitness.values))
+            print()
+
+            # Deactivate plotting to logfile
+            sys.stdout = sys.__stdout__
+
+            #  Evaluate all mutated individuals to add new fitness value
+            #  ###############################################################
+            list_ind_temp = [ind for ind in offspring if not ind.fitness.valid]
+
+            #  Check if individuum is already in parent generation
+            list_ind = [ind for ind in list_ind_temp if ind not in parents]
+
+            list_ind_eval = list_ind
+            list_ind_skip = []
+            matrix_pred = None
+
+            if use_surrogate and surrogate.trained:
+                #  Pre-screen offspring with surrogate model
+                first_front = tools.sortNondominated(parents, len(parents),
+                                                     first_front_only=True)[0]
+                (list_ind_eval, list_ind_skip, matrix_pred, list_fit_skip) = \
+                    surrogate.prescreen(list_ind=list_ind,
+                                        list_front_fitness=[ind.fitness.values
+                                                            for ind in
+                                                            first_front],
+                                        conf_z=surrogate_conf_z)
+
+                for ind, fit in zip(list_ind_skip, list_fit_skip):
+                    ind.fitness.values = fit
+
+            #  Evaluate fitness values for list of (unique) individuals
+            (fitnesses, dict_dedup) = \
+                eval.eval_population(list_ind=list_ind_eval,
+                                     evaluate=toolbox.evaluate,
+                                     map_func=toolbox.map,
+                                     fitness_cache=fitness_cache_stage)
+
+            #  Write system print statements to log file
+            sys.stdout = log_file
+
+            print('Nb. of individuals to evaluate: ', dict_dedup['nb_inds'])
+            print('Nb. of unique individuals: ', dict_dedup['nb_unique'])
+            print('Nb. of cached unique individuals: ',
+                  dict_dedup['nb_cached'])
+            print('Unique work ratio: ', round(dict_dedup['work_ratio'], 3))
+            print()
+
+            #  Save new fitness values to individuums
+            for ind, fit in zip(list_ind_eval, fitnesses):
+                print('Mutated/crossovered individuum: ', ind)
+                print('Fitness values: ', fit)
+                print()
+                ind.fitness.values = fit
+
+            if use_surrogate:
+                list_fit_eval = [ind.fitness.values for ind in list_ind_eval]
+
+                print('Surrogate: Skipped evaluations: ', len(list_ind_skip),
+                      ' of ', len(list_ind))
+                for ind in list_ind_skip:
+                    print('Skipped individuum: ', ind)
+                    print('Estimated fitness values: ', ind.fitness.values)
+
+                if matrix_pred is not None:
+                    array_error = \
+                        surro.calc_pred_error(matrix_pred=matrix_pred,
+                                              list_fitness=list_fit_eval)
+                    print('Surrogate: Mean rel. prediction error per '
+                          'objective: ', array_error)
+                print()
+
+                #  Retrain surrogate with newly evaluated individuals
+                surrogate.add_samples(list_ind=list_ind_eval,
+                                      list_fitness=list_fit_eval)
+                surrogate.fit()
+
+            if fitness_cache is not None:
+                (nb_hits, nb_misses) = fitness_cache_stage.get_stats()
+                print('Fitness cache hits: ', nb_hits)
+                print('Fitness cache misses: ', nb_misses)
+
+                if use_adaptive_mc:
+                    (nb_inds_mc, nb_runs_total) = \
+                        fitness_cache_stage.get_nb_runs_stats()
+                    if nb_inds_mc > 0:
+                        print('Mean nb. of performed MC runs per individuum: ',
+                              round(nb_runs_total / nb_inds_mc, 2))
+                print()
+
+            # Deactivate plotting to logfile
+            sys.stdout = sys.__stdout__
+
+            # Update the hall of fame by the best individuals from offspring
+            halloffame.update(pop)
+
+            #  Store the record to the logbook
+            logbook.record(gen=0, evals=30, **record)
+
+            #  Save population as pickle file
+            if save_pop:
+                name_pop = 'population_' + str(g) + '.pkl'
+                path_pop = os.path.join(workspace, 'output', 'ga_opt',
+                                        log_folder, name_pop)
+                pickle.dump(pop, open(path_pop, mode='wb'))
+
+            #  Save checkpoint to resume run with next generation
+            if use_checkpoint and (g + 1) % checkpoint_interval == 0:
+                if fitness_cache is not None:
+                    fitness_cache.flush()
+                    cache_settings_key = fitness_cache.settings_key
+                else:
+                    cache_settings_key = None
+
+                if use_surrogate:
+                    surrogate_state = surrogate
+                else:
+                    surrogate_state = None
+
+                checkp.save_checkpoint(path=path_checkpoint,
+                                       dict_state={
+                                           'gen': g + 1,
+                                           'pop': pop,
+                                           'parents': parents,
+                                           'list_ind': list_ind,
+                                           'halloffame': halloffame,
+                                           'logbook': logbook,
+                                           'fidelity': fidelity,
+                                           'surrogate': surrogate_state,
+                                           'cache_settings_key':
+                                               cache_settings_key,
+                                           'samples_hash': samples_hash})
+
+            #  Check if minimum number of generations has been processed to 
+            #  check if GA execution can terminate
+            if g > nb_min_gen and (fidelity is None
+                                   or (fidelity.is_final()
+                                       and g - fidelity.gen_stage_start
+                                       > nb_min_gen)):
+
+                (stall, ref_obj_0, ref_obj_1) = \
+                    is_std_stall(logbook=logbook, nb_min_gen=nb_min_gen,
+                                 std_break=std_break)
+
+                #  If both std are below std_break, exit iteration
+                if stall:
+                    #  Write system print statements to log file
+                    sys.stdout = log_file
+                    print('Stop iteration, as standard deviation over the last'
+                          + str(nb_min_gen) + ' generations is smaller than  '
+                          + str(std_break) + ' % of fitness values '
+                          + str(ref_obj_0) + ' and '
+                          + str(ref_obj_1))
+                    break
 
     # Write system print statements to log file
     sys.stdout = log_file
@@ -1225,6 +2142,10 @@ if __name__ == '__main__':
     pickle.dump(logbook, open(path_logbook, mode='wb'))
     print()
 
+    if fitness_cache is not None:
+        #  Write hit/miss counts of origin process and close database
+        fitness_cache.close()
+
     time_stop = time.time()
 
     print('Required runtime for execution in hours: ')
@@ -0,0 +1,338 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding compact array-backed genome representation of individuals.
+
+The dict representation of an individuum holds a nested dict with 8 energy
+system sizes per building and a list of lists of LHN subnetworks. The
+genome holds the same information as
+- integer matrix (buildings x esys types) of size indexes into value tables
+  of GenomeCodec (index 0 means, that energy system does not exist) and
+- LHN membership vector (per building, 0: no LHN, k: k-th LHN subnetwork).
+
+Value tables are initialized with dict_restr sizes. Unknown sizes (e.g. PV
+areas or sizes of initial city energy systems) are appended to the value
+tables of the codec, when they are encoded for the first time. Thus, index
+values of genomes are only comparable between genomes of the same codec
+(equality and hash of genomes are based on decoded values).
+
+LHN subnetworks are numbered in order of their first building (building
+ids are sorted), thus identical LHN networks (independent of subnetwork or
+node order) lead to identical membership vectors.
+
+Converters to and from the dict format (GenomeCodec.encode and
+GenomeCodec.decode) keep parse_ind_to_city and postprocessing working.
+"""
+from __future__ import division
+
+import copy
+import numpy as np
+
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+
+#  Energy system keys of single building dict (column order of esys matrix)
+list_esys_keys = ['bat', 'boi', 'chp', 'eh', 'hp_aw', 'hp_ww', 'pv', 'tes']
+
+#  Max. number of values per value table (int16 index)
+max_table_size = np.iinfo(np.int16).max
+
+
+class Genome(object):
+    __slots__ = ('codec', 'esys', 'lhn')
+
+    def __init__(self, codec, esys, lhn):
+        """
+        Constructor of genome
+
+        Parameters
+        ----------
+        codec : object
+            GenomeCodec object (holds building ids and value tables)
+        esys : np.array (of ints)
+            Matrix (nb. of buildings x nb. of esys keys) with indexes into
+            value tables of codec
+        lhn : np.array (of ints)
+            LHN membership vector (per building, 0: no LHN, k: k-th LHN
+            subnetwork)
+        """
+
+        self.codec = codec
+        self.esys = esys
+        self.lhn = lhn
+
+    def copy(self):
+        """
+        Returns copy of genome (arrays are copied, codec is shared)
+
+        Returns
+        -------
+        genome : object
+            Genome object
+        """
+        return self.__deepcopy__(memo={})
+
+    def __copy__(self):
+        return self.__deepcopy__(memo={})
+
+    def __deepcopy__(self, memo):
+        """
+        Copy arrays, but share codec (also used by toolbox.clone)
+        """
+
+        genome = self.__class__.__new__(self.__class__)
+        genome.codec = self.codec
+        genome.esys = self.esys.copy()
+        genome.lhn = self.lhn.copy()
+
+        #  Attributes of subclasses (e.g. fitness of creator.Individual)
+        if hasattr(self, '__dict__'):
+            genome.__dict__.update(copy.deepcopy(self.__dict__, memo))
+
+        return genome
+
+    def __getstate__(self):
+        state = {'codec': self.codec, 'esys': self.esys, 'lhn': self.lhn}
+        if hasattr(self, '__dict__'):
+            state['__dict__'] = self.__dict__
+        return state
+
+    def __setstate__(self, state):
+        self.codec = state['codec']
+        self.esys = state['esys']
+        self.lhn = state['lhn']
+        if '__dict__' in state:
+            self.__dict__.update(state['__dict__'])
+
+    def __eq__(self, other):
+        if isinstance(other, Genome):
+            if other.codec is self.codec:
+                return (np.array_equal(self.esys, other.esys)
+                        and np.array_equal(self.lhn, other.lhn))
+            return self.get_canonical() == other.get_canonical()
+        elif isinstance(other, dict):
+            #  Compare decoded values (encoding would modify codec)
+            return self.get_canonical() == fitcache.get_canonical_ind(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        if res is NotImplemented:
+            return res
+        return not res
+
+    def __hash__(self):
+        #  Index values depend on codec. Thus, hash decoded values (equal
+        #  for equal genomes of different codecs)
+        return hash(self.get_canonical())
+
+    def get_canonical(self):
+        """
+        Returns canonical (hashable, codec independent) representation of
+        genome (see fitness_cache.get_canonical_ind)
+
+        Returns
+        -------
+        tup_canon : tuple
+            Canonical representation of individuum dict of genome
+        """
+        return fitcache.get_canonical_ind(self.to_dict())
+
+    def to_dict(self):
+        """
+        Returns individuum dict of genome
+
+        Returns
+        -------
+        dict_ind : dict
+            Individuum dict
+        """
+        return self.codec.decode(self)
+
+
+class GenomeCodec(object):
+    def __init__(self, list_build_ids, dict_restr=None):
+        """
+        Constructor of genome codec (converter between individuum dicts and
+        genomes)
+
+        Parameters
+        ----------
+        list_build_ids : list (of ints)
+            List of building node ids
+        dict_restr : dict, optional
+            Dict holding possible energy system sizes (default: None). Used
+            to initialize value tables.
+        """
+
+        self.list_build_ids = sorted(list_build_ids)
+
+        self._dict_build_idx = {}
+        for i in range(len(self.list_build_ids)):
+            self._dict_build_idx[self.list_build_ids[i]] = i
+
+        #  Value table per esys key (index 0: esys does not exist)
+        self.list_tables = []
+        #  Value --> index per esys key
+        self._list_dict_idx = []
+
+        for key in list_esys_keys:
+            self.list_tables.append([0])
+            self._list_dict_idx.append({0: 0})
+
+            if dict_restr is not None and key in dict_restr:
+                for value in sorted(dict_restr[key]):
+                    self.get_idx(key_idx=len(self.list_tables) - 1,
+                                 value=value)
+
+    def get_idx(self, key_idx, value):
+        """
+        Returns index of value in value table (appends value, if unknown)
+
+        Parameters
+        ----------
+        key_idx : int
+            Index of esys key in list_esys_keys
+        value : float
+            Energy system size
+
+        Returns
+        -------
+        idx : int
+            Index of value in value table
+        """
+
+        dict_idx = self._list_dict_idx[key_idx]
+
+        if value in dict_idx:
+            return dict_idx[value]
+
+        table = self.list_tables[key_idx]
+
+        if len(table) >= max_table_size:
+            msg = 'Value table of ' + str(list_esys_keys[key_idx]) \
+                  + ' exceeds max. size of ' + str(max_table_size) + '.'
+            raise AssertionError(msg)
+
+        dict_idx[value] = len(table)
+        table.append(value)
+
+        return dict_idx[value]
+
+    def encode(self, ind, genome_class=Genome):
+        """
+        Returns genome of individuum dict
+
+        Parameters
+        ----------
+        ind : dict
+            Individuum dict (building ids of codec and 'lhn' as keys)
+        genome_class : class, optional
+            Genome class or subclass (default: Genome), e.g. individuum
+            class generated with creator of deap
+
+        Returns
+        -------
+        genome : object
+            Genome object
+        """
+
+        nb_build = len(self.list_build_ids)
+
+        esys = np.zeros((nb_build, len(list_esys_keys)), dtype=np.int16)
+
+        for n in self.list_build_ids:
+            i = self._dict_build_idx[n]
+            dict_esys = ind[n]
+            for j in range(len(list_esys_keys)):
+                esys[i, j] = self.get_idx(key_idx=j,
+                                          value=dict_esys[list_esys_keys[j]])
+
+        lhn = np.zeros(nb_build, dtype=np.int16)
+
+        if ind['lhn'] is not None:
+            for sublhn in ind['lhn']:
+                if len(sublhn) == 0:
+                    continue
+
+                #  Temporary label (replaced by canonical label)
+                label = lhn.max() + 1
+
+                for n in sublhn:
+                    if n not in self._dict_build_idx:
+                        msg = 'LHN node ' + str(n) + ' is no building ' \
+                              'node id of genome codec.'
+                        raise AssertionError(msg)
+                    lhn[self._dict_build_idx[n]] = label
+
+        return genome_class(codec=self, esys=esys, lhn=relabel_lhn(lhn))
+
+    def decode(self, genome):
+        """
+        Returns individuum dict of genome
+
+        Parameters
+        ----------
+        genome : object
+            Genome object of this codec
+
+        Returns
+        -------
+        dict_ind : dict
+            Individuum dict (LHN subnetworks and nodes are sorted)
+        """
+
+        if genome.codec is not self:
+            msg = 'Genome has been encoded with other codec.'
+            raise AssertionError(msg)
+
+        dict_ind = {}
+
+        for i in range(len(self.list_build_ids)):
+            dict_esys = {}
+            for j in range(len(list_esys_keys)):
+                dict_esys[list_esys_keys[j]] = \
+                    self.list_tables[j][genome.esys[i, j]]
+            dict_ind[self.list_build_ids[i]] = dict_esys
+
+        if len(genome.lhn) > 0:
+            nb_sublhn = int(genome.lhn.max())
+        else:
+            nb_sublhn = 0
+
+        list_lhn = []
+        for label in range(1, nb_sublhn + 1):
+            list_lhn.append([self.list_build_ids[i]
+                             for i in np.flatnonzero(genome.lhn == label)])
+
+        dict_ind['lhn'] = list_lhn
+
+        return dict_ind
+
+
+def relabel_lhn(lhn):
+    """
+    Returns LHN membership vector with canonical labels (subnetworks are
+    numbered 1, 2, ... in order of their first building)
+
+    Parameters
+    ----------
+    lhn : np.array (of ints)
+        LHN membership vector
+
+    Returns
+    -------
+    lhn_canon : np.array (of ints)
+        LHN membership vector with canonical labels
+    """
+
+    lhn_canon = np.zeros_like(lhn)
+
+    #  Labels in order of first occurrence
+    (array_labels, array_first) = np.unique(lhn, return_index=True)
+    list_labels = [label for (first, label)
+                   in sorted(zip(array_first, array_labels)) if label != 0]
+
+    for k in range(len(list_labels)):
+        lhn_canon[lhn == list_labels[k]] = k + 1
+
+    return lhn_canon
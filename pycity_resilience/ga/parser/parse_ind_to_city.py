@@ -11,6 +11,7 @@ import pycity_calc.toolbox.dimensioning.dim_networks as dimnet
 import pycity_calc.toolbox.networks.network_ops as netop
 
 import pycity_resilience.ga.verify.check_validity as checkval
+import pycity_resilience.ga.parser.genome as genom
 
 
 def parse_ind_dict_to_city(dict_ind, city, list_build_ids=None,
@@ -22,7 +23,8 @@ def parse_ind_dict_to_city(dict_ind, city, list_build_ids=None,
     Parameters
     ----------
     dict_ind : dict
-        Dictionary to form individuum for GA run
+        Dictionary to form individuum for GA run (or Genome object, which
+        is converted to individuum dict)
     city : object
         City object of pyCity_calc (going to be modified)
     list_build_ids : list (of ints)
@@ -42,6 +44,9 @@ def parse_ind_dict_to_city(dict_ind, city, list_build_ids=None,
         City object of pyCity_calc holding esys of dict_ind
     """
 
+    if isinstance(dict_ind, genom.Genome):
+        dict_ind = dict_ind.to_dict()
+
     if copy_city:  # Make deepcopy of city
         city = copy.deepcopy(city)
 
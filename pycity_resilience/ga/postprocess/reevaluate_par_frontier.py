@@ -23,6 +23,62 @@ import pycity_calc.toolbox.flex_quantification.flexibility_quant as flexquant
 import pycity_resilience.ga.preprocess.add_bes as addbes
 import pycity_resilience.ga.postprocess.analyze_generation_dev as andev
 import pycity_resilience.ga.parser.parse_ind_to_city as parseindcit
+import pycity_resilience.ga.evaluate.mc_archive as mcarch
+import pycity_resilience.ga.preprocess.ref_mc_run as refrun
+
+
+def get_res_of_ind(dict_mc_res, dict_mc_setup, dict_mc_res_ref):
+    """
+    Analyze MC results of single pareto solution
+
+    Parameters
+    ----------
+    dict_mc_res : dict
+        Dict holding MC results of solution
+    dict_mc_setup : dict
+        Dict holding MC setup (nb_runs, failure_tolerance, heating_off,
+        idx_failed_runs)
+    dict_mc_res_ref : dict
+        Dict holding MC results of reference system (rescaled boilers)
+
+    Returns
+    -------
+    dict_res_ind : dict
+        Dict holding result arrays of solution
+    """
+
+    #  Initialize mc analyze object
+    mc_analyze = analyzemc.EcoMCRunAnalyze()
+
+    #  Hand over results and setup dict
+    mc_analyze.dict_results = dict_mc_res
+    mc_analyze.dict_setup = dict_mc_setup
+
+    #  Extract basic results
+    mc_analyze.extract_basic_results()
+    mc_analyze.calc_annuity_to_net_energy_ratio()
+    mc_analyze.calc_co2_to_net_energy_ratio()
+    mc_analyze.calc_dimless_cost_co2(dict_ref_run=dict_mc_res_ref)
+
+    #  Save results
+    dict_res_ind = {}
+
+    dict_res_ind['array_dimless_cost'] = mc_analyze._array_dimless_cost
+    dict_res_ind['array_dimless_co2'] = mc_analyze._array_dimless_co2
+    dict_res_ind['array_ann'] = mc_analyze._array_ann_mod
+    dict_res_ind['array_co2'] = mc_analyze._array_co2_mod
+
+    dict_res_ind['array_sh'] = mc_analyze._array_sh_dem_mod
+    dict_res_ind['array_el'] = mc_analyze._array_el_dem_mod
+    dict_res_ind['array_dhw'] = mc_analyze._array_dhw_dem_mod
+
+    # dict_res_ind['beta_el_pos'] = beta_el_pos
+    # dict_res_ind['beta_el_neg'] = beta_el_neg
+
+    dict_res_ind[
+        'list_idx_failed_runs'] = mc_analyze._list_idx_failed_runs
+
+    return dict_res_ind
 
 
 def reeval_par_sol(path_city,
@@ -50,7 +106,10 @@ def reeval_par_sol(path_city,
                    failure_tolerance,
                    path_save_dict=None,
                    plot_res=False,
-                   save_res=False):
+                   save_res=False,
+                   path_mc_archive=None,
+                   path_archive_settings=None,
+                   path_ref_cache=None):
     """
     Reevaluate pareto solutions by reruning economic monte carlo analysis.
     Necessary, if more than default/saved results of opt_ga.py should be
@@ -84,6 +143,21 @@ def reeval_par_sol(path_city,
     path_save_dict : str, optional
     plot_res=False : bool, optional
     save_res : bool, optional
+    path_mc_archive : str, optional
+        Path to MC result archive of GA run (mc_archive.sqlite, see
+        opt_ga.py with use_mc_archive=True) (default: None). If not None
+        and existent, archived MC results of reference system and pareto
+        solutions are used instead of re-running the MC simulation.
+        Archived results are only used, if MC settings (e.g. nb_runs) and
+        samples are identical to the settings and samples of GA run.
+    path_archive_settings : str, optional
+        Path to pickled settings of MC result archive of GA run
+        (mc_archive_settings.pkl in log folder) (default: None). Required
+        to use path_mc_archive.
+    path_ref_cache : str, optional
+        Path to cache folder of reference scenario MC results (default:
+        None). If not None, results of identical city, samples and MC
+        settings are loaded from/saved to folder (see ref_mc_run.py)
 
     Returns
     -------
@@ -173,35 +247,81 @@ def reeval_par_sol(path_city,
                                     path_build_sample_dict=path_build_sample_dict,
                                     dem_unc=dem_unc)
 
-    #  Generate reference system (boilers 4x rescaled) and perform ref. run
+    #  Load MC result archive of GA run, if existent
     #  ###################################################################
+    mc_archive = None
+    tup_res_ref = None
+
+    if path_mc_archive is not None and os.path.exists(path_mc_archive):
+        if (path_archive_settings is not None
+                and os.path.exists(path_archive_settings)):
+            #  Settings of GA run with current MC settings and samples.
+            #  Thus, only results of identical settings and samples are
+            #  found in archive.
+            dict_archive_settings = \
+                pickle.load(open(path_archive_settings, mode='rb'))
+
+            if sampling_method == 'random':
+                #  Energy system samples are re-sampled for every
+                #  individuum (not part of samples hash, see opt_ga.py)
+                list_exclude = ['_dict_samples_esys']
+            else:
+                list_exclude = None
+
+            dict_archive_settings.update(
+                {'nb_runs': nb_runs,
+                 'sampling_method': sampling_method,
+                 'failure_tolerance': failure_tolerance,
+                 'dem_unc': dem_unc,
+                 'heating_off': heating_off,
+                 'eeg_pv_limit': eeg_pv_limit,
+                 'use_kwkg_lhn_sub': use_kwkg_lhn_sub,
+                 'el_mix_for_chp': el_mix_for_chp,
+                 'el_mix_for_pv': el_mix_for_pv,
+                 'samples_hash':
+                     refrun.calc_samples_hash(mc_run=mc_run,
+                                              list_exclude=list_exclude)})
+
+            mc_archive = \
+                mcarch.McResultArchive(path=path_mc_archive,
+                                       dict_settings=dict_archive_settings)
+            tup_res_ref = mc_archive.get_by_hash(ind_hash=mcarch.ref_key)
+
+            if tup_res_ref is None:
+                #  Reference and pareto solutions have to be evaluated
+                #  with identical samples. Thus, re-simulate all.
+                msg = 'No archived MC results for current MC settings and ' \
+                      'samples. Thus, pareto solutions are re-simulated.'
+                warnings.warn(msg)
+                mc_archive = None
+        else:
+            msg = 'Settings of MC result archive ' \
+                  + str(path_archive_settings) + ' not found. Thus, ' \
+                  'pareto solutions are re-simulated.'
+            warnings.warn(msg)
 
-    #  Copy city, only use boilers
-    city_copy = copy.deepcopy(city)
-
-    #  Add to copy of mc_runner --> Perform mc run
-    addbes.gen_boiler_ref_scenario(city=city_copy)
-
-    #  Copy mc_runner obj. of ga_runner
-    mc_run_ref = copy.deepcopy(mc_run)
-
-    #  Replace city object with city_copy
-    mc_run_ref._city_eco_calc.energy_balance.city = city_copy
-
-    #  Run MC analysis
-    (dict_mc_res_ref, dict_mc_setup_ref, dict_mc_cov_ref) = \
-        mc_run_ref.perform_mc_runs(nb_runs=nb_runs,
-                                   sampling_method=sampling_method,
-                                   eeg_pv_limit=eeg_pv_limit,
-                                   use_kwkg_lhn_sub=use_kwkg_lhn_sub,
-                                   el_mix_for_chp=el_mix_for_chp,
-                                   el_mix_for_pv=el_mix_for_pv,
-                                   heating_off=heating_off
-                                   )
+    #  Generate reference system (boilers 4x rescaled) and perform ref. run
+    #  ###################################################################
 
-    if len(dict_mc_setup_ref['idx_failed_runs']) > 0:
-        msg = 'Reference run (rescaled boilers) failed!'
-        raise AssertionError(msg)
+    if tup_res_ref is not None:
+        print('Use archived MC results of reference system')
+        (dict_mc_res_ref, list_idx_failed_ref) = tup_res_ref
+        if len(list_idx_failed_ref) > 0:
+            msg = 'Reference run (rescaled boilers) failed!'
+            raise AssertionError(msg)
+    else:
+        #  Perform reference run or load persisted results
+        dict_mc_res_ref = \
+            refrun.perform_ref_mc_run(city=city,
+                                      mc_run=mc_run,
+                                      nb_runs=nb_runs,
+                                      sampling_method=sampling_method,
+                                      eeg_pv_limit=eeg_pv_limit,
+                                      use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                                      el_mix_for_chp=el_mix_for_chp,
+                                      el_mix_for_pv=el_mix_for_pv,
+                                      heating_off=heating_off,
+                                      path_cache=path_ref_cache)
 
     #  ####################################################################
 
@@ -228,6 +348,29 @@ def reeval_par_sol(path_city,
 
             ind_sel = dict_pareto_sol[i]
 
+            if mc_archive is not None:
+                tup_res = mc_archive.get(ind=ind_sel)
+            else:
+                tup_res = None
+
+            if tup_res is not None:
+                #  Use archived MC results (no re-simulation necessary)
+                print('Use archived MC results')
+                (dict_mc_res, list_idx_failed) = tup_res
+
+                nb_runs_arch = len(dict_mc_res[list(dict_mc_res.keys())[0]])
+
+                dict_mc_setup = {'nb_runs': nb_runs_arch,
+                                 'failure_tolerance': failure_tolerance,
+                                 'heating_off': heating_off,
+                                 'idx_failed_runs': list_idx_failed}
+
+                dict_res[i] = \
+                    get_res_of_ind(dict_mc_res=dict_mc_res,
+                                   dict_mc_setup=dict_mc_setup,
+                                   dict_mc_res_ref=dict_mc_res_ref)
+                continue
+
             #  Copy mc_runner
             mc_run_copy = copy.deepcopy(mc_run)
 
@@ -257,19 +400,6 @@ def reeval_par_sol(path_city,
                                             heating_off=heating_off
                                             )
 
-            #  Initialize mc analyze object
-            mc_analyze = analyzemc.EcoMCRunAnalyze()
-
-            #  Hand over results and setup dict
-            mc_analyze.dict_results = dict_mc_res
-            mc_analyze.dict_setup = dict_mc_setup
-
-            #  Extract basic results
-            mc_analyze.extract_basic_results()
-            mc_analyze.calc_annuity_to_net_energy_ratio()
-            mc_analyze.calc_co2_to_net_energy_ratio()
-            mc_analyze.calc_dimless_cost_co2(dict_ref_run=dict_mc_res_ref)
-
             #  Perform flexibility calculation
             city_flex_copy = copy.deepcopy(
                 mc_run_copy._city_eco_calc.energy_balance.city)
@@ -277,26 +407,10 @@ def reeval_par_sol(path_city,
             (beta_el_pos, beta_el_neg) = \
                 flexquant.calc_beta_el_city(city=city_flex_copy)
 
-            #  Save results
-            dict_res_ind = {}
-
-            dict_res_ind['array_dimless_cost'] = mc_analyze._array_dimless_cost
-            dict_res_ind['array_dimless_co2'] = mc_analyze._array_dimless_co2
-            dict_res_ind['array_ann'] = mc_analyze._array_ann_mod
-            dict_res_ind['array_co2'] = mc_analyze._array_co2_mod
-
-            dict_res_ind['array_sh'] = mc_analyze._array_sh_dem_mod
-            dict_res_ind['array_el'] = mc_analyze._array_el_dem_mod
-            dict_res_ind['array_dhw'] = mc_analyze._array_dhw_dem_mod
-
-            # dict_res_ind['beta_el_pos'] = beta_el_pos
-            # dict_res_ind['beta_el_neg'] = beta_el_neg
-
-            dict_res_ind[
-                'list_idx_failed_runs'] = mc_analyze._list_idx_failed_runs
-
             #  Save to overall results dict
-            dict_res[i] = dict_res_ind
+            dict_res[i] = get_res_of_ind(dict_mc_res=dict_mc_res,
+                                         dict_mc_setup=dict_mc_setup,
+                                         dict_mc_res_ref=dict_mc_res_ref)
 
     if save_res:
         #  Save dict_res
@@ -347,6 +461,15 @@ def main():
     out_name = name_res_folder + '_dict_par_front_sol.pkl'
     path_save_par = os.path.join(workspace, 'output', 'ga_opt', out_name)
 
+    #  Path to MC result archive of GA run (used, if existent)
+    path_mc_archive = os.path.join(path_results, 'mc_archive.sqlite')
+    path_archive_settings = os.path.join(path_results,
+                                         'mc_archive_settings.pkl')
+
+    #  Path to cache folder of reference scenario MC results (shared with
+    #  opt_ga.py)
+    path_ref_cache = os.path.join(workspace, 'output', 'ref_mc_cache')
+
     save_res = True
     plot_res = True
 
@@ -493,7 +616,10 @@ def main():
                               failure_tolerance=failure_tolerance,
                               path_save_dict=path_save_dict,
                               save_res=save_res,
-                              plot_res=plot_res)
+                              plot_res=plot_res,
+                              path_mc_archive=path_mc_archive,
+                              path_archive_settings=path_archive_settings,
+                              path_ref_cache=path_ref_cache)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding persisted Monte-Carlo run of reference scenario (rescaled
+boilers), which is required for dimensionless cost and co2 objectives.
+
+The MC results of the reference scenario only depend on the city object,
+the MC samples and the MC settings. Thus, results are saved to a pickle
+file in a cache folder, named by a hash of city content, samples and
+settings. Repeated GA runs, restarts, diverse population generation and
+reevaluation of pareto solutions load the results instead of re-running
+the reference scenario.
+"""
+from __future__ import division
+
+import os
+import copy
+import pickle
+import hashlib
+import numpy as np
+
+import pycity_resilience.ga.preprocess.add_bes as addbes
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+import pycity_resilience.monte_carlo.run_mc as runmc
+
+
+def _update_hash(sha, data):
+    """
+    Update hash object with (nested) sample data
+
+    Parameters
+    ----------
+    sha : object
+        hashlib hash object
+    data : object
+        Sample data (e.g. nested dict with numpy arrays)
+    """
+
+    if isinstance(data, dict):
+        for key in sorted(data.keys(), key=repr):
+            sha.update(repr(key).encode('utf-8'))
+            _update_hash(sha=sha, data=data[key])
+    elif isinstance(data, np.ndarray):
+        sha.update(str(data.dtype).encode('utf-8'))
+        sha.update(str(data.shape).encode('utf-8'))
+        sha.update(np.ascontiguousarray(data).tobytes())
+    elif isinstance(data, (list, tuple)):
+        sha.update(str(len(data)).encode('utf-8'))
+        for val in data:
+            _update_hash(sha=sha, data=val)
+    else:
+        sha.update(pickle.dumps(data, protocol=2))
+
+
+def calc_city_hash(city):
+    """
+    Returns hash of city content (pickled city object)
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc
+
+    Returns
+    -------
+    city_hash : str
+        Hex digest of sha1 hash
+    """
+    return hashlib.sha1(pickle.dumps(city, protocol=2)).hexdigest()
+
+
+def calc_samples_hash(mc_run, list_exclude=None):
+    """
+    Returns hash of MC samples of mc_runner (e.g. attached sample bank)
+
+    Parameters
+    ----------
+    mc_run : object
+        McRunner object of pyCity_calc (sampling has been performed)
+    list_exclude : list (of str), optional
+        List of sample attribute names, which should not be hashed
+        (default: None), e.g. samples, which are excluded from sample bank
+        and re-sampled for every individuum
+
+    Returns
+    -------
+    samples_hash : str
+        Hex digest of sha1 hash
+    """
+
+    if list_exclude is None:
+        list_exclude = []
+
+    sha = hashlib.sha1()
+
+    for key in sorted(runmc.get_sample_attr_names(mc_run=mc_run)):
+        if key in list_exclude:
+            continue
+        sha.update(key.encode('utf-8'))
+        _update_hash(sha=sha, data=mc_run.__dict__[key])
+
+    return sha.hexdigest()
+
+
+def calc_ref_key(city, mc_run, dict_settings):
+    """
+    Returns key of reference MC run (city content, samples and settings)
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc
+    mc_run : object
+        McRunner object of pyCity_calc (sampling has been performed)
+    dict_settings : dict
+        Dict holding MC settings
+
+    Returns
+    -------
+    ref_key : str
+        Hex digest of sha1 hash
+    """
+
+    list_keys = [calc_city_hash(city=city),
+                 calc_samples_hash(mc_run=mc_run),
+                 fitcache.calc_settings_key(dict_settings)]
+
+    return hashlib.sha1('_'.join(list_keys).encode('utf-8')).hexdigest()
+
+
+def perform_ref_mc_run(city, mc_run, nb_runs, sampling_method,
+                       eeg_pv_limit=False, use_kwkg_lhn_sub=False,
+                       el_mix_for_chp=True, el_mix_for_pv=True,
+                       heating_off=True, path_cache=None):
+    """
+    Returns MC results of reference scenario (4x rescaled boilers). Loads
+    results from cache folder, if available. Otherwise, performs MC runs
+    and saves results to cache folder.
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc (not modified)
+    mc_run : object
+        McRunner object of pyCity_calc (sampling has been performed, not
+        modified)
+    nb_runs : int
+        Number of MC runs
+    sampling_method : str
+        Defines method used for sampling ('lhc' or 'random')
+    eeg_pv_limit : bool, optional
+        Defines, if EEG PV feed-in limitation of 70 % of peak load is
+        active (default: False)
+    use_kwkg_lhn_sub : bool, optional
+        Defines, if KWKG LHN subsidies are used (default: False)
+    el_mix_for_chp : bool, optional
+        Defines, if el. mix should be used for CHP fed-in electricity
+        (default: True)
+    el_mix_for_pv : bool, optional
+        Defines, if el. mix should be used for PV fed-in electricity
+        (default: True)
+    heating_off : bool, optional
+        Defines, if sampling to deactivate heating during summer should
+        be used (default: True)
+    path_cache : str, optional
+        Path to cache folder (default: None). If None, results are not
+        persisted.
+
+    Returns
+    -------
+    dict_mc_res : dict
+        Dict holding MC results of reference scenario
+    """
+
+    if path_cache is not None:
+        dict_settings = {'nb_runs': nb_runs,
+                         'sampling_method': sampling_method,
+                         'eeg_pv_limit': eeg_pv_limit,
+                         'use_kwkg_lhn_sub': use_kwkg_lhn_sub,
+                         'el_mix_for_chp': el_mix_for_chp,
+                         'el_mix_for_pv': el_mix_for_pv,
+                         'heating_off': heating_off}
+
+        ref_key = calc_ref_key(city=city, mc_run=mc_run,
+                               dict_settings=dict_settings)
+
+        path_file = os.path.join(path_cache, 'ref_mc_' + ref_key + '.pkl')
+
+        if os.path.exists(path_file):
+            print('Load MC results of reference scenario from ', path_file)
+            with open(path_file, mode='rb') as file:
+                return pickle.load(file)
+
+    #  Copy city, only use boilers
+    city_copy = copy.deepcopy(city)
+
+    #  Add to copy of mc_runner --> Perform mc run
+    addbes.gen_boiler_ref_scenario(city=city_copy)
+
+    #  Copy mc_runner obj.
+    mc_run_ref = copy.deepcopy(mc_run)
+
+    #  Replace city object with city_copy
+    mc_run_ref._city_eco_calc.energy_balance.city = city_copy
+
+    #  Run MC analysis
+    (dict_mc_res, dict_mc_setup, dict_mc_cov) = \
+        mc_run_ref.perform_mc_runs(nb_runs=nb_runs,
+                                   sampling_method=sampling_method,
+                                   eeg_pv_limit=eeg_pv_limit,
+                                   use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                                   el_mix_for_chp=el_mix_for_chp,
+                                   el_mix_for_pv=el_mix_for_pv,
+                                   heating_off=heating_off
+                                   )
+
+    if len(dict_mc_setup['idx_failed_runs']) > 0:
+        msg = 'Reference run (rescaled boilers) failed!'
+        raise AssertionError(msg)
+
+    if path_cache is not None:
+        if not os.path.exists(path_cache):
+            os.makedirs(path_cache)
+
+        #  Atomic replace (parallel GA runs might use same cache folder)
+        path_temp = path_file + '.' + str(os.getpid()) + '.tmp'
+        with open(path_temp, mode='wb') as file:
+            pickle.dump(dict_mc_res, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path_temp, path_file)
+
+    return dict_mc_res
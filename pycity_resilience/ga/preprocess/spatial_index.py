@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding spatial index of building positions.
+
+SpatialIndex is a dict (building node ids as keys and shapely points as
+values, thus it can be used as dict_pos everywhere), which additionally
+holds the building coordinates as numpy array. For small cities
+(nb. of buildings <= max_nb_dense), the complete distance matrix is
+precomputed. For large cities, distances are calculated on demand
+(vectorized) and a KD-tree is used to find buildings within max_dist.
+
+The distance functions of analyse.py use the index, if dict_pos is a
+SpatialIndex object, instead of calculating shapely point distances
+pairwise on every call.
+"""
+from __future__ import division
+
+import numpy as np
+
+from scipy.spatial import cKDTree
+
+#  Max. nb. of buildings with precomputed distance matrix (8 MB for 1000)
+max_nb_dense = 1000
+
+
+class SpatialIndex(dict):
+    def __init__(self, dict_pos, max_nb_dense=max_nb_dense):
+        """
+        Constructor of spatial index
+
+        Parameters
+        ----------
+        dict_pos : dict
+            Dict holding building node ids as keys and shapely point objects
+            (2d) as values (see get_pos.get_build_pos)
+        max_nb_dense : int, optional
+            Max. nb. of buildings, for which distance matrix is precomputed
+            (default: 1000). For larger cities, KD-tree is used.
+        """
+
+        dict.__init__(self, dict_pos)
+
+        self.list_ids = list(dict_pos.keys())
+
+        self._dict_idx = {}
+        for i in range(len(self.list_ids)):
+            self._dict_idx[self.list_ids[i]] = i
+
+        self.array_coord = np.zeros((len(self.list_ids), 2))
+        for i in range(len(self.list_ids)):
+            self.array_coord[i, 0] = dict_pos[self.list_ids[i]].x
+            self.array_coord[i, 1] = dict_pos[self.list_ids[i]].y
+
+        self.use_dense = len(self.list_ids) <= max_nb_dense
+
+        self._matrix_dist = None
+        self._tree = None
+
+        if self.use_dense:
+            self._matrix_dist = calc_dist(self.array_coord,
+                                          self.array_coord)
+        else:
+            self._tree = cKDTree(self.array_coord)
+
+    def get_idx(self, list_ids):
+        """
+        Returns array with row indexes of building node ids
+
+        Parameters
+        ----------
+        list_ids : list (of ints)
+            List of building node ids
+
+        Returns
+        -------
+        array_idx : np.array (of ints)
+            Indexes of building node ids
+        """
+        return np.array([self._dict_idx[n] for n in list_ids], dtype=int)
+
+    def get_dist_matrix(self, list_ref, list_search, max_dist=None):
+        """
+        Returns distance matrix (reference nodes x search nodes)
+
+        Parameters
+        ----------
+        list_ref : list (of ints)
+            List with reference node ids
+        list_search : list (of ints)
+            List with search node ids
+        max_dist : float, optional
+            Maximum distance in m (default: None). If not None, distances
+            larger than max_dist can be returned as np.inf (KD-tree)
+
+        Returns
+        -------
+        matrix_dist : np.array (of floats)
+            Distances in m
+        """
+
+        array_ref = self.get_idx(list_ref)
+        array_search = self.get_idx(list_search)
+
+        if self.use_dense:
+            return self._matrix_dist[np.ix_(array_ref, array_search)]
+
+        if max_dist is None or len(array_ref) == 0:
+            return calc_dist(self.array_coord[array_ref],
+                             self.array_coord[array_search])
+
+        #  Search nodes within max_dist of any reference node (KD-tree
+        #  radius is slightly enlarged, exact distances are calculated)
+        list_list_near = \
+            self._tree.query_ball_point(self.array_coord[array_ref],
+                                        r=max_dist * (1 + 1e-9) + 1e-9)
+
+        array_near = np.zeros(len(self.list_ids), dtype=bool)
+        for list_near in list_list_near:
+            array_near[list_near] = True
+
+        array_col = np.flatnonzero(array_near[array_search])
+
+        matrix_dist = np.full((len(array_ref), len(array_search)), np.inf)
+        matrix_dist[:, array_col] = \
+            calc_dist(self.array_coord[array_ref],
+                      self.array_coord[array_search[array_col]])
+
+        return matrix_dist
+
+    def get_dist(self, id, list_ids, max_dist=None):
+        """
+        Returns list of distances of building nodes to reference node
+
+        Parameters
+        ----------
+        id : int
+            Reference node id
+        list_ids : list (of ints)
+            List of building node ids
+        max_dist : float, optional
+            Maximum distance in m (default: None). If not None, distances
+            larger than max_dist can be returned as np.inf (KD-tree)
+
+        Returns
+        -------
+        list_dist : list (of floats)
+            Distances in m (order of list_ids)
+        """
+        return list(self.get_dist_matrix(list_ref=[id], list_search=list_ids,
+                                         max_dist=max_dist)[0])
+
+    def get_min_dist(self, list_ref, list_search, max_dist=None):
+        """
+        Returns dict with node ids as keys and distances as values
+        (distances to set of reference nodes). Same result (and key order)
+        as analyse.get_ids_closest_dist_to_list_of_build.
+
+        Parameters
+        ----------
+        list_ref : list (of ints)
+            List with reference node ids
+        list_search list (of ints):
+            List with search nodes
+        max_dist : float, optional
+            Maximum allowed distance in m (default: None).
+
+        Returns
+        -------
+        dict_dist : dict
+            Dict with node ids as keys and distances as values (distances to
+            set of reference nodes)
+        """
+
+        dict_dist = {}
+
+        if len(list_ref) == 0:
+            return dict_dist
+
+        #  Unique search nodes (in order of first occurrence)
+        list_unique = list(dict.fromkeys(list_search))
+
+        #  Node list_ref[0] is skipped in loop over first reference node,
+        #  thus it is added after all other nodes
+        list_order = [u for u in list_unique if u != list_ref[0]]
+        if len(list_order) < len(list_unique):
+            list_order.append(list_ref[0])
+
+        matrix_dist = self.get_dist_matrix(list_ref=list_ref,
+                                           list_search=list_order,
+                                           max_dist=max_dist)
+
+        #  Distances of nodes to themselves are not taken into account
+        matrix_same = self.get_idx(list_ref)[:, None] \
+                      == self.get_idx(list_order)[None, :]
+        matrix_dist[matrix_same] = np.inf
+
+        array_min = matrix_dist.min(axis=0)
+        array_has_other = np.any(~matrix_same, axis=0)
+
+        for j in range(len(list_order)):
+            if array_has_other[j]:
+                if max_dist is None or array_min[j] <= max_dist:
+                    dict_dist[list_order[j]] = float(array_min[j])
+
+        return dict_dist
+
+
+def calc_dist(array_coord_1, array_coord_2):
+    """
+    Returns euclidean distance matrix between two sets of 2d coordinates
+
+    Parameters
+    ----------
+    array_coord_1 : np.array (of floats)
+        Coordinates (n x 2)
+    array_coord_2 : np.array (of floats)
+        Coordinates (m x 2)
+
+    Returns
+    -------
+    matrix_dist : np.array (of floats)
+        Distance matrix (n x m)
+    """
+
+    array_dx = array_coord_1[:, 0][:, None] - array_coord_2[:, 0][None, :]
+    array_dy = array_coord_1[:, 1][:, None] - array_coord_2[:, 1][None, :]
+
+    return np.sqrt(array_dx * array_dx + array_dy * array_dy)
@@ -9,11 +9,13 @@ import copy
 import warnings
 import random
 import math
+import numpy as np
 
 import pycity_resilience.ga.analyse.find_lhn as findlhn
 import pycity_resilience.ga.analyse.analyse as analyse
 import pycity_resilience.ga.evolution.esys_changes as esyschanges
 import pycity_resilience.ga.evolution.helpers.mod_list_esys_sizes as modlist
+import pycity_resilience.ga.parser.genome as genom
 
 
 def check_ind_is_valid(ind):
@@ -61,7 +63,152 @@ def check_ind_is_valid(ind):
     return is_valid
 
 
-def check_no_hp_in_lhn(ind, do_correction=True):
+def check_genome_is_valid(genome, dict_max_pv_area=None,
+                          prevent_boi_lhn=True):
+    """
+    Check if genome (see genome.py) is valid (without correction). Checks
+    the same constraints as run_all_checks, but on the esys index matrix and
+    LHN membership vector (vectorized).
+
+    Parameters
+    ----------
+    genome : object
+        Genome object
+    dict_max_pv_area : dict, optional
+        Dict holding maximum usable PV area values in m2 per building
+        (default: None). If None, PV areas are not checked.
+    prevent_boi_lhn : bool, optional
+        Prevent boi/eh LHN combinations (without CHP) (default: True).
+        If True, each LHN subnetwork has to hold, at least, one CHP
+
+    Returns
+    -------
+    is_valid : bool
+        True, if genome is valid. False, if genome is incorrect
+    """
+
+    codec = genome.codec
+    nb_build = len(codec.list_build_ids)
+
+    if (genome.esys.shape != (nb_build, len(genom.list_esys_keys))
+            or genome.lhn.shape != (nb_build,)):
+        msg = 'Shape of genome arrays does not match genome codec!'
+        warnings.warn(msg)
+        return False
+
+    array_size = np.array([len(table) for table in codec.list_tables])
+
+    if (np.any(genome.esys < 0) or np.any(genome.esys >= array_size)
+            or np.any(genome.lhn < 0)):
+        msg = 'Genome holds index, which is not part of genome codec!'
+        warnings.warn(msg)
+        return False
+
+    #  Existence of energy systems (index 0: esys does not exist)
+    has = {}
+    for j in range(len(genom.list_esys_keys)):
+        has[genom.list_esys_keys[j]] = genome.esys[:, j] > 0
+
+    is_lhn = genome.lhn > 0
+    has_hp = has['hp_aw'] | has['hp_ww']
+
+    if dict_max_pv_area is not None:
+        key_idx = genom.list_esys_keys.index('pv')
+        array_pv = np.array(codec.list_tables[key_idx])[
+            genome.esys[:, key_idx]]
+        array_max = np.array([dict_max_pv_area[n]
+                              for n in codec.list_build_ids])
+        if np.any(array_pv > array_max):
+            return False
+
+    #  Stand-alone buildings need th. supply
+    if np.any(~is_lhn & ~(has['boi'] | has['chp'] | has_hp | has['eh'])):
+        return False
+
+    #  No CHP plus HP
+    if np.any(has['chp'] & has_hp):
+        return False
+
+    #  Battery only with PV or CHP
+    if np.any(has['bat'] & ~(has['chp'] | has['pv'])):
+        return False
+
+    #  No HP in LHN
+    if np.any(is_lhn & has_hp):
+        return False
+
+    if np.any(is_lhn):
+        #  Each LHN subnetwork holds, at least, two buildings (also prevents
+        #  empty subnetworks)
+        if np.any(np.bincount(genome.lhn)[1:] < 2):
+            return False
+
+        #  Each LHN subnetwork has, at least, one th. feeder
+        array_feeder = \
+            np.bincount(genome.lhn,
+                        weights=has['boi'] | has['chp'] | has['eh'])
+        if np.any(array_feeder[1:] == 0):
+            return False
+
+        if prevent_boi_lhn:
+            if np.any(np.bincount(genome.lhn, weights=has['chp'])[1:] == 0):
+                return False
+
+    return True
+
+
+def sort_by_order(list_ids, list_order):
+    """
+    Returns ids of list_ids in order of list_order
+
+    Parameters
+    ----------
+    list_ids : list
+        List of ids
+    list_order : list
+        List of ids, which defines order (holds all ids of list_ids)
+
+    Returns
+    -------
+    list_sorted : list
+        List of ids in order of list_order
+    """
+
+    set_ids = set(list_ids)
+
+    return [n for n in list_order if n in set_ids]
+
+
+def get_lhn_idx(ind, list_sublhn):
+    """
+    Returns indexes of LHN subnetwork lists on individuum (subnetwork lists
+    are identified by object identity, as indexes change, if subnetworks are
+    deleted)
+
+    Parameters
+    ----------
+    ind : dict
+        Individuum dict for GA run
+    list_sublhn : list (of lists)
+        List of LHN subnetwork lists of ind
+
+    Returns
+    -------
+    list_lhn_idx : list (of ints)
+        Indexes of subnetworks in ind['lhn'], which are still existing
+    """
+
+    set_obj_ids = set(id(sublhn) for sublhn in list_sublhn)
+
+    list_lhn_idx = []
+    for i in range(len(ind['lhn'])):
+        if id(ind['lhn'][i]) in set_obj_ids:
+            list_lhn_idx.append(i)
+
+    return list_lhn_idx
+
+
+def check_no_hp_in_lhn(ind, do_correction=True, list_lhn_idx=None):
     """
     Checks if individuum dict holds HP within LHN. If yes and do_correction is
     True, erases HP from LHN.
@@ -73,6 +220,9 @@ def check_no_hp_in_lhn(ind, do_correction=True):
     do_correction : bool, optional
         Defines, if ind dict should be modified, if necessary (default: True).
         If True, can erase HP form LHN network building nodes.
+    list_lhn_idx : list (of ints), optional
+        List with indexes of LHN subnetworks, which should be checked
+        (default: None). If None, checks all LHN subnetworks.
 
     Returns
     -------
@@ -84,9 +234,13 @@ def check_no_hp_in_lhn(ind, do_correction=True):
 
     is_correct = True
 
+    if list_lhn_idx is None:
+        list_lhn_idx = range(len(ind['lhn']))
+
     # check if heatpump is connected to LHN at ind1
     if len(ind['lhn']) > 0:
-        for subcity in ind['lhn']:
+        for i in sorted(list_lhn_idx):
+            subcity = ind['lhn'][i]
             for node in subcity:
                 if ind[node]['hp_aw'] > 0 or ind[node]['hp_ww'] > 0:
                     is_correct = False
@@ -99,7 +253,7 @@ def check_no_hp_in_lhn(ind, do_correction=True):
     return is_correct
 
 
-def check_lhn_has_min_two_build(ind, do_correction=True):
+def check_lhn_has_min_two_build(ind, do_correction=True, list_lhn_idx=None):
     """
     Checks if individuum dict has, at least, two buildings. If not, erases
     LHN system.
@@ -111,6 +265,9 @@ def check_lhn_has_min_two_build(ind, do_correction=True):
     do_correction : bool, optional
         Defines, if ind dict should be modified, if necessary (default: True).
         If True, erased LHN lists with only one or zero buildings.
+    list_lhn_idx : list (of ints), optional
+        List with indexes of LHN subnetworks, which should be checked
+        (default: None). If None, checks all LHN subnetworks.
 
     Returns
     -------
@@ -123,8 +280,11 @@ def check_lhn_has_min_two_build(ind, do_correction=True):
 
     list_del_idx = []
 
+    if list_lhn_idx is None:
+        list_lhn_idx = range(len(ind['lhn']))
+
     if len(ind['lhn']) > 0:
-        for i in range(len(ind['lhn'])):
+        for i in sorted(list_lhn_idx):
             list_sub_lhn = ind['lhn'][i]  # Get LHN sublist
             if len(list_sub_lhn) <= 1:  # If max. holds one element
                 is_correct = False
@@ -133,7 +293,9 @@ def check_lhn_has_min_two_build(ind, do_correction=True):
                     break
 
         if do_correction:
-            for i in list_del_idx:
+            #  Delete in descending order (indexes of remaining subnetworks
+            #  do not change)
+            for i in reversed(list_del_idx):
                 del ind['lhn'][i]
 
         if 'lhn' not in ind:
@@ -146,7 +308,7 @@ def check_lhn_th_supply(ind, do_correction=True, do_random=True,
                         dict_restr=None, dict_max_pv_area=None,
                         dict_heatloads=None, dict_sh=None, pv_min=None,
                         pv_step=1,
-                        use_pv=False, add_pv_prop=0):
+                        use_pv=False, add_pv_prop=0, list_lhn_idx=None):
     """
     Check if each sub-LHN in ind dict has, at least, one thermal feeder
 
@@ -189,6 +351,9 @@ def check_lhn_th_supply(ind, do_correction=True, do_random=True,
         mutation has been applied (defauft: 0). E.g. if boiler system has
         been changed to CHP, there is a change of add_pv_prob that also PV
         is mutated.
+    list_lhn_idx : list (of ints), optional
+        List with indexes of LHN subnetworks, which should be checked
+        (default: None). If None, checks all LHN subnetworks.
 
     Returns
     -------
@@ -214,8 +379,13 @@ def check_lhn_th_supply(ind, do_correction=True, do_random=True,
 
     list_failed_sublhn_idx = []
 
+    if list_lhn_idx is None:
+        list_lhn_idx = range(len(ind['lhn']))
+
+    is_correct = True
+
     if len(ind['lhn']) > 0:
-        for i in range(len(ind['lhn'])):  # Loop over lists of LHN networks
+        for i in sorted(list_lhn_idx):  # Loop over lists of LHN networks
             is_correct = False
             list_lhn_ids = ind['lhn'][i]
             for n in list_lhn_ids:  # Loop over nodes in LHN network
@@ -289,7 +459,8 @@ def check_lhn_th_supply(ind, do_correction=True, do_random=True,
     return is_correct
 
 
-def check_pv_max_areas(ind, dict_max_pv_area, do_correction=True):
+def check_pv_max_areas(ind, dict_max_pv_area, do_correction=True,
+                       list_ids=None):
     """
     Checks if used PV area is smaller or equal to maximum usable PV rooftop
     area. If not defines maximum usable PV rooftop area as new PV area.
@@ -303,6 +474,9 @@ def check_pv_max_areas(ind, dict_max_pv_area, do_correction=True):
         in m2 as values
     do_correction : bool, optional
         Defines, if ind dict should be modified, if necessary (default: True).
+    list_ids : list (of ints), optional
+        List with building node ids, which should be checked (default: None).
+        If None, checks all buildings.
 
     Returns
     -------
@@ -313,7 +487,8 @@ def check_pv_max_areas(ind, dict_max_pv_area, do_correction=True):
 
     is_correct = True
 
-    list_ids = analyse.get_build_ids_ind(ind=ind)
+    if list_ids is None:
+        list_ids = analyse.get_build_ids_ind(ind=ind)
 
     for n in list_ids:
         if ind[n]['pv'] > dict_max_pv_area[n]:
@@ -327,7 +502,7 @@ def check_pv_max_areas(ind, dict_max_pv_area, do_correction=True):
     return is_correct
 
 
-def check_bat_only_with_pv_or_chp(ind, do_correction=True):
+def check_bat_only_with_pv_or_chp(ind, do_correction=True, list_ids=None):
     """
     Check if battery is only installed when CHP or PV system exist
 
@@ -338,6 +513,9 @@ def check_bat_only_with_pv_or_chp(ind, do_correction=True):
     do_correction : bool, optional
         Defines, if ind dict should be modified, if necessary (default: True).
         If True, erases all batteries in buildings without CHP or PV
+    list_ids : list (of ints), optional
+        List with building node ids, which should be checked (default: None).
+        If None, checks all buildings.
 
     Returns
     -------
@@ -350,7 +528,8 @@ def check_bat_only_with_pv_or_chp(ind, do_correction=True):
 
     list_del = []
 
-    list_ids = analyse.get_build_ids_ind(ind=ind)
+    if list_ids is None:
+        list_ids = analyse.get_build_ids_ind(ind=ind)
 
     for n in list_ids:
         if ind[n]['bat'] > 0:
@@ -372,7 +551,7 @@ def check_stand_alone_build_th(ind, do_correction=True, do_random=True,
                                dict_sh=None, dict_restr=None,
                                pv_min=None, pv_step=1, use_pv=False,
                                add_pv_prop=0, dict_max_pv_area=None,
-                               dict_heatloads=None):
+                               dict_heatloads=None, list_ids=None):
     """
     Check if stand alone buildings (no LHN) have thermal energy supply.
 
@@ -408,6 +587,9 @@ def check_stand_alone_build_th(ind, do_correction=True, do_random=True,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    list_ids : list (of ints), optional
+        List with building node ids, which should be checked (default: None).
+        If None, checks all buildings.
 
     Returns
     -------
@@ -445,10 +627,14 @@ def check_stand_alone_build_th(ind, do_correction=True, do_random=True,
             for n in sublhn:
                 list_lhn.append(n)
 
-    # Generate difference to get all building ids without LHN connection
-    list_non_lhn = list(set(ind.keys()) - set(list_lhn))
-    #  Remove 'lhn' tag
-    list_non_lhn.remove('lhn')
+    if list_ids is None:
+        # Generate difference to get all building ids without LHN connection
+        list_non_lhn = list(set(ind.keys()) - set(list_lhn))
+        #  Remove 'lhn' tag
+        list_non_lhn.remove('lhn')
+    else:
+        set_lhn = set(list_lhn)
+        list_non_lhn = [n for n in list_ids if n not in set_lhn]
 
     list_ids_no_th = []  # List with build. ids without own th. supply
 
@@ -461,6 +647,12 @@ def check_stand_alone_build_th(ind, do_correction=True, do_random=True,
             if do_correction is False:  # pragma: no cover
                 break
 
+    if list_ids is not None and len(list_ids_no_th) > 1:
+        #  Correct buildings in order of full check (same random choices)
+        list_order = list(set(ind.keys()) - set(list_lhn))
+        list_ids_no_th = sort_by_order(list_ids=list_ids_no_th,
+                                       list_order=list_order)
+
     if do_correction:
         for n in list_ids_no_th:
             #  Randomly select esys type
@@ -473,24 +665,24 @@ def check_stand_alone_build_th(ind, do_correction=True, do_random=True,
                 if dict_sh is not None and dict_heatloads is not None:
                     #  Boiler
                     list_boi_choice = \
-                        modlist.get_list_values_larger_than_ref(
-                            list_val=dict_restr['boi'],
+                        modlist.get_range_larger_than_ref(
+                            dict_restr=dict_restr, key='boi',
                             ref_val=dict_heatloads[n])
                     #  Air/water heat pump
                     list_hp_aw_choice = modlist. \
-                        get_list_values_larger_than_ref(
-                        list_val=dict_restr['hp_aw'],
+                        get_range_larger_than_ref(
+                        dict_restr=dict_restr, key='hp_aw',
                         ref_val=dict_sh[n])
                     #  Water/water heat pump
                     list_hp_ww_choice = modlist. \
-                        get_list_values_larger_than_ref(
-                        list_val=dict_restr['hp_ww'],
+                        get_range_larger_than_ref(
+                        dict_restr=dict_restr, key='hp_ww',
                         ref_val=dict_sh[n])
 
                     #  CHP
                     list_chp_choice = modlist. \
-                        get_list_values_smaller_than_ref(
-                        list_val=dict_restr['chp'],
+                        get_range_smaller_than_ref(
+                        dict_restr=dict_restr, key='chp',
                         ref_val=dict_sh[n])
 
                     assert len(list_boi_choice) > 0
@@ -555,7 +747,7 @@ def check_stand_alone_build_th(ind, do_correction=True, do_random=True,
     return is_correct
 
 
-def check_no_chp_plus_hp(ind, do_correction=True):
+def check_no_chp_plus_hp(ind, do_correction=True, list_ids=None):
     """
 
     Parameters
@@ -565,6 +757,9 @@ def check_no_chp_plus_hp(ind, do_correction=True):
     do_correction : bool, optional
         Defines, if ind dict should be modified, if necessary (default: True).
         If True, deletes CHP or HP system.
+    list_ids : list (of ints), optional
+        List with building node ids, which should be checked (default: None).
+        If None, checks all buildings.
 
     Returns
     -------
@@ -575,7 +770,11 @@ def check_no_chp_plus_hp(ind, do_correction=True):
 
     is_correct = True
 
-    list_ids = analyse.get_build_ids_ind(ind=ind)
+    if list_ids is None:
+        list_ids = analyse.get_build_ids_ind(ind=ind)
+        is_subset = False
+    else:
+        is_subset = True
 
     list_ids_del = []
 
@@ -588,11 +787,20 @@ def check_no_chp_plus_hp(ind, do_correction=True):
             else:
                 list_ids_del.append(n)
 
-    if do_correction:
+    if is_subset and len(list_ids_del) > 1:
+        #  Correct buildings in order of full check (same random choices)
+        list_ids_del = \
+            sort_by_order(list_ids=list_ids_del,
+                          list_order=analyse.get_build_ids_ind(ind=ind))
+
+    if do_correction and len(list_ids_del) > 0:
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
         for n in list_ids_del:
 
             #  If building is LHN connected, delete heat pumps
-            if findlhn.has_lhn_connection(ind=ind, id=n) is True:
+            if findlhn.has_lhn_connection(ind=ind, id=n,
+                                          lhn_index=lhn_index) is True:
                 ind[n]['hp_aw'] = 0
                 ind[n]['hp_ww'] = 0
                 ind[n]['eh'] = 0
@@ -609,7 +817,8 @@ def check_no_chp_plus_hp(ind, do_correction=True):
 
 
 def check_no_boi_lhn_only(ind, dict_restr, dict_sh=None,
-                          do_correction=True, dict_heatloads=None):
+                          do_correction=True, dict_heatloads=None,
+                          list_lhn_idx=None):
     """
     Checks if boiler-lhn or eh-lhn only combinations exist. If yes,
     correct them by addding CHP system or deleting LHN and add boilers, only.
@@ -631,6 +840,9 @@ def check_no_boi_lhn_only(ind, dict_restr, dict_sh=None,
     dict_heatloads : dict, optional
         Dict holding building ids as keys and design heat loads in Watt
         as values (default: None)
+    list_lhn_idx : list (of ints), optional
+        List with indexes of LHN subnetworks, which should be checked
+        (default: None). If None, checks all LHN subnetworks.
 
     Returns
     -------
@@ -643,9 +855,13 @@ def check_no_boi_lhn_only(ind, dict_restr, dict_sh=None,
 
     list_subcities = []
 
+    if list_lhn_idx is None:
+        list_lhn_idx = range(len(ind['lhn']))
+
     # check if heatpump is connected to LHN at ind1
     if len(ind['lhn']) > 0:
-        for subcity in ind['lhn']:
+        for i in sorted(list_lhn_idx):
+            subcity = ind['lhn'][i]
 
             #  Assume supply is incorrect, until CHP is found
             has_chp = False
@@ -812,6 +1028,139 @@ def run_all_checks(ind, dict_max_pv_area, dict_restr=None, dict_sh=None,
     #  TODO: Add further checks
 
 
+def run_dirty_checks(ind, dict_max_pv_area, list_dirty_ids=None,
+                     list_dirty_lhn_idx=None, dict_restr=None,
+                     dict_sh=None, pv_min=None, pv_step=1, use_pv=False,
+                     add_pv_prop=0, do_random=True, prevent_boi_lhn=True,
+                     dict_heatloads=None):
+    """
+    Performs all checks of run_all_checks, but only on dirty buildings and
+    dirty LHN subnetworks. If invalid energy system or network,
+    automatically corrects it.
+
+    Requires, that all other buildings and LHN subnetworks fulfill all
+    constraints (see check_genome_is_valid). Then, result (including random
+    choices) is identical to run_all_checks. Buildings, which have been
+    removed from LHN, have to be marked as dirty, too. Note: Individuums
+    corrected by run_all_checks can still violate constraints (e.g. if
+    building without th. supply is removed from LHN, as stand-alone check is
+    performed before LHN checks).
+
+    Parameters
+    ----------
+    ind : individuum
+        Individuum of DEAP toolbox
+    dict_max_pv_area : dict
+        Dict holding maximum usable PV area values in m2 per building
+    list_dirty_ids : list (of ints), optional
+        List of building node ids with changed energy systems or LHN
+        connections (default: None). LHN subnetworks, which hold dirty
+        buildings, are also checked.
+    list_dirty_lhn_idx : list (of ints), optional
+        List with indexes of changed LHN subnetworks in ind['lhn']
+        (default: None)
+    dict_restr : dict, optional
+        Dict holding possible energy system sizes (default: None)
+    dict_sh : dict, optional
+        Dictionary holding building node ids as keys and maximum space heating
+        power values in Watt as dict values (default: None). If not None,
+        used for size limitation. If None, dict_restr is used for sizing.
+        (default: None)
+    pv_min : float, optional
+        Minimum possible PV area per building in m2 (default: None)
+    pv_step : float, optional
+        Defines discrete step of Pv sizing in m2 (default: 1).
+    use_pv : bool, optional
+        Defines, if PV can be used (default: False)
+    add_pv_prop : float, optional
+        Defines additional probability of PV being changed, if only thermal
+        mutation has been applied (defauft: 0).
+    do_random : bool, optional
+        If True, uses random values to generate feeder node (default: True),
+        when LHN has to be corrected.
+    prevent_boi_lhn : bool, optional
+        Prevent boi/eh LHN combinations (without CHP) (default: True).
+        If True, adds CHPs to LHN systems without CHP
+    dict_heatloads : dict, optional
+        Dict holding building ids as keys and design heat loads in Watt
+        as values (default: None)
+    """
+
+    if list_dirty_ids is None:
+        list_dirty_ids = []
+    if list_dirty_lhn_idx is None:
+        list_dirty_lhn_idx = []
+
+    #  Unique building ids (in order of first occurrence)
+    list_dirty_ids = list(dict.fromkeys(list_dirty_ids))
+    set_dirty_ids = set(list_dirty_ids)
+
+    if len(list_dirty_ids) > 0:
+        #  Check PV
+        if dict_max_pv_area is not None:
+            check_pv_max_areas(ind=ind, dict_max_pv_area=dict_max_pv_area,
+                               list_ids=list_dirty_ids)
+
+        #  Check thermal supply of stand alone buildings
+        check_stand_alone_build_th(ind=ind, dict_sh=dict_sh,
+                                   dict_restr=dict_restr,
+                                   pv_min=pv_min, pv_step=pv_step,
+                                   use_pv=use_pv, add_pv_prop=add_pv_prop,
+                                   dict_max_pv_area=dict_max_pv_area,
+                                   dict_heatloads=dict_heatloads,
+                                   list_ids=list_dirty_ids)
+
+        #  Check that no CHP plus HP is build
+        check_no_chp_plus_hp(ind=ind, list_ids=list_dirty_ids)
+
+        #  Check battery
+        check_bat_only_with_pv_or_chp(ind=ind, list_ids=list_dirty_ids)
+
+    #  Dirty LHN subnetworks (and subnetworks with dirty buildings)
+    set_dirty_lhn_idx = set(list_dirty_lhn_idx)
+
+    list_dirty_sublhn = []
+    for i in range(len(ind['lhn'])):
+        if (i in set_dirty_lhn_idx
+                or not set_dirty_ids.isdisjoint(ind['lhn'][i])):
+            list_dirty_sublhn.append(ind['lhn'][i])
+
+    if len(list_dirty_sublhn) == 0:
+        return
+
+    #  Check LHN constraints
+    ############################
+    list_lhn_idx = get_lhn_idx(ind=ind, list_sublhn=list_dirty_sublhn)
+
+    #  Check if heatpump is connected to LHN at ind
+    check_no_hp_in_lhn(ind=ind, list_lhn_idx=list_lhn_idx)
+
+    #  If LHN subcity has only one building it is deleted
+    check_lhn_has_min_two_build(ind=ind, list_lhn_idx=list_lhn_idx)
+
+    #  Indexes of remaining dirty subnetworks
+    list_lhn_idx = get_lhn_idx(ind=ind, list_sublhn=list_dirty_sublhn)
+
+    if len(list_lhn_idx) == 0:
+        return
+
+    #  Check, if each subLHN has, at least, one feeder node
+    check_lhn_th_supply(ind=ind, dict_restr=dict_restr,
+                        dict_max_pv_area=dict_max_pv_area,
+                        dict_heatloads=dict_heatloads,
+                        dict_sh=dict_sh,
+                        pv_min=pv_min, pv_step=pv_step, use_pv=use_pv,
+                        add_pv_prop=add_pv_prop, do_random=do_random,
+                        list_lhn_idx=list_lhn_idx)
+
+    if prevent_boi_lhn:
+        check_no_boi_lhn_only(ind=ind,
+                              dict_restr=dict_restr,
+                              dict_sh=dict_sh,
+                              dict_heatloads=dict_heatloads,
+                              list_lhn_idx=list_lhn_idx)
+
+
 #  TODO: if CHP or HP, use TES
 #  TODO: Prevent EH-stand-alone
 #  TODO: No stand-alone CHP (add boiler and tes)
@@ -7,6 +7,7 @@ from __future__ import division
 
 import os
 import pickle
+import numpy as np
 
 import pycity_calc.economic.city_economic_calc as citecon
 import pycity_calc.environments.germanmarket as gmarket
@@ -215,6 +216,162 @@ def run_monte_carlo_analysis(city, nb_runs,
             list_failed_idx, dict_mc_cov)
 
 
+def slice_sample_data(data, list_idx, nb_samples):
+    """
+    Returns copy of (nested) sample data structure, where every numpy array
+    with nb_samples entries in first dimension is reduced to the sample
+    indexes in list_idx. All other values are returned as references.
+
+    Parameters
+    ----------
+    data : object
+        Sample data (e.g. nested dict with numpy arrays)
+    list_idx : list (of ints)
+        List of sample indexes, which should be kept (in given order)
+    nb_samples : int
+        Total number of samples
+
+    Returns
+    -------
+    data_slice : object
+        Sliced sample data
+    """
+
+    if isinstance(data, dict):
+        data_slice = {}
+        for key in data.keys():
+            data_slice[key] = slice_sample_data(data=data[key],
+                                                list_idx=list_idx,
+                                                nb_samples=nb_samples)
+        return data_slice
+    elif isinstance(data, np.ndarray):
+        if data.ndim > 0 and len(data) == nb_samples:
+            return data[np.array(list_idx, dtype=int)]
+        return data
+    elif isinstance(data, list) and len(data) == nb_samples:
+        return [data[i] for i in list_idx]
+
+    return data
+
+
+def get_sample_attr_names(mc_run):
+    """
+    Returns list of names of attributes on mc_runner, which hold sample
+    dictionaries (e.g. _dict_samples_const, _dict_samples_esys or lhc
+    sample dicts)
+
+    Parameters
+    ----------
+    mc_run : object
+        MC runner object of pyCity_calc
+
+    Returns
+    -------
+    list_names : list (of str)
+        List with attribute names
+    """
+
+    list_names = []
+
+    for key in sorted(mc_run.__dict__.keys()):
+        if key.startswith('_dict_') and isinstance(mc_run.__dict__[key],
+                                                   dict):
+            list_names.append(key)
+
+    return list_names
+
+
+def perform_mc_runs_for_samples(mc_run, list_idx, nb_samples,
+                                sampling_method, failure_tolerance=0.05,
+                                heating_off=True, eeg_pv_limit=False,
+                                use_kwkg_lhn_sub=False, el_mix_for_chp=True,
+                                el_mix_for_pv=True):
+    """
+    Perform Monte-Carlo runs of mc_runner only for subset of existing
+    samples (e.g. for batch wise or incremental evaluation). Sample
+    dictionaries of mc_runner are temporarily replaced by sliced versions.
+
+    Parameters
+    ----------
+    mc_run : object
+        MC runner object of pyCity_calc (with existing samples)
+    list_idx : list (of ints)
+        List of sample indexes, which should be evaluated
+    nb_samples : int
+        Total number of samples on mc_runner
+    sampling_method : str
+        Defines method used for sampling.
+        Options:
+        - 'lhc': latin hypercube sampling
+        - 'random': randomized sampling
+    failure_tolerance : float, optional
+        Allowed EnergyBalanceException failure tolerance (default: 0.05)
+    heating_off : bool, optional
+        Defines, if sampling to deactivate heating during summer should
+        be used (default: True)
+    eeg_pv_limit : bool, optional
+        Defines, if EEG PV feed-in limitation of 70 % of peak load is
+        active (default: False)
+    use_kwkg_lhn_sub : bool, optional
+        Defines, if KWKG LHN subsidies are used (default: False)
+    el_mix_for_chp : bool, optional
+        Defines, if el. mix should be used for CHP fed-in electricity
+        (default: True)
+    el_mix_for_pv : bool, optional
+        Defines, if el. mix should be used for PV fed-in electricity
+        (default: True)
+
+    Returns
+    -------
+    tuple_res : tuple (of dicts)
+        (dict_mc_res, dict_mc_setup, dict_mc_cov) of perform_mc_runs.
+        Result arrays are ordered as list_idx. dict_mc_setup['idx_failed_runs']
+        holds original sample indexes of failed runs.
+    """
+
+    list_idx = list(list_idx)
+
+    if len(list_idx) == 0:
+        msg = 'list_idx cannot be empty!'
+        raise AssertionError(msg)
+
+    if max(list_idx) >= nb_samples or min(list_idx) < 0:
+        msg = 'list_idx holds sample indexes, which are out of range!'
+        raise AssertionError(msg)
+
+    use_all = list_idx == list(range(nb_samples))
+
+    dict_orig = {}
+    if not use_all:
+        #  Temporarily replace sample dicts with sliced versions
+        for key in get_sample_attr_names(mc_run=mc_run):
+            dict_orig[key] = mc_run.__dict__[key]
+            mc_run.__dict__[key] = slice_sample_data(data=dict_orig[key],
+                                                     list_idx=list_idx,
+                                                     nb_samples=nb_samples)
+
+    try:
+        (dict_mc_res, dict_mc_setup, dict_mc_cov) = \
+            mc_run.perform_mc_runs(nb_runs=len(list_idx),
+                                   sampling_method=sampling_method,
+                                   failure_tolerance=failure_tolerance,
+                                   eeg_pv_limit=eeg_pv_limit,
+                                   use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                                   el_mix_for_chp=el_mix_for_chp,
+                                   el_mix_for_pv=el_mix_for_pv,
+                                   heating_off=heating_off
+                                   )
+    finally:
+        mc_run.__dict__.update(dict_orig)
+
+    if not use_all:
+        #  Map failed run indexes to original sample indexes
+        dict_mc_setup['idx_failed_runs'] = \
+            [list_idx[i] for i in dict_mc_setup['idx_failed_runs']]
+
+    return (dict_mc_res, dict_mc_setup, dict_mc_cov)
+
+
 if __name__ == '__main__':
 
     #  Get workspace path
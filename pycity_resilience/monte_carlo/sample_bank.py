@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script holding sample bank (common random numbers) for GA evaluations.
+
+City, building and energy system uncertainty samples are drawn once per GA
+run (by the McRunner object of pyCity_calc). The sample bank saves every
+sample array (with one row per MC run) to a .npy file, which is opened as
+read-only memory-mapped array by every process. Thus, all workers index
+the same sample rows (common random numbers for all individuals) without
+holding copies of the samples in memory or receiving them via pickling.
+
+All other (non-array) parts of the sample dicts are saved to a skeleton
+pickle file.
+"""
+from __future__ import division
+
+import os
+import pickle
+import numpy as np
+
+import pycity_resilience.monte_carlo.run_mc as runmc
+
+#  Name of skeleton file in sample bank folder
+skeleton_name = 'skeleton.pkl'
+
+
+class BankRef(object):
+    def __init__(self, filename):
+        """
+        Placeholder for sample array, which is stored in sample bank
+
+        Parameters
+        ----------
+        filename : str
+            Name of .npy file in sample bank folder
+        """
+        self.filename = filename
+
+
+def _replace_arrays(data, nb_samples, list_arrays):
+    """
+    Returns copy of (nested) sample data, where every numeric numpy array
+    with nb_samples entries in first dimension is replaced by BankRef. The
+    replaced arrays are appended to list_arrays.
+
+    Parameters
+    ----------
+    data : object
+        Sample data (e.g. nested dict with numpy arrays)
+    nb_samples : int
+        Total number of samples
+    list_arrays : list
+        List of (filename, array) tuples (is extended)
+
+    Returns
+    -------
+    data_skel : object
+        Sample data skeleton
+    """
+
+    if isinstance(data, dict):
+        data_skel = {}
+        for key in data.keys():
+            data_skel[key] = _replace_arrays(data=data[key],
+                                             nb_samples=nb_samples,
+                                             list_arrays=list_arrays)
+        return data_skel
+    elif (isinstance(data, np.ndarray) and data.ndim > 0
+          and len(data) == nb_samples and data.dtype != object):
+        filename = 'sample_' + str(len(list_arrays)) + '.npy'
+        list_arrays.append((filename, data))
+        return BankRef(filename=filename)
+
+    return data
+
+
+def _resolve_refs(data, path):
+    """
+    Returns copy of sample data skeleton, where every BankRef is replaced
+    by read-only memory-mapped array
+
+    Parameters
+    ----------
+    data : object
+        Sample data skeleton
+    path : str
+        Path to sample bank folder
+
+    Returns
+    -------
+    data_res : object
+        Sample data with memory-mapped arrays
+    """
+
+    if isinstance(data, dict):
+        data_res = {}
+        for key in data.keys():
+            data_res[key] = _resolve_refs(data=data[key], path=path)
+        return data_res
+    elif isinstance(data, BankRef):
+        return np.load(os.path.join(path, data.filename), mmap_mode='r')
+
+    return data
+
+
+def save_sample_bank(mc_run, path, nb_samples, list_exclude=None):
+    """
+    Save sample dicts of mc_runner to sample bank folder
+
+    Parameters
+    ----------
+    mc_run : object
+        MC runner object of pyCity_calc (with existing samples)
+    path : str
+        Path to sample bank folder (generated, if not existent)
+    nb_samples : int
+        Total number of samples
+    list_exclude : list (of str), optional
+        List of sample dict attribute names, which should not be saved to
+        sample bank (default: None), e.g. ['_dict_samples_esys'], if
+        energy system samples are re-sampled for every evaluation
+    """
+
+    if list_exclude is None:
+        list_exclude = []
+
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+    dict_skeleton = {}
+    list_arrays = []
+
+    for key in runmc.get_sample_attr_names(mc_run=mc_run):
+        if key in list_exclude:
+            continue
+        dict_skeleton[key] = _replace_arrays(data=mc_run.__dict__[key],
+                                             nb_samples=nb_samples,
+                                             list_arrays=list_arrays)
+
+    #  Atomic replace of every file (processes, which have attached former
+    #  sample bank, keep reading the replaced files). Skeleton is written
+    #  last, thus existing skeleton marks complete sample bank.
+    for (filename, array) in list_arrays:
+        path_file = os.path.join(path, filename)
+        path_temp = path_file + '.' + str(os.getpid()) + '.tmp'
+        with open(path_temp, mode='wb') as file:
+            np.save(file, np.ascontiguousarray(array))
+        os.replace(path_temp, path_file)
+
+    path_file = os.path.join(path, skeleton_name)
+    path_temp = path_file + '.' + str(os.getpid()) + '.tmp'
+    with open(path_temp, mode='wb') as file:
+        pickle.dump((nb_samples, dict_skeleton), file,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path_temp, path_file)
+
+
+def has_sample_bank(path):
+    """
+    Returns True, if complete sample bank exists in folder
+
+    Parameters
+    ----------
+    path : str
+        Path to sample bank folder
+
+    Returns
+    -------
+    has_bank : bool
+        True, if skeleton file of sample bank exists
+    """
+    return os.path.exists(os.path.join(path, skeleton_name))
+
+
+def attach_sample_bank(mc_run, path):
+    """
+    Replace sample dicts of mc_runner with sample dicts of sample bank
+    (holding read-only memory-mapped arrays)
+
+    Parameters
+    ----------
+    mc_run : object
+        MC runner object of pyCity_calc
+    path : str
+        Path to sample bank folder
+
+    Returns
+    -------
+    nb_samples : int
+        Total number of samples of sample bank
+    """
+
+    with open(os.path.join(path, skeleton_name), mode='rb') as file:
+        (nb_samples, dict_skeleton) = pickle.load(file)
+
+    for key in dict_skeleton.keys():
+        mc_run.__dict__[key] = _resolve_refs(data=dict_skeleton[key],
+                                             path=path)
+
+    return nb_samples
+
+
+def get_state_without_samples(mc_run, path):
+    """
+    Returns shallow copy of mc_runner, where sample dicts of sample bank
+    are set to None (e.g. for pickling, if samples are attached from sample
+    bank later on)
+
+    Parameters
+    ----------
+    mc_run : object
+        MC runner object of pyCity_calc
+    path : str
+        Path to sample bank folder (only sample dicts, which are stored in
+        sample bank, are removed)
+
+    Returns
+    -------
+    mc_run_copy : object
+        Shallow copy of mc_runner without sample dicts
+    """
+
+    with open(os.path.join(path, skeleton_name), mode='rb') as file:
+        dict_skeleton = pickle.load(file)[1]
+
+    mc_run_copy = mc_run.__class__.__new__(mc_run.__class__)
+    mc_run_copy.__dict__.update(mc_run.__dict__)
+
+    for key in dict_skeleton.keys():
+        mc_run_copy.__dict__[key] = None
+
+    return mc_run_copy
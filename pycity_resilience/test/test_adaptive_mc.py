@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_resilience.ga.evaluate.adaptive_mc as adamc
+
+
+class McAnalyzeDummy(object):
+    def __init__(self, dict_mc_res, dict_mc_setup):
+        list_idx = [i for i in range(dict_mc_setup['nb_runs'])
+                    if i not in dict_mc_setup['idx_failed_runs']]
+        self._array_ann_mod = dict_mc_res['annuity'][list_idx]
+        self._array_co2_mod = dict_mc_res['co2'][list_idx]
+        self._array_sh_dem_mod = np.ones(len(list_idx))
+        self._array_el_dem_mod = np.ones(len(list_idx))
+        self._array_dhw_dem_mod = np.ones(len(list_idx))
+
+
+class TestAdaptiveMC():
+    def test_calc_conf_half_width(self):
+        array = np.array([1., 2., 3., 4.])
+
+        (mean, half_width) = adamc.calc_conf_half_width(array=array,
+                                                        stat_type='mean',
+                                                        conf_z=2)
+        assert abs(mean - 2.5) < 10 ** -8
+        assert abs(half_width - 2 * np.std(array, ddof=1) / 2) < 10 ** -8
+
+        #  Same std as objectives.calc_all_stats
+        (std, half_width_std) = \
+            adamc.calc_conf_half_width(array=array, stat_type='std')
+        assert abs(std - np.std(array)) < 10 ** -8
+
+        (stat, half_width_risk) = \
+            adamc.calc_conf_half_width(array=array, stat_type='risk_av',
+                                       risk_factor=-1)
+        assert abs(stat - (mean + np.std(array))) < 10 ** -8
+        assert half_width_risk > adamc.calc_conf_half_width(
+            array=array, stat_type='mean')[1]
+
+    def test_risk_friendly_stat(self):
+        array = np.array([1., 2., 3., 4.])
+
+        for objective in ['mc_risk_friendly_ann_and_co2',
+                          'mc_dimless_eco_em_2d_risk_friendly']:
+            risk_factor = adamc.get_risk_factor(objective=objective)
+            assert risk_factor > 0
+
+            (stat, half_width) = \
+                adamc.calc_conf_half_width(array=array,
+                                           stat_type='risk_friendly',
+                                           risk_factor=risk_factor)
+
+            #  Risk friendly parameter of EcoMCRunAnalyze: mean - k * std
+            assert abs(stat - (np.mean(array) - np.std(array))) < 10 ** -8
+
+        assert adamc.get_risk_factor(objective='mc_risk_av_ann_and_co2') < 0
+
+    def test_is_converged(self):
+        array_const = np.ones(20) * 100
+        array_noisy = np.array([50., 150.] * 10)
+
+        assert adamc.is_converged(list_arrays=[array_const],
+                                  stat_type='mean')
+        assert not adamc.is_converged(list_arrays=[array_const, array_noisy],
+                                      stat_type='mean')
+
+    def test_concat_mc_results(self):
+        tup_res1 = ({'annuity': np.array([1., 2.])},
+                    {'nb_runs': 2, 'idx_failed_runs': [1]})
+        tup_res2 = ({'annuity': np.array([3., 4., 5.])},
+                    {'nb_runs': 3, 'idx_failed_runs': [0]})
+
+        (dict_mc_res, dict_mc_setup) = \
+            adamc.concat_mc_results([tup_res1, tup_res2])
+
+        assert np.allclose(dict_mc_res['annuity'], [1., 2., 3., 4., 5.])
+        assert dict_mc_setup['nb_runs'] == 5
+        assert dict_mc_setup['idx_failed_runs'] == [1, 2]
+
+    def test_perform_adaptive_mc_runs(self):
+        list_batches = []
+
+        def run_batch(list_idx):
+            list_batches.append(list_idx)
+            nb = len(list_idx)
+            return ({'annuity': np.ones(nb) * 1000, 'co2': np.ones(nb) * 10},
+                    {'nb_runs': nb, 'idx_failed_runs': []})
+
+        (mc_analyze, nb_used) = \
+            adamc.perform_adaptive_mc_runs(run_batch=run_batch,
+                                           analyze=McAnalyzeDummy,
+                                           objective='mc_mean_ann_and_co2',
+                                           nb_runs=100, batch_size=10,
+                                           min_runs=20)
+
+        #  Constant results converge after min. nb. of runs
+        assert nb_used == 20
+        assert list_batches == [list(range(20))]
+        assert len(mc_analyze._array_ann_mod) == 20
+
+        def run_batch_noisy(list_idx):
+            array = np.array([(-1) ** i * 500 + 1000 for i in list_idx])
+            return ({'annuity': array, 'co2': array},
+                    {'nb_runs': len(list_idx), 'idx_failed_runs': []})
+
+        (mc_analyze, nb_used) = \
+            adamc.perform_adaptive_mc_runs(run_batch=run_batch_noisy,
+                                           analyze=McAnalyzeDummy,
+                                           objective='mc_mean_ann_and_co2',
+                                           nb_runs=100, batch_size=10,
+                                           min_runs=20)
+
+        #  Noisy results use all runs
+        assert nb_used == 100
+        assert len(mc_analyze._array_ann_mod) == 100
@@ -9,6 +9,7 @@ import shapely.geometry.point as point
 
 import pycity_resilience.ga.analyse.find_lhn as findlhn
 import pycity_resilience.ga.analyse.analyse as analyse
+import pycity_resilience.ga.preprocess.spatial_index as spatind
 
 
 class TestAnalysis():
@@ -42,6 +43,34 @@ class TestAnalysis():
         assert sorted(list_lhn_ids) == [1002, 1003, 1004, 1005, 1010, 1011,
                                         1012]
 
+    def test_lhn_index(self):
+        ind = {1001: {}, 1002: {}, 1003: {}, 1004: {}, 1005: {}, 1006: {},
+               'lhn': [[1002, 1003], [1004, 1005]]}
+
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
+        assert lhn_index == {1002: 0, 1003: 0, 1004: 1, 1005: 1}
+        assert findlhn.has_lhn_connection(ind=ind, id=1002,
+                                          lhn_index=lhn_index) is True
+        assert findlhn.has_lhn_connection(ind=ind, id=1001,
+                                          lhn_index=lhn_index) is False
+
+        lhn_index.add_sublhn(ind=ind, list_sublhn=[1001, 1006])
+        lhn_index.del_node(ind=ind, idx_lhn=1, n=1004)
+        lhn_index.add_node(ind=ind, idx_lhn=0, n=1004)
+
+        assert ind['lhn'] == [[1002, 1003, 1004], [1005], [1001, 1006]]
+        assert lhn_index == findlhn.LhnIndex(ind=ind)
+
+        #  Indexes of following subnetworks are shifted
+        lhn_index.del_sublhn(ind=ind, idx_lhn=0)
+
+        assert ind['lhn'] == [[1005], [1001, 1006]]
+        assert lhn_index == {1005: 0, 1001: 1, 1006: 1}
+        assert sorted(findlhn.get_all_lhn_ids(ind=ind,
+                                              lhn_index=lhn_index)) \
+               == [1001, 1005, 1006]
+
     def test_get_ids_sorted_by_dist(self):
         id = 1001
 
@@ -147,6 +176,39 @@ class TestAnalysis():
 
         assert list_sorted == [(1006, 10), (1004, 20)]
 
+    def test_spatial_index_orderings(self):
+        dict_pos = {}
+        for i in range(30):
+            dict_pos[1001 + i] = point.Point((i * 7) % 50, (i * 13) % 40)
+
+        list_ids = list(dict_pos.keys())
+
+        for max_nb_dense in [1000, 0]:
+            #  Dense distance matrix and KD-tree
+            index = spatind.SpatialIndex(dict_pos=dict_pos,
+                                         max_nb_dense=max_nb_dense)
+
+            for max_dist in [None, 20]:
+                for id in [1001, 1010, 1030]:
+                    assert analyse.get_ids_sorted_by_dist(
+                        id=id, dict_pos=dict_pos, list_av=list(list_ids),
+                        max_dist=max_dist) == \
+                           analyse.get_ids_sorted_by_dist(
+                               id=id, dict_pos=index, list_av=list(list_ids),
+                               max_dist=max_dist)
+
+                list_ref = [1003, 1001, 1020]
+                dict_dist = analyse.get_ids_closest_dist_to_list_of_build(
+                    list_ref=list_ref, list_search=list_ids,
+                    dict_pos=dict_pos, max_dist=max_dist)
+                dict_dist_index = \
+                    analyse.get_ids_closest_dist_to_list_of_build(
+                        list_ref=list_ref, list_search=list_ids,
+                        dict_pos=index, max_dist=max_dist)
+
+                assert list(dict_dist.items()) == \
+                       list(dict_dist_index.items())
+
     def test_get_build_ids_without_th_supply(self):
         dict_b1 = {'bat': 5000,  # in Joule
                    'boi': 10000,  # in Watt
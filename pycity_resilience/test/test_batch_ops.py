@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import copy
+import random
+import numpy as np
+
+from deap import base, creator
+
+import pycity_resilience.ga.parser.genome as genom
+import pycity_resilience.ga.evolution.batch_ops as batchops
+
+if not hasattr(creator, 'FitnessBatch'):
+    creator.create('FitnessBatch', base.Fitness, weights=(-1.0, -1.0))
+    creator.create('IndBatch', dict, fitness=creator.FitnessBatch)
+
+list_build_ids = [1001, 1002, 1003, 1004]
+
+dict_restr = {'boi': [10000, 20000, 30000],
+              'chp': [5000, 10000, 15000],
+              'tes': [100, 300, 500, 1000],
+              'hp_aw': [5000, 10000, 15000],
+              'hp_ww': [5000, 10000, 15000],
+              'eh': [5000, 10000],
+              'bat': [5, 10]}
+
+dict_sh = {1001: 8000, 1002: 12000, 1003: 4000, 1004: 20000}
+dict_heatloads = {1001: 15000, 1002: 25000, 1003: 5000, 1004: 35000}
+dict_max_pv_area = {1001: 30, 1002: 20, 1003: 5, 1004: 50}
+
+
+def gen_ind():
+    ind = {}
+    for n in list_build_ids:
+        ind[n] = {'bat': 0, 'boi': 20000, 'chp': 0, 'eh': 0, 'hp_aw': 0,
+                  'hp_ww': 0, 'pv': 0, 'tes': 0}
+    ind[1001]['chp'] = 5000
+    ind[1001]['tes'] = 500
+    ind[1002]['pv'] = 12.0
+    ind['lhn'] = [[1003, 1004]]
+    return ind
+
+
+def gen_batch_ops(**kwargs):
+    codec = genom.GenomeCodec(list_build_ids=list_build_ids,
+                              dict_restr=dict_restr)
+    return batchops.BatchOperators(codec=codec, dict_restr=dict_restr,
+                                   dict_max_pv_area=dict_max_pv_area,
+                                   pv_min=8, dict_sh=dict_sh,
+                                   dict_heatloads=dict_heatloads, **kwargs)
+
+
+def get_values(batch_ops, esys, key):
+    key_idx = batchops.dict_key_idx[key]
+    return np.array(batch_ops.codec.list_tables[key_idx])[esys[..., key_idx]]
+
+
+class TestBatchOps():
+    def test_choice_tables(self):
+        batch_ops = gen_batch_ops()
+
+        array_build = np.repeat(np.arange(len(list_build_ids)), 100)
+
+        list_boi = np.array(batch_ops.codec.list_tables[
+                                batchops.dict_key_idx['boi']])[
+            batch_ops.draw(name='boi_hl', array_build=array_build)]
+        list_pv = np.array(batch_ops.codec.list_tables[
+                               batchops.dict_key_idx['pv']])[
+            batch_ops.draw(name='pv', array_build=array_build)]
+
+        for i in range(len(array_build)):
+            n = list_build_ids[array_build[i]]
+            #  Largest boiler, if no boiler is large enough
+            assert list_boi[i] >= min(dict_heatloads[n], 30000)
+            if n == 1003:
+                #  Max. PV area smaller than pv_min
+                assert list_pv[i] == 0
+            else:
+                assert 8 <= list_pv[i] < dict_max_pv_area[n]
+
+    def test_mutate_configs(self):
+        np.random.seed(1)
+
+        batch_ops = gen_batch_ops(list_options=['hp_aw_eh'],
+                                  list_opt_prob=[1],
+                                  list_lhn_opt=['no_th_supply'],
+                                  list_lhn_prob=[1])
+
+        (esys, lhn) = batch_ops.encode_population([gen_ind()] * 10)
+
+        batch_ops.mutate_configs(esys=esys, lhn=lhn,
+                                 mask=np.ones(lhn.shape, dtype=bool))
+
+        is_lhn = lhn > 0
+        for key in ['boi', 'chp', 'hp_ww']:
+            assert np.all(get_values(batch_ops, esys, key) == 0)
+        for key in ['hp_aw', 'eh', 'tes']:
+            assert np.all(get_values(batch_ops, esys, key)[~is_lhn] > 0)
+            assert np.all(get_values(batch_ops, esys, key)[is_lhn] == 0)
+        assert np.all(get_values(batch_ops, esys, 'tes')[~is_lhn] >= 300)
+        #  PV is not changed
+        assert np.all(get_values(batch_ops, esys, 'pv')[:, 1] == 12.0)
+
+    def test_mutate_values(self):
+        np.random.seed(2)
+
+        batch_ops = gen_batch_ops(prob_mut=1)
+
+        (esys, lhn) = batch_ops.encode_population([gen_ind()] * 20)
+        esys_orig = esys.copy()
+
+        batch_ops.mutate_values(esys=esys,
+                                mask=np.ones(lhn.shape, dtype=bool))
+
+        #  Existence of energy systems is not changed
+        assert np.array_equal(esys > 0, esys_orig > 0)
+        #  CHP size smaller than space heating power
+        assert np.all(get_values(batch_ops, esys, 'chp')[:, 0] <= 8000)
+        #  Sizes have been mutated
+        assert not np.array_equal(esys, esys_orig)
+
+    def test_crossover(self):
+        np.random.seed(3)
+
+        batch_ops = gen_batch_ops()
+
+        ind_other = gen_ind()
+        for n in list_build_ids:
+            ind_other[n]['boi'] = 30000
+            ind_other[n]['tes'] = 1000
+        ind_other[1004]['pv'] = 40.0
+
+        (esys1_orig, lhn) = batch_ops.encode_population([gen_ind()] * 50)
+        (esys2_orig, lhn) = batch_ops.encode_population([ind_other] * 50)
+
+        esys1 = esys1_orig.copy()
+        esys2 = esys2_orig.copy()
+
+        array_done = batch_ops.crossover(esys1=esys1, esys2=esys2)
+
+        assert np.all(array_done)
+        assert not np.array_equal(esys1, esys1_orig)
+        #  Sizes are only exchanged between individuals of pair
+        for i in range(50):
+            for k in range(len(genom.list_esys_keys)):
+                assert sorted(list(esys1[i, :, k]) + list(esys2[i, :, k])) \
+                       == sorted(list(esys1_orig[i, :, k])
+                                 + list(esys2_orig[i, :, k]))
+
+    def test_gen_offspring(self):
+        random.seed(4)
+        np.random.seed(4)
+
+        batch_ops = gen_batch_ops()
+
+        pop = []
+        for i in range(10):
+            ind = creator.IndBatch(copy.deepcopy(gen_ind()))
+            ind[1002]['boi'] = dict_restr['boi'][i % 3]
+            ind.fitness.values = (float(i), float(10 - i))
+            pop.append(ind)
+
+        list_checked = []
+
+        offspring = batch_ops.gen_offspring(
+            pop=pop, ind_class=creator.IndBatch, prob_cx=0.5,
+            prob_mutation=0.5, lhn_mutate=None,
+            check_ind=list_checked.append)
+
+        assert len(offspring) == len(pop)
+        #  Parents are not modified
+        assert pop[0][1002]['boi'] == 10000
+        assert pop[0][1001] == gen_ind()[1001]
+
+        for ind in offspring:
+            assert sorted(ind.keys(), key=str) \
+                   == sorted(list_build_ids + ['lhn'], key=str)
+            assert ind['lhn'] == [[1003, 1004]]
+            if ind.fitness.valid:
+                #  Unchanged copy of parent
+                assert ind in pop
+                assert not any(ind is ind_check for ind_check in list_checked)
+            else:
+                assert any(ind is ind_check for ind_check in list_checked)
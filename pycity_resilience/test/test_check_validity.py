@@ -6,8 +6,61 @@
 from __future__ import division
 
 import copy
+import random
+import numpy as np
 
 import pycity_resilience.ga.verify.check_validity as checkval
+import pycity_resilience.ga.parser.genome as genom
+
+list_build_ids = [1001, 1002, 1003, 1004, 1005, 1006, 1007, 1008]
+
+dict_restr_rand = {'boi': [10000, 20000, 50000, 100000, 200000],
+                   'tes': [100, 500, 2000],
+                   'chp': [1000, 5000, 20000],
+                   'hp_aw': [5000, 10000, 20000],
+                   'hp_ww': [5000, 10000, 20000],
+                   'eh': [5000, 10000, 20000],
+                   'bat': [5, 10]}
+
+dict_sh_rand = {}
+dict_hl_rand = {}
+dict_pv_rand = {}
+for n in list_build_ids:
+    dict_sh_rand[n] = 2000 * (n - 1000)
+    dict_hl_rand[n] = 3000 * (n - 1000)
+    dict_pv_rand[n] = 10 * (n - 1000)
+
+
+def gen_rand_esys():
+    dict_esys = {}
+    for key in ['boi', 'tes', 'chp', 'hp_aw', 'hp_ww', 'eh', 'bat']:
+        if random.random() < 0.4:
+            dict_esys[key] = random.choice(dict_restr_rand[key])
+        else:
+            dict_esys[key] = 0
+    if random.random() < 0.5:
+        dict_esys['pv'] = float(random.randint(8, 100))
+    else:
+        dict_esys['pv'] = 0
+    return dict_esys
+
+
+def gen_rand_ind():
+    ind = {}
+    for n in list_build_ids:
+        ind[n] = gen_rand_esys()
+
+    list_ids = copy.copy(list_build_ids)
+    random.shuffle(list_ids)
+
+    ind['lhn'] = []
+    while len(list_ids) > 0 and random.random() < 0.7:
+        nb_nodes = random.randint(1, 4)
+        ind['lhn'].append(list_ids[:nb_nodes])
+        list_ids = list_ids[nb_nodes:]
+        ind['lhn'] = [sublhn for sublhn in ind['lhn'] if len(sublhn) > 0]
+
+    return ind
 
 
 class TestCheckValidity():
@@ -360,3 +413,112 @@ class TestCheckValidity():
         #  Check, if CHP has been added to
         assert (dict_b1['chp'] > 0 and dict_b1['boi'] > 0 or
                 dict_b3['boi'] > 0 and dict_b3['chp'] > 0)
+
+    def test_run_dirty_checks(self):
+        dict_kwargs = {'dict_max_pv_area': dict_pv_rand,
+                       'dict_restr': dict_restr_rand,
+                       'dict_sh': dict_sh_rand,
+                       'dict_heatloads': dict_hl_rand,
+                       'pv_min': 8, 'use_pv': True, 'add_pv_prop': 0.5}
+
+        codec = genom.GenomeCodec(list_build_ids=list_build_ids,
+                                  dict_restr=dict_restr_rand)
+
+        nb_tested = 0
+
+        for i in range(300):
+            random.seed(i)
+
+            #  Individuum, which fulfills all constraints
+            ind = gen_rand_ind()
+            for j in range(5):
+                checkval.run_all_checks(ind=ind, **dict_kwargs)
+                if checkval.check_genome_is_valid(
+                        genome=codec.encode(ind),
+                        dict_max_pv_area=dict_pv_rand):
+                    break
+            else:
+                continue
+
+            nb_tested += 1
+
+            #  Change energy systems of random buildings
+            list_dirty_ids = random.sample(list_build_ids,
+                                           random.randint(1, 3))
+            for n in list_dirty_ids:
+                ind[n] = gen_rand_esys()
+
+            list_dirty_lhn_idx = []
+            if len(ind['lhn']) > 0 and random.random() < 0.5:
+                #  Remove building from LHN subnetwork
+                idx = random.randint(0, len(ind['lhn']) - 1)
+                list_dirty_ids.append(ind['lhn'][idx].pop())
+                list_dirty_lhn_idx.append(idx)
+
+            ind_full = copy.deepcopy(ind)
+            ind_dirty = copy.deepcopy(ind)
+
+            random.seed(i)
+            np.random.seed(i)
+            checkval.run_all_checks(ind=ind_full, **dict_kwargs)
+
+            random.seed(i)
+            np.random.seed(i)
+            checkval.run_dirty_checks(ind=ind_dirty,
+                                      list_dirty_ids=list_dirty_ids,
+                                      list_dirty_lhn_idx=list_dirty_lhn_idx,
+                                      **dict_kwargs)
+
+            assert ind_dirty == ind_full
+
+        assert nb_tested > 200
+
+    def test_run_dirty_checks_no_dirty(self):
+        ind = {1001: {'bat': 0, 'boi': 0, 'chp': 0, 'eh': 0, 'hp_aw': 0,
+                      'hp_ww': 0, 'pv': 0, 'tes': 0},
+               'lhn': []}
+
+        #  Only dirty buildings are checked
+        checkval.run_dirty_checks(ind=ind, dict_max_pv_area=None,
+                                  do_random=False)
+
+        assert ind[1001]['boi'] == 0
+
+    def test_check_genome_is_valid(self):
+        codec = genom.GenomeCodec(list_build_ids=list_build_ids,
+                                  dict_restr=dict_restr_rand)
+
+        for i in range(300):
+            random.seed(i)
+
+            ind = gen_rand_ind()
+
+            #  Reference (checks without correction)
+            is_valid = \
+                (checkval.check_pv_max_areas(ind=ind,
+                                             dict_max_pv_area=dict_pv_rand,
+                                             do_correction=False)
+                 and checkval.check_stand_alone_build_th(ind=ind,
+                                                         do_correction=False,
+                                                         do_random=False)
+                 and checkval.check_no_chp_plus_hp(ind=ind,
+                                                   do_correction=False)
+                 and checkval.check_bat_only_with_pv_or_chp(
+                            ind=ind, do_correction=False)
+                 and checkval.check_no_hp_in_lhn(ind=ind,
+                                                 do_correction=False)
+                 and checkval.check_lhn_has_min_two_build(
+                            ind=ind, do_correction=False)
+                 and checkval.check_no_boi_lhn_only(
+                            ind=ind, dict_restr=dict_restr_rand,
+                            do_correction=False))
+
+            genome = codec.encode(ind)
+
+            assert checkval.check_genome_is_valid(
+                genome=genome, dict_max_pv_area=dict_pv_rand) == is_valid
+
+        #  Index, which is not part of value table
+        genome = codec.encode(gen_rand_ind())
+        genome.esys[0, 0] = len(codec.list_tables[0])
+        assert checkval.check_genome_is_valid(genome=genome) is False
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import os
+import random
+import numpy as np
+
+from deap import base, creator, tools
+
+import pycity_resilience.ga.checkpoint as checkp
+
+if not hasattr(creator, 'FitnessCheckp'):
+    creator.create('FitnessCheckp', base.Fitness, weights=(-1.0, -1.0))
+    creator.create('IndCheckp', dict, fitness=creator.FitnessCheckp)
+
+
+class TestCheckpoint():
+    def test_rng_state(self):
+        random.seed(1)
+        np.random.seed(1)
+
+        dict_rng = checkp.get_rng_state()
+
+        list_rand = [random.random(), np.random.rand()]
+
+        checkp.set_rng_state(dict_rng=dict_rng)
+
+        assert [random.random(), np.random.rand()] == list_rand
+
+    def test_save_and_load_checkpoint(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'checkpoint.pkl')
+
+        ind = creator.IndCheckp({1001: {'boi': 10000}, 'lhn': []})
+        ind.fitness.values = (1., 2.)
+
+        halloffame = tools.HallOfFame(2)
+        halloffame.update([ind])
+
+        logbook = tools.Logbook()
+        logbook.record(gen=0, evals=1)
+
+        random.seed(2)
+        np.random.seed(2)
+
+        checkp.save_checkpoint(path=path,
+                               dict_state={'gen': 1,
+                                           'pop': [ind],
+                                           'parents': [ind],
+                                           'list_ind': [],
+                                           'halloffame': halloffame,
+                                           'logbook': logbook})
+
+        list_rand = [random.random(), np.random.rand()]
+
+        #  Atomic replace (no temporary file left)
+        assert os.listdir(str(tmpdir)) == ['checkpoint.pkl']
+
+        dict_checkpoint = checkp.load_checkpoint(path=path)
+
+        assert dict_checkpoint['gen'] == 1
+        assert dict_checkpoint['pop'] == [ind]
+        assert dict_checkpoint['pop'][0].fitness.values == (1., 2.)
+        assert dict_checkpoint['halloffame'][0] == ind
+        assert len(dict_checkpoint['logbook']) == 1
+
+        checkp.set_rng_state(dict_rng=dict_checkpoint['dict_rng'])
+        assert [random.random(), np.random.rand()] == list_rand
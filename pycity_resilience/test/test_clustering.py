@@ -5,6 +5,7 @@
 """
 from __future__ import division
 
+import numpy as np
 import shapely.geometry.point as point
 
 import pycity_resilience.ga.clustering.cluster as clust
@@ -37,3 +38,87 @@ class TestClustering():
         dict_clusters = clust.kmeans_clustering(dict_pos=dict_pos,
                                                 list_av_ids=list_av_ids,
                                                 nb_clusters=nb_clusters)
+
+    def test_kmeans_clustering_cache(self):
+        dict_pos = {}
+        for i in range(12):
+            dict_pos[1001 + i] = point.Point((i % 3) * 2 + (i // 6) * 50,
+                                             (i // 3) % 2)
+
+        list_av_ids = list(dict_pos.keys())
+
+        clust.clear_cache()
+
+        dict_clusters = clust.kmeans_clustering(dict_pos=dict_pos,
+                                                list_av_ids=list_av_ids,
+                                                nb_clusters=2, seed=1)
+
+        assert len(clust._dict_cache) == 1
+
+        #  Same set of ids (other order) is taken from cache
+        dict_clusters_2 = \
+            clust.kmeans_clustering(dict_pos=dict_pos,
+                                    list_av_ids=list(reversed(list_av_ids)),
+                                    nb_clusters=2, seed=1)
+
+        assert dict_clusters_2 == dict_clusters
+        assert len(clust._dict_cache) == 1
+
+        #  Cached result is not modified by caller
+        dict_clusters_2[0].append(9999)
+        assert clust.kmeans_clustering(dict_pos=dict_pos,
+                                       list_av_ids=list_av_ids,
+                                       nb_clusters=2,
+                                       seed=1) == dict_clusters
+
+        #  No caching without seed
+        clust.kmeans_clustering(dict_pos=dict_pos, list_av_ids=list_av_ids,
+                                nb_clusters=2)
+        assert len(clust._dict_cache) == 1
+
+        list_all = []
+        for key in dict_clusters:
+            list_all += dict_clusters[key]
+        assert sorted(list_all) == list_av_ids
+
+    def test_kmeans(self):
+        rng = np.random.RandomState(1)
+
+        #  Three separated groups of nodes
+        x_y_array = np.concatenate((rng.rand(20, 2),
+                                    rng.rand(20, 2) + [100, 0],
+                                    rng.rand(20, 2) + [0, 100]))
+
+        (array_centers, array_labels) = \
+            clust.kmeans(x_y_array=x_y_array, nb_clusters=3,
+                         rng=np.random.RandomState(2))
+
+        assert array_centers.shape == (3, 2)
+        for i in range(3):
+            assert len(set(array_labels[i * 20:(i + 1) * 20])) == 1
+        assert len(set(array_labels)) == 3
+
+        #  Same seed leads to same result
+        (array_centers_2, array_labels_2) = \
+            clust.kmeans(x_y_array=x_y_array, nb_clusters=3,
+                         rng=np.random.RandomState(2))
+        assert np.array_equal(array_labels, array_labels_2)
+
+    def test_kmeans_empty_cluster_repair(self):
+        #  Duplicate positions (k-means++ seeds identical centers)
+        x_y_array = np.array([[0., 0.], [0., 0.], [0., 0.], [5., 5.]])
+
+        (array_centers, array_labels) = \
+            clust.kmeans(x_y_array=x_y_array, nb_clusters=3,
+                         rng=np.random.RandomState(1))
+
+        #  No empty cluster
+        assert sorted(np.bincount(array_labels, minlength=3)) == [1, 1, 2]
+
+    def test_kmeans_clustering_single_nodes(self):
+        dict_pos = {1001: point.Point(0, 0), 1002: point.Point(50, 0),
+                    1003: point.Point(0, 50)}
+
+        assert clust.kmeans_clustering(dict_pos=dict_pos,
+                                       list_av_ids=[1001, 1002, 1003],
+                                       nb_clusters=3) is None
@@ -6,6 +6,7 @@
 from __future__ import division
 
 import copy
+import random
 
 import pycity_resilience.ga.evolution.crossover as cx
 
@@ -345,3 +346,41 @@ class TestCrossover():
             cx.do_crossover(ind1=ind1, ind2=ind2,
                             dict_max_pv_area=dict_max_pv_area,
                             perform_checks=False)
+
+    def test_cx_dirty_checks(self):
+        dict_bat = {'boi': 10000, 'chp': 0, 'hp_aw': 0, 'hp_ww': 0, 'eh': 0,
+                    'tes': 0, 'pv': 20, 'bat': 5}
+        dict_boi = {'boi': 10000, 'chp': 0, 'hp_aw': 0, 'hp_ww': 0, 'eh': 0,
+                    'tes': 0, 'pv': 0, 'bat': 0}
+
+        ind1 = {'lhn': [[1002, 1003]]}
+        ind2 = {'lhn': []}
+        for n in [1001, 1002, 1003]:
+            ind1[n] = copy.deepcopy(dict_bat)
+            ind2[n] = copy.deepcopy(dict_boi)
+
+        dict_max_pv_area = {1001: 50, 1002: 50, 1003: 50}
+        dict_restr = {'boi': [10000, 20000], 'chp': [1000],
+                      'hp_aw': [10000], 'hp_ww': [10000], 'eh': [5000],
+                      'tes': [500], 'bat': [5]}
+        dict_sh = {1001: 5000, 1002: 5000, 1003: 5000}
+
+        list_res = []
+
+        for dirty_checks in [False, True]:
+            random.seed(1)
+            list_res.append(
+                cx.do_crossover(ind1=ind1, ind2=ind2,
+                                dict_max_pv_area=dict_max_pv_area,
+                                dict_restr=dict_restr,
+                                dict_sh=dict_sh, dict_heatloads=dict_sh,
+                                list_cx_combis=[['pv']],
+                                prevent_boi_lhn=False,
+                                dirty_checks=dirty_checks))
+
+        assert list_res[0] == list_res[1]
+
+        #  Battery without PV has been removed
+        (ind1_res, ind2_res) = list_res[1]
+        for n in [1001, 1002, 1003]:
+            assert ind1_res[n]['pv'] > 0 or ind1_res[n]['bat'] == 0
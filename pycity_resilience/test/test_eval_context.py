@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import copy
+
+import shapely.geometry.point as point
+
+import pycity_base.classes.Weather as Weather
+import pycity_base.classes.demand.SpaceHeating as SpaceHeating
+import pycity_base.classes.demand.ElectricalDemand as ElectricalDemand
+import pycity_base.classes.demand.Apartment as Apartment
+
+import pycity_calc.buildings.building as build_ex
+import pycity_calc.cities.city as city
+import pycity_calc.environments.co2emissions as co2
+import pycity_calc.environments.environment as env
+import pycity_calc.environments.germanmarket as germarkt
+import pycity_calc.environments.timer as time
+
+import pycity_resilience.ga.parser.parse_ind_to_city as parse_ind_to_city
+import pycity_resilience.ga.preprocess.add_bes as addbes
+import pycity_resilience.ga.evaluate.eval_context as evalcon
+import pycity_resilience.monte_carlo.run_mc as runmc
+
+
+class TestEvalContext():
+    def gen_city(self):
+        year = 2010
+        timestep = 900  # Timestep in seconds
+        location = (51.529086, 6.944689)  # (latitude, longitute) of Bottrop
+        altitude = 55  # Altitude of Bottrop
+
+        timer = time.TimerExtended(timestep=timestep, year=year)
+        weather = Weather.Weather(timer, useTRY=True, location=location,
+                                  altitude=altitude)
+        market = germarkt.GermanMarket()
+        co2em = co2.Emissions(year=year)
+        environment = env.EnvironmentExtended(timer, weather, prices=market,
+                                              location=location, co2em=co2em)
+
+        city_object = city.City(environment=environment)
+
+        for i in range(3):
+            extended_building = build_ex.BuildingExtended(
+                environment, build_year=1990, mod_year=2003, build_type=0,
+                roof_usabl_pv_area=30, net_floor_area=150,
+                height_of_floors=3, nb_of_floors=2, neighbour_buildings=0,
+                residential_layout=0, attic=0, cellar=1,
+                construction_type='heavy', dormer=0)
+
+            heat_demand = SpaceHeating.SpaceHeating(environment,
+                                                    method=1,
+                                                    profile_type='HEF',
+                                                    livingArea=100,
+                                                    specificDemand=130)
+
+            el_demand = ElectricalDemand.ElectricalDemand(environment,
+                                                          method=1,
+                                                          annualDemand=3000,
+                                                          profileType="H0")
+
+            apartment = Apartment.Apartment(environment)
+            apartment.addMultipleEntities([heat_demand, el_demand])
+            extended_building.addEntity(entity=apartment)
+
+            city_object.add_extended_building(extended_building,
+                                              position=point.Point(i * 50, 0))
+
+        addbes.add_bes_to_city(city=city_object, add_init_boi=True)
+
+        return city_object
+
+    def test_reset_and_load_ind(self):
+        city_object = self.gen_city()
+
+        mc_run = runmc.init_base_mc_objects(city=city_object)
+
+        city_orig = copy.deepcopy(city_object)
+
+        eval_context = evalcon.EvalContext(city=city_object,
+                                           mc_runner=mc_run)
+
+        dict_b1 = {'chp': 10000, 'boi': 30000, 'tes': 500,
+                   'eh': 0, 'hp_aw': 0, 'hp_ww': 0, 'pv': 30, 'bat': 0}
+        dict_b2 = {'chp': 0, 'boi': 0, 'tes': 0,
+                   'eh': 0, 'hp_aw': 0, 'hp_ww': 0, 'pv': 0,
+                   'bat': 0}
+        dict_b3 = {'chp': 0, 'boi': 0, 'tes': 200,
+                   'eh': 10000, 'hp_aw': 10000, 'hp_ww': 0, 'pv': 20,
+                   'bat': 3600000}
+
+        ind1 = {1001: dict_b1, 1002: dict_b2, 1003: dict_b3,
+                'lhn': [[1001, 1002]]}
+
+        city_mod = eval_context.load_ind(ind=ind1)
+
+        assert city_mod is city_object
+        assert city_mod.nodes[1001]['entity'].bes.chp.qNominal == 10000
+        assert city_mod.nodes[1003]['entity'].bes.hasHeatpump is True
+        assert city_mod.edges[1001, 1002]['network_type'] == 'heating'
+
+        #  Reset city and compare to original state
+        eval_context.reset()
+
+        assert sorted(city_mod.edges()) == sorted(city_orig.edges())
+        for n in [1001, 1002, 1003]:
+            bes = city_mod.nodes[n]['entity'].bes
+            bes_orig = city_orig.nodes[n]['entity'].bes
+            for flag in evalcon.list_bes_flags:
+                assert getattr(bes, flag) == getattr(bes_orig, flag)
+            assert bes.boiler.qNominal == bes_orig.boiler.qNominal
+            assert bes.chp.qNominal == bes_orig.chp.qNominal
+            assert bes.tes.capacity == bes_orig.tes.capacity
+
+        #  Load second individuum and compare with deepcopy path
+        dict_b1_2 = copy.deepcopy(dict_b2)
+        dict_b1_2['boi'] = 20000
+        dict_b2_2 = copy.deepcopy(dict_b2)
+        dict_b2_2['boi'] = 20000
+        ind2 = {1001: dict_b1_2, 1002: dict_b2_2, 1003: dict_b3,
+                'lhn': []}
+
+        city_mod = eval_context.load_ind(ind=ind2)
+
+        city_ref = parse_ind_to_city. \
+            parse_ind_dict_to_city(dict_ind=ind2,
+                                   city=city_orig,
+                                   copy_city=True)
+
+        assert sorted(city_mod.edges()) == sorted(city_ref.edges())
+        for n in [1001, 1002, 1003]:
+            bes = city_mod.nodes[n]['entity'].bes
+            bes_ref = city_ref.nodes[n]['entity'].bes
+            for flag in evalcon.list_bes_flags:
+                assert getattr(bes, flag) == getattr(bes_ref, flag)
+            assert bes.boiler.qNominal == bes_ref.boiler.qNominal
+            assert bes.chp.qNominal == bes_ref.chp.qNominal
+            assert bes.chp.pNominal == bes_ref.chp.pNominal
+            assert bes.heatpump.qNominal == bes_ref.heatpump.qNominal
+            assert bes.tes.capacity == bes_ref.tes.capacity
+            assert bes.battery.capacity == bes_ref.battery.capacity
+
+    def test_get_eval_context(self):
+        city_object = self.gen_city()
+
+        mc_run = runmc.init_base_mc_objects(city=city_object)
+
+        class Runner(object):
+            pass
+
+        ga_runner = Runner()
+        ga_runner.mc_runner = mc_run
+        ga_runner._city = city_object
+        ga_runner._list_build_ids = [1001, 1002, 1003]
+
+        eval_context = evalcon.get_eval_context(ga_runner=ga_runner)
+
+        #  Context is generated once per ga_runner
+        assert evalcon.get_eval_context(ga_runner=ga_runner) is eval_context
+        assert eval_context.city is city_object
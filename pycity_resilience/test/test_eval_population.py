@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import os
+import copy
+
+import pycity_resilience.ga.evaluate.eval as eval
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+
+
+def gen_ind(boi_size):
+    dict_esys = {'bat': 0, 'boi': 0, 'chp': 0, 'eh': 0, 'hp_aw': 0,
+                 'hp_ww': 0, 'pv': 0, 'tes': 0}
+
+    ind = {1001: copy.deepcopy(dict_esys), 1002: copy.deepcopy(dict_esys),
+           'lhn': [[1001, 1002]]}
+    ind[1001]['boi'] = boi_size
+
+    return ind
+
+
+class TestEvalPopulation():
+    def test_eval_population(self, tmpdir):
+        list_evaluated = []
+
+        def evaluate(ind):
+            list_evaluated.append(ind)
+            return (float(ind[1001]['boi']), 1.)
+
+        ind_dupl = gen_ind(boi_size=2000)
+        #  Identical LHN network in other order
+        ind_dupl['lhn'] = [[1002, 1001]]
+
+        list_ind = [gen_ind(boi_size=1000), gen_ind(boi_size=2000),
+                    ind_dupl, gen_ind(boi_size=3000)]
+
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100})
+        cache.put(gen_ind(boi_size=3000), (3000., 1.))
+
+        (list_fitness, dict_dedup) = \
+            eval.eval_population(list_ind=list_ind, evaluate=evaluate,
+                                 fitness_cache=cache)
+
+        assert list_fitness == [(1000., 1.), (2000., 1.), (2000., 1.),
+                                (3000., 1.)]
+        assert len(list_evaluated) == 2
+        assert dict_dedup['nb_inds'] == 4
+        assert dict_dedup['nb_unique'] == 3
+        assert dict_dedup['nb_cached'] == 1
+        assert dict_dedup['nb_work'] == 2
+        assert dict_dedup['work_ratio'] == 0.5
+
+        (list_fitness, dict_dedup) = \
+            eval.eval_population(list_ind=[], evaluate=evaluate)
+        assert list_fitness == []
+        assert dict_dedup['work_ratio'] == 0
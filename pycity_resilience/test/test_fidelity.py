@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_resilience.ga.evaluate.fidelity as fidel
+
+
+class TestFidelity():
+    def test_calc_front_mean(self):
+        array_mean = fidel.calc_front_mean([(1., 4.), (3., 2.),
+                                            (10 ** 100, 10 ** 100)])
+        assert np.allclose(array_mean, [2., 3.])
+
+        assert fidel.calc_front_mean([(10 ** 100, 10 ** 100)]) is None
+
+    def test_fidelity_schedule(self):
+        fidelity = fidel.FidelitySchedule(list_nb_runs=[10, 50, 100],
+                                          rel_tol=0.01, nb_stall_gen=2,
+                                          max_stage_gen=5)
+
+        assert fidelity.get_nb_runs() == 10
+        assert not fidelity.is_final()
+
+        #  Improving front does not raise fidelity
+        assert not fidelity.update(gen=0, list_fitness_front=[(100., 100.)])
+        assert not fidelity.update(gen=1, list_fitness_front=[(90., 90.)])
+        assert not fidelity.update(gen=2, list_fitness_front=[(80., 80.)])
+
+        #  Converged front raises fidelity
+        assert not fidelity.update(gen=3, list_fitness_front=[(80., 80.)])
+        assert fidelity.update(gen=4, list_fitness_front=[(80., 80.)])
+        assert fidelity.get_nb_runs() == 50
+        assert fidelity.gen_stage_start == 4
+
+        #  Max. nb. of generations per stage raises fidelity
+        for g in range(5, 9):
+            assert not fidelity.update(gen=g,
+                                       list_fitness_front=[(100. - g,
+                                                            100. - g)])
+        assert fidelity.update(gen=9, list_fitness_front=[(90., 90.)])
+        assert fidelity.is_final()
+        assert fidelity.get_nb_runs() == 100
+
+        #  Final stage is kept
+        assert not fidelity.update(gen=100, list_fitness_front=[(1., 1.)])
+
+    def test_unsorted_list(self):
+        try:
+            fidel.FidelitySchedule(list_nb_runs=[100, 10])
+            assert False
+        except AssertionError as e:
+            assert 'increasing' in str(e)
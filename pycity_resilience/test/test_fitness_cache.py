@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import os
+import copy
+import pickle
+
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+
+
+class TestFitnessCache():
+    def gen_ind(self):
+        dict_b1 = {'chp': 10000, 'boi': 30000, 'tes': 500,
+                   'eh': 0, 'hp_aw': 0, 'hp_ww': 0, 'pv': 30, 'bat': 0}
+        dict_b2 = {'chp': 0, 'boi': 0, 'tes': 0,
+                   'eh': 0, 'hp_aw': 0, 'hp_ww': 0, 'pv': 0, 'bat': 0}
+        dict_b3 = {'chp': 0, 'boi': 20000, 'tes': 0,
+                   'eh': 0, 'hp_aw': 0, 'hp_ww': 0, 'pv': 0, 'bat': 0}
+
+        return {1001: dict_b1, 1002: dict_b2, 1003: dict_b3,
+                'lhn': [[1001, 1002]]}
+
+    def test_calc_ind_hash(self):
+        ind = self.gen_ind()
+
+        #  Reordered ind with reversed LHN node order
+        ind2 = {'lhn': [[1002, 1001]]}
+        for key in [1003, 1002, 1001]:
+            ind2[key] = copy.deepcopy(ind[key])
+
+        assert fitcache.calc_ind_hash(ind) == fitcache.calc_ind_hash(ind2)
+
+        #  Int and float sizes are equal
+        ind2[1003]['boi'] = 20000.0
+        assert fitcache.calc_ind_hash(ind) == fitcache.calc_ind_hash(ind2)
+
+        ind2[1003]['boi'] = 30000
+        assert fitcache.calc_ind_hash(ind) != fitcache.calc_ind_hash(ind2)
+
+        ind3 = self.gen_ind()
+        ind3['lhn'] = [[1001, 1002, 1003]]
+        assert fitcache.calc_ind_hash(ind) != fitcache.calc_ind_hash(ind3)
+
+    def test_calc_settings_key(self):
+        dict_set1 = {'objective': 'mc_mean_ann_and_co2', 'nb_runs': 100}
+        dict_set2 = {'nb_runs': 100, 'objective': 'mc_mean_ann_and_co2'}
+        dict_set3 = {'nb_runs': 10, 'objective': 'mc_mean_ann_and_co2'}
+
+        assert fitcache.calc_settings_key(dict_set1) == \
+            fitcache.calc_settings_key(dict_set2)
+        assert fitcache.calc_settings_key(dict_set1) != \
+            fitcache.calc_settings_key(dict_set3)
+
+    def test_fitness_cache(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'cache', 'fitness_cache.sqlite')
+
+        dict_set = {'objective': 'mc_mean_ann_and_co2', 'nb_runs': 100,
+                    'sampling_method': 'lhc', 'risk_fac_av': -1,
+                    'risk_fac_friendly': 1}
+
+        cache = fitcache.FitnessCache(path=path, dict_settings=dict_set)
+
+        ind = self.gen_ind()
+
+        assert cache.get(ind) is None
+        cache.put(ind, (1000.5, 2000.25))
+        assert cache.get(ind) == (1000.5, 2000.25)
+        assert len(cache) == 1
+
+        #  Penalty values are stored without loss
+        ind2 = self.gen_ind()
+        ind2['lhn'] = []
+        cache.put(ind2, (10 ** 100, 10 ** 100))
+        assert cache.get(ind2) == (10 ** 100, 10 ** 100)
+
+        assert cache.nb_hits == 2
+        assert cache.nb_misses == 1
+        assert cache.get_stats() == (2, 1)
+
+        #  Cache can be pickled (e.g. for worker processes) and is
+        #  persistent
+        cache2 = pickle.loads(pickle.dumps(cache))
+        assert cache2.get(ind) == (1000.5, 2000.25)
+        assert cache2.get_stats() == (3, 1)
+
+        #  Different settings do not share fitness values
+        dict_set['nb_runs'] = 10
+        cache3 = fitcache.FitnessCache(path=path, dict_settings=dict_set)
+        assert cache3.get(ind) is None
+        assert cache3.get_stats() == (0, 1)
+
+    def test_nb_runs(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100})
+
+        ind = self.gen_ind()
+        ind2 = self.gen_ind()
+        ind2['lhn'] = []
+
+        assert cache.get_nb_runs(ind) is None
+        assert cache.get_nb_runs_stats() == (0, 0)
+
+        cache.put_nb_runs_by_hash(fitcache.calc_ind_hash(ind), 20)
+        cache.put_nb_runs_by_hash(fitcache.calc_ind_hash(ind2), 100)
+
+        assert cache.get_nb_runs(ind) == 20
+        assert cache.get_nb_runs_stats() == (2, 120)
+
+    def test_obj_stats(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100})
+
+        ind = self.gen_ind()
+        dict_stats = {'annuity_mean': 1000.5, 'co2_std': 20.25}
+
+        assert cache.get_obj_stats(ind) is None
+
+        cache.put_obj_stats_by_hash(fitcache.calc_ind_hash(ind), dict_stats)
+
+        assert cache.get_obj_stats(ind) == dict_stats
+
+    def test_with_settings(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100,
+                                                     'objective': 'obj'})
+
+        assert cache.with_settings({'nb_runs': 100}) is cache
+
+        cache_low = cache.with_settings({'nb_runs': 10})
+        assert cache.with_settings({'nb_runs': 10}) is cache_low
+        assert cache_low.dict_settings == {'nb_runs': 10, 'objective': 'obj'}
+
+        ind = self.gen_ind()
+
+        cache_low.put(ind, (1., 2.))
+
+        assert cache_low.get(ind) == (1., 2.)
+        assert cache.get(ind) is None
+
+        cache_load = pickle.loads(pickle.dumps(cache))
+        assert cache_load.with_settings({'nb_runs': 10}).get(ind) == (1., 2.)
+
+    def test_beta_el(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100})
+
+        ind_hash = fitcache.calc_ind_hash(self.gen_ind())
+
+        assert cache.get_beta_el_by_hash(ind_hash) is None
+
+        cache.put_beta_el_by_hash(ind_hash=ind_hash, beta_el=0.25)
+
+        assert cache.get_beta_el_by_hash(ind_hash) == 0.25
+
+    def test_flush(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100})
+        cache.put(self.gen_ind(), (1., 2.))
+        cache.flush()
+
+        cache_load = fitcache.FitnessCache(path=path,
+                                           dict_settings={'nb_runs': 100})
+        assert cache_load.get(self.gen_ind()) == (1., 2.)
+
+    def test_reopen_in_forked_process(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100})
+        cache.put(self.gen_ind(), (1., 2.))
+
+        #  Connection of other (forked) process is not used
+        conn = cache._get_conn()
+        cache._pid = -1
+        assert cache._get_conn() is not conn
+        assert cache.get(self.gen_ind()) == (1., 2.)
+
+    def test_stats_interval(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100},
+                                      stats_interval=3)
+        cache_other = fitcache.FitnessCache(path=path,
+                                            dict_settings={'nb_runs': 100})
+
+        ind = self.gen_ind()
+        cache.put(ind, (1., 2.))
+
+        cache.get(ind)
+        cache.get(ind)
+
+        #  Counts are kept in memory of current process
+        assert cache_other.get_stats() == (0, 0)
+
+        cache.get(self.gen_ind())
+        assert cache_other.get_stats() == (3, 0)
+
+        cache.get(ind)
+        cache.close()
+        assert cache_other.get_stats() == (4, 0)
+        assert cache.nb_hits == 4
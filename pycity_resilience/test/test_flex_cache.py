@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import os
+
+import pycity_resilience.ga.evaluate.fitness_cache as fitcache
+import pycity_resilience.ga.evaluate.flex_cache as flexcache
+
+
+class TestFlexCache():
+    def test_get_beta_el(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache = fitcache.FitnessCache(path=path,
+                                      dict_settings={'nb_runs': 100})
+
+        cache.put_beta_el_by_hash(ind_hash='ind_1', beta_el=0.5)
+
+        #  Loaded from fitness cache (city is not required)
+        assert flexcache.get_beta_el(city=None, ind_hash='ind_1',
+                                     fitness_cache=cache) == 0.5
+
+        #  Memoized in current process (scoped by settings of cache)
+        memo_key = (cache.settings_key, 'ind_1')
+        assert memo_key in flexcache._dict_beta_el
+        assert flexcache.get_beta_el(city=None, ind_hash='ind_1',
+                                     scope_key=cache.settings_key) == 0.5
+
+        del flexcache._dict_beta_el[memo_key]
+
+    def test_get_beta_el_scope(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'fitness_cache.sqlite')
+
+        cache_1 = fitcache.FitnessCache(path=path,
+                                        dict_settings={'city_name': 'c1'})
+        cache_2 = fitcache.FitnessCache(path=path,
+                                        dict_settings={'city_name': 'c2'})
+
+        cache_1.put_beta_el_by_hash(ind_hash='ind_1', beta_el=0.5)
+        cache_2.put_beta_el_by_hash(ind_hash='ind_1', beta_el=0.75)
+
+        #  Identical energy systems on other city do not share memo entry
+        assert flexcache.get_beta_el(city=None, ind_hash='ind_1',
+                                     fitness_cache=cache_1) == 0.5
+        assert flexcache.get_beta_el(city=None, ind_hash='ind_1',
+                                     fitness_cache=cache_2) == 0.75
+
+        del flexcache._dict_beta_el[(cache_1.settings_key, 'ind_1')]
+        del flexcache._dict_beta_el[(cache_2.settings_key, 'ind_1')]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import copy
+import pickle
+import numpy as np
+
+from deap import base, creator
+
+import pycity_resilience.ga.parser.genome as genom
+
+if not hasattr(creator, 'FitnessGenome'):
+    creator.create('FitnessGenome', base.Fitness, weights=(-1.0, -1.0))
+    creator.create('IndGenome', genom.Genome, fitness=creator.FitnessGenome)
+
+
+def gen_ind():
+    dict_esys = {'bat': 0, 'boi': 0, 'chp': 0, 'eh': 0, 'hp_aw': 0,
+                 'hp_ww': 0, 'pv': 0, 'tes': 0}
+
+    ind = {}
+    for n in [1001, 1002, 1003, 1004]:
+        ind[n] = copy.deepcopy(dict_esys)
+
+    ind[1001]['boi'] = 20000
+    ind[1001]['chp'] = 5000
+    ind[1001]['tes'] = 300
+    ind[1002]['hp_aw'] = 10000
+    ind[1002]['eh'] = 5000
+    ind[1002]['pv'] = 33.0
+    ind[1004]['boi'] = 12345  # Not part of dict_restr
+
+    ind['lhn'] = [[1004, 1001], [1002]]
+
+    return ind
+
+
+def gen_codec():
+    dict_restr = {'boi': [10000, 20000, 30000],
+                  'chp': [5000, 10000],
+                  'tes': [100, 200, 300],
+                  'hp_aw': [5000, 10000],
+                  'eh': [5000, 10000]}
+
+    return genom.GenomeCodec(list_build_ids=[1004, 1003, 1002, 1001],
+                             dict_restr=dict_restr)
+
+
+class TestGenome():
+    def test_encode_decode(self):
+        codec = gen_codec()
+        ind = gen_ind()
+
+        genome = codec.encode(ind)
+
+        assert genome.esys.shape == (4, 8)
+        assert genome.esys.dtype == np.int16
+        assert genome.esys[0, genom.list_esys_keys.index('boi')] == 2
+        #  Unknown sizes are appended to value tables
+        assert genome.esys[3, genom.list_esys_keys.index('boi')] == 4
+        assert list(genome.lhn) == [1, 2, 0, 1]
+
+        dict_ind = genome.to_dict()
+
+        for n in [1001, 1002, 1003, 1004]:
+            assert dict_ind[n] == ind[n]
+        #  LHN subnetworks and nodes are sorted
+        assert dict_ind['lhn'] == [[1001, 1004], [1002]]
+
+    def test_canonical_lhn(self):
+        codec = gen_codec()
+
+        ind = gen_ind()
+        ind_other = gen_ind()
+        ind_other['lhn'] = [[1002], [1001, 1004]]
+
+        genome = codec.encode(ind)
+        genome_other = codec.encode(ind_other)
+
+        assert genome == genome_other
+        assert hash(genome) == hash(genome_other)
+        assert genome == ind_other
+
+        ind_other[1003]['boi'] = 10000
+        assert codec.encode(ind_other) != genome
+        assert genome != ind_other
+
+    def test_eq_without_codec_change(self):
+        codec = gen_codec()
+
+        genome = codec.encode(gen_ind())
+        list_len = [len(table) for table in codec.list_tables]
+
+        ind_other = gen_ind()
+        ind_other[1003]['boi'] = 54321  # Unknown size
+        assert genome != ind_other
+
+        #  Comparison does not append values to value tables
+        assert [len(table) for table in codec.list_tables] == list_len
+
+    def test_eq_other_codec(self):
+        genome = gen_codec().encode(gen_ind())
+
+        #  Other order of value tables
+        codec_other = genom.GenomeCodec(list_build_ids=[1001, 1002, 1003,
+                                                        1004])
+        genome_other = codec_other.encode(gen_ind())
+
+        assert genome == genome_other
+        assert hash(genome) == hash(genome_other)
+
+    def test_copy(self):
+        codec = gen_codec()
+
+        genome = codec.encode(gen_ind())
+        genome_copy = genome.copy()
+
+        assert genome_copy == genome
+        assert genome_copy.codec is genome.codec
+
+        genome_copy.esys[0, 0] = 1
+        assert genome_copy != genome
+
+    def test_individual_with_fitness(self):
+        codec = gen_codec()
+
+        ind = codec.encode(gen_ind(), genome_class=creator.IndGenome)
+        ind.fitness.values = (1., 2.)
+
+        ind_copy = copy.deepcopy(ind)
+        assert ind_copy == ind
+        assert ind_copy.fitness.values == (1., 2.)
+        assert ind_copy.fitness is not ind.fitness
+        assert ind_copy.codec is ind.codec
+
+        ind_load = pickle.loads(pickle.dumps(ind))
+        assert ind_load.fitness.values == (1., 2.)
+        assert ind_load.to_dict() == ind.to_dict()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_resilience.ga.evaluate.incremental as incr
+
+
+class TestIncremental():
+    def gen_ind(self):
+        dict_b1 = {'chp': 10000, 'boi': 30000, 'tes': 500,
+                   'eh': 0, 'hp_aw': 0, 'hp_ww': 0, 'pv': 30, 'bat': 0}
+        dict_b2 = {'chp': 0, 'boi': 0, 'tes': 0,
+                   'eh': 0, 'hp_aw': 0, 'hp_ww': 0, 'pv': 0, 'bat': 0}
+        dict_b3 = {'chp': 0, 'boi': 20000, 'tes': 0,
+                   'eh': 0, 'hp_aw': 0, 'hp_ww': 0, 'pv': 0, 'bat': 0}
+
+        return {1001: dict_b1, 1002: dict_b2, 1003: dict_b3,
+                'lhn': [[1002, 1001]]}
+
+    def test_get_eval_units(self):
+        ind = self.gen_ind()
+
+        list_units = incr.get_eval_units(ind=ind)
+
+        assert len(list_units) == 2
+
+        (unit_key, list_ids, sub_ind) = list_units[0]
+        assert unit_key[0] == 'build'
+        assert unit_key[1] == 1003
+        assert list_ids == [1003]
+        assert sub_ind == {1003: ind[1003], 'lhn': []}
+
+        (unit_key, list_ids, sub_ind) = list_units[1]
+        assert unit_key[0] == 'lhn'
+        assert unit_key[1] == (1001, 1002)
+        assert list_ids == [1001, 1002]
+        assert sub_ind['lhn'] == [[1001, 1002]]
+
+        #  Change of building 1003 does not change LHN unit
+        ind[1003]['boi'] = 25000
+        list_units2 = incr.get_eval_units(ind=ind)
+        assert list_units2[0][0] != list_units[0][0]
+        assert list_units2[1][0] == list_units[1][0]
+
+    def test_partial_result_cache(self):
+        cache = incr.PartialResultCache(nb_samples=5, max_units=2)
+
+        unit_key = ('build', 1003, (0.0, 20000.0))
+
+        assert cache.get_missing_idx(unit_key, [0, 1, 2]) == [0, 1, 2]
+
+        cache.add_results(unit_key=unit_key, list_idx=[0, 2],
+                          dict_res={'annuity': np.array([10., 30.])},
+                          list_failed=[2])
+
+        assert cache.get_missing_idx(unit_key, [0, 1, 2]) == [1]
+        assert cache.nb_hits == 2
+        assert cache.nb_misses == 4
+
+        (dict_res, list_failed) = cache.get_results(unit_key, [2, 0])
+        assert np.allclose(dict_res['annuity'], [30., 10.])
+        assert list_failed == [2]
+
+        #  Oldest unit is removed, if max_units is exceeded
+        cache.add_results(('build', 1), [0], {'annuity': np.array([1.])}, [])
+        cache.add_results(('build', 2), [0], {'annuity': np.array([2.])}, [])
+        assert len(cache) == 2
+        assert cache.get_missing_idx(unit_key, [0]) == [0]
+
+    def test_sum_unit_results(self):
+        list_dict_res = [{'annuity': np.array([1., 2.]),
+                          'co2': np.array([10., 20.])},
+                         {'annuity': np.array([3., 4.]),
+                          'co2': np.array([30., 40.]),
+                          'lhn_pump': np.array([1., 1.])}]
+
+        dict_sum = incr.sum_unit_results(list_dict_res=list_dict_res)
+
+        assert np.allclose(dict_sum['annuity'], [4., 6.])
+        assert np.allclose(dict_sum['co2'], [40., 60.])
+        assert np.allclose(dict_sum['lhn_pump'], [1., 1.])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import copy
+import random
+import multiprocessing
+
+from deap import base, creator, tools
+
+import pycity_resilience.ga.evolution.islands as islands
+
+if not hasattr(creator, 'FitnessIsland'):
+    creator.create('FitnessIsland', base.Fitness, weights=(-1.0, -1.0))
+    creator.create('IndIsland', dict, fitness=creator.FitnessIsland)
+
+
+def gen_ind(boi_size):
+    ind = creator.IndIsland({1001: {'boi': boi_size, 'chp': 0}, 'lhn': []})
+    ind.fitness.values = evaluate(ind)
+    return ind
+
+
+def evaluate(ind):
+    return (float(ind[1001]['boi']), 100000. - ind[1001]['boi'])
+
+
+def crossover(pop, nb_offspring=None):
+    if nb_offspring is None:
+        nb_offspring = len(pop)
+    offspring = []
+    for i in range(nb_offspring):
+        ind = copy.deepcopy(random.choice(pop))
+        ind[1001]['boi'] += random.choice([-1000, 1000])
+        del ind.fitness.values
+        offspring.append(ind)
+    return offspring
+
+
+def mutate(ind):
+    ind[1001]['boi'] = random.randint(0, 100) * 1000
+    return ind
+
+
+def select(parents, invalid_ind, nb_ind, objective):
+    return tools.selNSGA2(parents + invalid_ind, nb_ind)
+
+
+def gen_toolbox():
+    toolbox = base.Toolbox()
+    toolbox.register('crossover', crossover)
+    toolbox.register('mutate', mutate)
+    toolbox.register('select', select)
+    toolbox.register('evaluate', evaluate)
+    return toolbox
+
+
+class TestIslands():
+    def test_get_targets(self):
+        assert islands.get_targets(island_id=3, nb_islands=4,
+                                   topology='ring') == [0]
+        assert islands.get_targets(island_id=1, nb_islands=4,
+                                   topology='full') == [0, 2, 3]
+        assert islands.get_targets(island_id=1, nb_islands=4,
+                                   topology='random')[0] in [0, 2, 3]
+        assert islands.get_targets(island_id=0, nb_islands=1,
+                                   topology='ring') == []
+
+    def test_select_and_receive_migrants(self):
+        pop = [gen_ind(boi_size=size) for size in [10000, 20000, 30000]]
+
+        list_migrants = islands.select_migrants(pop=pop, nb_migrants=2)
+        assert len(list_migrants) == 2
+        for ind in list_migrants:
+            assert ind in pop
+            assert ind.fitness.valid
+
+        inbox = multiprocessing.Queue()
+        inbox.put((1, list_migrants + [gen_ind(boi_size=40000)]))
+        inbox.put((2, [gen_ind(boi_size=40000)]))
+
+        #  Wait for queue feeder thread
+        while inbox.empty():
+            pass
+
+        list_imm = []
+        while len(list_imm) == 0:
+            list_imm = islands.receive_migrants(inbox=inbox, pop=pop)
+
+        assert list_imm == [gen_ind(boi_size=40000)]
+
+    def test_run_islands(self):
+        pop = [gen_ind(boi_size=size) for size in range(10000, 90000, 10000)]
+
+        (list_pop, list_logbook, list_nb_imm) = \
+            islands.run_islands(pop=pop, toolbox=gen_toolbox(),
+                                nb_islands=2, ngen=4, prob_mutation=0.5,
+                                objective='ann_and_co2_ref_test',
+                                mig_interval=2, nb_migrants=2,
+                                topology='full', nb_processes=2, seed=1)
+
+        assert len(list_pop) == 2
+        for pop_island, logbook in zip(list_pop, list_logbook):
+            assert len(pop_island) == 4
+            assert len(logbook) == 0
+            for ind in pop_island:
+                assert ind.fitness.values == evaluate(ind)
+        for nb_imm in list_nb_imm:
+            assert nb_imm >= 0
@@ -9,6 +9,7 @@ import copy
 import shapely.geometry.point as point
 
 import pycity_resilience.ga.evolution.lhn_changes as lhnchanges
+import pycity_resilience.ga.analyse.find_lhn as findlhn
 
 
 class TestLHNChanges():
@@ -1391,3 +1392,63 @@ class TestLHNChanges():
         assert count_tes == 1
 
         assert ind[1001]['chp'] == 0  # CHP moved to other node
+
+    def test_lhn_index_up_to_date(self):
+        dict_restr = {'boi': [1],
+                      'tes': [2],
+                      'chp': [3],
+                      'hp_aw': [4],
+                      'hp_ww': [5],
+                      'eh': [6],
+                      'pv': [7],
+                      'bat': [8]}
+
+        b_dict = {'boi': 0,
+                  'chp': 0,
+                  'hp_aw': 0,
+                  'hp_ww': 0,
+                  'eh': 0,
+                  'tes': 0,
+                  'pv': 0,
+                  'bat': 0}
+
+        ind = {'lhn': [[1001, 1002, 1003, 1004], [1005, 1006, 1007]]}
+
+        dict_max_pv_area = {}
+        dict_pos = {}
+
+        for i in range(10):
+            ind[1001 + i] = copy.copy(b_dict)
+            dict_max_pv_area[1001 + i] = 10
+            dict_pos[1001 + i] = point.Point(10 * i, 0)
+
+        lhn_index = findlhn.LhnIndex(ind=ind)
+
+        lhnchanges.del_lhn_node(ind=ind, idx_lhn=0, dict_restr=dict_restr,
+                                pv_min=0, dict_max_pv_area=dict_max_pv_area,
+                                dict_pos=dict_pos, prob_nodes=[1, 0],
+                                prob_lhn_mut=1, lhn_index=lhn_index)
+
+        assert len(ind['lhn'][0]) == 3
+        assert lhn_index == findlhn.LhnIndex(ind=ind)
+
+        lhnchanges.add_lhn_node(ind=ind, idx_lhn=1, dict_restr=dict_restr,
+                                dict_pos=dict_pos, prob_nodes=[1, 0],
+                                prob_lhn_mut=1, lhn_index=lhn_index)
+
+        assert len(ind['lhn'][1]) == 4
+        assert lhn_index == findlhn.LhnIndex(ind=ind)
+
+        lhnchanges.add_single_lhn(ind=ind, dict_restr=dict_restr, pv_min=0,
+                                  dict_max_pv_area=dict_max_pv_area,
+                                  dict_pos=dict_pos, lhn_index=lhn_index)
+
+        assert len(ind['lhn']) == 3
+        assert lhn_index == findlhn.LhnIndex(ind=ind)
+
+        lhnchanges.del_lhn(ind=ind, dict_restr=dict_restr, pv_min=0,
+                           dict_max_pv_area=dict_max_pv_area,
+                           prob_del=[1, 0], lhn_index=lhn_index)
+
+        assert len(ind['lhn']) == 2
+        assert lhn_index == findlhn.LhnIndex(ind=ind)
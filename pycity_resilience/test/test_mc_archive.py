@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import os
+import copy
+import pickle
+import numpy as np
+
+import pycity_resilience.ga.evaluate.mc_archive as mcarch
+
+
+def gen_ind():
+    dict_esys = {'bat': 0, 'boi': 0, 'chp': 0, 'eh': 0, 'hp_aw': 0,
+                 'hp_ww': 0, 'pv': 0, 'tes': 0}
+
+    ind = {1001: copy.deepcopy(dict_esys), 1002: copy.deepcopy(dict_esys),
+           'lhn': []}
+    ind[1001]['boi'] = 20000
+
+    return ind
+
+
+class TestMcArchive():
+    def test_pack_unpack(self):
+        dict_mc_res = {'annuity': np.array([1., 2., 3.]),
+                       'co2': np.array([4., 5., 6.])}
+
+        data = mcarch.pack_results(dict_mc_res=dict_mc_res,
+                                   list_idx_failed=[1])
+
+        (dict_mc_res_load, list_idx_failed) = mcarch.unpack_results(data)
+
+        assert sorted(dict_mc_res_load.keys()) == ['annuity', 'co2']
+        assert np.allclose(dict_mc_res_load['annuity'], [1., 2., 3.])
+        assert list_idx_failed == [1]
+
+    def test_put_get(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'mc_archive.sqlite')
+
+        archive = mcarch.McResultArchive(path=path,
+                                         dict_settings={'nb_runs': 3})
+
+        ind = gen_ind()
+        dict_mc_res = {'annuity': np.array([1., 2., 3.])}
+
+        assert archive.get(ind) is None
+        assert ind not in archive
+
+        archive.put(ind=ind, dict_mc_res=dict_mc_res, list_idx_failed=[])
+        archive.put_by_hash(ind_hash=mcarch.ref_key,
+                            dict_mc_res=dict_mc_res, list_idx_failed=[2])
+
+        assert ind in archive
+        assert len(archive) == 2
+        assert archive.get_by_hash(mcarch.ref_key)[1] == [2]
+
+        #  Other settings do not share results
+        archive_other = \
+            mcarch.McResultArchive(path=path, dict_settings={'nb_runs': 5})
+        assert ind not in archive_other
+        assert len(archive_other) == 0
+
+        #  Without settings, all results are found
+        archive_all = mcarch.McResultArchive(path=path)
+        (dict_mc_res_load, list_idx_failed) = archive_all.get(ind)
+        assert np.allclose(dict_mc_res_load['annuity'], [1., 2., 3.])
+        assert list_idx_failed == []
+
+    def test_pickle(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'mc_archive.sqlite')
+
+        archive = mcarch.McResultArchive(path=path)
+        archive.put(ind=gen_ind(),
+                    dict_mc_res={'co2': np.array([1.])},
+                    list_idx_failed=[])
+
+        archive_load = pickle.loads(pickle.dumps(archive))
+
+        assert gen_ind() in archive_load
+
+    def test_close_and_fork(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'mc_archive.sqlite')
+
+        archive = mcarch.McResultArchive(path=path)
+        archive.put(ind=gen_ind(),
+                    dict_mc_res={'co2': np.array([1.])},
+                    list_idx_failed=[])
+
+        #  Connection is reopened on access
+        archive.close()
+        assert gen_ind() in archive
+
+        #  Connection of other (forked) process is not used
+        conn = archive._get_conn()
+        archive._pid = -1
+        assert archive._get_conn() is not conn
+        assert gen_ind() in archive
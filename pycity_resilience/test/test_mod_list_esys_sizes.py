@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import pickle
+import random
+
+import pycity_resilience.ga.evolution.helpers.mod_list_esys_sizes as modlist
+
+
+class TestModListEsysSizes():
+    def test_ranges_equal_lists(self):
+        list_val = list(range(1000, 10000, 1000)) \
+                   + list(range(10000, 50000, 5000))
+
+        size_table = modlist.SizeTable(list_val=list_val)
+
+        for ref_val in [0, 999, 1000, 4500, 10000, 12345, 45000, 60000]:
+            assert list(size_table.get_range_larger_than_ref(ref_val)) == \
+                   modlist.get_list_values_larger_than_ref(list_val=list_val,
+                                                           ref_val=ref_val)
+            assert list(size_table.get_range_smaller_than_ref(ref_val)) == \
+                   modlist.get_list_values_smaller_than_ref(list_val=list_val,
+                                                            ref_val=ref_val)
+
+    def test_choice(self):
+        list_val = list(range(100, 2100, 100))
+
+        dict_restr = modlist.SizeTables(dict_restr={'tes': list_val})
+
+        size_range = modlist.get_range_larger_than_ref(dict_restr=dict_restr,
+                                                       key='tes', ref_val=500)
+
+        assert len(size_range) == 16
+        assert size_range[0] == 500
+        assert size_range[-1] == 2000
+
+        #  Same random draws as random.choice on list
+        random.seed(1)
+        list_choice = [random.choice(size_range) for i in range(20)]
+        random.seed(1)
+        list_ref = [random.choice(list_val[4:]) for i in range(20)]
+        random.seed(1)
+        list_range = [size_range.choice() for i in range(20)]
+
+        assert list_choice == list_ref
+        assert list_range == list_ref
+
+    def test_size_tables(self):
+        dict_restr = {'boi': [30000, 10000, 20000], 'chp': [1000, 2000]}
+
+        size_tables = modlist.SizeTables(dict_restr=dict_restr)
+
+        #  Can be used as dict_restr
+        assert size_tables == dict_restr
+        assert repr(size_tables) == repr(dict_restr)
+
+        size_tables_load = pickle.loads(pickle.dumps(size_tables))
+
+        assert size_tables_load.dict_tables['boi'].list_val == \
+               [10000, 20000, 30000]
+        assert list(modlist.get_range_smaller_than_ref(
+            dict_restr=size_tables_load, key='chp', ref_val=100)) == [1000]
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_resilience.ga.evaluate.objectives as objfkt
+
+
+class McAnalyzeDummy(object):
+    def __init__(self):
+        self._array_ann_mod = np.array([1000., 1200., 800.])
+        self._array_co2_mod = np.array([500., 400., 600.])
+        self._array_sh_dem_mod = np.array([100., 100., 100.])
+        self._array_el_dem_mod = np.array([50., 50., 50.])
+        self._array_dhw_dem_mod = np.array([50., 50., 50.])
+        self._array_dimless_cost = np.array([0.9, 1.1, 1.0])
+        self._array_dimless_co2 = np.array([0.8, 0.7, 0.9])
+
+    def _get_array(self, type):
+        if type == 'annuity':
+            return self._array_ann_mod
+        elif type == 'co2':
+            return self._array_co2_mod
+        elif type == 'ann_to_en':
+            return self._array_ann_mod / 200
+        elif type == 'co2_to_en':
+            return self._array_co2_mod / 200
+        elif type == 'dimless_an':
+            return self._array_dimless_cost
+        elif type == 'dimless_co2':
+            return self._array_dimless_co2
+
+    def calc_risk_averse_parameters(self, type, risk_factor=-1):
+        array = self._get_array(type)
+        return np.mean(array) - risk_factor * np.std(array)
+
+    def calc_risk_friendly_parameters(self, type, risk_factor=1):
+        array = self._get_array(type)
+        return np.mean(array) - risk_factor * np.std(array)
+
+
+class TestObjectives():
+    def test_calc_all_stats(self):
+        mc_analyze = McAnalyzeDummy()
+
+        dict_stats = objfkt.calc_all_stats(mc_analyze=mc_analyze,
+                                           risk_fac_av=-2)
+
+        assert len(dict_stats) == 6 * len(objfkt.list_stats)
+
+        assert abs(dict_stats['annuity_mean'] - 1000) < 10 ** -8
+        assert abs(dict_stats['co2_std'] -
+                   np.std(mc_analyze._array_co2_mod)) < 10 ** -8
+        assert abs(dict_stats['ann_to_en_mean'] - 5) < 10 ** -8
+        assert abs(dict_stats['dimless_an_risk_av'] -
+                   (1 + 2 * np.std(mc_analyze._array_dimless_cost))) \
+            < 10 ** -8
+
+    def test_get_obj_values(self):
+        dict_stats = objfkt.calc_all_stats(mc_analyze=McAnalyzeDummy())
+
+        #  All registered objectives can be extracted from one result
+        for objective in objfkt.dict_objectives.keys():
+            tup_obj = objfkt.get_obj_values(dict_stats=dict_stats,
+                                            objective=objective,
+                                            beta_el=0.5)
+            if objfkt.get_objective(objective)[2]:
+                assert len(tup_obj) == 3
+                assert tup_obj[2] == 0.5
+            else:
+                assert len(tup_obj) == 2
+
+        assert objfkt.get_obj_values(dict_stats, 'mc_mean_ann_and_co2') == \
+            (dict_stats['annuity_mean'], dict_stats['co2_mean'])
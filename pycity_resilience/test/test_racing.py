@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import os
+import numpy as np
+
+import pycity_resilience.ga.evaluate.racing as racing
+
+
+class McAnalyzeDummy(object):
+    def __init__(self, array_ann, array_co2):
+        self._array_ann_mod = np.array(array_ann, dtype=float)
+        self._array_co2_mod = np.array(array_co2, dtype=float)
+        self._array_sh_dem_mod = np.ones(len(array_ann))
+        self._array_el_dem_mod = np.ones(len(array_ann))
+        self._array_dhw_dem_mod = np.ones(len(array_ann))
+
+
+class TestRacing():
+    def test_is_dominated(self):
+        array_front = np.array([[100., 50.], [50., 100.]])
+
+        assert racing.is_dominated([120., 60.], array_front)
+        assert racing.is_dominated([100., 60.], array_front)
+        assert not racing.is_dominated([100., 50.], array_front)
+        assert not racing.is_dominated([70., 70.], array_front)
+        assert not racing.is_dominated([120., 60.], None)
+
+    def test_save_load_front(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'first_front.json')
+
+        assert racing.load_front(path) is None
+
+        racing.save_front(path=path, list_fitness=[(100., 50.), (50., 100.)])
+
+        array_front = racing.load_front(path)
+        assert np.allclose(array_front, [[100., 50.], [50., 100.]])
+
+    def test_dominance_race(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'first_front.json')
+
+        race = racing.DominanceRace(path_front=path,
+                                    objective='mc_mean_ann_and_co2')
+
+        mc_analyze = McAnalyzeDummy(array_ann=[1000., 1010., 990., 1000.],
+                                    array_co2=[500., 505., 495., 500.])
+
+        #  No front, yet
+        assert not race(mc_analyze, 4)
+
+        #  Front is not clearly better
+        racing.save_front(path=path, list_fitness=[(995., 499.)])
+        os.utime(path, (1, 1))
+        assert not race(mc_analyze, 4)
+        assert race.fitness_est is None
+
+        #  Clearly dominated
+        racing.save_front(path=path, list_fitness=[(500., 100.)])
+        os.utime(path, (2, 2))
+        assert race(mc_analyze, 4)
+        assert race.fitness_est[0] > 1000
+        assert race.fitness_est[1] > 500
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import os
+import pickle
+import numpy as np
+
+import pycity_resilience.ga.preprocess.ref_mc_run as refrun
+
+
+class McRunDummy(object):
+    def __init__(self, array):
+        self._dict_samples_const = {'city': {'interest': array}}
+        self._dict_samples_esys = {1001: {'boi': [array, 1]}}
+        self._nb_runs = len(array)
+
+
+class TestRefMcRun():
+    def test_calc_samples_hash(self):
+        mc_run = McRunDummy(array=np.array([1., 2., 3.]))
+        mc_run_same = McRunDummy(array=np.array([1., 2., 3.]))
+        mc_run_other = McRunDummy(array=np.array([1., 2., 4.]))
+
+        assert refrun.calc_samples_hash(mc_run) == \
+            refrun.calc_samples_hash(mc_run_same)
+        assert refrun.calc_samples_hash(mc_run) != \
+            refrun.calc_samples_hash(mc_run_other)
+
+    def test_calc_samples_hash_exclude(self):
+        mc_run = McRunDummy(array=np.array([1., 2., 3.]))
+        mc_run_other = McRunDummy(array=np.array([1., 2., 3.]))
+        mc_run_other._dict_samples_esys = {1001: {'boi': [5., 1]}}
+
+        assert refrun.calc_samples_hash(mc_run) != \
+            refrun.calc_samples_hash(mc_run_other)
+        assert refrun.calc_samples_hash(
+            mc_run, list_exclude=['_dict_samples_esys']) == \
+            refrun.calc_samples_hash(mc_run_other,
+                                     list_exclude=['_dict_samples_esys'])
+
+    def test_calc_ref_key(self):
+        mc_run = McRunDummy(array=np.array([1., 2., 3.]))
+
+        key = refrun.calc_ref_key(city={'build': 1}, mc_run=mc_run,
+                                  dict_settings={'nb_runs': 3})
+
+        assert key == refrun.calc_ref_key(city={'build': 1}, mc_run=mc_run,
+                                          dict_settings={'nb_runs': 3})
+        assert key != refrun.calc_ref_key(city={'build': 2}, mc_run=mc_run,
+                                          dict_settings={'nb_runs': 3})
+        assert key != refrun.calc_ref_key(city={'build': 1}, mc_run=mc_run,
+                                          dict_settings={'nb_runs': 5})
+
+    def test_load_persisted_ref_run(self, tmpdir):
+        path_cache = str(tmpdir)
+
+        city = {'build': 1}
+        mc_run = McRunDummy(array=np.array([1., 2., 3.]))
+
+        dict_settings = {'nb_runs': 3,
+                         'sampling_method': 'lhc',
+                         'eeg_pv_limit': False,
+                         'use_kwkg_lhn_sub': False,
+                         'el_mix_for_chp': True,
+                         'el_mix_for_pv': True,
+                         'heating_off': True}
+
+        key = refrun.calc_ref_key(city=city, mc_run=mc_run,
+                                  dict_settings=dict_settings)
+
+        dict_mc_res = {'annuity': np.array([10., 11., 12.])}
+
+        pickle.dump(dict_mc_res,
+                    open(os.path.join(path_cache, 'ref_mc_' + key + '.pkl'),
+                         mode='wb'))
+
+        #  Persisted results are used (dummy city cannot be simulated)
+        dict_mc_res_load = \
+            refrun.perform_ref_mc_run(city=city, mc_run=mc_run, nb_runs=3,
+                                      sampling_method='lhc',
+                                      path_cache=path_cache)
+
+        assert np.allclose(dict_mc_res_load['annuity'], [10., 11., 12.])
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import os
+import pickle
+import numpy as np
+
+import pycity_resilience.monte_carlo.sample_bank as samplebank
+
+
+class McRunnerDummy(object):
+    def __init__(self, nb_runs):
+        self._dict_samples_const = {'interest': np.random.rand(nb_runs),
+                                    'name': 'const'}
+        self._dict_samples_esys = {1001: {'boi': np.random.rand(nb_runs, 2)}}
+        self._list_build_ids = [1001]
+
+
+class TestSampleBank():
+    def test_sample_bank(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'sample_bank')
+        nb_runs = 10
+
+        mc_run = McRunnerDummy(nb_runs=nb_runs)
+        array_int = np.array(mc_run._dict_samples_const['interest'])
+        array_boi = np.array(mc_run._dict_samples_esys[1001]['boi'])
+
+        samplebank.save_sample_bank(mc_run=mc_run, path=path,
+                                    nb_samples=nb_runs)
+
+        mc_run2 = McRunnerDummy(nb_runs=nb_runs)
+        assert samplebank.attach_sample_bank(mc_run=mc_run2,
+                                             path=path) == nb_runs
+
+        #  Identical sample rows (memory-mapped)
+        assert isinstance(mc_run2._dict_samples_const['interest'], np.memmap)
+        assert np.allclose(mc_run2._dict_samples_const['interest'], array_int)
+        assert np.allclose(mc_run2._dict_samples_esys[1001]['boi'],
+                           array_boi)
+        assert mc_run2._dict_samples_const['name'] == 'const'
+
+        #  Samples are not pickled
+        mc_run3 = samplebank.get_state_without_samples(mc_run=mc_run2,
+                                                       path=path)
+        assert mc_run3._dict_samples_const is None
+        assert mc_run3._list_build_ids is mc_run2._list_build_ids
+        assert mc_run2._dict_samples_const is not None
+        assert len(pickle.dumps(mc_run3)) < len(pickle.dumps(mc_run))
+
+    def test_sample_bank_exclude(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'sample_bank')
+
+        mc_run = McRunnerDummy(nb_runs=5)
+        samplebank.save_sample_bank(mc_run=mc_run, path=path, nb_samples=5,
+                                    list_exclude=['_dict_samples_esys'])
+
+        mc_run2 = McRunnerDummy(nb_runs=5)
+        array_boi = mc_run2._dict_samples_esys[1001]['boi']
+        samplebank.attach_sample_bank(mc_run=mc_run2, path=path)
+
+        assert mc_run2._dict_samples_esys[1001]['boi'] is array_boi
+
+    def test_sample_bank_overwrite(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'sample_bank')
+
+        assert samplebank.has_sample_bank(path=path) is False
+
+        mc_run = McRunnerDummy(nb_runs=5)
+        samplebank.save_sample_bank(mc_run=mc_run, path=path, nb_samples=5)
+
+        assert samplebank.has_sample_bank(path=path) is True
+
+        mc_run2 = McRunnerDummy(nb_runs=5)
+        samplebank.attach_sample_bank(mc_run=mc_run2, path=path)
+        array_int = np.array(mc_run2._dict_samples_const['interest'])
+
+        #  Overwriting sample bank does not change attached arrays
+        mc_run3 = McRunnerDummy(nb_runs=5)
+        samplebank.save_sample_bank(mc_run=mc_run3, path=path, nb_samples=5)
+
+        assert np.allclose(mc_run2._dict_samples_const['interest'], array_int)
+        assert not any(name.endswith('.tmp') for name in os.listdir(path))
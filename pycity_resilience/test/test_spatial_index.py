@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import pickle
+import numpy as np
+
+import shapely.geometry.point as point
+
+import pycity_resilience.ga.preprocess.spatial_index as spatind
+
+
+def gen_dict_pos():
+    np.random.seed(1)
+
+    dict_pos = {}
+    for i in range(50):
+        dict_pos[1001 + i] = point.Point(np.random.rand() * 100,
+                                         np.random.rand() * 100)
+    return dict_pos
+
+
+class TestSpatialIndex():
+    def test_dist(self):
+        dict_pos = gen_dict_pos()
+        list_ids = list(dict_pos.keys())
+
+        index = spatind.SpatialIndex(dict_pos=dict_pos)
+
+        assert index.use_dense
+        assert index == dict_pos
+
+        list_dist = index.get_dist(id=1001, list_ids=list_ids)
+
+        for i in range(len(list_ids)):
+            assert list_dist[i] == \
+                   dict_pos[1001].distance(dict_pos[list_ids[i]])
+
+    def test_dense_and_tree(self):
+        dict_pos = gen_dict_pos()
+        list_ids = list(dict_pos.keys())
+
+        index_dense = spatind.SpatialIndex(dict_pos=dict_pos)
+        index_tree = spatind.SpatialIndex(dict_pos=dict_pos, max_nb_dense=10)
+
+        assert not index_tree.use_dense
+
+        list_ref = [1001, 1005, 1030]
+
+        for max_dist in [None, 15, 40]:
+            matrix_dense = index_dense.get_dist_matrix(list_ref=list_ref,
+                                                       list_search=list_ids)
+            matrix_tree = index_tree.get_dist_matrix(list_ref=list_ref,
+                                                     list_search=list_ids,
+                                                     max_dist=max_dist)
+
+            if max_dist is None:
+                assert np.array_equal(matrix_dense, matrix_tree)
+            else:
+                mask = matrix_dense <= max_dist
+                assert np.array_equal(matrix_dense[mask], matrix_tree[mask])
+                assert np.all(matrix_tree[~mask] > max_dist)
+
+            dict_dense = index_dense.get_min_dist(list_ref=list_ref,
+                                                  list_search=list_ids,
+                                                  max_dist=max_dist)
+            dict_tree = index_tree.get_min_dist(list_ref=list_ref,
+                                                list_search=list_ids,
+                                                max_dist=max_dist)
+
+            assert list(dict_dense.items()) == list(dict_tree.items())
+
+    def test_min_dist_key_order(self):
+        dict_pos = {1001: point.Point(0, 0), 1002: point.Point(10, 0),
+                    1003: point.Point(0, 10), 1004: point.Point(0, 30)}
+
+        index = spatind.SpatialIndex(dict_pos=dict_pos)
+
+        dict_dist = index.get_min_dist(list_ref=[1001, 1002],
+                                       list_search=[1001, 1003, 1004])
+
+        #  Reference node is added, after all other nodes
+        assert list(dict_dist.keys()) == [1003, 1004, 1001]
+        assert dict_dist[1001] == 10
+
+        dict_dist = index.get_min_dist(list_ref=[1001],
+                                       list_search=[1001, 1003, 1004],
+                                       max_dist=20)
+
+        assert dict_dist == {1003: 10}
+
+    def test_pickle(self):
+        index = spatind.SpatialIndex(dict_pos=gen_dict_pos(), max_nb_dense=10)
+
+        index_load = pickle.loads(pickle.dumps(index))
+
+        assert index_load == index
+        assert index_load.get_dist(id=1001, list_ids=[1002, 1003]) == \
+               index.get_dist(id=1001, list_ids=[1002, 1003])
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import copy
+import random
+from multiprocessing.pool import ThreadPool
+
+from deap import base, creator, tools
+
+import pycity_resilience.ga.evolution.steady_state as steady
+
+if not hasattr(creator, 'FitnessSteady'):
+    creator.create('FitnessSteady', base.Fitness, weights=(-1.0, -1.0))
+    creator.create('IndSteady', dict, fitness=creator.FitnessSteady)
+
+
+def gen_ind(boi_size):
+    ind = creator.IndSteady({1001: {'boi': boi_size, 'chp': 0}, 'lhn': []})
+    return ind
+
+
+def evaluate(ind):
+    return (float(ind[1001]['boi']), 100000. - ind[1001]['boi'])
+
+
+def crossover(pop, nb_offspring=None):
+    if nb_offspring is None:
+        nb_offspring = len(pop)
+    offspring = []
+    for i in range(nb_offspring):
+        ind = copy.deepcopy(random.choice(pop))
+        ind[1001]['boi'] += random.choice([-1000, 1000])
+        del ind.fitness.values
+        offspring.append(ind)
+    return offspring
+
+
+def mutate(ind):
+    ind[1001]['boi'] = random.randint(0, 100) * 1000
+    return ind
+
+
+def select(parents, invalid_ind, nb_ind, objective):
+    return tools.selNSGA2(parents + invalid_ind, nb_ind)
+
+
+def gen_toolbox():
+    toolbox = base.Toolbox()
+    toolbox.register('crossover', crossover)
+    toolbox.register('mutate', mutate)
+    toolbox.register('select', select)
+    return toolbox
+
+
+class TestSteadyState():
+    def test_gen_offspring(self):
+        random.seed(1)
+
+        pop = [gen_ind(boi_size=size) for size in [10000, 20000, 30000]]
+        for ind in pop:
+            ind.fitness.values = evaluate(ind)
+
+        list_off = steady.gen_offspring(pop=pop, toolbox=gen_toolbox(),
+                                        nb_offspring=2, prob_mutation=0.5,
+                                        list_exclude=[gen_ind(11000)])
+
+        assert len(list_off) <= 2
+        for ind in list_off:
+            assert not ind.fitness.valid
+            assert ind not in pop
+            assert ind != gen_ind(11000)
+
+    def test_run_steady_state(self):
+        random.seed(1)
+
+        nb_ind = 6
+
+        pop = [gen_ind(boi_size=50000) for i in range(nb_ind)]
+        for ind in pop:
+            ind.fitness.values = evaluate(ind)
+
+        list_gen = []
+
+        def callback(gen, pop, list_ind):
+            list_gen.append((gen, len(pop), len(list_ind)))
+            return gen == 2
+
+        pool = ThreadPool(processes=2)
+
+        evaluator = steady.AsyncEvaluator(evaluate=evaluate, pool=pool)
+
+        nb_done = steady.run_steady_state(pop=pop, toolbox=gen_toolbox(),
+                                          evaluator=evaluator,
+                                          nb_ind=nb_ind, nb_evals=100,
+                                          prob_mutation=0.5, nb_parallel=3,
+                                          objective='ann_and_co2_ref_test',
+                                          callback=callback)
+
+        pool.close()
+        pool.join()
+
+        #  Run is stopped by callback after third generation equivalent
+        assert len(list_gen) == 3
+        assert [gen for (gen, nb_pop, nb_new) in list_gen] == [0, 1, 2]
+        assert 3 * nb_ind <= nb_done < 100
+        assert evaluator.get_nb_pending() == 0
+
+        assert len(pop) == nb_ind
+        for ind in pop:
+            assert ind.fitness.valid
+            assert ind.fitness.values == evaluate(ind)
+
+    def test_gen_offspring_nb_parents(self):
+        random.seed(2)
+
+        pop = [gen_ind(boi_size=size * 1000) for size in range(20)]
+        for ind in pop:
+            ind.fitness.values = evaluate(ind)
+
+        list_nb = []
+
+        def crossover_count(pop, nb_offspring=None):
+            list_nb.append(nb_offspring)
+            return crossover(pop, nb_offspring=nb_offspring)
+
+        toolbox = gen_toolbox()
+        toolbox.register('crossover', crossover_count)
+
+        steady.gen_offspring(pop=pop, toolbox=toolbox, nb_offspring=2,
+                             prob_mutation=0)
+
+        #  Only offspring for free slots is generated (not whole population)
+        assert list_nb == [2]
+
+    def test_run_steady_state_retry(self):
+        random.seed(3)
+
+        nb_ind = 4
+
+        pop = [gen_ind(boi_size=50000) for i in range(nb_ind)]
+        for ind in pop:
+            ind.fitness.values = evaluate(ind)
+
+        list_calls = []
+
+        def crossover_dupl(pop, nb_offspring=None):
+            list_calls.append(nb_offspring)
+            if len(list_calls) % 3 != 0:
+                #  Only copies of population (no new individuals)
+                return [copy.deepcopy(ind) for ind in pop[:nb_offspring]]
+            return crossover(pop, nb_offspring=nb_offspring)
+
+        toolbox = gen_toolbox()
+        toolbox.register('crossover', crossover_dupl)
+
+        pool = ThreadPool(processes=1)
+
+        evaluator = steady.AsyncEvaluator(evaluate=evaluate, pool=pool)
+
+        nb_done = steady.run_steady_state(pop=pop, toolbox=toolbox,
+                                          evaluator=evaluator,
+                                          nb_ind=nb_ind, nb_evals=10,
+                                          prob_mutation=0, nb_parallel=1,
+                                          objective='ann_and_co2_ref_test')
+
+        pool.close()
+        pool.join()
+
+        #  Evaluation budget is used, although offspring generation
+        #  repeatedly returned no new individuals
+        assert nb_done == 10
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+"""
+from __future__ import division
+
+import copy
+import numpy as np
+
+import pycity_resilience.ga.evaluate.surrogate as surro
+
+
+def gen_ind(boi_size, lhn=False):
+    dict_esys = {'bat': 0, 'boi': 0, 'chp': 0, 'eh': 0, 'hp_aw': 0,
+                 'hp_ww': 0, 'pv': 0, 'tes': 0}
+
+    ind = {1001: copy.deepcopy(dict_esys), 1002: copy.deepcopy(dict_esys),
+           'lhn': []}
+    ind[1001]['boi'] = boi_size
+
+    if lhn:
+        ind['lhn'] = [[1001, 1002]]
+
+    return ind
+
+
+class TestSurrogate():
+    def test_encode_ind(self):
+        ind = gen_ind(boi_size=20000, lhn=True)
+
+        list_build_ids = surro.get_build_ids(ind)
+        assert list_build_ids == [1001, 1002]
+
+        array_feat = surro.encode_ind(ind=ind, list_build_ids=list_build_ids)
+
+        assert len(array_feat) == 2 * (len(surro.list_esys_keys) + 1)
+        assert array_feat[1] == 20000
+        assert array_feat[8] == 1
+        assert array_feat[17] == 1
+
+    def test_prescreen(self):
+        surrogate = surro.Surrogate(weights=(-1.0, -1.0), min_train=10,
+                                    seed=1)
+
+        list_ind = [gen_ind(boi_size=size) for size in range(0, 100000, 1000)]
+        list_fit = [(ind[1001]['boi'] + 1000, ind[1001]['boi'] + 1000)
+                    for ind in list_ind]
+
+        #  Penalty values are not used for training
+        surrogate.add_samples(list_ind=list_ind + [gen_ind(boi_size=5)],
+                              list_fitness=list_fit + [(10 ** 100,
+                                                        10 ** 100)])
+        assert len(surrogate.list_feat) == len(list_ind)
+
+        surrogate.fit()
+        assert surrogate.trained
+
+        list_off = [gen_ind(boi_size=500), gen_ind(boi_size=95000)]
+
+        (list_ind_eval, list_ind_skip, matrix_pred, list_fit_skip) = \
+            surrogate.prescreen(list_ind=list_off,
+                                list_front_fitness=[(1500., 1500.)])
+
+        #  Large boiler is clearly dominated by front
+        assert list_ind_eval == [list_off[0]]
+        assert list_ind_skip == [list_off[1]]
+        assert matrix_pred.shape == (1, 2)
+        assert list_fit_skip[0][0] > 50000
+
+    def test_calc_pred_error(self):
+        array_error = \
+            surro.calc_pred_error(matrix_pred=np.array([[110., 90.],
+                                                        [1., 1.]]),
+                                  list_fitness=[(100., 100.),
+                                                (10 ** 100, 10 ** 100)])
+
+        assert np.allclose(array_error, [0.1, 0.1])
+
+        assert surro.calc_pred_error(matrix_pred=np.array([[1., 1.]]),
+                                     list_fitness=[(10 ** 100,
+                                                    10 ** 100)]) is None